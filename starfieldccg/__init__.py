@@ -1,8 +1,12 @@
 """
-    Init  file for the root of the package.
+    Init  file for the root of the package. Catalog is the library entry
+    point, importing the package reads no files.
 """
+from .src.catalog import Catalog
 
 __all__ =[
+    'Catalog',
+    'src.catalog',
     'src.data_file_reader',
     'src.data_objects',
     'src.menu_views']
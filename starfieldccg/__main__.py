@@ -1,25 +1,253 @@
 """
-    Main Execution part of the program.
+    Main Execution part of the program. The menus are one consumer of the
+    Catalog library API, and nothing is read until run() is called.
 """
 # pylint: disable=wrong-import-position
+import argparse
 from os import path as OSPATH
 import sys
 sys.path.insert(0, OSPATH.abspath(OSPATH.join(OSPATH.dirname(__file__), './')))
 sys.path.insert(0, OSPATH.abspath(OSPATH.join(OSPATH.dirname(__file__), './src/')))
+from .src.one_shot import ONE_SHOT_COMMANDS, run_one_shot
+# The one shot commands print and exit before the menus (and prompt_toolkit) are imported.
+if __name__ == "__main__" and len(sys.argv) > 1 and sys.argv[1] in ONE_SHOT_COMMANDS:
+    sys.exit(run_one_shot(sys.argv[1:]))
 from .src.menu_views import ItemMenu, NavMenu, StatusModMenu, QualityMenu, SettingsMenu
-from .src.data_file_reader import DataFileReader as DFR
+from .src.catalog import Catalog
+from .src.batch_files import BatchFileWriter, iter_loadout_entries
 
 
-items_workbook = DFR(OSPATH.abspath(OSPATH.join(OSPATH.dirname(__file__),
-                                                  './data/Starfield_Datatable.xls')))
-print("Datasheets Loaded!")
+def make_arg_parser():
+    """
+    Returns the argument parser of the menus.
+
+    :return: An argparse.ArgumentParser object.
+    """
+    arg_parser = argparse.ArgumentParser(prog="starfieldccg",
+                                         description="Generate Starfield console commands.",
+                                         epilog="To print one command and exit, run "
+                                         "starfieldccg give CATEGORY NAME [QUANTITY], "
+                                         "starfieldccg mods {armor,weapon} SLOT [SLOT] [SLOT], "
+                                         "or starfieldccg quality {armor,weapon} LEVEL. Add "
+                                         "--help to any of them for more.")
+    arg_parser.add_argument("--rebuild-snapshot", action="store_true",
+                            help="Ignore the saved catalog snapshot and rebuild it from the "
+                            "datasheet.")
+    arg_parser.add_argument("--no-snapshot", action="store_true",
+                            help="Always read the datasheet and don't save a catalog snapshot.")
+    arg_parser.add_argument("--datatable", metavar="PATH",
+                            help="Read the datatable from PATH instead of the built in one. It "
+                            "can be a .xls or .xlsx workbook, a folder of .csv files, or a .json "
+                            "or .ndjson file.")
+    arg_parser.add_argument("--convert", metavar="PATH",
+                            help="Write the datatable's sheets to PATH in the format its "
+                            "extension gives (a folder of .csv files if it has none) and exit.")
+    arg_parser.add_argument("--database", metavar="PATH",
+                            help="Load the items from a catalog database instead of the "
+                            "datasheet.")
+    arg_parser.add_argument("--export-database", metavar="PATH",
+                            help="Write the items to a catalog database and exit.")
+    arg_parser.add_argument("--map", metavar="PATH",
+                            help="Read the items from a catalog map file instead of the "
+                            "datasheet.")
+    arg_parser.add_argument("--export-map", metavar="PATH",
+                            help="Write the items to a catalog map file and exit.")
+    arg_parser.add_argument("--batch-file", metavar="PATH",
+                            help="Also write the commands to PATH, a batch file that the game "
+                            "runs with 'bat <name>', and an index of it. It is written on exit.")
+    arg_parser.add_argument("--batch-lines", metavar="N", type=int,
+                            help="Split the batch file into numbered files of at most N lines.")
+    arg_parser.add_argument("--loadout", metavar="PATH",
+                            help="Make the commands of a .csv file of category,name,quantity "
+                            "rows, print them or write them to --batch-file, and exit.")
+    arg_parser.add_argument("--timings", action="store_true",
+                            help="Build every sheet and print how long each phase of loading "
+                            "took.")
+    arg_parser.add_argument("--watch", action="store_true",
+                            help="Reload the sheets that change when the datasheet is saved.")
+    arg_parser.add_argument("--overlay", metavar="PATH", action="append", default=[],
+                            help="Read the items of another datatable on top of the built in "
+                            "one. Items with the same name replace the earlier ones. Can be "
+                            "repeated.")
+    arg_parser.add_argument("--show-conflicts", action="store_true",
+                            help="List the items the overlays replaced and exit.")
+    return arg_parser
+
+def parse_args(argv: list = None):
+    """
+    Parses and checks the arguments of the menus.
+
+    :param argv: An optional list of the str arguments. Defaults to sys.argv[1:].
+
+    :return: An argparse.Namespace of the parsed arguments.
+    """
+    arg_parser = make_arg_parser()
+    args = arg_parser.parse_args(argv)
+    if len(args.overlay) > 0 and args.database is not None:
+        arg_parser.error("--overlay can't be used with --database")
+    if len(args.overlay) > 0 and args.map is not None:
+        arg_parser.error("--overlay can't be used with --map")
+    if len(args.overlay) > 0 and args.convert is not None:
+        arg_parser.error("--overlay can't be used with --convert")
+    if args.database is not None and args.map is not None:
+        arg_parser.error("--database can't be used with --map")
+    if args.batch_lines is not None and args.batch_file is None:
+        arg_parser.error("--batch-lines can only be used with --batch-file")
+    if args.batch_lines is not None and args.batch_lines < 1:
+        arg_parser.error("--batch-lines has to be above 0")
+    return args
+
+def make_catalog(args):
+    """
+    Creates the Catalog of the parsed arguments.
+
+    :param args: The argparse.Namespace of the parsed arguments.
+
+    :return: A Catalog object.
+    """
+    # Everything but the menus needs the whole catalog before it can go on.
+    load_in_background = args.timings is not True and args.show_conflicts is not True \
+        and args.export_database is None and args.export_map is None and args.convert is None \
+        and args.loadout is None
+    return Catalog(args.datatable, overlay_paths=args.overlay,
+                   use_snapshot=not args.no_snapshot,
+                   rebuild_snapshot=args.rebuild_snapshot,
+                   database_path=args.database,
+                   map_path=args.map,
+                   record_timings=args.timings,
+                   load_in_background=load_in_background)
+
+def run_catalog_tools(catalog: Catalog, args):
+    """
+    Runs the options that write or report on the catalog instead of showing
+    the menus, and starts watching the datasheet if asked to.
+
+    :param catalog: The Catalog of the parsed arguments.
+    :param args: The argparse.Namespace of the parsed arguments.
+
+    :return: True if one of them ran and the program should exit.
+    """
+    items_workbook = catalog.get_reader()
+    if args.show_conflicts is True:
+        if len(catalog.overlay_paths) > 0:
+            print(items_workbook.format_conflict_report())
+        else:
+            print("No overlays were given.")
+        return True
+    if args.convert is not None:
+        row_count = items_workbook.export_datatable(args.convert)
+        print(f"Wrote {row_count} rows to {args.convert}")
+        return True
+    if args.export_database is not None:
+        item_count = items_workbook.export_database(args.export_database)
+        print(f"Wrote {item_count} items to {args.export_database}")
+        return True
+    if args.export_map is not None:
+        item_count = items_workbook.export_catalog_map(args.export_map)
+        print(f"Wrote {item_count} items to {args.export_map}")
+        return True
+    if args.timings is True:
+        items_workbook.build_catalog()
+        if items_workbook.loaded_from_snapshot is True:
+            print("The catalog was loaded from its snapshot, so no sheets were built. "
+                  "Use --rebuild-snapshot or --no-snapshot to time them.")
+        else:
+            print(items_workbook.format_load_report())
+        print("Datasheets Loaded!")
+    if args.watch is True and args.database is None and args.map is None \
+    and items_workbook.datatable_format == "xls":
+        items_workbook.start_watching(
+            on_reload=lambda sheets: print(f"\nReloaded {', '.join(sheets)} from the datasheet."))
+    return False
+
+def close_batch_writer(batch_writer: BatchFileWriter):
+    """
+    Writes the last batch file and the index, and prints what was written.
 
-def handle_item_menu(data_dict: dict, title: str):
+    :param batch_writer: The BatchFileWriter of --batch-file.
+    """
+    for batch in batch_writer.close():
+        print(f"Wrote {batch['lines']} lines to {batch['file']}")
+
+def run_loadout(catalog: Catalog, loadout_path: str, batch_writer: BatchFileWriter = None):
+    """
+    Prints the commands of a loadout .csv file, or writes them to the batch file.
+
+    :param catalog: The Catalog to find the items in.
+    :param loadout_path: A str filepath to the .csv file.
+    :param batch_writer: An optional BatchFileWriter to write the commands to.
+
+    :return: An int exit code, 0 if the commands were made and 1 if they weren't.
+    """
+    try:
+        loadout_batch = catalog.make_batch(iter_loadout_entries(loadout_path),
+                                           allow_unknown=True)
+    except (OSError, ValueError) as e:
+        print(e)
+        return 1
+    if len(loadout_batch.unknown) > 0:
+        print(f"{len(loadout_batch.unknown)} items in {loadout_path} weren't found:")
+        for category, name, _ in loadout_batch.unknown:
+            print(f"  {category}: {name}")
+        return 1
+    if batch_writer is not None:
+        try:
+            batch_writer.write_commands(loadout_batch.iter_commands(),
+                                        f"Loadout: {OSPATH.basename(loadout_path)}")
+            close_batch_writer(batch_writer)
+        except OSError as e:
+            batch_writer.abort()
+            print(e)
+            return 1
+    else:
+        for command_line in loadout_batch.iter_commands():
+            print(command_line)
+    return 0
+
+def print_load_progress(progress: tuple):
+    """
+    Prints how much of the catalog has loaded over the last progress line.
+
+    :param progress: A tuple of (int built item dicts, int item dicts).
+    """
+    loaded, total = progress
+    bar_width = 30
+    filled = bar_width * loaded // total
+    print(f"\rLoading the datasheets [{'#' * filled}{'.' * (bar_width - filled)}] "
+          f"{loaded}/{total}", end="", flush=True)
+
+def get_catalog(catalog: Catalog, catalog_name: str):
+    """
+    Returns an item dict, showing a progress bar if the background load
+    hasn't built it yet.
+
+    :param catalog: The Catalog the item dict is from.
+    :param catalog_name: A str of the item dict's attribute name, e.g. "ammo_data".
+
+    :return: A dict with the items.
+    """
+    waited = False
+
+    def on_wait(progress: tuple):
+        nonlocal waited
+        waited = True
+        print_load_progress(progress)
+
+    data_dict = catalog.get_items(catalog_name, on_wait=on_wait)
+    if waited is True:
+        print()
+    return data_dict
+
+def handle_item_menu(catalog: Catalog, data_dict: dict, title: str, catalog_name: str,
+                     batch_writer: BatchFileWriter = None):
     """
     Handles a menu for an item type.
 
+    :param catalog: The Catalog the items are from.
     :param data_dict: A dict containing item data.
     :param title: A str containing the title for the menu.
+    :param catalog_name: A str of the item dict the items are from, e.g. "ammo_data".
+    :param batch_writer: An optional BatchFileWriter to also write the command to.
 
     :return: Returns True if the operation is successful.
     """
@@ -33,18 +261,23 @@ def handle_item_menu(data_dict: dict, title: str):
     return_value = False
     if item_choice != "end":
         print("\n")
-        pretty_print_command(data_dict[item_choice]
-              .get_command(item_amount))
+        pretty_print_command(catalog.get_command_cache().get_command(catalog_name, item_choice,
+                                                                     item_amount),
+                             f"{data_dict[item_choice].get_name()} x{item_amount}", batch_writer)
         return_value = True
 
     return return_value
 
-def handle_status_mods(title: str, data_dict: dict):
+def handle_status_mods(catalog: Catalog, title: str, data_dict: dict, catalog_name: str,
+                       batch_writer: BatchFileWriter = None):
     """
     Handles the Status Mods menu.
 
+    :param catalog: The Catalog the mods are from.
     :param title: A str with the title of the prompt.
     :param data_dict: A dict with the type of data to search through.
+    :param catalog_name: A str of the item dict the mods are from.
+    :param batch_writer: An optional BatchFileWriter to also write the commands to.
 
     :return: Returns True if the operation is successful.
     """
@@ -59,23 +292,31 @@ def handle_status_mods(title: str, data_dict: dict):
         print("\n")
         for i, choice in enumerate(mod_choices):
             if choice != "skip":
-                command.append(data_dict[mod_choices[i]]
-              .get_command())
+                command.append(catalog.get_command_cache().get_command(catalog_name,
+                                                                       mod_choices[i]))
         return_value = True
-    pretty_print_command("\n".join(command))
+    pretty_print_command("\n".join(command),
+                         ", ".join(data_dict[choice].get_name() for choice in mod_choices
+                                   if choice in data_dict), batch_writer)
 
     return return_value
 
-def handle_quality_mods(title: str, prompt: str, data_dict: dict):
+def handle_quality_mods(catalog: Catalog, title: str, prompt: str, data_dict: dict,
+                        catalog_name: str, batch_writer: BatchFileWriter = None):
     """
     Handles a quality mod menu by passing a prompt to it.
 
+    :param catalog: The Catalog the mods are from.
     :param title: A str with the title of the prompt.
     :param prompt: A str with a prompt to display.
     :param data_dict: A dict with the type of data to search through.
+    :param catalog_name: A str of the item dict the mods are from.
+    :param batch_writer: An optional BatchFileWriter to also write the command to.
 
     :return: Returns True if the operation is successful.
     """
+    # pylint: disable=too-many-positional-arguments
+    # pylint: disable=too-many-arguments
 
     quality_menu = QualityMenu(data_dict, title,
                               prompt)
@@ -85,8 +326,8 @@ def handle_quality_mods(title: str, prompt: str, data_dict: dict):
 
     if mod_choice != "quit":
         print("\n")
-        pretty_print_command(data_dict[mod_choice]
-        .get_command())
+        pretty_print_command(catalog.get_command_cache().get_command(catalog_name, mod_choice),
+                             data_dict[mod_choice].get_name(), batch_writer)
         return_value = True
 
     return return_value
@@ -103,10 +344,13 @@ def handle_settings_menu():
 
     return True
 
-def handle_weapons_menu():
+def handle_weapons_menu(catalog: Catalog, batch_writer: BatchFileWriter = None):
     """
     Handles the weapons menu and splits weapons 
     between unique and not unique.
+
+    :param catalog: The Catalog the weapons are from.
+    :param batch_writer: An optional BatchFileWriter to also write the command to.
     """
     options_menu_selection = ["Unique Weapons", "Normal Weapons", \
                               "Melee Weapons", "Guns", "Thrown Weapons","All Weapons"]
@@ -114,38 +358,46 @@ def handle_weapons_menu():
                           "Select a category of Weapons or 'end' to return to the main menu> ")
     options_selection = option_menu.display_menu().lower()
 
+    if options_selection in [option.lower() for option in options_menu_selection]:
+        get_catalog(catalog, "weapon_data")
+    items_workbook = catalog.get_reader()
+
     if options_selection == "unique weapons":
-        result = handle_item_menu(items_workbook.get_weapons_by_unique(True),
-                                  "Select a Weapon Type:")
+        result = handle_item_menu(catalog, items_workbook.get_weapons_by_unique(True),
+                                  "Select a Weapon Type:", "weapon_data", batch_writer)
 
     elif options_selection == "normal weapons":
-        result = handle_item_menu(items_workbook.get_weapons_by_unique(False),
-                                  "Select a Weapon Type:")
+        result = handle_item_menu(catalog, items_workbook.get_weapons_by_unique(False),
+                                  "Select a Weapon Type:", "weapon_data", batch_writer)
 
     elif options_selection == "all weapons":
-        result = handle_item_menu(items_workbook.weapon_data, "Select a Weapon Type:")
+        result = handle_item_menu(catalog, get_catalog(catalog, "weapon_data"),
+                                  "Select a Weapon Type:", "weapon_data", batch_writer)
 
     elif options_selection == "melee weapons":
-        result = handle_item_menu(items_workbook.get_weapons_by_type("melee"),
-                                  "Select a Weapon Type:")
+        result = handle_item_menu(catalog, items_workbook.get_weapons_by_type("melee"),
+                                  "Select a Weapon Type:", "weapon_data", batch_writer)
     elif options_selection == "guns":
-        result = handle_item_menu(items_workbook.get_weapons_by_type("gun"),
-                                  "Select a Weapon Type:")
+        result = handle_item_menu(catalog, items_workbook.get_weapons_by_type("gun"),
+                                  "Select a Weapon Type:", "weapon_data", batch_writer)
 
     elif options_selection == "thrown weapons":
-        result = handle_item_menu(items_workbook.get_weapons_by_type("thrown"),
-                                  "Select a Weapon Type:")
+        result = handle_item_menu(catalog, items_workbook.get_weapons_by_type("thrown"),
+                                  "Select a Weapon Type:", "weapon_data", batch_writer)
 
     else:
         result = False
 
     return result
 
-def pretty_print_command(command: str):
+def pretty_print_command(command: str, label: str = None, batch_writer: BatchFileWriter = None):
     """
-    Standardizes how console commands are printed.
+    Standardizes how console commands are printed, and adds them to the
+    batch file when there is one.
     
     :param command: A str for commands to print.
+    :param label: An optional str the batch file's index lists the commands under.
+    :param batch_writer: An optional BatchFileWriter to also write the commands to.
     """
     border = "=" * 60
     print(border)
@@ -155,21 +407,31 @@ def pretty_print_command(command: str):
     print(command)
     print("\n")
     print(f"{border}\n")
+    if batch_writer is not None:
+        line_count = batch_writer.write_commands([command], label)
+        if line_count > 0:
+            print(f"Added {line_count} lines to the batch file.\n")
 
 
 
 # pylint: disable=too-many-branches
-def main():
+def main(catalog: Catalog, batch_writer: BatchFileWriter = None):
     """
         Main loop of program.
+
+        :param catalog: The Catalog the menus show the items of.
+        :param batch_writer: An optional BatchFileWriter to also write the commands to.
     """
 
     exited = False
-    menu_options = items_workbook.pretty_sheet_names
-    menu_options.insert(0,"Settings")
+    menu_options = ["Settings"] + catalog.get_reader().pretty_sheet_names
     main_menu = NavMenu(menu_options,
                         "Main Menu:", "Select an option or type quit to exit> ")
     while exited is False:
+        # The watch thread keeps a failed reload for here instead of printing over a menu.
+        watch_error = catalog.get_reader().get_watch_error()
+        if watch_error is not None:
+            print(f"Error reloading the datasheet: {watch_error}\n")
         menu_selection = main_menu.display_menu().lower()
 
         if menu_selection == "quit":
@@ -183,40 +445,78 @@ def main():
             else:
                 exited = True
         elif menu_selection == "ammo":
-            exited = handle_item_menu(items_workbook.ammo_data,
-                                          "Select an Ammo Type:")
+            exited = handle_item_menu(catalog, get_catalog(catalog, "ammo_data"),
+                                          "Select an Ammo Type:", "ammo_data", batch_writer)
         elif menu_selection == "spacesuits":
-            exited = handle_item_menu(items_workbook.spacesuit_data,
-                                      "Select a Spacesuit Type:")
+            exited = handle_item_menu(catalog, get_catalog(catalog, "spacesuit_data"),
+                                      "Select a Spacesuit Type:", "spacesuit_data", batch_writer)
         elif menu_selection == "packs":
-            exited = handle_item_menu(items_workbook.pack_data,
-                                      "Select a Pack Type:")
+            exited = handle_item_menu(catalog, get_catalog(catalog, "pack_data"),
+                                      "Select a Pack Type:", "pack_data", batch_writer)
         elif menu_selection == "helmets":
-            exited = handle_item_menu(items_workbook.helmet_data,
-                                      "Select a Helmet Type:")
+            exited = handle_item_menu(catalog, get_catalog(catalog, "helmet_data"),
+                                      "Select a Helmet Type:", "helmet_data", batch_writer)
         elif menu_selection == "resources":
-            exited = handle_item_menu(items_workbook.resource_data,
-                                      "Select a Resource Type:")
+            exited = handle_item_menu(catalog, get_catalog(catalog, "resource_data"),
+                                      "Select a Resource Type:", "resource_data", batch_writer)
         elif menu_selection == "weapons":
-            exited = handle_weapons_menu()
+            exited = handle_weapons_menu(catalog, batch_writer)
         elif menu_selection == "spacesuit sets":
-            exited = handle_item_menu(items_workbook.spacesuit_set_data,
-                                      "Select a Spacesuit Set:")
+            exited = handle_item_menu(catalog, get_catalog(catalog, "spacesuit_set_data"),
+                                      "Select a Spacesuit Set:", "spacesuit_set_data", batch_writer)
         elif menu_selection == "armor status mods":
-            exited = handle_status_mods("Select Armor Status Mod Type from Slot",
-                                        items_workbook.armor_status_mods_data)
+            exited = handle_status_mods(catalog, "Select Armor Status Mod Type from Slot",
+                                        get_catalog(catalog, "armor_status_mods_data"),
+                                        "armor_status_mods_data", batch_writer)
         elif menu_selection == "weapon status mods":
-            exited = handle_status_mods("Select Weapon Status Mod Type from Slot",
-                                        items_workbook.weapon_status_mods_data)
+            exited = handle_status_mods(catalog, "Select Weapon Status Mod Type from Slot",
+                                        get_catalog(catalog, "weapon_status_mods_data"),
+                                        "weapon_status_mods_data", batch_writer)
         elif menu_selection == "armor quality mods":
-            exited = handle_quality_mods("Select Armor Quality Mod Level:",
+            exited = handle_quality_mods(catalog, "Select Armor Quality Mod Level:",
                                          "Type Mod name or type 'end to \
 return back to the main menu> ",
-                                         items_workbook.armor_quality_mods_data)
+                                         get_catalog(catalog, "armor_quality_mods_data"),
+                                         "armor_quality_mods_data", batch_writer)
         elif menu_selection == "weapon quality mods":
-            exited = handle_quality_mods("Select Weapon Quality Mod Level:",
+            exited = handle_quality_mods(catalog, "Select Weapon Quality Mod Level:",
                                          "Type Mod name or type 'end' to \
 return back to the main menu> ",
-                                         items_workbook.weapon_quality_mods_data)
+                                         get_catalog(catalog, "weapon_quality_mods_data"),
+                                         "weapon_quality_mods_data", batch_writer)
+
+def run(argv: list = None):
+    """
+        Runs the program with its arguments: one of the one shot commands, one of
+        the options that writes or reports on the catalog, or the menus.
+
+        :param argv: An optional list of the str arguments. Defaults to sys.argv[1:].
+
+        :return: An int exit code.
+    """
 
-main()
+    if argv is None:
+        argv = sys.argv[1:]
+    if len(argv) > 0 and argv[0] in ONE_SHOT_COMMANDS:
+        return run_one_shot(argv)
+    args = parse_args(argv)
+    catalog = make_catalog(args)
+    if run_catalog_tools(catalog, args) is True:
+        return 0
+    # Follows the DLC load order, so a change in the settings menu is used right away.
+    catalog.get_command_cache()
+    batch_writer = None
+    if args.batch_file is not None:
+        batch_writer = BatchFileWriter(args.batch_file, args.batch_lines)
+    if args.loadout is not None:
+        return run_loadout(catalog, args.loadout, batch_writer)
+
+    try:
+        main(catalog, batch_writer)
+    finally:
+        if batch_writer is not None:
+            close_batch_writer(batch_writer)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(run())
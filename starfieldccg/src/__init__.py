@@ -4,7 +4,21 @@
 """
 
 __all__ =[
+    'batch_files',
+    'catalog',
+    'catalog_database',
+    'catalog_mapfile',
+    'catalog_snapshot',
+    'command_cache',
     'data_file_reader',
     'data_objects',
+    'datatable_formats',
+    'datatable_layers',
+    'item_builders',
+    'item_indexes',
+    'item_store',
+    'load_timings',
     'menu_views',
+    'one_shot',
+    'reader_backends',
     'settings_io']
@@ -0,0 +1,237 @@
+"""
+    A module to write console commands to the batch files Starfield runs with
+    "bat <file>", so they don't have to be pasted into the console one at a time.
+
+    BatchFileWriter streams the commands into the files a chunk of lines at a
+    time, so a batch of any size is never held in memory. It can split the
+    commands over several files at a line limit, and it writes an index file
+    listing what each of the batch files has in it.
+"""
+import csv
+import itertools
+import json
+import os
+from os import path as OSPATH
+
+BATCH_SUFFIX = ".txt"
+INDEX_SUFFIX = "_index.json"
+WRITE_CHUNK_LINES = 4096        # How many lines are joined into one write() call.
+WRITE_BUFFER_BYTES = 1024 * 1024
+
+class BatchFileWriter():
+    """
+        Writes console commands to one batch file, or to numbered batch files
+        of at most max_lines lines each, e.g. loadout_1.txt and loadout_2.txt.
+
+        A batch file is written to a temporary file and moved into place when
+        it is full or the writer is closed, so the game never runs half of one.
+        Use it as a context manager, or call close() when done.
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, target_path: str, max_lines: int = None):
+        """
+        Create a BatchFileWriter object. No file is made until a command is written.
+
+        :param target_path: A str filepath of the batch file. ".txt" is added if \
+it doesn't end with it.
+        :param max_lines: An optional int of the most lines a batch file can have. \
+When it is given the files are numbered, starting at 1.
+        """
+
+        if max_lines is not None and (isinstance(max_lines, int) is not True or max_lines < 1):
+            raise ValueError("The line limit of a batch file has to be a whole number above 0.")
+
+        if target_path.lower().endswith(BATCH_SUFFIX):
+            target_path = target_path[:-len(BATCH_SUFFIX)]
+        self.target_stem = target_path
+        self.max_lines = max_lines
+        self.index_path = f"{target_path}{INDEX_SUFFIX}"
+        self.batches = []
+        self.batch_file = None
+        self.batch_path = None
+        self.temp_path = None
+        self.batch_lines = 0
+        self.batch_contents = []
+        self.line_count = 0
+
+    def __repr__(self):
+        """
+        Return a str representation of the BatchFileWriter object.
+
+        :return: A str version of BatchFileWriter.
+        """
+
+        return (f"BatchFileWriter(target_stem='{self.target_stem}', max_lines={self.max_lines}, "
+                f"batches={len(self.batches)}, line_count={self.line_count})")
+
+    def __enter__(self):
+        """
+        Return the writer for a with block.
+
+        :return: The BatchFileWriter object.
+        """
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Close the writer at the end of a with block, or throw away the batch
+        file being written if the block raised.
+        """
+
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def get_batch_path(self, batch_number: int):
+        """
+        Return the filepath of a batch file.
+
+        :param batch_number: An int of the batch file's number, starting at 1.
+
+        :return: A str filepath.
+        """
+
+        if self.max_lines is None:
+            return f"{self.target_stem}{BATCH_SUFFIX}"
+        return f"{self.target_stem}_{batch_number}{BATCH_SUFFIX}"
+
+    def start_batch(self):
+        """
+        Open the temporary file of the next batch file.
+        """
+
+        self.batch_path = self.get_batch_path(len(self.batches) + 1)
+        self.temp_path = f"{self.batch_path}.{os.getpid()}.tmp"
+        # pylint: disable=consider-using-with
+        self.batch_file = open(self.temp_path, "w", WRITE_BUFFER_BYTES, "UTF-8")
+        self.batch_lines = 0
+        self.batch_contents = []
+
+    def finish_batch(self):
+        """
+        Close the batch file being written, move it into place, and add it to
+        the index.
+        """
+
+        if self.batch_file is None:
+            return
+        self.batch_file.close()
+        self.batch_file = None
+        os.replace(self.temp_path, self.batch_path)
+        self.batches.append({"file": OSPATH.basename(self.batch_path),
+                             "lines": self.batch_lines,
+                             "contents": self.batch_contents})
+
+    def add_contents(self, label: str, line_count: int):
+        """
+        Count lines of a label in the batch file being written.
+
+        :param label: A str describing the commands, or None.
+        :param line_count: An int of how many of their lines went in the batch file.
+        """
+
+        if len(self.batch_contents) > 0 and self.batch_contents[-1]["label"] == label:
+            self.batch_contents[-1]["lines"] += line_count
+        else:
+            self.batch_contents.append({"label": label, "lines": line_count})
+
+    def write_commands(self, commands, label: str = None):
+        """
+        Write console commands to the batch files, starting a new batch file
+        whenever the one being written is full.
+
+        :param commands: An iterable of str console commands. A command with \
+several lines, like a spacesuit set's, counts as that many lines.
+        :param label: An optional str the index lists the commands under, e.g. \
+"Weapons: Rifle x5".
+
+        :return: An int of how many lines were written.
+        """
+
+        lines = itertools.chain.from_iterable(map(str.splitlines, commands))
+        written = 0
+        while True:
+            chunk_size = WRITE_CHUNK_LINES
+            if self.max_lines is not None:
+                if self.batch_file is not None and self.batch_lines >= self.max_lines:
+                    self.finish_batch()
+                batch_lines = self.batch_lines if self.batch_file is not None else 0
+                chunk_size = min(chunk_size, self.max_lines - batch_lines)
+
+            chunk = list(itertools.islice(lines, chunk_size))
+            if len(chunk) == 0:
+                break
+            if self.batch_file is None:
+                self.start_batch()
+            self.batch_file.write("\n".join(chunk))
+            self.batch_file.write("\n")
+            self.batch_lines += len(chunk)
+            self.add_contents(label, len(chunk))
+            written += len(chunk)
+
+        self.line_count += written
+        return written
+
+    def close(self):
+        """
+        Finish the last batch file and write the index file.
+
+        :return: A list of dicts of each batch file's "file" name, its "lines" \
+count, and its "contents", a list of dicts of a "label" and its "lines" count.
+        """
+
+        self.finish_batch()
+        temp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "w", 1, "UTF-8") as index_file:
+                json.dump({"name": "Starfield Batch Files", "lines": self.line_count,
+                           "batches": self.batches}, index_file, indent=2)
+            os.replace(temp_path, self.index_path)
+        except Exception:
+            if OSPATH.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return self.batches
+
+    def abort(self):
+        """
+        Throw away the batch file being written. The finished batch files are kept.
+        """
+
+        if self.batch_file is not None:
+            self.batch_file.close()
+            self.batch_file = None
+            if OSPATH.exists(self.temp_path):
+                os.remove(self.temp_path)
+
+def iter_loadout_entries(loadout_path: str):
+    """
+    Read the (category, name, quantity) entries of a loadout .csv file a row at
+    a time, for CommandCache.make_batch(). A first row of "category,name,quantity"
+    is skipped, and so are empty rows. The quantity can be left out for a mod.
+
+    :param loadout_path: A str filepath to the .csv file.
+
+    :return: An iterator of (str category, str name, int quantity) tuples.
+    """
+
+    with open(loadout_path, "r", newline="", encoding="utf-8-sig") as loadout_file:
+        for line_number, row in enumerate(csv.reader(loadout_file), 1):
+            if len(row) == 0 or all(cell.strip() == "" for cell in row):
+                continue
+            if line_number == 1 and [cell.strip().lower() for cell in row[:2]] \
+            == ["category", "name"]:
+                continue
+            if len(row) < 2 or len(row) > 3:
+                raise ValueError(f"Line {line_number} of {loadout_path} has to be "
+                                 "category,name,quantity")
+            quantity = row[2].strip() if len(row) == 3 else ""
+            try:
+                quantity = int(quantity) if quantity != "" else 1
+            except ValueError as e:
+                raise ValueError(f"Line {line_number} of {loadout_path} has a quantity "
+                                 f"that isn't a whole number: {quantity}") from e
+            yield (row[0], row[1], quantity)
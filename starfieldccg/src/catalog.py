@@ -0,0 +1,313 @@
+"""
+    A module for Catalog, the entry point of the package as a library, e.g.:
+
+    from starfieldccg import Catalog
+
+    catalog = Catalog()
+    catalog.get_command("weapon", "Broken Fang's Heirloom Rifle", 5)
+    catalog.get_commands([("ammo", ".27 Caliber", 100), ("pack", "Mantis Pack", 1)])
+
+    Importing the package reads no files. The settings and the reader are made
+    the first time a Catalog needs them, and a Catalog can be kept and used
+    from any number of threads. The menus and the one shot commands are built
+    on it too.
+"""
+import sys
+import threading
+from os import path as OSPATH
+from .batch_files import BatchFileWriter
+from .command_cache import normalize_name
+from .data_file_reader import DataFileReader
+from .datatable_layers import LayeredDataFileReader
+sys.path.insert(0, OSPATH.abspath(OSPATH.join(OSPATH.dirname(__file__), './')))
+# pylint: disable=wrong-import-position
+import settings_io
+
+DEFAULT_DATATABLE_PATH = OSPATH.abspath(OSPATH.join(OSPATH.dirname(__file__),
+                                                    "../data/Starfield_Datatable.xls"))
+
+class Catalog():
+    """
+        The items of a datatable and their console commands.
+
+        Nothing is read when a Catalog is made. Its reader is made by the
+        first call that needs it, once, even if several threads ask at the
+        same time, and it is kept for every call after.
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, datatable_path: str = None, overlay_paths: list = None,
+                 use_snapshot: bool = True, rebuild_snapshot: bool = False,
+                 database_path: str = None, map_path: str = None,
+                 record_timings: bool = False, load_in_background: bool = False,
+                 write_snapshot: bool = True):
+        """
+        Create a Catalog object.
+
+        :param datatable_path: An optional str filepath to the data table. Defaults \
+to the one the package ships with.
+        :param overlay_paths: An optional list of str filepaths to datatables read on \
+top of it, see LayeredDataFileReader.
+        :param use_snapshot: A bool of whether to load from and save to a snapshot file.
+        :param rebuild_snapshot: A bool to ignore any existing snapshot and write a new one.
+        :param database_path: An optional str filepath to a catalog database to read \
+the items from instead.
+        :param map_path: An optional str filepath to a catalog map file to read the \
+items from instead.
+        :param record_timings: A bool of whether to time the loading phases, see \
+DataFileReader.load_report().
+        :param load_in_background: A bool of whether the reader loads every item dict \
+on a background thread once it is made.
+        :param write_snapshot: A bool of whether a missing or out of date snapshot \
+is built and saved. When it is False only the item dicts that are used are built.
+        """
+
+        # pylint: disable=too-many-positional-arguments
+        # pylint: disable=too-many-arguments
+
+        overlay_paths = list(overlay_paths) if overlay_paths is not None else []
+        if len(overlay_paths) > 0 and (database_path is not None or map_path is not None):
+            raise ValueError("Overlays can't be read from a catalog database or map file.")
+        if database_path is not None and map_path is not None:
+            raise ValueError("Items can't be read from both a catalog database and a map file.")
+
+        if datatable_path is None:
+            datatable_path = DEFAULT_DATATABLE_PATH
+        self.datatable_path = OSPATH.abspath(datatable_path)
+        self.overlay_paths = [OSPATH.abspath(overlay_path) for overlay_path in overlay_paths]
+        self.use_snapshot = use_snapshot
+        self.rebuild_snapshot = rebuild_snapshot
+        self.database_path = database_path
+        self.map_path = map_path
+        self.record_timings = record_timings
+        self.load_in_background = load_in_background
+        self.write_snapshot = write_snapshot
+        self.reader = None
+        self.reader_lock = threading.Lock()
+
+    def __repr__(self):
+        """
+        Return a str representation of the Catalog object.
+
+        :return: A str version of Catalog.
+        """
+
+        return (f"Catalog(datatable_path='{self.datatable_path}', "
+                f"overlay_paths={self.overlay_paths}, loaded={self.reader is not None})")
+
+    def __enter__(self):
+        """
+        Return the catalog for a with block.
+
+        :return: The Catalog object.
+        """
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Close the catalog at the end of a with block.
+        """
+
+        self.close()
+
+    @staticmethod
+    def get_settings():
+        """
+        Return the settings the item ids are built with, reading them the
+        first time.
+
+        :return: The SCCGSettings object.
+        """
+
+        return settings_io.get_global_settings()
+
+    def get_reader(self):
+        """
+        Return the catalog's reader, making it the first time.
+
+        :return: A DataFileReader, or a LayeredDataFileReader when there are overlays.
+        """
+
+        if self.reader is None:
+            with self.reader_lock:
+                if self.reader is None:
+                    self.get_settings()
+                    self.reader = self.make_reader()
+        return self.reader
+
+    def make_reader(self):
+        """
+        Make a new reader of the catalog's datatables.
+
+        :return: A DataFileReader, or a LayeredDataFileReader when there are overlays.
+        """
+
+        if len(self.overlay_paths) > 0:
+            return LayeredDataFileReader([self.datatable_path] + self.overlay_paths,
+                                         use_snapshot=self.use_snapshot,
+                                         rebuild_snapshot=self.rebuild_snapshot,
+                                         record_timings=self.record_timings,
+                                         load_in_background=self.load_in_background,
+                                         write_snapshot=self.write_snapshot)
+        return DataFileReader(self.datatable_path,
+                              use_snapshot=self.use_snapshot,
+                              rebuild_snapshot=self.rebuild_snapshot,
+                              database_path=self.database_path,
+                              map_path=self.map_path,
+                              record_timings=self.record_timings,
+                              load_in_background=self.load_in_background,
+                              write_snapshot=self.write_snapshot)
+
+    def get_command_cache(self):
+        """
+        Return the reader's CommandCache.
+
+        :return: The CommandCache object.
+        """
+
+        return self.get_reader().get_command_cache()
+
+    def get_catalog_name(self, category: str):
+        """
+        Return the item dict a category names.
+
+        :param category: A str of a category, e.g. "weapon" or "Armor_Status_Mods".
+
+        :return: A str of the item dict's attribute name.
+        """
+
+        catalog_name = self.get_command_cache().get_catalog_name(category)
+        if catalog_name is None:
+            raise ValueError(f"Unknown category: {category}")
+        return catalog_name
+
+    def get_items(self, category: str, on_wait=None):
+        """
+        Return the items of a category, waiting for the background load to
+        build them if it hasn't yet.
+
+        :param category: A str of a category, e.g. "ammo", or an item dict's name.
+        :param on_wait: An optional callable given the load progress while waiting, \
+see DataFileReader.wait_for_catalog().
+
+        :return: A dict of the items.
+        """
+
+        return self.get_reader().wait_for_catalog(self.get_catalog_name(category),
+                                                  on_wait=on_wait)
+
+    def make_batch(self, entries, allow_unknown: bool = False):
+        """
+        Resolve (category, name, quantity) entries to their items, see
+        CommandCache.make_batch().
+
+        :param entries: An iterable of (str category, str name, int quantity) tuples.
+        :param allow_unknown: A bool to keep the unknown entries in the batch's \
+unknown list instead of raising a ValueError that lists them.
+
+        :return: A CommandBatch object.
+        """
+
+        return self.get_command_cache().make_batch(entries, allow_unknown)
+
+    def get_commands(self, entries):
+        """
+        Return the command lines of (category, name, quantity) entries.
+
+        :param entries: An iterable of (str category, str name, int quantity) tuples.
+
+        :return: A list of str command lines.
+        """
+
+        return list(self.make_batch(entries).iter_commands())
+
+    def get_command(self, category: str, name: str, quantity: int = 1):
+        """
+        Return the command that adds an item.
+
+        :param category: A str of the item's category, e.g. "weapon".
+        :param name: A str of the item's name.
+        :param quantity: An int of how many to add. It is ignored for a mod.
+
+        :return: A str of the command, with a line for each part of a spacesuit set.
+        """
+
+        self.get_catalog_name(category)
+        return "\n".join(self.get_commands([(category, name, quantity)]))
+
+    def get_status_mod_commands(self, kind: str, mod_names: list):
+        """
+        Return the commands of up to three status mods, one for each slot.
+        Every mod that isn't found, or isn't a mod of its slot, is reported in
+        one ValueError.
+
+        :param kind: A str of "armor" or "weapon".
+        :param mod_names: A list of the str name of each slot's mod in order, or \
+None to leave a slot as it is.
+
+        :return: A list of str command lines.
+        """
+
+        if len(mod_names) > 3:
+            raise ValueError(f"There are only 3 mod slots, not {len(mod_names)}")
+        catalog_name = self.get_catalog_name(f"{kind} status mods")
+        command_cache = self.get_command_cache()
+        mods = self.get_reader().load_catalog(catalog_name)
+        name_index = command_cache.get_name_index(catalog_name)
+        keys = []
+        problems = []
+        for mod_slot, name in enumerate(mod_names, 1):
+            if name is None:
+                continue
+            key = name_index.get(normalize_name(name))
+            if key is None:
+                problems.append(f"{name!r} isn't a {kind} status mod")
+            elif mods[key].mod_slot != mod_slot:
+                problems.append(f"{name!r} is a slot {mods[key].mod_slot} mod, not slot {mod_slot}")
+            else:
+                keys.append(key)
+        if len(problems) > 0:
+            raise ValueError("; ".join(problems))
+        return [command_cache.get_command(catalog_name, key) for key in keys]
+
+    def write_batch_files(self, entries, target_path: str, max_lines: int = None,
+                          label: str = None):
+        """
+        Write the commands of (category, name, quantity) entries to batch files,
+        see BatchFileWriter. Nothing is written if an entry isn't found.
+
+        :param entries: An iterable of (str category, str name, int quantity) tuples.
+        :param target_path: A str filepath of the batch file.
+        :param max_lines: An optional int of the most lines a batch file can have.
+        :param label: An optional str the index lists the commands under.
+
+        :return: A list of dicts describing each batch file, see BatchFileWriter.close().
+        """
+
+        batch = self.make_batch(entries)
+        batch_writer = BatchFileWriter(target_path, max_lines)
+        try:
+            batch_writer.write_commands(batch.iter_commands(), label)
+        except Exception:
+            batch_writer.abort()
+            raise
+        return batch_writer.close()
+
+    def close(self):
+        """
+        Stop the reader's watcher, background load, and command cache and close
+        the workbooks its backends left open. The background load is waited for
+        before the workbooks are closed. The catalog makes a new reader if it
+        is used again.
+        """
+
+        with self.reader_lock:
+            reader = self.reader
+            self.reader = None
+        if reader is not None:
+            reader.stop_watching()
+            reader.stop_background_load()
+            reader.close()
+            if reader.command_cache is not None:
+                reader.command_cache.close()
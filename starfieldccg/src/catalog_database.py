@@ -0,0 +1,243 @@
+"""
+    A module to export the built item catalog to a SQLite database and to
+    read it back, so large datatables can be queried through indexes
+    instead of parsing the datasheet again.
+"""
+import os
+import sqlite3
+from os import path as OSPATH
+
+DATABASE_FORMAT_VERSION = 1
+
+# The columns of the items table. Columns an item type doesn't have are NULL.
+ITEM_COLUMNS = [
+    "catalog", "position", "item_key", "name", "item_id", "dlc", "is_unique", "weapon_type",
+    "description", "mod_slot", "faction", "spacesuit_key", "helmet_key", "pack_key"
+]
+
+# The items table columns that make up each catalog's sheet columns, in sheet order.
+CATALOG_COLUMNS = {
+    "ammo_data": ["name", "item_id"],
+    "spacesuit_data": ["name", "item_id", "dlc"],
+    "pack_data": ["name", "item_id", "dlc"],
+    "helmet_data": ["name", "item_id", "dlc"],
+    "spacesuit_set_data": ["name", "spacesuit_key", "helmet_key", "pack_key", "faction", "dlc"],
+    "weapon_data": ["name", "item_id", "dlc", "is_unique", "weapon_type"],
+    "resource_data": ["name", "item_id"],
+    "weapon_status_mods_data": ["name", "item_id", "description", "mod_slot"],
+    "armor_status_mods_data": ["name", "item_id", "description", "mod_slot"],
+    "armor_quality_mods_data": ["name", "item_id"],
+    "weapon_quality_mods_data": ["name", "item_id"]
+}
+
+SCHEMA = [
+    "CREATE TABLE metadata (name TEXT PRIMARY KEY, value TEXT)",
+    "CREATE TABLE items (catalog TEXT NOT NULL, position INTEGER NOT NULL, "
+    "item_key TEXT NOT NULL, name TEXT NOT NULL, item_id TEXT, dlc INTEGER, "
+    "is_unique INTEGER, weapon_type TEXT, description TEXT, mod_slot INTEGER, "
+    "faction TEXT, spacesuit_key TEXT, helmet_key TEXT, pack_key TEXT, "
+    "PRIMARY KEY (catalog, item_key))",
+    "CREATE INDEX items_position ON items (catalog, position)",
+    "CREATE INDEX items_name ON items (name COLLATE NOCASE)",
+    "CREATE INDEX items_id ON items (item_id)",
+    "CREATE INDEX items_type ON items (catalog, weapon_type)",
+    "CREATE INDEX items_slot ON items (catalog, mod_slot)"
+]
+
+def get_part_key(part):
+    """
+    Return the lowercase name of a spacesuit set part.
+
+    :param part: A SpacesuitItem, HelmetItem, PackItem, or None.
+
+    :return: A str of the lowercase name or None.
+    """
+
+    return None if part is None else part.get_name().lower()
+
+def item_to_row(catalog_name: str, position: int, item_key: str, item):
+    """
+    Return the items table row for an item.
+
+    :param catalog_name: A str of the item dict's attribute name, e.g. "ammo_data".
+    :param position: An int of the item's position in its item dict.
+    :param item_key: A str of the item's key in its item dict.
+    :param item: The item object.
+
+    :return: A tuple with a value for each of ITEM_COLUMNS.
+    """
+
+    item_id = item.get_id()
+    if isinstance(item_id, tuple):
+        # Spacesuit sets are stored by the keys of their parts instead.
+        item_id = None
+
+    return (catalog_name, position, item_key, item.get_name(), item_id,
+            getattr(item, "dlc", None), getattr(item, "unique", None),
+            getattr(item, "weapon_type", None), getattr(item, "status_mod_desc", None),
+            getattr(item, "mod_slot", None), getattr(item, "faction", None),
+            get_part_key(getattr(item, "spacesuit", None)),
+            get_part_key(getattr(item, "helmet", None)),
+            get_part_key(getattr(item, "pack", None)))
+
+class CatalogDatabase():
+    """
+        Handles a SQLite database with the built item catalog in it.
+    """
+
+    def __init__(self, database_path: str):
+        """
+        Create a CatalogDatabase object. The database isn't opened until it is used.
+
+        :param database_path: A str filepath to the database.
+        """
+
+        self.database_path = database_path
+
+    def __repr__(self):
+        """
+        Return a str representation of the CatalogDatabase object.
+
+        :return: A str version of CatalogDatabase.
+        """
+
+        return f"CatalogDatabase(database_path='{self.database_path}')"
+
+    def connect(self):
+        """
+        Open a connection to the database and check that it was written by export().
+
+        :return: A sqlite3.Connection.
+        """
+
+        if OSPATH.exists(self.database_path) is not True:
+            raise FileNotFoundError(f"No catalog database at {self.database_path}")
+
+        connection = sqlite3.connect(self.database_path)
+        try:
+            version = connection.execute(
+                "SELECT value FROM metadata WHERE name = 'format_version'").fetchone()
+        except sqlite3.DatabaseError:
+            version = None
+        if version is None or version[0] != str(DATABASE_FORMAT_VERSION):
+            connection.close()
+            raise ValueError(f"{self.database_path} is not a catalog database "
+                             f"of version {DATABASE_FORMAT_VERSION}")
+
+        return connection
+
+    def export(self, catalog: dict, dlc_load_order: str):
+        """
+        Write the catalog to the database, replacing anything already in it.
+
+        The database is written to a temporary path first and then moved into
+        place so that a reader never sees a half written database.
+
+        :param catalog: A dict of all of the item dicts keyed by their attribute name.
+        :param dlc_load_order: A str of the DLC load order the ids were built with.
+
+        :return: An int of how many items were written.
+        """
+
+        temp_path = f"{self.database_path}.{os.getpid()}.tmp"
+        if OSPATH.exists(temp_path):
+            os.remove(temp_path)
+
+        rows = [item_to_row(catalog_name, position, item_key, item)
+                for catalog_name, data_dict in catalog.items()
+                for position, (item_key, item) in enumerate(data_dict.items())]
+        connection = sqlite3.connect(temp_path)
+        try:
+            with connection:
+                for statement in SCHEMA:
+                    connection.execute(statement)
+                connection.executemany("INSERT INTO metadata VALUES (?, ?)",
+                                       [("format_version", str(DATABASE_FORMAT_VERSION)),
+                                        ("dlc_load_order", dlc_load_order)])
+                connection.executemany(
+                    f"INSERT INTO items VALUES ({', '.join(['?'] * len(ITEM_COLUMNS))})", rows)
+        except Exception:
+            connection.close()
+            os.remove(temp_path)
+            raise
+        connection.close()
+        os.replace(temp_path, self.database_path)
+
+        return len(rows)
+
+    def get_metadata(self):
+        """
+        Return the values that were saved with the catalog.
+
+        :return: A dict of str metadata names to str values.
+        """
+
+        connection = self.connect()
+        try:
+            return dict(connection.execute("SELECT name, value FROM metadata").fetchall())
+        finally:
+            connection.close()
+
+    def read_catalog_columns(self, catalog_name: str):
+        """
+        Return an item dict's rows as the same columns its sheet has, so they can
+        be built into items by the item_builders module.
+
+        :param catalog_name: A str of the item dict's attribute name, e.g. "ammo_data".
+
+        :return: A list of column lists.
+        """
+
+        if catalog_name not in CATALOG_COLUMNS:
+            raise ValueError(f"Unknown catalog name: {catalog_name}")
+        columns = CATALOG_COLUMNS[catalog_name]
+
+        connection = self.connect()
+        try:
+            rows = connection.execute(
+                f"SELECT {', '.join(columns)} FROM items WHERE catalog = ? ORDER BY position",
+                (catalog_name,)).fetchall()
+        finally:
+            connection.close()
+
+        if len(rows) == 0:
+            return [[] for _ in columns]
+        return [list(column) for column in zip(*rows)]
+
+    def query(self, catalog_name: str = None, **conditions):
+        """
+        Return the rows that match every condition, using the table's indexes.
+
+        Each keyword is one of ITEM_COLUMNS and its value is the value the
+        column has to have. "name" is matched without case.
+
+        :param catalog_name: An optional str of the item dict's attribute name to search in.
+
+        :return: A list of dicts with a key for each of ITEM_COLUMNS.
+        """
+
+        if catalog_name is not None:
+            conditions["catalog"] = catalog_name
+        where_parts = []
+        values = []
+        for column, value in conditions.items():
+            if column not in ITEM_COLUMNS:
+                raise ValueError(f"Invalid column: {column}")
+            if column == "name":
+                where_parts.append("name = ? COLLATE NOCASE")
+            else:
+                where_parts.append(f"{column} = ?")
+            values.append(value)
+
+        statement = f"SELECT {', '.join(ITEM_COLUMNS)} FROM items"
+        if len(where_parts) > 0:
+            statement = f"{statement} WHERE {' AND '.join(where_parts)}"
+
+        connection = self.connect()
+        try:
+            rows = connection.execute(f"{statement} ORDER BY catalog, position",
+                                      values).fetchall()
+        finally:
+            connection.close()
+
+        return [dict(zip(ITEM_COLUMNS, row)) for row in rows]
@@ -0,0 +1,666 @@
+"""
+    A module to write the built item catalog to a compact file of fixed
+    width records and to read it back through mmap.
+
+    Opening the file only reads its header and category table, and an item
+    object is only made the first time it is used, so startup doesn't grow
+    with the size of the catalog. Every process that opens the same file
+    shares the operating system's cached pages of it.
+
+    The file is laid out as:
+
+    - a header (HEADER) with the file's magic, version, and DLC load order
+    - a table with a CATEGORY_ENTRY for each item dict
+    - each item dict's records (RECORD), in item dict order
+    - each item dict's key index, the row numbers sorted by their key's bytes
+    - a string table of UTF-8 text that the records point into
+"""
+import bisect
+import mmap
+import os
+import struct
+from collections.abc import Mapping, Sequence
+from os import path as OSPATH
+from types import MappingProxyType
+from .data_objects import AmmoItem, SpacesuitItem, PackItem, HelmetItem
+from .data_objects import SpacesuitSetItem, WeaponItem, ResourceItem, StatusModType
+from .data_objects import QualityModType
+
+MAPFILE_MAGIC = b"SCCGMAP\x00"
+MAPFILE_FORMAT_VERSION = 1
+
+# magic, version, category count, string table offset, string table length, DLC load order.
+HEADER = struct.Struct("<8sIIII16s")
+# item dict name, record count, records offset, key index offset.
+CATEGORY_ENTRY = struct.Struct("<32sIII")
+# key offset and length, name offset and length, form id, id text offset and length,
+# flags, mod slot, text offset and length, and the spacesuit, helmet, and pack rows.
+RECORD = struct.Struct("<IIIIIIIBxhIIiii")
+ROW_INDEX = struct.Struct("<I")
+
+# Bits of a record's flags.
+FLAG_DLC = 0x01
+FLAG_UNIQUE = 0x02
+# The id isn't an 8 digit hex form id, so it is kept as text instead.
+FLAG_ID_TEXT = 0x04
+# The record has a weapon type, status mod description, or faction.
+FLAG_TEXT = 0x08
+
+# The spacesuit set part attributes and the item dicts their rows point into.
+SET_PARTS = (("spacesuit", "spacesuit_data"), ("helmet", "helmet_data"), ("pack", "pack_data"))
+
+def get_item_text(item):
+    """
+    Return the one text value an item has besides its name and id.
+
+    :param item: The item object.
+
+    :return: A str of the weapon type, status mod description, or faction, or None.
+    """
+
+    for attribute in ("weapon_type", "status_mod_desc", "faction"):
+        if hasattr(item, attribute):
+            return getattr(item, attribute)
+    return None
+
+class StringTable():
+    """
+        Collects the text a map file's records point to, storing each distinct
+        string once.
+    """
+
+    def __init__(self):
+        """
+        Create an empty StringTable object.
+        """
+
+        self.offsets = {}
+        self.parts = []
+        self.length = 0
+
+    def __repr__(self):
+        """
+        Return a str representation of the StringTable object.
+
+        :return: A str version of StringTable.
+        """
+
+        return f"StringTable(strings={len(self.offsets)}, length={self.length})"
+
+    def add(self, text: str):
+        """
+        Add a string if it isn't in the table yet.
+
+        :param text: A str to add.
+
+        :return: A tuple of the (int offset, int length) of its UTF-8 bytes.
+        """
+
+        encoded = text.encode("utf-8")
+        offset = self.offsets.get(encoded)
+        if offset is None:
+            offset = self.length
+            self.offsets[encoded] = offset
+            self.parts.append(encoded)
+            self.length += len(encoded)
+        return (offset, len(encoded))
+
+    def to_bytes(self):
+        """
+        Return the whole table.
+
+        :return: The bytes of every string in the order they were added.
+        """
+
+        return b"".join(self.parts)
+
+class MappedKeys(Sequence):
+    """
+        The keys of an item dict in key index order, read from a map file.
+        It is a Sequence so the key index can be searched with bisect.
+    """
+
+    def __init__(self, item_dict: "MappedItemDict"):
+        """
+        Create a MappedKeys object.
+
+        :param item_dict: The MappedItemDict with every row of the item dict.
+        """
+
+        self.item_dict = item_dict
+
+    def __len__(self):
+        """
+        Return the number of keys.
+
+        :return: An int of the number of rows.
+        """
+
+        return self.item_dict.record_count
+
+    def __getitem__(self, index: int):
+        """
+        Return the UTF-8 bytes of the key at a position in the key index.
+
+        :param index: An int position in the key index.
+
+        :return: The bytes of the key.
+        """
+
+        return self.item_dict.read_key_bytes(self.item_dict.get_sorted_row(index))
+
+class MappedItemDict(Mapping):
+    """
+        A read only dict of lowercase item names to items that reads its items
+        from a map file the first time they are used.
+
+        A key is found with a binary search of the key index. An item made
+        once is kept by the CatalogMapFile, so every view of the item dict
+        returns the same object. get_index() and get_indexed() work like they
+        do on an IndexedItemDict, grouping the rows by the fixed width fields
+        without making the items.
+    """
+
+    # How each attribute that can be indexed is read from a record.
+    INDEX_FIELDS = {
+        "dlc": lambda record, text: bool(record[7] & FLAG_DLC),
+        "unique": lambda record, text: bool(record[7] & FLAG_UNIQUE),
+        "mod_slot": lambda record, text: record[8],
+        "weapon_type": lambda record, text: text,
+        "faction": lambda record, text: text
+    }
+
+    def __init__(self, catalog_file: "CatalogMapFile", catalog_name: str, rows: list = None):
+        """
+        Create a MappedItemDict object.
+
+        :param catalog_file: The open CatalogMapFile the records are in.
+        :param catalog_name: A str of the item dict's attribute name, e.g. "ammo_data".
+        :param rows: An optional list of int rows that this view has. Every row \
+is in it if it isn't supplied.
+        """
+
+        self.catalog_file = catalog_file
+        self.catalog_name = catalog_name
+        self.record_count, _, self.index_offset = \
+            catalog_file.categories[catalog_name]
+        self.rows = rows
+        self.row_set = None if rows is None else frozenset(rows)
+        self.indexes = {}
+
+    def __repr__(self):
+        """
+        Return a str representation of the MappedItemDict object.
+
+        :return: A str version of MappedItemDict.
+        """
+
+        return f"MappedItemDict(catalog_name='{self.catalog_name}', rows={len(self)})"
+
+    def __len__(self):
+        """
+        Return the number of items.
+
+        :return: An int of the number of items in this view.
+        """
+
+        return self.record_count if self.rows is None else len(self.rows)
+
+    def __iter__(self):
+        """
+        Iterate over the keys in item dict order.
+
+        :return: An iterator of str keys.
+        """
+
+        rows = range(self.record_count) if self.rows is None else self.rows
+        for row in rows:
+            yield self.read_key_bytes(row).decode("utf-8")
+
+    def __getitem__(self, key: str):
+        """
+        Return an item by its key, making it the first time.
+
+        :param key: A str of the lowercase item name.
+
+        :return: The item object.
+        """
+
+        row = self.find_row(key)
+        if row is None:
+            raise KeyError(key)
+        return self.catalog_file.get_item(self.catalog_name, row)
+
+    def __contains__(self, key):
+        """
+        Return whether a key is in the item dict without making the item.
+
+        :param key: A str of the lowercase item name.
+
+        :return: A bool of whether the key is in this view.
+        """
+
+        return self.find_row(key) is not None
+
+    def values(self):
+        """
+        Return the items in item dict order, making the ones that haven't been made.
+
+        :return: A list of the item objects.
+        """
+
+        rows = range(self.record_count) if self.rows is None else self.rows
+        return [self.catalog_file.get_item(self.catalog_name, row) for row in rows]
+
+    def items(self):
+        """
+        Return the keys and items in item dict order.
+
+        :return: A list of (str key, item) tuples.
+        """
+
+        return list(zip(self, self.values()))
+
+    def read_key_bytes(self, row: int):
+        """
+        Return the UTF-8 bytes of a row's key.
+
+        :param row: An int row of the item dict.
+
+        :return: The bytes of the key.
+        """
+
+        key_offset, key_length = self.catalog_file.read_record(self.catalog_name, row)[:2]
+        return self.catalog_file.read_bytes(key_offset, key_length)
+
+    def get_sorted_row(self, index: int):
+        """
+        Return the row at a position of the key index.
+
+        :param index: An int position in the key index.
+
+        :return: An int row.
+        """
+
+        return ROW_INDEX.unpack_from(self.catalog_file.data,
+                                     self.index_offset + index * ROW_INDEX.size)[0]
+
+    def find_row(self, key):
+        """
+        Return the row of a key with a binary search of the key index.
+
+        :param key: A str of the lowercase item name.
+
+        :return: An int row, or None if the key isn't in this view.
+        """
+
+        if not isinstance(key, str):
+            return None
+        key_bytes = key.encode("utf-8")
+        sorted_keys = MappedKeys(self)
+        index = bisect.bisect_left(sorted_keys, key_bytes)
+        if index == len(sorted_keys) or sorted_keys[index] != key_bytes:
+            return None
+        row = self.get_sorted_row(index)
+        if self.row_set is not None and row not in self.row_set:
+            return None
+        return row
+
+    def build_indexes(self, attributes):
+        """
+        Build the indexes for the given attributes if they haven't been built yet.
+
+        :param attributes: An iterable of str attribute names, e.g. ["unique", "weapon_type"].
+        """
+
+        for attribute in attributes:
+            self.get_index(attribute)
+
+    def get_index(self, attribute: str):
+        """
+        Return the index for an attribute, building it the first time.
+
+        The fields in INDEX_FIELDS are read from the records. Any other
+        attribute is read from the items, which makes them.
+
+        :param attribute: A str of the item attribute to group by, e.g. "mod_slot".
+
+        :return: A read only dict of attribute values to MappedItemDict views of \
+the items with that value.
+        """
+
+        index = self.indexes.get(attribute)
+        if index is None:
+            rows = range(self.record_count) if self.rows is None else self.rows
+            groups = {}
+            read_field = self.INDEX_FIELDS.get(attribute)
+            for row in rows:
+                if read_field is not None:
+                    record = self.catalog_file.read_record(self.catalog_name, row)
+                    value = read_field(record, self.catalog_file.read_text(record))
+                else:
+                    value = getattr(self.catalog_file.get_item(self.catalog_name, row), attribute)
+                groups.setdefault(value, []).append(row)
+            index = MappingProxyType({value: MappedItemDict(self.catalog_file, self.catalog_name,
+                                                            group_rows)
+                                      for value, group_rows in groups.items()})
+            self.indexes[attribute] = index
+
+        return index
+
+    def get_indexed(self, attribute: str, value):
+        """
+        Return the items whose attribute has a value.
+
+        :param attribute: A str of the item attribute to filter by, e.g. "dlc".
+        :param value: The value the attribute has to have.
+
+        :return: A MappedItemDict view of the matching items.
+        """
+
+        group = self.get_index(attribute).get(value)
+        if group is None:
+            group = MappedItemDict(self.catalog_file, self.catalog_name, [])
+        return group
+
+class CatalogMapFile():
+    """
+        Handles a map file with the built item catalog in it.
+    """
+
+    def __init__(self, map_path: str):
+        """
+        Create a CatalogMapFile object. The file isn't opened until open() is called.
+
+        :param map_path: A str filepath to the map file.
+        """
+
+        self.map_path = map_path
+        self.map_file = None
+        self.data = None
+        self.categories = {}
+        self.string_offset = 0
+        self.item_dicts = {}
+        self.made_items = {}
+
+    def __repr__(self):
+        """
+        Return a str representation of the CatalogMapFile object.
+
+        :return: A str version of CatalogMapFile.
+        """
+
+        return f"CatalogMapFile(map_path='{self.map_path}')"
+
+    def export(self, catalog: dict, dlc_load_order: str):
+        """
+        Write the catalog to the map file, replacing anything already in it.
+
+        The file is written to a temporary path first and then moved into place
+        so that a reader never sees a half written file.
+
+        :param catalog: A dict of all of the item dicts keyed by their attribute name.
+        :param dlc_load_order: A str of the DLC load order the ids were built with.
+
+        :return: An int of how many items were written.
+        """
+
+        # pylint: disable=too-many-locals
+
+        strings = StringTable()
+        part_rows = {catalog_name: {key: row for row, key in enumerate(catalog.get(catalog_name,
+                                                                                   {}))}
+                     for _, catalog_name in SET_PARTS}
+        category_entries = []
+        sections = []
+        position = HEADER.size + CATEGORY_ENTRY.size * len(catalog)
+        item_count = 0
+        for catalog_name, data_dict in catalog.items():
+            records = bytearray()
+            for key, item in data_dict.items():
+                records += self.make_record(strings, part_rows, key, item)
+            key_bytes = [key.encode("utf-8") for key in data_dict]
+            sorted_rows = sorted(range(len(key_bytes)), key=key_bytes.__getitem__)
+            key_index = b"".join(ROW_INDEX.pack(row) for row in sorted_rows)
+
+            category_entries.append(CATEGORY_ENTRY.pack(catalog_name.encode("utf-8"),
+                                                        len(key_bytes),
+                                                        position, position + len(records)))
+            sections += [bytes(records), key_index]
+            position += len(records) + len(key_index)
+            item_count += len(key_bytes)
+
+        string_table = strings.to_bytes()
+        header = HEADER.pack(MAPFILE_MAGIC, MAPFILE_FORMAT_VERSION, len(catalog), position,
+                             len(string_table), dlc_load_order.encode("utf-8"))
+
+        temp_path = f"{self.map_path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "wb") as map_file:
+                map_file.write(header)
+                map_file.write(b"".join(category_entries))
+                for section in sections:
+                    map_file.write(section)
+                map_file.write(string_table)
+            os.replace(temp_path, self.map_path)
+        except Exception:
+            if OSPATH.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        return item_count
+
+    @staticmethod
+    def make_record(strings: StringTable, part_rows: dict, key: str, item):
+        """
+        Return the record for an item.
+
+        :param strings: The StringTable to add the item's text to.
+        :param part_rows: A dict of the spacesuit, helmet, and pack item dict names \
+to dicts of their keys to rows.
+        :param key: A str of the item's key in its item dict.
+        :param item: The item object.
+
+        :return: The bytes of the record.
+        """
+
+        flags = 0
+        if getattr(item, "dlc", False) is True:
+            flags |= FLAG_DLC
+        if getattr(item, "unique", False) is True:
+            flags |= FLAG_UNIQUE
+
+        form_id = 0
+        id_ref = (0, 0)
+        item_id = None if isinstance(item, SpacesuitSetItem) else item.get_id()
+        if item_id is not None:
+            if len(item_id) == 8 and item_id == item_id.upper() \
+            and all(char in "0123456789ABCDEF" for char in item_id):
+                form_id = int(item_id, 16)
+            else:
+                flags |= FLAG_ID_TEXT
+                id_ref = strings.add(str(item_id))
+
+        text = get_item_text(item)
+        text_ref = (0, 0)
+        if text is not None:
+            flags |= FLAG_TEXT
+            text_ref = strings.add(text)
+
+        set_rows = []
+        for part_name, catalog_name in SET_PARTS:
+            part = getattr(item, part_name, None)
+            set_rows.append(-1 if part is None
+                            else part_rows[catalog_name][part.get_name().lower()])
+
+        return RECORD.pack(*strings.add(key), *strings.add(item.get_name()), form_id, *id_ref,
+                           flags, getattr(item, "mod_slot", 0), *text_ref, *set_rows)
+
+    def open(self, dlc_load_order: str):
+        """
+        Map the file and read its category table.
+
+        :param dlc_load_order: A str of the current DLC load order, which has to \
+match the one the file was written with.
+
+        :return: The CatalogMapFile object.
+        """
+
+        if OSPATH.exists(self.map_path) is not True:
+            raise FileNotFoundError(f"No catalog map file at {self.map_path}")
+
+        with open(self.map_path, "rb") as map_file:
+            data = mmap.mmap(map_file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(data) < HEADER.size:
+            data.close()
+            raise ValueError(f"{self.map_path} is not a catalog map file")
+        magic, version, category_count, string_offset, _, saved_order = \
+            HEADER.unpack_from(data, 0)
+        if magic != MAPFILE_MAGIC or version != MAPFILE_FORMAT_VERSION:
+            data.close()
+            raise ValueError(f"{self.map_path} is not a catalog map file "
+                             f"of version {MAPFILE_FORMAT_VERSION}")
+        saved_order = saved_order.rstrip(b"\x00").decode("utf-8")
+        if saved_order != dlc_load_order:
+            data.close()
+            raise ValueError(f"{self.map_path} was written with DLC load order "
+                             f"{saved_order}, not {dlc_load_order}")
+
+        for entry in range(category_count):
+            name, record_count, records_offset, index_offset = \
+                CATEGORY_ENTRY.unpack_from(data, HEADER.size + entry * CATEGORY_ENTRY.size)
+            self.categories[name.rstrip(b"\x00").decode("utf-8")] = \
+                (record_count, records_offset, index_offset)
+        self.data = data
+        self.string_offset = string_offset
+
+        return self
+
+    def close(self):
+        """
+        Unmap the file. Items that were already made can still be used.
+        """
+
+        if self.data is not None:
+            self.data.close()
+            self.data = None
+
+    def get_item_dict(self, catalog_name: str):
+        """
+        Return the MappedItemDict of an item dict.
+
+        :param catalog_name: A str of the item dict's attribute name, e.g. "ammo_data".
+
+        :return: A MappedItemDict with every row of the item dict.
+        """
+
+        if catalog_name not in self.categories:
+            raise ValueError(f"Unknown catalog name: {catalog_name}")
+        if catalog_name not in self.item_dicts:
+            self.item_dicts[catalog_name] = MappedItemDict(self, catalog_name)
+        return self.item_dicts[catalog_name]
+
+    def read_record(self, catalog_name: str, row: int):
+        """
+        Return the fields of a record.
+
+        :param catalog_name: A str of the item dict's attribute name.
+        :param row: An int row of the item dict.
+
+        :return: A tuple of the RECORD fields.
+        """
+
+        records_offset = self.categories[catalog_name][1]
+        return RECORD.unpack_from(self.data, records_offset + row * RECORD.size)
+
+    def read_bytes(self, offset: int, length: int):
+        """
+        Return bytes from the string table.
+
+        :param offset: An int offset into the string table.
+        :param length: An int of how many bytes to read.
+
+        :return: The bytes.
+        """
+
+        start = self.string_offset + offset
+        return self.data[start:start + length]
+
+    def read_text(self, record: tuple):
+        """
+        Return the weapon type, status mod description, or faction of a record.
+
+        :param record: A tuple of the RECORD fields.
+
+        :return: A str, or None if the record has no text.
+        """
+
+        if record[7] & FLAG_TEXT:
+            return self.read_bytes(record[9], record[10]).decode("utf-8")
+        return None
+
+    def get_item(self, catalog_name: str, row: int):
+        """
+        Return the item of a row, making it the first time.
+
+        :param catalog_name: A str of the item dict's attribute name.
+        :param row: An int row of the item dict.
+
+        :return: The item object.
+        """
+
+        made_items = self.made_items.setdefault(catalog_name, {})
+        item = made_items.get(row)
+        if item is None:
+            item = self.make_item(catalog_name, self.read_record(catalog_name, row))
+            made_items[row] = item
+        return item
+
+    def make_item(self, catalog_name: str, record: tuple):
+        """
+        Make the item object of a record.
+
+        :param catalog_name: A str of the item dict's attribute name.
+        :param record: A tuple of the RECORD fields.
+
+        :return: The item object.
+        """
+
+        # pylint: disable=too-many-branches
+
+        name = self.read_bytes(record[2], record[3]).decode("utf-8")
+        flags = record[7]
+        if flags & FLAG_ID_TEXT:
+            item_id = self.read_bytes(record[5], record[6]).decode("utf-8")
+        else:
+            item_id = f"{record[4]:08X}"
+        dlc = bool(flags & FLAG_DLC)
+        text = self.read_text(record)
+
+        if catalog_name == "ammo_data":
+            item = AmmoItem(name, item_id)
+        elif catalog_name == "spacesuit_data":
+            item = SpacesuitItem(name, item_id, dlc)
+        elif catalog_name == "pack_data":
+            item = PackItem(name, item_id, dlc)
+        elif catalog_name == "helmet_data":
+            item = HelmetItem(name, item_id, dlc)
+        elif catalog_name == "spacesuit_set_data":
+            item = SpacesuitSetItem(name, dlc)
+            for (part_name, part_catalog), part_row in zip(SET_PARTS, record[11:14]):
+                if part_row >= 0:
+                    getattr(item, f"set_{part_name}")(self.get_item(part_catalog, part_row))
+            if text is not None:
+                item.set_faction(text)
+        elif catalog_name == "weapon_data":
+            item = WeaponItem(name, item_id, dlc, bool(flags & FLAG_UNIQUE), text)
+        elif catalog_name == "resource_data":
+            item = ResourceItem(name, item_id)
+        elif catalog_name in ("weapon_status_mods_data", "armor_status_mods_data"):
+            item = StatusModType(name, item_id, text, record[8])
+        elif catalog_name in ("armor_quality_mods_data", "weapon_quality_mods_data"):
+            item = QualityModType(name, item_id)
+        else:
+            raise ValueError(f"Unknown catalog name: {catalog_name}")
+
+        return item
@@ -0,0 +1,271 @@
+"""
+    A module to save and load compiled snapshots of the fully built
+    item catalog so that warm starts don't have to parse the datasheet.
+
+    The datasheet can be a single file or a folder with a .csv file for each
+    sheet, in which case the snapshot key covers every .csv file in it.
+"""
+import hashlib
+import os
+import pickle
+import warnings
+from os import path as OSPATH
+from . import data_objects
+from .item_indexes import IndexedItemDict
+from .reader_backends import CSV_SUFFIX
+
+SNAPSHOT_FORMAT_VERSION = 3
+SNAPSHOT_SUFFIX = ".snapshot"
+
+# Only the item classes and the dict they are kept in are allowed to be
+# rebuilt from a snapshot file.
+SNAPSHOT_CLASSES = {
+    "AmmoItem": data_objects.AmmoItem,
+    "SpacesuitItem": data_objects.SpacesuitItem,
+    "PackItem": data_objects.PackItem,
+    "HelmetItem": data_objects.HelmetItem,
+    "SpacesuitSetItem": data_objects.SpacesuitSetItem,
+    "WeaponItem": data_objects.WeaponItem,
+    "ResourceItem": data_objects.ResourceItem,
+    "StatusModType": data_objects.StatusModType,
+    "QualityModType": data_objects.QualityModType,
+    "IndexedItemDict": IndexedItemDict
+}
+
+class CatalogUnpickler(pickle.Unpickler):
+    """
+        An Unpickler that only rebuilds the known item classes.
+
+        Item classes are looked up by name so a snapshot written while the
+        package was imported as "starfieldccg.src" still loads when it
+        is imported as "src" (the way the tests import it), and vice versa.
+    """
+
+    def find_class(self, module, name):
+        """
+        Return the class to rebuild for a pickled class reference.
+
+        :param module: A str of the module the class was pickled from.
+        :param name: A str of the class name.
+
+        :return: The matching class from the data_objects module.
+        """
+
+        if name in SNAPSHOT_CLASSES:
+            return SNAPSHOT_CLASSES[name]
+        raise pickle.UnpicklingError(f"Snapshot contains unexpected class {module}.{name}")
+
+class CatalogSnapshot():
+    """
+        Handles the snapshot file that sits next to a datasheet.
+    """
+
+    def __init__(self, workbook_path: str, snapshot_path: str = None):
+        """
+        Create a CatalogSnapshot object.
+
+        :param workbook_path: A str filepath to the data table.
+        :param snapshot_path: An optional str filepath for the snapshot. Defaults to \
+the workbook path with a ".snapshot" suffix.
+        """
+
+        self.workbook_path = workbook_path
+        if snapshot_path is None:
+            snapshot_path = f"{workbook_path}{SNAPSHOT_SUFFIX}"
+        self.snapshot_path = snapshot_path
+
+    def __repr__(self):
+        """
+        Return a str representation of the CatalogSnapshot object.
+
+        :return: A str version of CatalogSnapshot.
+        """
+
+        return f"CatalogSnapshot(workbook_path='{self.workbook_path}', \
+snapshot_path='{self.snapshot_path}')"
+
+    def get_workbook_files(self):
+        """
+        Return the files the workbook is made of.
+
+        :return: A list with the workbook's str filepath, or the filepath of every \
+.csv file in it, sorted, if it is a folder.
+        """
+
+        if OSPATH.isdir(self.workbook_path):
+            return [OSPATH.join(self.workbook_path, file_name)
+                    for file_name in sorted(os.listdir(self.workbook_path))
+                    if file_name.lower().endswith(CSV_SUFFIX)]
+        return [self.workbook_path]
+
+    def get_workbook_stat(self):
+        """
+        Return the size and modification time of the workbook. The size of a
+        folder is the size of its files added up, and its modification time is
+        the latest of theirs and the folder's own, which changes when a file is
+        added, removed, or renamed.
+
+        :return: A tuple of (int size, int mtime in nanoseconds).
+        """
+
+        workbook_stat = os.stat(self.workbook_path)
+        if OSPATH.isdir(self.workbook_path) is not True:
+            return (workbook_stat.st_size, workbook_stat.st_mtime_ns)
+        file_stats = [os.stat(file_path) for file_path in self.get_workbook_files()]
+        return (sum(file_stat.st_size for file_stat in file_stats),
+                max([workbook_stat.st_mtime_ns]
+                    + [file_stat.st_mtime_ns for file_stat in file_stats]))
+
+    def get_workbook_hash(self):
+        """
+        Return the sha256 hash of the workbook's contents. A folder's hash
+        covers the names and contents of its files.
+
+        :return: A str with the hex digest of the workbook.
+        """
+
+        digest = hashlib.sha256()
+        is_folder = OSPATH.isdir(self.workbook_path)
+        for file_path in self.get_workbook_files():
+            if is_folder is True:
+                digest.update(OSPATH.basename(file_path).encode("utf-8") + b"\x00")
+            self.update_digest(digest, file_path)
+
+        return digest.hexdigest()
+
+    @staticmethod
+    def update_digest(digest, file_path: str):
+        """
+        Add the contents of a file to a hash.
+
+        :param digest: A hashlib hash object.
+        :param file_path: A str filepath to the file to hash.
+        """
+
+        with open(file_path, "rb") as workbook_file:
+            for chunk in iter(lambda: workbook_file.read(1 << 16), b""):
+                digest.update(chunk)
+
+    def get_key(self, dlc_load_order: str, sheet_names: list, content_hash: str = None):
+        """
+        Return the key that a snapshot has to match to be valid.
+
+        :param dlc_load_order: A str of the DLC load order the ids were built with.
+        :param sheet_names: A list of the sheet names that were read.
+        :param content_hash: An optional str hash of the workbook. It is computed \
+if it isn't supplied.
+
+        :return: A dict with the snapshot key.
+        """
+
+        size, mtime_ns = self.get_workbook_stat()
+        if content_hash is None:
+            content_hash = self.get_workbook_hash()
+
+        return {
+            "version": SNAPSHOT_FORMAT_VERSION,
+            "size": size,
+            "mtime_ns": mtime_ns,
+            "sha256": content_hash,
+            "dlc_load_order": dlc_load_order,
+            "sheet_names": list(sheet_names)
+        }
+
+    def is_key_valid(self, saved_key: dict, dlc_load_order: str, sheet_names: list):
+        """
+        Check a saved key against the current workbook and settings.
+
+        The content hash is only computed when the size or mtime differ, so
+        an untouched workbook is validated with a single stat call.
+
+        :param saved_key: A dict with the key read from the snapshot.
+        :param dlc_load_order: A str of the current DLC load order.
+        :param sheet_names: A list of the sheet names that would be read.
+
+        :return: A bool of whether the snapshot can be used.
+        """
+
+        if not isinstance(saved_key, dict):
+            return False
+        if saved_key.get("version") != SNAPSHOT_FORMAT_VERSION \
+        or saved_key.get("dlc_load_order") != dlc_load_order \
+        or saved_key.get("sheet_names") != list(sheet_names):
+            return False
+
+        size, mtime_ns = self.get_workbook_stat()
+        if saved_key.get("size") != size:
+            return False
+        if saved_key.get("mtime_ns") == mtime_ns:
+            return True
+
+        return saved_key.get("sha256") == self.get_workbook_hash()
+
+    def load(self, dlc_load_order: str, sheet_names: list):
+        """
+        Load the catalog from the snapshot file if it is still valid.
+
+        :param dlc_load_order: A str of the current DLC load order.
+        :param sheet_names: A list of the sheet names that would be read.
+
+        :return: A dict of the catalog data or None if there is no valid snapshot.
+        """
+
+        # pylint: disable=broad-exception-caught
+
+        if OSPATH.exists(self.snapshot_path) is not True:
+            return None
+
+        try:
+            with open(self.snapshot_path, "rb") as snapshot_file:
+                saved_key = CatalogUnpickler(snapshot_file).load()
+                if self.is_key_valid(saved_key, dlc_load_order, sheet_names) is not True:
+                    return None
+                # The key and the catalog are separate pickles, so they need separate memos.
+                catalog = CatalogUnpickler(snapshot_file).load()
+
+        except Exception as e:
+            # A warning, so nothing lands in the commands printed to stdout.
+            warnings.warn(f"Ignoring unreadable snapshot: {e}", RuntimeWarning, stacklevel=2)
+            catalog = None
+
+        return catalog
+
+    def save(self, catalog: dict, dlc_load_order: str, sheet_names: list):
+        """
+        Write the catalog to the snapshot file.
+
+        The file is written to a temporary path first and then moved into place
+        so that a reader never sees a half written snapshot.
+
+        :param catalog: A dict of the catalog data to save.
+        :param dlc_load_order: A str of the DLC load order the ids were built with.
+        :param sheet_names: A list of the sheet names that were read.
+
+        :return: A bool of whether the snapshot was written.
+        """
+
+        # pylint: disable=broad-exception-caught
+
+        temp_path = f"{self.snapshot_path}.{os.getpid()}.tmp"
+        try:
+            key = self.get_key(dlc_load_order, sheet_names)
+            with open(temp_path, "wb") as snapshot_file:
+                pickle.dump(key, snapshot_file, pickle.HIGHEST_PROTOCOL)
+                pickle.dump(catalog, snapshot_file, pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self.snapshot_path)
+
+        except Exception as e:
+            warnings.warn(f"Error writing snapshot file: {e}", RuntimeWarning, stacklevel=2)
+            if OSPATH.exists(temp_path):
+                os.remove(temp_path)
+            return False
+
+        return True
+
+    def delete(self):
+        """
+        Remove the snapshot file if it exists.
+        """
+
+        if OSPATH.exists(self.snapshot_path):
+            os.remove(self.snapshot_path)
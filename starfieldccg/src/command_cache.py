@@ -0,0 +1,410 @@
+"""
+    A module containing the cache of the console commands of a
+    DataFileReader's items.
+
+    Each item's id and the start of its command, e.g. "player.additem 0000ABCD",
+    are worked out once per item dict instead of on every get_command() call.
+    The cache follows the dlc_load_order setting: the cached ids and commands
+    of DLC items always have the prefix of the current load order, and when it
+    changes the cached entries of the DLC items are given the new prefix in
+    one pass. The items themselves keep the ids they were built with, since
+    they are shared with the reader's item dicts, snapshots, and map files.
+
+    CommandCache.make_batch() turns many (category, name, quantity) entries,
+    e.g. a whole loadout, into one CommandBatch of commands.
+"""
+import sys
+from os import path as OSPATH
+from .data_objects import normalize_ids
+sys.path.insert(0, OSPATH.abspath(OSPATH.join(OSPATH.dirname(__file__), './')))
+# pylint: disable=wrong-import-position
+import settings_io
+
+# The attribute holding the id of the items that can be from a DLC, by item dict.
+DLC_ID_FIELDS = {
+    "spacesuit_data": "spacesuit_id",
+    "pack_data": "pack_id",
+    "helmet_data": "helmet_id",
+    "weapon_data": "weapon_id"
+}
+
+# The parts of a spacesuit set, which are items of the DLC_ID_FIELDS item dicts.
+SET_PART_NAMES = ("spacesuit", "helmet", "pack")
+
+# The item dicts of mods, whose commands don't take a number of items.
+MOD_CATALOGS = ("weapon_status_mods_data", "armor_status_mods_data",
+                "armor_quality_mods_data", "weapon_quality_mods_data")
+
+def normalize_name(name: str):
+    """
+    Return the form of an item name that batch entries are matched with:
+    lowercase, with the whitespace collapsed to single spaces.
+
+    :param name: A str of an item name.
+
+    :return: A str of the normalized name.
+    """
+
+    return " ".join(str(name).lower().split())
+
+def normalize_category(category: str):
+    """
+    Return the form of a category that batch entries are matched with, so an
+    item dict can be named by its sheet, its attribute, or either in the
+    singular, e.g. "Spacesuit_Sets", "spacesuit_set_data", or "spacesuit set".
+
+    :param category: A str of a category.
+
+    :return: A str of the normalized category.
+    """
+
+    category = " ".join(str(category).lower().replace("_", " ").replace("-", " ").split())
+    if category.endswith(" data"):
+        category = category[:-len(" data")]
+    if category.endswith("s"):
+        category = category[:-1]
+    return category
+
+def get_base_commands(catalog_name: str, item):
+    """
+    Return the commands of an item without the number of items to add.
+
+    :param catalog_name: A str of the item dict's attribute name, e.g. "ammo_data".
+    :param item: An item from that item dict.
+
+    :return: A tuple of str commands, one for each id of a spacesuit set.
+    """
+
+    if catalog_name in MOD_CATALOGS:
+        return (item.get_command(),)
+    if catalog_name == "spacesuit_set_data":
+        return tuple(f"player.additem {item_id}" for item_id in item.get_id()
+                     if item_id is not None)
+    return (f"player.additem {item.get_id()}",)
+
+class CommandCache():
+    """
+        Keeps the id and base commands of every item of a DataFileReader's
+        item dicts, building the entries of an item dict the first time a
+        command from it is asked for.
+
+        An item dict that the reader rebuilds, e.g. after reload(), is
+        noticed and its entries are built again.
+    """
+
+    def __init__(self, reader, settings=None):
+        """
+        Create a CommandCache object and subscribe it to the DLC load order.
+
+        :param reader: The DataFileReader whose items the commands are for.
+        :param settings: An optional SCCGSettings to subscribe to. Defaults to \
+settings_io.global_settings.
+        """
+
+        self.reader = reader
+        self.settings = settings if settings is not None else settings_io.global_settings
+        self.dlc_load_order = self.settings.settings["dlc_load_order"]
+        # Item dict names to (the item dict, dict of keys to (id, base commands)).
+        self.entries = {}
+        # Item dict names to (their entries, dict of normalized names to keys).
+        self.name_indexes = {}
+        self.categories = {normalize_category(sheet_name): catalog_name for catalog_name,
+                           (sheet_name, _) in reader.CATALOG_SOURCES.items()}
+        self.settings.subscribe("dlc_load_order", self.on_dlc_load_order)
+
+    def __repr__(self):
+        """
+        Return a str representation of the CommandCache object.
+
+        :return: A str version of CommandCache.
+        """
+
+        return f"CommandCache(reader={self.reader}, catalogs={list(self.entries)})"
+
+    def close(self):
+        """
+        Stop following the DLC load order and drop the cached entries.
+        """
+
+        self.settings.unsubscribe("dlc_load_order", self.on_dlc_load_order)
+        self.entries.clear()
+        self.name_indexes.clear()
+
+    def get_entries(self, catalog_name: str):
+        """
+        Return the cached ids and base commands of an item dict, building them
+        if the item dict hasn't been cached or has been rebuilt since.
+
+        :param catalog_name: A str of the item dict's attribute name, e.g. "ammo_data".
+
+        :return: A dict of lowercase item names to (id, tuple of base commands) tuples.
+        """
+
+        cached = self.entries.get(catalog_name)
+        if cached is not None and cached[0] is self.reader.catalog_data.get(catalog_name):
+            return cached[1]
+
+        self.reader.wait_for_catalog(catalog_name)
+        with self.reader.load_lock:
+            data_dict = self.reader.load_catalog(catalog_name)
+            cached = (data_dict, {key: (item.get_id(), get_base_commands(catalog_name, item))
+                                  for key, item in data_dict.items()})
+            self.prefix_dlc_entries(catalog_name, data_dict, cached[1])
+            self.entries[catalog_name] = cached
+
+        return cached[1]
+
+    def get_name_index(self, catalog_name: str):
+        """
+        Return the dict that finds the key of an item from its normalized
+        name, building it if the item dict's entries were built since.
+
+        :param catalog_name: A str of the item dict's attribute name, e.g. "ammo_data".
+
+        :return: A dict of normalized names to str keys.
+        """
+
+        entries = self.get_entries(catalog_name)
+        indexed = self.name_indexes.get(catalog_name)
+        if indexed is None or indexed[0] is not entries:
+            name_index = {}
+            for key in entries:
+                name_index.setdefault(normalize_name(key), key)
+            indexed = (entries, name_index)
+            self.name_indexes[catalog_name] = indexed
+        return indexed[1]
+
+    def get_catalog_name(self, category: str):
+        """
+        Return the item dict a category names, see normalize_category().
+
+        :param category: A str of a category, e.g. "weapon" or "Armor_Status_Mods".
+
+        :return: A str of the item dict's attribute name, or None if it isn't one.
+        """
+
+        return self.categories.get(normalize_category(category))
+
+    def make_batch(self, entries, allow_unknown: bool = False):
+        """
+        Resolve (category, name, quantity) entries to the items of the item dicts
+        and add up the quantities of the entries of the same item.
+
+        Every entry is looked at before anything is reported, so all of the
+        entries whose category or name isn't known, and all of the quantities
+        that aren't whole numbers above 0, are reported in one ValueError.
+
+        :param entries: An iterable of (str category, str name, int quantity) \
+tuples. The quantity of a mod is ignored, a mod is only added once.
+        :param allow_unknown: A bool to keep the unknown entries in the batch's \
+unknown list instead of raising a ValueError that lists them.
+
+        :return: A CommandBatch object.
+        """
+
+        quantities = {}
+        unknown = []
+        bad_quantities = []
+        lookups = {}
+        for entry in entries:
+            category, name, quantity = entry
+            lookup = lookups.get(category)
+            if lookup is None:
+                catalog_name = self.get_catalog_name(category)
+                name_index = None if catalog_name is None else self.get_name_index(catalog_name)
+                lookup = (catalog_name, name_index)
+                lookups[category] = lookup
+
+            catalog_name, name_index = lookup
+            key = None if name_index is None else name_index.get(normalize_name(name))
+            if key is None:
+                unknown.append(entry)
+                continue
+            if isinstance(quantity, int) is not True or isinstance(quantity, bool) \
+            or quantity < 1:
+                bad_quantities.append(entry)
+                continue
+            item = (catalog_name, key)
+            quantities[item] = quantities.get(item, 0) + quantity
+
+        problems = []
+        if len(unknown) > 0 and allow_unknown is not True:
+            problems.append(f"{len(unknown)} unknown items: " + ", ".join(
+                f"{category} {name!r}" for category, name, _ in unknown))
+        if len(bad_quantities) > 0:
+            problems.append(f"{len(bad_quantities)} quantities that aren't whole numbers "
+                            "above 0: " + ", ".join(f"{category} {name!r} {quantity!r}"
+                                                    for category, name, quantity
+                                                    in bad_quantities))
+        if len(problems) > 0:
+            raise ValueError("; ".join(problems))
+        return CommandBatch(self, quantities, unknown)
+
+    def iter_batch_commands(self, entries):
+        """
+        Return the console commands of (category, name, quantity) entries a
+        line at a time, see make_batch().
+
+        :param entries: An iterable of (str category, str name, int quantity) tuples.
+
+        :return: An iterator of str console command lines.
+        """
+
+        return self.make_batch(entries).iter_commands()
+
+    def get_id(self, catalog_name: str, item_key: str):
+        """
+        Return the cached id of an item.
+
+        :param catalog_name: A str of the item dict's attribute name, e.g. "ammo_data".
+        :param item_key: A str of the item's lowercase name.
+
+        :return: A str id, or a tuple of the part ids of a spacesuit set.
+        """
+
+        return self.get_entries(catalog_name)[item_key][0]
+
+    def get_command(self, catalog_name: str, item_key: str, number: int = None):
+        """
+        Return the console command of an item, the same one its get_command() gives.
+
+        :param catalog_name: A str of the item dict's attribute name, e.g. "ammo_data".
+        :param item_key: A str of the item's lowercase name.
+        :param number: An int of how many items to add. Mods don't take one.
+
+        :return: A str of the console command, a line for each part of a spacesuit set.
+        """
+
+        base_commands = self.get_entries(catalog_name)[item_key][1]
+        if catalog_name in MOD_CATALOGS:
+            return base_commands[0]
+        if len(base_commands) == 1:
+            return f"{base_commands[0]} {number}"
+        return "\n".join(f"{base_command} {number}" for base_command in base_commands)
+
+    def on_dlc_load_order(self, _old_load_order: str, new_load_order: str):
+        """
+        Called by the settings when the DLC load order changes.
+
+        :param _old_load_order: A str of the load order the ids were built with.
+        :param new_load_order: A str of the new load order.
+        """
+
+        self.apply_dlc_load_order(new_load_order)
+
+    def apply_dlc_load_order(self, dlc_load_order: str):
+        """
+        Give the cached entries of the DLC items the prefix of a DLC load order,
+        in one pass for each cached item dict. The items aren't changed.
+
+        Item dicts that aren't cached yet get the prefix when they are.
+
+        :param dlc_load_order: A str of the DLC load order.
+
+        :return: An int of how many entries got the new prefix.
+        """
+
+        changed_count = 0
+        with self.reader.load_lock:
+            self.dlc_load_order = dlc_load_order
+            for catalog_name, (data_dict, entries) in list(self.entries.items()):
+                if data_dict is self.reader.catalog_data.get(catalog_name):
+                    changed_count += self.prefix_dlc_entries(catalog_name, data_dict, entries)
+
+        return changed_count
+
+    def prefix_dlc_entries(self, catalog_name: str, data_dict, entries: dict):
+        """
+        Rebuild the entries of an item dict's DLC items, and of the spacesuit
+        sets with a DLC part, with the prefix of the cache's DLC load order.
+
+        :param catalog_name: A str of the item dict's attribute name, e.g. "ammo_data".
+        :param data_dict: The item dict the entries are of.
+        :param entries: The dict of keys to (id, base commands) tuples to update.
+
+        :return: An int of how many entries were rebuilt.
+        """
+
+        if catalog_name in DLC_ID_FIELDS:
+            dlc_items = data_dict.get_indexed("dlc", True)
+            item_ids = normalize_ids([item.get_id() for item in dlc_items.values()],
+                                     [True] * len(dlc_items), self.dlc_load_order)
+            for key, item_id in zip(dlc_items, item_ids):
+                entries[key] = (item_id, (f"player.additem {item_id}",))
+            return len(item_ids)
+
+        if catalog_name != "spacesuit_set_data":
+            return 0
+        changed_count = 0
+        for key, item in data_dict.items():
+            parts = [getattr(item, part_name) for part_name in SET_PART_NAMES]
+            if all(getattr(part, "dlc", False) is not True for part in parts):
+                continue
+            part_ids = tuple(None if part is None
+                             else normalize_ids([part.get_id()], [part.dlc],
+                                                self.dlc_load_order)[0]
+                             for part in parts)
+            entries[key] = (part_ids, tuple(f"player.additem {part_id}"
+                                            for part_id in part_ids if part_id is not None))
+            changed_count += 1
+        return changed_count
+
+class CommandBatch():
+    """
+        The items of a CommandCache.make_batch() call with their added up
+        quantities, in the order they were first given, and the entries that
+        weren't found.
+    """
+
+    def __init__(self, command_cache: CommandCache, quantities: dict, unknown: list):
+        """
+        Create a CommandBatch object.
+
+        :param command_cache: The CommandCache the commands come from.
+        :param quantities: A dict of (str item dict name, str key) tuples to int quantities.
+        :param unknown: A list of the (category, name, quantity) entries that weren't found.
+        """
+
+        self.command_cache = command_cache
+        self.quantities = quantities
+        self.unknown = unknown
+
+    def __repr__(self):
+        """
+        Return a str representation of the CommandBatch object.
+
+        :return: A str version of CommandBatch.
+        """
+
+        return f"CommandBatch(items={len(self.quantities)}, unknown={len(self.unknown)})"
+
+    def __len__(self):
+        """
+        Return the number of different items.
+
+        :return: An int of the number of items in the batch.
+        """
+
+        return len(self.quantities)
+
+    def iter_commands(self):
+        """
+        Yield the console commands of the items a line at a time, a
+        "player.additem" line for each item (each part of a spacesuit set)
+        and a ".amod" line for each mod.
+
+        :return: An iterator of str console command lines.
+        """
+
+        entries = {}
+        for (catalog_name, key), quantity in self.quantities.items():
+            catalog_entries = entries.get(catalog_name)
+            if catalog_entries is None:
+                catalog_entries = self.command_cache.get_entries(catalog_name)
+                entries[catalog_name] = catalog_entries
+            base_commands = catalog_entries[key][1]
+            if catalog_name in MOD_CATALOGS:
+                yield base_commands[0]
+            else:
+                for base_command in base_commands:
+                    yield f"{base_command} {quantity}"
@@ -3,68 +3,1353 @@
     and store that information as datastructures for the rest
     of the program.
 """
-import pandas as pd
-from .data_objects import AmmoItem, SpacesuitItem, PackItem, HelmetItem
-from .data_objects import SpacesuitSetItem, WeaponItem, ResourceItem, StatusModType
-from .data_objects import QualityModType
+# pylint: disable=too-many-lines
+import itertools
+import os
+import sys
+import threading
+import time
+import weakref
+from collections.abc import Mapping
+from os import path as OSPATH
+from typing import TYPE_CHECKING
+from .data_objects import WeaponItem
+from .item_indexes import IndexedItemDict
+from . import item_builders
+from .command_cache import CommandCache
+from .catalog_mapfile import CatalogMapFile, MappedItemDict
+from .catalog_snapshot import CatalogSnapshot
+from .load_timings import LoadTimings
+from .datatable_formats import write_datatable
+from .reader_backends import DATATABLE_BACKENDS, PandasBackend, XlrdBackend
+from .reader_backends import get_datatable_backend, get_datatable_format, get_reader_backend
+from .reader_backends import get_datatable_size
+sys.path.insert(0, OSPATH.abspath(OSPATH.join(OSPATH.dirname(__file__), './')))
+# pylint: disable=wrong-import-position
+import settings_io
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Below this size the cost of starting processes and pickling DataFrames
+# back outweighs parsing in parallel, so "auto" uses threads instead.
+PROCESS_POOL_MIN_BYTES = 4 * 1024 * 1024
+
+def parse_sheet(file_path: str, sheet_name: str, column_count: int,
+                backend_name: str = "xlrd"):
+    """
+    Read a single sheet from an Excel file. This is a module level function so
+    it can be sent to a worker process.
+
+    :param file_path: The str filepath to the data table.
+    :param sheet_name: A str of the name of the sheet to read.
+    :param column_count: An int of how many leading columns to read.
+    :param backend_name: A str of the reader backend to read the sheet with.
+
+    :return: A tuple of (sheet name, list of column lists, float seconds it took to read).
+    """
+
+    start_time = time.perf_counter()
+    backend = get_reader_backend(backend_name, file_path)
+    try:
+        columns = backend.read_sheet_columns(sheet_name, column_count)
+    finally:
+        backend.close()
+
+    return (sheet_name, columns, time.perf_counter() - start_time)
+
+class LazyCatalog():
+    """
+        A descriptor for an item dict of a DataFileReader that is only
+        built the first time it is used.
+    """
+
+    def __init__(self):
+        """
+        Create a LazyCatalog object. The name is filled in by __set_name__.
+        """
+
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        """
+        Remember the attribute name the descriptor was assigned to.
+
+        :param owner: The class the descriptor belongs to.
+        :param name: A str of the attribute name.
+        """
+
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        """
+        Return the item dict, building it if needed.
+
+        :param instance: The DataFileReader the item dict belongs to.
+        :param owner: The class the descriptor belongs to.
+
+        :return: A dict with the items.
+        """
+
+        if instance is None:
+            return self
+        return instance.load_catalog(self.name)
+
+    def __set__(self, instance, value):
+        """
+        Replace the item dict.
+
+        :param instance: The DataFileReader the item dict belongs to.
+        :param value: A dict with the items.
+        """
+
+        instance.store_catalog(self.name, value)
+
+class LazySheets(Mapping):
+    """
+        A read only dict of sheet names to DataFrames that reads each
+        sheet the first time it is used.
+    """
+
+    def __init__(self, reader):
+        """
+        Create a LazySheets object.
+
+        :param reader: The DataFileReader to read the sheets with.
+        """
+
+        self.reader = reader
+        self.loaded_sheets = {}
+
+    def __repr__(self):
+        """
+        Return a str representation of the LazySheets object.
+
+        :return: A str version of LazySheets.
+        """
+
+        return f"LazySheets(loaded_sheets={list(self.loaded_sheets)})"
+
+    def __getitem__(self, sheet_name):
+        """
+        Return a sheet's DataFrame, reading it if needed.
+
+        :param sheet_name: A str of the sheet name.
+
+        :return: A DataFrame with the sheet data.
+        """
+
+        if sheet_name not in self.reader.sheet_names:
+            raise KeyError(sheet_name)
+        if sheet_name not in self.loaded_sheets:
+            self.loaded_sheets[sheet_name] = self.reader.read_sheet(sheet_name)
+        return self.loaded_sheets[sheet_name]
+
+    def __iter__(self):
+        """
+        Iterate over the sheet names.
+
+        :return: An iterator of the sheet names.
+        """
+
+        return iter(self.reader.sheet_names)
+
+    def __len__(self):
+        """
+        Return the number of sheets.
+
+        :return: An int of the number of sheets.
+        """
+
+        return len(self.reader.sheet_names)
 
 # pylint: disable=too-many-instance-attributes
+# pylint: disable=too-many-public-methods
 class DataFileReader:
     """
         Handles the reading of all of the sheets in the datasheet.
     """
 
-    def __init__(self, file_path: str):
+    SHEET_NAMES = [
+        "Resources", "Spacesuits", "Helmets", "Packs",
+        "Spacesuit_Sets", "Weapons", "Ammo", "Armor_Status_Mods", "Weapon_Status_Mods",
+        "Armor_Quality_Mods", "Weapon_Quality_Mods"
+    ]
+
+    # How many leading columns of each sheet the get_*_data methods actually use.
+    SHEET_COLUMN_COUNTS = {
+        "Resources": 2, "Spacesuits": 3, "Helmets": 3, "Packs": 3, "Spacesuit_Sets": 6,
+        "Weapons": 5, "Ammo": 2, "Armor_Status_Mods": 4, "Weapon_Status_Mods": 4,
+        "Armor_Quality_Mods": 2, "Weapon_Quality_Mods": 2
+    }
+
+    # The sheet each item dict is built from and the item dicts it needs first.
+    CATALOG_SOURCES = {
+        "ammo_data": ("Ammo", ()),
+        "spacesuit_data": ("Spacesuits", ()),
+        "pack_data": ("Packs", ()),
+        "helmet_data": ("Helmets", ()),
+        "spacesuit_set_data": ("Spacesuit_Sets", ("spacesuit_data", "helmet_data", "pack_data")),
+        "weapon_data": ("Weapons", ()),
+        "resource_data": ("Resources", ()),
+        "weapon_status_mods_data": ("Weapon_Status_Mods", ()),
+        "armor_status_mods_data": ("Armor_Status_Mods", ()),
+        "armor_quality_mods_data": ("Armor_Quality_Mods", ()),
+        "weapon_quality_mods_data": ("Weapon_Quality_Mods", ())
+    }
+
+    CATALOG_NAMES = list(CATALOG_SOURCES)
+
+    # The item_builders function each item dict is built with. It is passed the
+    # sheet columns and then the item dicts from CATALOG_SOURCES in order.
+    CATALOG_BUILDERS = {
+        "ammo_data": item_builders.build_ammo_items,
+        "spacesuit_data": item_builders.build_spacesuit_items,
+        "pack_data": item_builders.build_pack_items,
+        "helmet_data": item_builders.build_helmet_items,
+        "spacesuit_set_data": item_builders.build_spacesuit_set_items,
+        "weapon_data": item_builders.build_weapon_items,
+        "resource_data": item_builders.build_resource_items,
+        "weapon_status_mods_data": item_builders.build_status_mod_items,
+        "armor_status_mods_data": item_builders.build_status_mod_items,
+        "armor_quality_mods_data": item_builders.build_quality_mod_items,
+        "weapon_quality_mods_data": item_builders.build_quality_mod_items
+    }
+
+    # The item attributes each item dict is indexed by as soon as it is loaded.
+    SECONDARY_INDEXES = {
+        "spacesuit_data": ("dlc",),
+        "pack_data": ("dlc",),
+        "helmet_data": ("dlc",),
+        "spacesuit_set_data": ("dlc", "faction"),
+        "weapon_data": ("unique", "weapon_type", "dlc"),
+        "weapon_status_mods_data": ("mod_slot",),
+        "armor_status_mods_data": ("mod_slot",)
+    }
+
+    ammo_data = LazyCatalog()
+    spacesuit_data = LazyCatalog()
+    pack_data = LazyCatalog()
+    helmet_data = LazyCatalog()
+    spacesuit_set_data = LazyCatalog()
+    weapon_data = LazyCatalog()
+    resource_data = LazyCatalog()
+    weapon_status_mods_data = LazyCatalog()
+    armor_status_mods_data = LazyCatalog()
+    armor_quality_mods_data = LazyCatalog()
+    weapon_quality_mods_data = LazyCatalog()
+
+    READER_BACKEND_NAMES = ["auto", "xlrd", "pandas"]
+
+    # How many rows iter_items() builds items from at a time.
+    STREAM_CHUNK_SIZE = 1000
+
+    def __init__(self, file_path: str, use_snapshot: bool = False,
+                 rebuild_snapshot: bool = False, backend: str = "auto",
+                 database_path: str = None, map_path: str = None,
+                 record_timings: bool = False, load_in_background: bool = False,
+                 write_snapshot: bool = True):
         """
         Initialize the DataFileReader with the file path.
 
-        :param file_path: The str filepath to the data table.
+        Nothing is read here. Each item dict (ammo_data, weapon_data, etc.) is
+        built from its own sheet the first time it is used, and a sheet in
+        datasheets is only read the first time it is used.
+
+        When use_snapshot is True the fully built catalog is loaded from a snapshot
+        file next to the data table if the data table and the DLC load order haven't
+        changed since it was written, otherwise the whole catalog is built and saved.
+        On a snapshot hit pandas isn't imported until a DataFrame is needed.
+        With write_snapshot False a missing or out of date snapshot is left as
+        it is, and the item dicts are built one at a time as they are used.
+
+        When load_in_background is True the snapshot is loaded (or the catalog is
+        built and saved) by start_background_load() instead, so this returns at once.
+
+        The item dicts are built from rows read by a reader backend. "auto" reads
+        them with the backend of the data table's format (the xlrd backend for a
+        .xls workbook), so pandas is only imported when datasheets is used, and
+        reuses any sheet that datasheets has already read.
+
+        :param file_path: The str filepath to the data table. It can be a .xls or \
+.xlsx workbook, a folder with a .csv file for each sheet, or a .json or .ndjson \
+file, see get_datatable_format().
+        :param use_snapshot: A bool of whether to load from and save to a snapshot file.
+        :param rebuild_snapshot: A bool to ignore any existing snapshot and write a new one.
+        :param backend: A str of the reader backend to build the item dicts with, \
+"auto", "xlrd", or "pandas".
+        :param database_path: An optional str filepath to a catalog database written by \
+export_database(). When it is set the item dicts are built from the database \
+instead of the datasheet and no snapshot is used.
+        :param map_path: An optional str filepath to a catalog map file written by \
+export_catalog_map(). When it is set the item dicts are read from the map file, \
+each item is made the first time it is used, and no snapshot is used.
+        :param record_timings: A bool of whether to time the read, normalize, build, \
+join, and index phases of every item dict that is built, for load_report().
+        :param load_in_background: A bool of whether to start loading every item dict \
+on a background thread, see start_background_load().
+        :param write_snapshot: A bool of whether a missing or out of date snapshot \
+is built and saved.
         """
 
+        # pylint: disable=too-many-positional-arguments
+        # pylint: disable=too-many-arguments
+
+        if backend not in self.READER_BACKEND_NAMES:
+            raise ValueError(f"Invalid reader backend: {backend}")
+
         self.file_path = file_path
-        self.sheet_names = [
-            "Resources", "Spacesuits", "Helmets", "Packs",
-            "Spacesuit_Sets", "Weapons", "Ammo", "Armor_Status_Mods", "Weapon_Status_Mods",
-            "Armor_Quality_Mods", "Weapon_Quality_Mods"
-        ]
+        self.datatable_format = None
+        if file_path is not None:
+            self.datatable_format = get_datatable_format(file_path)
+        self.backend_name = backend
+        self.sheet_names = self.get_sheet_names()
 
         self.pretty_sheet_names = [name.replace("_", " ") for name in self.sheet_names]
-        self.datasheets = self.read_sheets()
-        self.ammo_data = self.get_ammo_data()
-        self.spacesuit_data = self.get_spacesuit_data()
-        self.pack_data = self.get_pack_data()
-        self.helmet_data = self.get_helmet_data()
-        self.spacesuit_set_data = self.get_spacesuit_set_data(self.spacesuit_data,
-                                                                self.helmet_data,
-                                                                self.pack_data)
-        self.weapon_data = self.get_weapon_data()
-        self.resource_data = self.get_resource_data()
-        self.weapon_status_mods_data = self.get_status_mod_data("Weapon_Status_Mods")
-        self.armor_status_mods_data = self.get_status_mod_data("Armor_Status_Mods")
-        self.armor_quality_mods_data = self.get_quality_mod_data("Armor_Quality_Mods")
-        self.weapon_quality_mods_data = self.get_quality_mod_data("Weapon_Quality_Mods")
-
-    def read_sheets(self):
+        self.load_lock = threading.RLock()
+        self.catalog_data = {}
+        self.backends = {}
+        self.parsed_columns = {}
+        self.row_indexes = {}
+        self.item_stores = {}
+        self.command_cache = None
+        # The items keep the DLC load order they were built with, see CommandCache.
+        self.dlc_load_order = self.get_dlc_load_order()
+        self.sheet_hashes = {}
+        self.watch_thread = None
+        self.watch_stop = threading.Event()
+        self.watch_error = None
+        self.load_thread = None
+        self.load_stop = threading.Event()
+        self.load_condition = threading.Condition()
+        self.pending_catalogs = []
+        self.load_errors = {}
+        self.datasheets = LazySheets(self)
+        self.sheet_timings = {}
+        self.load_timings = LoadTimings() if record_timings is True else None
+        self.database = None
+        if database_path is not None:
+            # catalog_database imports sqlite3, which a reader of the datasheet,
+            # like a one shot command's, shouldn't pay for at import.
+            # pylint: disable=import-outside-toplevel
+            from .catalog_database import CatalogDatabase
+            self.database = CatalogDatabase(database_path)
+        self.catalog_map = CatalogMapFile(map_path) if map_path is not None else None
+        self.snapshot = None
+        if use_snapshot is True and self.database is None and self.catalog_map is None:
+            self.snapshot = CatalogSnapshot(file_path)
+        self.loaded_from_snapshot = False
+        self.write_snapshot = write_snapshot
+
+        if load_in_background is True:
+            self.start_background_load(rebuild_snapshot)
+        elif self.snapshot is not None:
+            if (rebuild_snapshot is True or self.read_snapshot() is not True) \
+            and write_snapshot is True:
+                self.build_catalog()
+                self.save_snapshot()
+
+    def read_snapshot(self):
+        """
+        Replace the item dicts with the snapshot's if the snapshot is up to date.
+
+        :return: A bool of whether the item dicts were loaded from the snapshot.
+        """
+
+        catalog = self.snapshot.load(self.get_dlc_load_order(), self.sheet_names)
+        if catalog is not None:
+            with self.load_lock:
+                self.set_catalog(catalog)
+            self.loaded_from_snapshot = True
+
+        return self.loaded_from_snapshot
+
+    def save_snapshot(self):
+        """
+        Write every item dict to the snapshot, building the ones that aren't built.
+        Nothing is written if the reader doesn't write snapshots, or once the DLC
+        load order has changed, since the item dicts built before and after the
+        change have different DLC ids.
+        """
+
+        if self.write_snapshot is not True or self.is_dlc_load_order_current() is not True:
+            return
+        self.snapshot.save(self.get_catalog(), self.get_dlc_load_order(), self.sheet_names)
+
+    def start_background_load(self, rebuild_snapshot: bool = False):
+        """
+        Start a background thread that loads every item dict that isn't built yet,
+        so the caller can go on (e.g. show a menu) while they load.
+
+        The thread loads the snapshot if the reader uses one and it is up to date.
+        Otherwise it builds the item dicts one at a time in CATALOG_NAMES order,
+        building the one that wait_for_catalog() is waiting for next, and then
+        saves the snapshot.
+
+        :param rebuild_snapshot: A bool to ignore any existing snapshot and write a new one.
+        """
+
+        with self.load_condition:
+            if self.load_thread is not None:
+                return
+            self.pending_catalogs = [name for name in self.CATALOG_NAMES
+                                     if self.is_loaded(name) is not True]
+            self.load_stop.clear()
+            self.load_thread = threading.Thread(target=self.run_background_load,
+                                                args=(rebuild_snapshot,),
+                                                name="DataFileReader load", daemon=True)
+            self.load_thread.start()
+
+    def run_background_load(self, rebuild_snapshot: bool):
+        """
+        Load every pending item dict. This is the body of the thread that
+        start_background_load() starts. An error building an item dict is kept
+        and raised by wait_for_catalog() for that item dict.
+
+        :param rebuild_snapshot: A bool to ignore any existing snapshot and write a new one.
+        """
+
+        # pylint: disable=broad-exception-caught
+
+        try:
+            if self.snapshot is not None and rebuild_snapshot is not True:
+                self.read_snapshot()
+            while True:
+                with self.load_condition:
+                    self.pending_catalogs = [name for name in self.pending_catalogs
+                                             if self.is_loaded(name) is not True]
+                    if len(self.pending_catalogs) == 0 or self.load_stop.is_set():
+                        break
+                    catalog_name = self.pending_catalogs.pop(0)
+                try:
+                    self.load_catalog(catalog_name)
+                except Exception as e:
+                    with self.load_condition:
+                        self.load_errors[catalog_name] = e
+                with self.load_condition:
+                    self.load_condition.notify_all()
+            if self.snapshot is not None and self.loaded_from_snapshot is not True \
+            and len(self.load_errors) == 0 and self.load_stop.is_set() is not True:
+                self.save_snapshot()
+        except Exception as e:
+            with self.load_condition:
+                for catalog_name in self.CATALOG_NAMES:
+                    if self.is_loaded(catalog_name) is not True:
+                        self.load_errors.setdefault(catalog_name, e)
+        finally:
+            with self.load_condition:
+                self.load_thread = None
+                self.load_condition.notify_all()
+
+    def stop_background_load(self):
+        """
+        Stop the thread start_background_load() started once it has built the
+        item dict it is building, and wait for it. It doesn't save the snapshot,
+        and the item dicts it didn't build are built when they are used.
+        """
+
+        with self.load_condition:
+            load_thread = self.load_thread
+            self.load_stop.set()
+            self.pending_catalogs = []
+        if load_thread is not None:
+            load_thread.join()
+
+    def is_loading(self):
+        """
+        Return whether the background load is still running.
+
+        :return: A bool of whether the thread start_background_load() started is running.
+        """
+
+        return self.load_thread is not None
+
+    def get_load_progress(self):
+        """
+        Return how many of the item dicts are built.
+
+        :return: A tuple of (int built item dicts, int item dicts).
+        """
+
+        return (sum(1 for name in self.CATALOG_NAMES if self.is_loaded(name)),
+                len(self.CATALOG_NAMES))
+
+    def wait_for_catalog(self, catalog_name: str, on_wait=None, interval: float = 0.1):
+        """
+        Return an item dict, waiting for the background load to build it first.
+
+        The item dict is moved to the front of the background load. When there
+        is no background load it is built on this thread like load_catalog().
+
+        :param catalog_name: A str of the item dict's attribute name, e.g. "ammo_data".
+        :param on_wait: An optional function called with get_load_progress() \
+every interval seconds while waiting, e.g. to show a progress indicator.
+        :param interval: A float of how many seconds to wait between on_wait calls.
+
+        :return: A dict with the items.
+        """
+
+        if catalog_name not in self.CATALOG_SOURCES:
+            raise ValueError(f"Unknown catalog name: {catalog_name}")
+
+        with self.load_condition:
+            if catalog_name in self.pending_catalogs:
+                self.pending_catalogs.remove(catalog_name)
+                self.pending_catalogs.insert(0, catalog_name)
+        def is_ready():
+            return self.is_loaded(catalog_name) or catalog_name in self.load_errors \
+                or self.is_loading() is not True
+
+        while is_ready() is not True:
+            if on_wait is not None:
+                on_wait(self.get_load_progress())
+            with self.load_condition:
+                self.load_condition.wait_for(is_ready, timeout=interval)
+
+        with self.load_condition:
+            error = self.load_errors.pop(catalog_name, None)
+        if error is not None:
+            raise error
+        return self.load_catalog(catalog_name)
+
+    def get_sheet_names(self):
+        """
+        Return the names of the sheets the item dicts are read from.
+
+        :return: A list of str sheet names.
+        """
+
+        return list(self.SHEET_NAMES)
+
+    def build_catalog(self):
+        """
+        Build every item dict that hasn't been built yet. The sheets are read in
+        parallel when the load_workers setting is more than zero.
+        """
+
+        if settings_io.global_settings.settings.get("load_workers", 0) > 0 \
+        and self.database is None and self.catalog_map is None:
+            self.load_parallel()
+
+        for name in self.CATALOG_NAMES:
+            self.load_catalog(name)
+
+    def load_parallel(self, max_workers: int = None, executor_type: str = "auto"):
+        """
+        Read every sheet that isn't loaded yet across a pool of workers, then build
+        the item dicts (including joining the spacesuit sets) on this thread.
+
+        :param max_workers: An int of how many workers to use. Defaults to the \
+load_workers setting.
+        :param executor_type: A str of "process", "thread", or "auto". "auto" uses \
+processes only for workbooks of at least PROCESS_POOL_MIN_BYTES.
+
+        :return: A dict of sheet names to dicts with the "parse" and "build" seconds.
+        """
+
+        if max_workers is None or max_workers < 1:
+            max_workers = max(settings_io.global_settings.settings.get("load_workers", 0), 1)
+        if executor_type == "auto":
+            if get_datatable_size(self.file_path) >= PROCESS_POOL_MIN_BYTES:
+                executor_type = "process"
+            else:
+                executor_type = "thread"
+        # concurrent.futures pulls in multiprocessing and logging, which a
+        # reader that never loads in parallel shouldn't pay for at import.
+        # pylint: disable=import-outside-toplevel
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+        if executor_type == "process":
+            executor_class = ProcessPoolExecutor
+        elif executor_type == "thread":
+            executor_class = ThreadPoolExecutor
+        else:
+            raise ValueError(f"Invalid executor type: {executor_type}")
+
+        unloaded_sheets = [sheet for sheet in self.sheet_names
+                           if sheet not in self.datasheets.loaded_sheets
+                           and self.is_loaded(self.get_catalog_name(sheet)) is not True]
+        if len(unloaded_sheets) > 0:
+            with executor_class(max_workers=max_workers) as executor:
+                results = executor.map(parse_sheet,
+                                       [self.file_path] * len(unloaded_sheets),
+                                       unloaded_sheets,
+                                       [self.SHEET_COLUMN_COUNTS[sheet]
+                                        for sheet in unloaded_sheets],
+                                       [self.get_catalog_backend_name()] * len(unloaded_sheets))
+                for sheet_name, columns, parse_time in results:
+                    self.parsed_columns.setdefault(sheet_name, columns)
+                    self.sheet_timings[sheet_name] = {"parse": parse_time}
+                    if self.load_timings is not None:
+                        self.load_timings.add_time(sheet_name, "read", parse_time)
+
+        for name in self.CATALOG_NAMES:
+            sheet_name = self.CATALOG_SOURCES[name][0]
+            start_time = time.perf_counter()
+            self.load_catalog(name)
+            self.sheet_timings.setdefault(sheet_name, {})["build"] = \
+                time.perf_counter() - start_time
+
+        return self.sheet_timings
+
+    def format_sheet_timings(self):
+        """
+        Return the per sheet read and build times as printable lines.
+
+        :return: A str with a line for each sheet.
+        """
+
+        lines = []
+        for sheet_name in self.sheet_names:
+            timings = self.sheet_timings.get(sheet_name, {})
+            lines.append(f"{sheet_name:<22} parse {timings.get('parse', 0.0) * 1000:8.1f}ms "
+                         f"build {timings.get('build', 0.0) * 1000:8.1f}ms")
+        return "\n".join(lines)
+
+    def get_catalog_name(self, sheet_name: str):
+        """
+        Return the name of the item dict that is built from a sheet.
+
+        :param sheet_name: A str of the sheet name.
+
+        :return: A str of the item dict's attribute name, e.g. "ammo_data".
+        """
+
+        for name, (source_sheet, _) in self.CATALOG_SOURCES.items():
+            if source_sheet == sheet_name:
+                return name
+        raise ValueError(f"Unknown sheet name: {sheet_name}")
+
+    def is_loaded(self, catalog_name: str):
+        """
+        Return whether an item dict has already been built.
+
+        :param catalog_name: A str of the item dict's attribute name, e.g. "ammo_data".
+
+        :return: A bool of whether the item dict has been built.
+        """
+
+        return catalog_name in self.catalog_data
+
+    def load_catalog(self, catalog_name: str):
+        """
+        Return an item dict, building it and the item dicts it depends on first
+        if they haven't been built yet.
+
+        :param catalog_name: A str of the item dict's attribute name, e.g. "ammo_data".
+
+        :return: A dict with the items.
+        """
+
+        data_dict = self.catalog_data.get(catalog_name)
+        if data_dict is None:
+            with self.load_lock:
+                data_dict = self.catalog_data.get(catalog_name)
+                if data_dict is None:
+                    for dependency in self.CATALOG_SOURCES[catalog_name][1]:
+                        self.load_catalog(dependency)
+                    data_dict = self.build_and_store_catalog(catalog_name)
+
+        return data_dict
+
+    def build_and_store_catalog(self, catalog_name: str):
+        """
+        Build an item dict and keep it, timing its phases if timings are recorded.
+
+        :param catalog_name: A str of the item dict's attribute name, e.g. "ammo_data".
+
+        :return: The item dict that was stored.
+        """
+
+        if self.load_timings is None:
+            return self.store_catalog(catalog_name, self.build_catalog_data(catalog_name))
+
+        data_dict = None
+        clock = self.load_timings.start_clock(self.CATALOG_SOURCES[catalog_name][0])
+        try:
+            data_dict = self.build_catalog_data(catalog_name)
+            clock.mark("index")
+            data_dict = self.store_catalog(catalog_name, data_dict)
+        finally:
+            clock.stop(None if data_dict is None else len(data_dict))
+
+        return data_dict
+
+    def load_report(self):
+        """
+        Return how long each phase of loading each sheet took, with its row and item
+        counts. Only the item dicts built since the reader was created are in it.
+
+        :return: A dict with a "sheets" dict of sheet names to dicts of the seconds \
+of each phase ("read", "normalize", "build", "join", "index", and "total") and the \
+"rows" and "items" counts, and a "totals" dict of the seconds of each phase.
+        """
+
+        if self.load_timings is None:
+            raise ValueError("Load timings are only recorded by a DataFileReader "
+                             "created with record_timings=True")
+        return self.load_timings.to_dict()
+
+    def format_load_report(self):
+        """
+        Return the load_report() as a printable table.
+
+        :return: A str with a line for each sheet and one for the totals.
+        """
+
+        if self.load_timings is None:
+            raise ValueError("Load timings are only recorded by a DataFileReader "
+                             "created with record_timings=True")
+        return self.load_timings.format()
+
+    def store_catalog(self, catalog_name: str, data_dict: dict):
+        """
+        Keep a built item dict and build its secondary indexes. The indexes of an
+        item dict read from a map file are built the first time they are used.
+
+        :param catalog_name: A str of the item dict's attribute name, e.g. "ammo_data".
+        :param data_dict: A dict with the items.
+
+        :return: The IndexedItemDict or MappedItemDict that was stored.
+        """
+
+        if isinstance(data_dict, MappedItemDict) is not True:
+            if isinstance(data_dict, IndexedItemDict) is not True:
+                data_dict = IndexedItemDict(data_dict)
+            data_dict.build_indexes(self.SECONDARY_INDEXES.get(catalog_name, ()))
+        self.catalog_data[catalog_name] = data_dict
+        self.item_stores.pop(catalog_name, None)
+
+        return data_dict
+
+    def get_item_store(self, catalog_name: str):
+        """
+        Return a columnar ItemStore of an item dict, building it the first time.
+
+        The store is a copy of the item dict when it was built, so it is rebuilt
+        when the item dict is replaced but not when the item dict is changed.
+
+        :param catalog_name: A str of the item dict's attribute name, e.g. "weapon_data".
+
+        :return: An ItemStore object.
+        """
+
+        # pylint: disable=import-outside-toplevel
+        from .item_store import ItemStore
+
+        item_store = self.item_stores.get(catalog_name)
+        if item_store is None:
+            with self.load_lock:
+                item_store = self.item_stores.get(catalog_name)
+                if item_store is None:
+                    item_store = ItemStore(self.load_catalog(catalog_name))
+                    self.item_stores[catalog_name] = item_store
+
+        return item_store
+
+    def get_indexed_items(self, catalog_name: str, attribute: str, value):
+        """
+        Return the items of an item dict whose attribute has a value, from the
+        secondary index built when the item dict was loaded.
+
+        :param catalog_name: A str of the item dict's attribute name, e.g. "weapon_data".
+        :param attribute: A str of the item attribute to filter by, e.g. "dlc".
+        :param value: The value the attribute has to have.
+
+        :return: A read only dict of lowercase item names to items.
+        """
+
+        return self.load_catalog(catalog_name).get_indexed(attribute, value)
+
+    def build_catalog_data(self, catalog_name: str):
+        """
+        Build one item dict from its sheet.
+
+        :param catalog_name: A str of the item dict's attribute name, e.g. "ammo_data".
+
+        :return: A dict with the items.
+        """
+
+        if self.catalog_map is not None:
+            return self.get_catalog_map().get_item_dict(catalog_name)
+
+        sheet_name = self.CATALOG_SOURCES[catalog_name][0]
+        if catalog_name == "ammo_data":
+            data_dict = self.get_ammo_data()
+        elif catalog_name == "spacesuit_data":
+            data_dict = self.get_spacesuit_data()
+        elif catalog_name == "pack_data":
+            data_dict = self.get_pack_data()
+        elif catalog_name == "helmet_data":
+            data_dict = self.get_helmet_data()
+        elif catalog_name == "spacesuit_set_data":
+            data_dict = self.get_spacesuit_set_data(*self.get_dependency_dicts(catalog_name))
+        elif catalog_name == "weapon_data":
+            data_dict = self.get_weapon_data()
+        elif catalog_name == "resource_data":
+            data_dict = self.get_resource_data()
+        elif catalog_name in ("weapon_status_mods_data", "armor_status_mods_data"):
+            data_dict = self.get_status_mod_data(sheet_name)
+        elif catalog_name in ("armor_quality_mods_data", "weapon_quality_mods_data"):
+            data_dict = self.get_quality_mod_data(sheet_name)
+        else:
+            raise ValueError(f"Unknown catalog name: {catalog_name}")
+
+        return data_dict
+
+    def get_dependency_dicts(self, catalog_name: str, new_catalog: dict = None):
+        """
+        Return the item dicts that an item dict is built from, e.g. the spacesuits,
+        helmets, and packs for the spacesuit sets.
+
+        :param catalog_name: A str of the item dict's attribute name, e.g. "spacesuit_set_data".
+        :param new_catalog: An optional dict of item dicts to use instead of the loaded ones.
+
+        :return: A list of the item dicts in CATALOG_SOURCES order.
+        """
+
+        if new_catalog is None:
+            new_catalog = {}
+        return [new_catalog[dependency] if dependency in new_catalog
+                else self.load_catalog(dependency)
+                for dependency in self.CATALOG_SOURCES[catalog_name][1]]
+
+    def reload(self):
+        """
+        Rebuild the item dicts whose sheets changed since the last reload (or since
+        watching started) and swap them in all at once.
+
+        The workbook is opened again and the sheets that changed are found from
+        the hashes of their cell values, one sheet in memory at a time. Only the
+        item dicts that were already built are rebuilt from the changed sheets,
+        along with the spacesuit sets when one of their parts is rebuilt. The
+        others are built from the new file when they are first used. The new item
+        dicts are built on the side and replace the old ones in a single assignment,
+        so a reader of ammo_data, weapon_data, etc. sees either the old catalog or
+        the new one.
+
+        :return: A list of the str names of the sheets whose contents changed.
+        """
+
+        if self.database is not None:
+            raise ValueError("A reader using a catalog database can't be reloaded")
+        if self.catalog_map is not None:
+            raise ValueError("A reader using a catalog map file can't be reloaded")
+        if self.datatable_format != "xls":
+            raise ValueError("Only a .xls datatable can be reloaded")
+
+        # A new backend so nothing that was cached from the old file is read.
+        backend = XlrdBackend(self.file_path)
+        try:
+            with self.load_lock:
+                changed_sheets = self.find_changed_sheets(backend)
+
+                new_catalog = {}
+                for name in self.get_stale_catalog_names(changed_sheets):
+                    columns = self.read_changed_sheet(backend, self.CATALOG_SOURCES[name][0])
+                    data_dict = self.CATALOG_BUILDERS[name](
+                        columns, *self.get_dependency_dicts(name, new_catalog))
+                    data_dict.build_indexes(self.SECONDARY_INDEXES.get(name, ()))
+                    new_catalog[name] = data_dict
+
+                # Anything read from the old file is stale now.
+                for sheet_name in changed_sheets:
+                    self.datasheets.loaded_sheets.pop(sheet_name, None)
+                    self.parsed_columns.pop(sheet_name, None)
+                for old_backend in self.backends.values():
+                    old_backend.close()
+                self.backends = {}
+                self.row_indexes.clear()
+                self.swap_catalog(new_catalog)
+        finally:
+            backend.close()
+
+        if self.snapshot is not None and len(changed_sheets) > 0:
+            self.save_snapshot()
+
+        return changed_sheets
+
+    def get_stale_catalog_names(self, changed_sheets: list):
+        """
+        Return the loaded item dicts that are built from changed sheets, and the
+        loaded item dicts that are built from those.
+
+        :param changed_sheets: A list of the str names of the changed sheets.
+
+        :return: A list of str item dict attribute names in CATALOG_NAMES order.
+        """
+
+        stale_names = []
+        for name in self.CATALOG_NAMES:
+            sheet_name, dependencies = self.CATALOG_SOURCES[name]
+            if self.is_loaded(name) is True and (sheet_name in changed_sheets or any(
+                    dependency in stale_names for dependency in dependencies)):
+                stale_names.append(name)
+        return stale_names
+
+    def swap_catalog(self, new_catalog: dict):
+        """
+        Replace item dicts with rebuilt ones in a single assignment, so a reader of
+        ammo_data, weapon_data, etc. sees either the old item dicts or the new ones.
+
+        :param new_catalog: A dict of item dict attribute names to IndexedItemDicts.
+        """
+
+        for name in new_catalog:
+            self.item_stores.pop(name, None)
+        updated_data = dict(self.catalog_data)
+        updated_data.update(new_catalog)
+        self.catalog_data = updated_data
+
+    def read_changed_sheet(self, backend: XlrdBackend, sheet_name: str):
+        """
+        Return the used columns of a sheet from the file reload() opened.
+
+        :param backend: An XlrdBackend with the new file open.
+        :param sheet_name: A str of the name of the sheet.
+
+        :return: A list of column lists.
+        """
+
+        return backend.read_sheet_columns(sheet_name, self.SHEET_COLUMN_COUNTS[sheet_name])
+
+    def find_changed_sheets(self, backend: XlrdBackend):
+        """
+        Return the sheets whose contents differ from when the sheet hashes were
+        last recorded, and record the new ones. Every sheet counts as changed if
+        no hashes were recorded yet.
+
+        :param backend: An XlrdBackend with the new file open.
+
+        :return: A list of the str names of the changed sheets.
+        """
+
+        sheet_hashes = backend.get_sheet_hashes(self.sheet_names)
+        changed_sheets = [sheet for sheet in self.sheet_names
+                          if sheet_hashes[sheet] != self.sheet_hashes.get(sheet)]
+        self.sheet_hashes = sheet_hashes
+
+        return changed_sheets
+
+    def record_sheet_hashes(self):
+        """
+        Record the sheet hashes of the file as it is now, so the next reload() only
+        rebuilds the sheets that change after this.
+        """
+
+        backend = XlrdBackend(self.file_path)
+        try:
+            with self.load_lock:
+                self.find_changed_sheets(backend)
+        finally:
+            backend.close()
+
+    def get_file_state(self):
+        """
+        Return the size and modification time of the datasheet.
+
+        :return: A tuple of (int size, int mtime in nanoseconds), or None if it can't be read.
+        """
+
+        try:
+            file_stat = os.stat(self.file_path)
+        except OSError:
+            return None
+        return (file_stat.st_size, file_stat.st_mtime_ns)
+
+    def start_watching(self, interval: float = 1.0, on_reload=None, on_error=None):
+        """
+        Start a background thread that checks the datasheet every interval seconds
+        and calls reload() when its size or modification time changes.
+
+        A reload that fails is tried again the next time the datasheet changes.
+        Its exception is kept for get_watch_error() and given to on_error, once.
+
+        :param interval: A float of how many seconds to wait between checks.
+        :param on_reload: An optional function that is called with the list of \
+changed sheet names after each reload that changed something.
+        :param on_error: An optional function that is called on the watch thread \
+with the exception of a reload that failed.
+        """
+
+        # pylint: disable=broad-exception-caught
+
+        if self.watch_thread is not None:
+            return
+        if self.datatable_format != "xls":
+            raise ValueError("Only a .xls datatable can be watched")
+        self.record_sheet_hashes()
+        self.watch_stop.clear()
+        watched_state = self.get_file_state()
+
+        def watch():
+            nonlocal watched_state
+            while self.watch_stop.wait(interval) is not True:
+                file_state = self.get_file_state()
+                if file_state is None or file_state == watched_state:
+                    continue
+                watched_state = file_state
+                try:
+                    changed_sheets = self.reload()
+                except Exception as e:
+                    # The file is likely still being saved, so try again when it changes.
+                    with self.load_lock:
+                        self.watch_error = e
+                    if on_error is not None:
+                        on_error(e)
+                    continue
+                with self.load_lock:
+                    self.watch_error = None
+                if len(changed_sheets) > 0 and on_reload is not None:
+                    on_reload(changed_sheets)
+
+        self.watch_thread = threading.Thread(target=watch, name="DataFileReader watch",
+                                             daemon=True)
+        self.watch_thread.start()
+
+    def get_watch_error(self):
+        """
+        Return the exception of the last reload the watch thread tried, if it
+        failed, and forget it so it is only returned once.
+
+        :return: An Exception, or None.
+        """
+
+        with self.load_lock:
+            watch_error = self.watch_error
+            self.watch_error = None
+        return watch_error
+
+    def stop_watching(self):
+        """
+        Stop the thread start_watching() started.
+        """
+
+        if self.watch_thread is not None:
+            self.watch_stop.set()
+            self.watch_thread.join()
+            self.watch_thread = None
+
+    def get_catalog(self):
+        """
+        Return all of the item dicts keyed by their attribute name.
+
+        :return: A dict of all of the item dicts.
+        """
+
+        return {name: getattr(self, name) for name in self.CATALOG_NAMES}
+
+    def set_catalog(self, catalog: dict):
+        """
+        Set all of the item dicts from a dict like the one get_catalog() returns.
+
+        :param catalog: A dict of all of the item dicts keyed by their attribute name.
+        """
+
+        for name in self.CATALOG_NAMES:
+            setattr(self, name, catalog[name])
+
+    def get_command_cache(self):
+        """
+        Return the reader's CommandCache, creating it the first time. Its
+        commands follow the dlc_load_order setting.
+
+        :return: The CommandCache object.
+        """
+
+        with self.load_lock:
+            if self.command_cache is None:
+                self.command_cache = CommandCache(self)
+        return self.command_cache
+
+    @staticmethod
+    def get_dlc_load_order():
+        """
+        Return the current DLC load order, which new item dicts are built with.
+
+        :return: A str of the DLC load order.
+        """
+
+        return settings_io.global_settings.settings["dlc_load_order"]
+
+    def is_dlc_load_order_current(self):
+        """
+        Return whether the DLC load order is still the one the reader was made
+        with. Once it changes, the items already built keep their old DLC ids.
+
+        :return: A bool of whether the DLC load order hasn't changed.
+        """
+
+        return self.dlc_load_order == self.get_dlc_load_order()
+
+    def check_dlc_load_order(self):
+        """
+        Raise a ValueError if the DLC load order changed since the reader was
+        made, so items with ids of both load orders aren't written out.
+        """
+
+        if self.is_dlc_load_order_current() is not True:
+            raise ValueError(f"The DLC load order changed from {self.dlc_load_order} to "
+                             f"{self.get_dlc_load_order()} since the items were read")
+
+    def export_database(self, database_path: str):
+        """
+        Write every item dict to a SQLite catalog database that a DataFileReader
+        can be created from with database_path.
+
+        :param database_path: A str filepath to write the database to.
+
+        :return: An int of how many items were written.
+        """
+
+        # pylint: disable=import-outside-toplevel
+        from .catalog_database import CatalogDatabase
+        self.check_dlc_load_order()
+        return CatalogDatabase(database_path).export(self.get_catalog(),
+                                                     self.get_dlc_load_order())
+
+    def export_catalog_map(self, map_path: str):
+        """
+        Write every item dict to a catalog map file that a DataFileReader can be
+        created from with map_path.
+
+        :param map_path: A str filepath to write the map file to.
+
+        :return: An int of how many items were written.
+        """
+
+        self.check_dlc_load_order()
+        return CatalogMapFile(map_path).export(self.get_catalog(), self.get_dlc_load_order())
+
+    def export_datatable(self, target_path: str, target_format: str = None):
+        """
+        Write the sheets the item dicts are read from to a datatable of another
+        format, which a DataFileReader can be created from. Every column of the
+        sheets is written, so nothing is lost going from one format to another.
+
+        :param target_path: A str filepath to write the datatable to, a folder for CSV.
+        :param target_format: An optional str of "xls", "xlsx", "csv", "json", or \
+"ndjson". Defaults to the format of target_path, see get_datatable_format().
+
+        :return: An int of how many rows were written, not counting the header rows.
+        """
+
+        backend = get_datatable_backend(self.file_path)
+        try:
+            available_sheets = backend.get_sheet_names()
+            return write_datatable(target_path,
+                                   {sheet_name: backend.iter_table(sheet_name)
+                                    for sheet_name in self.sheet_names
+                                    if sheet_name in available_sheets},
+                                   target_format)
+        finally:
+            backend.close()
+
+    def get_catalog_map(self):
+        """
+        Return the reader's CatalogMapFile, mapping the file the first time.
+
+        :return: The open CatalogMapFile object.
+        """
+
+        with self.load_lock:
+            if self.catalog_map.data is None:
+                self.catalog_map.open(self.get_dlc_load_order())
+        return self.catalog_map
+
+    def read_sheets(self, used_columns_only: bool = False):
         """
         Read the specified sheets from the Excel file.
 
+        The workbook is opened and parsed once and every sheet is pulled
+        out of that single open workbook.
+
+        :param used_columns_only: A bool to only read the columns that the \
+get_*_data methods use.
+
         :return: A dict where keys are sheet names and values are DataFrames.
         """
 
         # pylint: disable=broad-exception-caught
+        # pylint: disable=import-outside-toplevel
+        import pandas as pd
 
         data = {}
         try:
-            for sheet in self.sheet_names:
-                # print(sheet)
-                data[sheet] = pd.read_excel(self.file_path, sheet_name=sheet)
+            with pd.ExcelFile(self.file_path) as workbook:
+                for sheet in self.sheet_names:
+                    used_columns = None
+                    if used_columns_only is True:
+                        used_columns = list(range(self.SHEET_COLUMN_COUNTS[sheet]))
+                    data[sheet] = workbook.parse(sheet, usecols=used_columns)
 
         except Exception as e:
             print(f"Error reading Excel file: {e}")
 
         return data
 
-    def get_row_index(self, dataframe_ref: pd.DataFrame, search_column_name: str,
+    def get_catalog_backend_name(self):
+        """
+        Return the name of the reader backend the item dicts are built with.
+
+        :return: A str of the backend name, e.g. "xlrd", "pandas", or "csv".
+        """
+
+        if self.backend_name == "auto":
+            return DATATABLE_BACKENDS[self.datatable_format].name
+        return self.backend_name
+
+    def get_backend(self, backend_name: str = None):
+        """
+        Return a reader backend, creating it the first time it is used.
+
+        :param backend_name: An optional str of the backend name. Defaults to the \
+backend the item dicts are built with.
+
+        :return: A ReaderBackend object.
+        """
+
+        if backend_name is None:
+            backend_name = self.get_catalog_backend_name()
+        with self.load_lock:
+            if backend_name not in self.backends:
+                self.backends[backend_name] = get_reader_backend(backend_name, self.file_path)
+            return self.backends[backend_name]
+
+    def read_sheet(self, sheet_name: str):
+        """
+        Read a single sheet from the Excel file with the pandas backend.
+
+        The workbook is opened on demand the first time and kept open, so only
+        the records for the sheets that are actually read get parsed.
+
+        :param sheet_name: A str of the name of the sheet to read.
+
+        :return: A DataFrame with the used columns of the sheet.
+        """
+
+        return self.get_backend("pandas").read_sheet(sheet_name,
+                                                     self.SHEET_COLUMN_COUNTS[sheet_name])
+
+    def iter_rows(self, sheet_name: str):
+        """
+        Yield the used columns of each row of a sheet as a plain tuple.
+
+        :param sheet_name: A str of the name of the sheet to read.
+
+        :return: An iterator of tuples of cell values.
+        """
+
+        if sheet_name not in self.sheet_names:
+            raise ValueError(f"Unknown sheet name: {sheet_name}")
+        return self.get_backend().iter_rows(sheet_name, self.SHEET_COLUMN_COUNTS[sheet_name])
+
+    def iter_items(self, sheet_name: str, chunk_size: int = None):
+        """
+        Yield the items of a sheet one at a time without keeping them.
+
+        The rows are streamed a sheet at a time (or from the lines of a .csv or
+        .ndjson file) with a backend of its own and built into items
+        chunk_size rows at a time, so memory use stays the
+        same however many rows the sheet has. Nothing is added to the item dicts,
+        the datasheets, or the other caches. The Spacesuit_Sets sheet needs the
+        spacesuit, helmet, and pack dicts, which are loaded the usual way.
+
+        An item name that is in the sheet more than once is only yielded once by
+        each chunk, but can be yielded again by a later one.
+
+        :param sheet_name: A str of the name of the sheet to read.
+        :param chunk_size: An optional int of how many rows to build at a time. \
+Defaults to STREAM_CHUNK_SIZE.
+
+        :return: An iterator of the sheet's item objects in sheet order.
+        """
+
+        catalog_name = self.get_catalog_name(sheet_name)
+        builder = self.CATALOG_BUILDERS[catalog_name]
+        dependency_dicts = self.get_dependency_dicts(catalog_name)
+        column_count = self.SHEET_COLUMN_COUNTS[sheet_name]
+        if chunk_size is None:
+            chunk_size = self.STREAM_CHUNK_SIZE
+
+        if self.datatable_format == "xls":
+            backend = XlrdBackend(self.file_path, use_mmap=True)
+            rows = backend.stream_rows(sheet_name, column_count)
+        else:
+            backend = get_datatable_backend(self.file_path)
+            rows = backend.iter_rows(sheet_name, column_count)
+        try:
+            while True:
+                chunk = list(itertools.islice(rows, chunk_size))
+                if len(chunk) == 0:
+                    break
+                columns = [list(column) for column in zip(*chunk)]
+                del chunk
+                yield from builder(columns, *dependency_dicts).values()
+        finally:
+            backend.close()
+
+    def close(self):
+        """
+        Stop the background load and close any workbooks the reader backends
+        left open. A backend is made again if a sheet is read after this.
+        """
+
+        self.stop_background_load()
+        with self.load_lock:
+            for backend in self.backends.values():
+                backend.close()
+            self.backends = {}
+
+    def get_dataframe(self, sheet: "str | pd.DataFrame"):
+        """
+        Return the DataFrame for a sheet name, or the DataFrame itself if one is passed.
+
+        :param sheet: A str sheet name or a pandas.DataFrame.
+
+        :return: A pandas.DataFrame.
+        """
+
+        if isinstance(sheet, str):
+            if sheet not in self.sheet_names:
+                raise ValueError(f"Unknown sheet name: {sheet}")
+            return self.datasheets[sheet]
+        return sheet
+
+    def get_column_index(self, dataframe_ref: "pd.DataFrame", search_column_name: str):
+        """
+        Return a dict of each value in a column to the first row it is in.
+
+        The dict is built the first time a column of a DataFrame is searched and
+        reused after that, so the DataFrame shouldn't be changed once it has been
+        searched. Call clear_row_indexes() if it is.
+
+        :param dataframe_ref: A pandas.DataFrame reference to the dataframe name.
+        :param search_column_name: A str Column Name to search for.
+
+        :return: A dict of column values to int row numbers.
+        """
+
+        key = (id(dataframe_ref), search_column_name)
+        cached = self.row_indexes.get(key)
+        if cached is not None and cached[0]() is dataframe_ref:
+            return cached[1]
+
+        values = dataframe_ref[search_column_name].array.tolist()
+        # Walk the rows backwards so the first row wins for duplicate values, like list.index.
+        column_index = dict(zip(reversed(values), range(len(values) - 1, -1, -1)))
+        self.row_indexes[key] = (weakref.ref(dataframe_ref), column_index)
+
+        return column_index
+
+    def clear_row_indexes(self):
+        """
+        Forget every column index that get_row_index() has built.
+        """
+
+        self.row_indexes.clear()
+
+    def get_row_index(self, dataframe_ref: "pd.DataFrame", search_column_name: str,
                       search_column_val: str):
         """
         Return the row index of particular value in a particular sheet given the DataFrame ref,
@@ -77,9 +1362,12 @@ class DataFileReader:
         :return: an integer with the row number for pandas.
         """
 
-        return dataframe_ref[search_column_name].array.tolist().index(search_column_val)
+        row_index = self.get_column_index(dataframe_ref, search_column_name).get(search_column_val)
+        if row_index is None:
+            raise ValueError(f"{search_column_val!r} is not in column {search_column_name}")
+        return row_index
 
-    def get_cell_value(self, dataframe_ref: pd.DataFrame,
+    def get_cell_value(self, dataframe_ref: "pd.DataFrame",
                        search_column_name: str, search_column_value: str,
                        tgt_column_name: str):
         """
@@ -97,6 +1385,32 @@ class DataFileReader:
         return dataframe_ref.at[self.get_row_index(
             dataframe_ref, search_column_name, search_column_value), tgt_column_name]
 
+    def get_cell_values(self, sheet: "str | pd.DataFrame", search_column_name: str,
+                        search_column_values: list, tgt_column_name: str):
+        """
+        Return the cell values for many search values at once. Every row is
+        found through the column index and the target cells are pulled out
+        in a single take from the target column.
+
+        :param sheet: A str sheet name or a pandas.DataFrame reference.
+        :param search_column_name: A str Column Name to search for.
+        :param search_column_values: A list of the values in that column to search for.
+        :param tgt_column_name: A str The column name to pull the actual values from.
+
+        :return: A list with the cell data in the same order as search_column_values.
+        """
+
+        dataframe_ref = self.get_dataframe(sheet)
+        column_index = self.get_column_index(dataframe_ref, search_column_name)
+
+        row_indexes = [column_index.get(value) for value in search_column_values]
+        missing_values = [value for value, row_index
+                          in zip(search_column_values, row_indexes) if row_index is None]
+        if len(missing_values) > 0:
+            raise ValueError(f"Values not in column {search_column_name}: {missing_values}")
+
+        return dataframe_ref[tgt_column_name].to_numpy()[row_indexes].tolist()
+
     @staticmethod
     def get_status_mods_by_mod_slot(slot: int, mod_dict: dict):
         """
@@ -106,10 +1420,13 @@ class DataFileReader:
         :param slot: An int value for the target slot.
         :param mod_dict: A dict containing the status mods.
 
-        :return: A dict with a subset of a StatusModType dict containing \
+        :return: A read only dict with a subset of a StatusModType dict containing \
 only items with a specific mod slot.
         """
 
+        if isinstance(mod_dict, (IndexedItemDict, MappedItemDict)):
+            return mod_dict.get_indexed("mod_slot", slot)
+
         output_dict = {}
         for status_mod in mod_dict.values():
             if status_mod.get_mod_slot() == slot:
@@ -121,30 +1438,68 @@ only items with a specific mod slot.
         Selects a subset of weapons based on whether they're unique or not.
         
         :param want_unique: A bool of whether you want unique weapons or not unique weapons.
-        """
 
-        data_dict = {}
-        for weapon in list(self.weapon_data.values()):
-            if weapon.unique is want_unique:
-                data_dict[weapon.get_name().lower()] = weapon
+        :return: A read only dict of the selected weapons.
+        """
 
-        return data_dict
+        return self.get_indexed_items("weapon_data", "unique", want_unique)
 
     def get_weapons_by_type(self, tgt_weapon_type: str):
         """
         Selects a subset of weapons based on type.
         
         :param tgt_weapon_type: A str of the weapon type to select for.
+
+        :return: A read only dict of the selected weapons.
         """
 
-        data_dict = {}
         if tgt_weapon_type not in WeaponItem.get_valid_weapon_types():
             raise ValueError("Invalid Weapon Type")
-        for weapon in list(self.weapon_data.values()):
-            if weapon.weapon_type == tgt_weapon_type:
-                data_dict[weapon.get_name().lower()] = weapon
+        return self.get_indexed_items("weapon_data", "weapon_type", tgt_weapon_type)
 
-        return data_dict
+    def get_items_by_dlc(self, catalog_name: str, want_dlc: bool):
+        """
+        Selects a subset of an item dict based on whether the items are from a DLC.
+
+        :param catalog_name: A str of the item dict's attribute name, e.g. "helmet_data".
+        :param want_dlc: A bool of whether you want DLC items or base game items.
+
+        :return: A read only dict of the selected items.
+        """
+
+        return self.get_indexed_items(catalog_name, "dlc", want_dlc)
+
+    def get_spacesuit_sets_by_faction(self, faction: str):
+        """
+        Selects the spacesuit sets of a faction.
+
+        :param faction: A str of the faction name, or None for sets without a faction.
+
+        :return: A read only dict of the selected spacesuit sets.
+        """
+
+        if faction is not None:
+            faction = faction.lower()
+        return self.get_indexed_items("spacesuit_set_data", "faction", faction)
+
+    def get_sheet_columns(self, sheet_name: str):
+        """
+        Return the used columns of a sheet as lists of plain python values.
+
+        :param sheet_name: A str of the name of the sheet.
+
+        :return: A list of column lists.
+        """
+
+        column_count = self.SHEET_COLUMN_COUNTS[sheet_name]
+        if self.database is not None:
+            return self.database.read_catalog_columns(self.get_catalog_name(sheet_name))
+        if sheet_name in self.parsed_columns:
+            return self.parsed_columns.pop(sheet_name)
+        if self.backend_name == "auto" and sheet_name in self.datasheets.loaded_sheets:
+            return PandasBackend.get_dataframe_columns(self.datasheets[sheet_name],
+                                                       column_count)
+        return self.get_backend().read_sheet_columns(sheet_name, column_count)
 
     def get_ammo_data(self):
         """
@@ -153,15 +1508,7 @@ only items with a specific mod slot.
         :return: A dict with all of the Ammo page data.
         """
 
-        num_rows = self.datasheets["Ammo"].shape[0]
-        output_dict = {}
-        for row in range(num_rows):
-            temp_row = self.datasheets["Ammo"].loc[row]
-            temp_key = temp_row.iloc[0].strip().lower()
-            temp_value = AmmoItem(temp_row.iloc[0].strip(), temp_row.iloc[1].strip())
-            output_dict[temp_key] = temp_value
-
-        return output_dict
+        return item_builders.build_ammo_items(self.get_sheet_columns("Ammo"))
 
     def get_spacesuit_data(self):
         """
@@ -170,17 +1517,7 @@ only items with a specific mod slot.
         :return: A dict with all of the Spacesuit page data.
         """
 
-        num_rows = self.datasheets["Spacesuits"].shape[0]
-        output_dict = {}
-        for row in range(num_rows):
-            temp_row = self.datasheets["Spacesuits"].loc[row]
-            temp_key = temp_row.iloc[0].strip().lower()
-            temp_value = SpacesuitItem(temp_row.iloc[0].strip(),
-                                  str(temp_row.iloc[1]).strip(),
-                                  bool(temp_row.iloc[2]))
-            output_dict[temp_key] = temp_value
-
-        return output_dict
+        return item_builders.build_spacesuit_items(self.get_sheet_columns("Spacesuits"))
 
     def get_pack_data(self):
         """
@@ -189,17 +1526,7 @@ only items with a specific mod slot.
         :return: A dict with all of the Pack page data.
         """
 
-        num_rows = self.datasheets["Packs"].shape[0]
-        output_dict = {}
-        for row in range(num_rows):
-            temp_row = self.datasheets["Packs"].loc[row]
-            temp_key = temp_row.iloc[0].strip().lower()
-            temp_value = PackItem(temp_row.iloc[0].strip(),
-                                  str(temp_row.iloc[1]).strip(),
-                                  bool(temp_row.iloc[2]))
-            output_dict[temp_key] = temp_value
-
-        return output_dict
+        return item_builders.build_pack_items(self.get_sheet_columns("Packs"))
 
     def get_helmet_data(self):
         """
@@ -208,17 +1535,7 @@ only items with a specific mod slot.
         :return: A dict with all of the Helmet page data.
         """
 
-        num_rows = self.datasheets["Helmets"].shape[0]
-        output_dict = {}
-        for row in range(num_rows):
-            temp_row = self.datasheets["Helmets"].loc[row]
-            temp_key = temp_row.iloc[0].strip().lower()
-            temp_value = HelmetItem(temp_row.iloc[0].strip(),
-                                  str(temp_row.iloc[1]).strip(),
-                                  bool(temp_row.iloc[2]))
-            output_dict[temp_key] = temp_value
-
-        return output_dict
+        return item_builders.build_helmet_items(self.get_sheet_columns("Helmets"))
 
     def get_spacesuit_set_data(self, spacesuits: dict,
                                 helmets: dict, packs: dict):
@@ -232,27 +1549,8 @@ only items with a specific mod slot.
         :return: A dict with all of the spacesuit sets.
         """
 
-        num_rows = self.datasheets["Spacesuit_Sets"].shape[0]
-        output_dict = {}
-
-        for row in range(num_rows):
-            temp_row = self.datasheets["Spacesuit_Sets"].loc[row]
-            temp_key = temp_row.iloc[0].strip().lower()
-
-            temp_value = SpacesuitSetItem(temp_row.iloc[0].strip(),
-                                    str(temp_row.iloc[5]).strip())
-
-            if pd.isna(temp_row.iloc[1]) is not True:
-                temp_value.set_spacesuit(spacesuits[str(temp_row.iloc[1]).strip().lower()])
-            if pd.isna(temp_row.iloc[2]) is not True:
-                temp_value.set_helmet(helmets[str(temp_row.iloc[2]).strip().lower()])
-            if pd.isna(temp_row.iloc[3]) is not True:
-                temp_value.set_pack(packs[str(temp_row.iloc[3]).strip().lower()])
-            if pd.isna(temp_row.iloc[4]) is not True:
-                temp_value.set_faction(str(temp_row.iloc[4]).strip().lower())
-            output_dict[temp_key] = temp_value
-
-        return output_dict
+        return item_builders.build_spacesuit_set_items(self.get_sheet_columns("Spacesuit_Sets"),
+                                                       spacesuits, helmets, packs)
 
     def get_weapon_data(self):
         """
@@ -261,19 +1559,7 @@ only items with a specific mod slot.
         :return: A dict with all of the Weapon page data.
         """
 
-        num_rows = self.datasheets["Weapons"].shape[0]
-        output_dict = {}
-        for row in range(num_rows):
-            temp_row = self.datasheets["Weapons"].loc[row]
-            temp_key = temp_row.iloc[0].strip().lower()
-            temp_value = WeaponItem(str(temp_row.iloc[0]).strip(),
-                                  str(temp_row.iloc[1]).strip(),
-                                  bool(temp_row.iloc[2]),
-                                  bool(temp_row.iloc[3]),
-                                  str(temp_row.iloc[4]).strip())
-            output_dict[temp_key] = temp_value
-
-        return output_dict
+        return item_builders.build_weapon_items(self.get_sheet_columns("Weapons"))
 
     def get_resource_data(self):
         """
@@ -282,15 +1568,7 @@ only items with a specific mod slot.
         :return: A dict with all of the Resource page data.
         """
 
-        num_rows = self.datasheets["Resources"].shape[0]
-        output_dict = {}
-        for row in range(num_rows):
-            temp_row = self.datasheets["Resources"].loc[row]
-            temp_key = temp_row.iloc[0].strip().lower()
-            temp_value = ResourceItem(temp_row.iloc[0].strip(), temp_row.iloc[1].strip())
-            output_dict[temp_key] = temp_value
-
-        return output_dict
+        return item_builders.build_resource_items(self.get_sheet_columns("Resources"))
 
     def get_status_mod_data(self, sheet_name: str):
         """
@@ -301,17 +1579,7 @@ only items with a specific mod slot.
         :return: A dict with all of the Weapon_Status_Mods page data
         """
 
-        num_rows = self.datasheets[sheet_name].shape[0]
-        output_dict = {}
-        for row in range(num_rows):
-            temp_row = self.datasheets[sheet_name].loc[row]
-            temp_key = temp_row.iloc[0].strip().lower()
-            temp_value = StatusModType(temp_row.iloc[0].strip(),
-                                        temp_row.iloc[1].strip(),
-                                        temp_row.iloc[2].strip(),
-                                        temp_row.iloc[3])
-            output_dict[temp_key] = temp_value
-        return output_dict
+        return item_builders.build_status_mod_items(self.get_sheet_columns(sheet_name))
 
     def get_quality_mod_data(self, sheet_name: str):
         """
@@ -321,12 +1589,4 @@ only items with a specific mod slot.
         :return: A dict with all of a quality mod page's data.
         """
 
-        num_rows = self.datasheets[sheet_name].shape[0]
-        output_dict = {}
-        for row in range(num_rows):
-            temp_row = self.datasheets[sheet_name].loc[row]
-            temp_key = temp_row.iloc[0].strip().lower()
-            temp_value = QualityModType(temp_row.iloc[0].strip(),
-                                        temp_row.iloc[1].strip())
-            output_dict[temp_key] = temp_value
-        return output_dict
+        return item_builders.build_quality_mod_items(self.get_sheet_columns(sheet_name))
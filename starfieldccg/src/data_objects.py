@@ -7,11 +7,53 @@ from os import path as OSPATH
 sys.path.insert(0, OSPATH.abspath(OSPATH.join(OSPATH.dirname(__file__), './')))
 import settings_io
 
+# How many hex digits a form id has.
+FORM_ID_LENGTH = 8
+
+def normalize_ids(item_ids: list, dlc_flags: list = None, dlc_prefix: str = None):
+    """
+    Normalize a whole column of ids so each one works with the correct DLC and
+    is the correct length.
+
+    An id that isn't FORM_ID_LENGTH long has its x placeholders replaced with
+    zeros, and is then cut down to its last digits or padded on the left with
+    zeros. The ids of DLC items then have their first two digits replaced with
+    the DLC load order. The settings are only read once for the whole column.
+
+    :param item_ids: A list of str ids.
+    :param dlc_flags: An optional list of bools of whether each item is from a DLC. \
+No id is given the DLC load order if it isn't supplied.
+    :param dlc_prefix: An optional str of the DLC load order. Defaults to the \
+dlc_load_order setting.
+
+    :return: A list of the normalized str ids, in the same order.
+    """
+
+    # Chained str.replace() calls are much faster than str.translate() with a table.
+    ids = [item_id if len(item_id) == FORM_ID_LENGTH
+           else item_id.replace("x", "0").replace("X", "0")[-FORM_ID_LENGTH:]
+           .rjust(FORM_ID_LENGTH, "0")
+           for item_id in item_ids]
+    if dlc_flags is None:
+        return ids
+
+    if dlc_prefix is None:
+        dlc_prefix = settings_io.global_settings.settings["dlc_load_order"]
+    dlc_prefix = dlc_prefix[:2]
+    return [dlc_prefix + item_id[2:] if dlc is True else item_id
+            for item_id, dlc in zip(ids, dlc_flags)]
+
 class ItemType():
     """
         A class to ensure all of the item classes
         have the minimum fields to make the menus work.
     """
+
+    # Every item class lists its fields in __slots__, so an item has no
+    # __dict__ and takes a fraction of the memory. Setting a field that isn't
+    # in its class's __slots__ raises an AttributeError.
+    __slots__ = ()
+
     @abstractmethod
     def get_name(self):
         """
@@ -47,30 +89,8 @@ class ItemType():
 
         :return: A str with a processed id value.
         """
-        temp_id_list = list(self.get_id())
-        dlc_prefix = settings_io.global_settings.settings["dlc_load_order"]
 
-        if len(temp_id_list) != 8:
-            # Replace placeholder chars with zeros
-            for i, char in enumerate(temp_id_list):
-                if char.lower() == "x":
-                    temp_id_list[i] = "0"
-
-            # Strip the leading zeros if there are too many.
-            if len(temp_id_list) > 8:
-                while len(temp_id_list) > 8:
-                    temp_id_list.pop(0)
-
-            # Pad the string to left with zeros if there are too few.
-            while len(temp_id_list) < 8:
-                temp_id_list.insert(0, "0")
-
-        if dlc is True:
-            # Replace the first two characters in the id with the load order.
-            temp_id_list[0] = dlc_prefix[0]
-            temp_id_list[1] = dlc_prefix[1]
-
-        return "".join(temp_id_list)
+        return normalize_ids([self.get_id()], [dlc])[0]
 
 
 class AmmoItem(ItemType):
@@ -79,12 +99,16 @@ class AmmoItem(ItemType):
         an ammo object without costly pandas overhead.
     """
 
-    def __init__(self, ammo_name: str, ammo_id: int):
+    __slots__ = ("ammo_name", "ammo_id")
+
+    def __init__(self, ammo_name: str, ammo_id: int, normalized: bool = False):
         """
         The constructor for the AmmoItem Class
 
         :param ammo_name: The name of the ammunition.
         :param ammo_id: The id of the ammunition.
+        :param normalized: A bool of whether the id was already normalized by \
+normalize_ids(), so it is kept as it is.
 
         to_dict(): Convert the AmmoItem object to a dict.
         get_name(): Return the name of the ammunition.
@@ -94,7 +118,8 @@ class AmmoItem(ItemType):
 
         self.ammo_name = ammo_name
         self.ammo_id = ammo_id
-        self.ammo_id = self.process_id(False)
+        if normalized is not True:
+            self.ammo_id = self.process_id(False)
 
     def __repr__(self):
         """
@@ -152,18 +177,23 @@ class SpacesuitItem(ItemType):
         a SpacesuitItem object without costly pandas overhead.
     """
 
-    def __init__(self, spacesuit_name: str, spacesuit_id: int, dlc: bool):
+    __slots__ = ("spacesuit_name", "spacesuit_id", "dlc")
+
+    def __init__(self, spacesuit_name: str, spacesuit_id: int, dlc: bool, normalized: bool = False):
         """
         Initialize a SpacesuitItem object.
 
         :param spacesuit_name: The name of the spacesuit.
         :param spacesuit_id: The id of the spacesuit.
         :param dlc: A bool of whether the item is a DLC item or not.
+        :param normalized: A bool of whether the id was already normalized by \
+normalize_ids(), so it is kept as it is.
         """
         self.spacesuit_name = spacesuit_name
         self.spacesuit_id = spacesuit_id
         self.dlc = dlc
-        self.spacesuit_id = self.process_id(dlc)
+        if normalized is not True:
+            self.spacesuit_id = self.process_id(dlc)
 
     def __repr__(self):
         """
@@ -223,19 +253,24 @@ class PackItem(ItemType):
         a PackItem object without costly pandas overhead.
     """
 
-    def __init__(self, pack_name: str, pack_id: int, dlc: bool):
+    __slots__ = ("pack_name", "pack_id", "dlc")
+
+    def __init__(self, pack_name: str, pack_id: int, dlc: bool, normalized: bool = False):
         """
         Initialize a PackItem object.
 
         :param pack_name: The name of the pack.
         :param pack_id: The id of the pack.
         :param dlc: A bool of whether the item is a DLC item or not.
+        :param normalized: A bool of whether the id was already normalized by \
+normalize_ids(), so it is kept as it is.
         """
 
         self.pack_name = pack_name
         self.pack_id = pack_id
         self.dlc = dlc
-        self.pack_id = self.process_id(dlc)
+        if normalized is not True:
+            self.pack_id = self.process_id(dlc)
 
     def __repr__(self):
         """
@@ -295,19 +330,24 @@ class HelmetItem(ItemType):
         a HelmetItem object without costly pandas overhead.
     """
 
-    def __init__(self, helmet_name: str, helmet_id: int, dlc: bool):
+    __slots__ = ("helmet_name", "helmet_id", "dlc")
+
+    def __init__(self, helmet_name: str, helmet_id: int, dlc: bool, normalized: bool = False):
         """
         Initialize a helmetItem object.
 
         :param helmet_name: The name of the helmet.
         :param helmet_id: The id of the helmet.
         :param dlc: A bool of whether the item is a DLC item or not. 
+        :param normalized: A bool of whether the id was already normalized by \
+normalize_ids(), so it is kept as it is.
         """
 
         self.helmet_name = helmet_name
         self.helmet_id = helmet_id
         self.dlc = dlc
-        self.helmet_id = self.process_id(dlc)
+        if normalized is not True:
+            self.helmet_id = self.process_id(dlc)
 
     def __repr__(self):
         """
@@ -367,6 +407,9 @@ class SpacesuitSetItem(ItemType):
         a SpacesuitSetItem object without costly pandas overhead.
     """
 
+    __slots__ = ("spacesuit_set_name", "dlc", "spacesuit", "helmet", "pack", "faction",
+                 "spacesuit_set_id")
+
     def __init__(self, spacesuit_set_name: str, dlc: bool):
         """
         Initialize a SpacesuitSetItem object.
@@ -512,7 +555,10 @@ class WeaponItem(ItemType):
         a WeaponItem object without costly pandas overhead.
     """
 
-    def __init__(self, weapon_name: str, weapon_id: int, dlc: bool, unique: bool, weapon_type: str):
+    __slots__ = ("weapon_name", "weapon_id", "dlc", "unique", "weapon_type")
+
+    def __init__(self, weapon_name: str, weapon_id: int, dlc: bool, unique: bool, weapon_type: str,
+                 normalized: bool = False):
         """
         Initialize a WeaponItem object.
 
@@ -520,6 +566,8 @@ class WeaponItem(ItemType):
         :param weapon_id: The id of the weapon.
         :param dlc: A bool of whether the item is a DLC item or not. 
         :param unique: A bool of whether the item is a unique weapon or not.
+        :param normalized: A bool of whether the id was already normalized by \
+normalize_ids(), so it is kept as it is.
         """
         # pylint: disable=too-many-positional-arguments
         # pylint: disable=too-many-arguments
@@ -527,7 +575,8 @@ class WeaponItem(ItemType):
         self.weapon_name = weapon_name
         self.weapon_id = weapon_id
         self.dlc = dlc
-        self.weapon_id = self.process_id(dlc)
+        if normalized is not True:
+            self.weapon_id = self.process_id(dlc)
         self.unique = unique
 
         if weapon_type.lower() not in self.get_valid_weapon_types():
@@ -604,17 +653,22 @@ class ResourceItem(ItemType):
         a ResourceItem object without costly pandas overhead.
     """
 
-    def __init__(self, resource_name: str, resource_id: int):
+    __slots__ = ("resource_name", "resource_id")
+
+    def __init__(self, resource_name: str, resource_id: int, normalized: bool = False):
         """
         Initialize a ResourceItem object.
 
         :param resource_name: The name of the resource.
         :param resource_id: The id of the resource. 
+        :param normalized: A bool of whether the id was already normalized by \
+normalize_ids(), so it is kept as it is.
         """
 
         self.resource_name = resource_name
         self.resource_id = resource_id
-        self.resource_id = self.process_id(False)
+        if normalized is not True:
+            self.resource_id = self.process_id(False)
 
 
     def __repr__(self):
@@ -674,6 +728,8 @@ class StatusModType():
     a StatusModType object without costly pandas overhead.
     """
 
+    __slots__ = ("status_mod_name", "status_mod_id", "status_mod_desc", "mod_slot")
+
     def __init__(self, status_mod_name: str, status_mod_id: int,
                  status_mod_desc: str, mod_slot: int):
         """
@@ -769,6 +825,8 @@ class QualityModType():
     Represents a Quality mod for weapons or armor.
     """
 
+    __slots__ = ("mod_name", "mod_id")
+
     def __init__(self, mod_name: str, mod_id: str):
         """
         Creates a QualityModType object for storing quality mods.
@@ -0,0 +1,249 @@
+"""
+    A module to write a datatable's sheets in any of the formats a
+    DataFileReader can read, so the catalog can be kept under version
+    control as text and converted back to a workbook.
+
+    Each writer takes the rows of every sheet, the header row first, and
+    writes them a row at a time, so a sheet is never held in memory whole.
+    The sheets come from ReaderBackend.iter_table(), see
+    DataFileReader.export_datatable().
+"""
+import csv
+import json
+import os
+from os import path as OSPATH
+from .reader_backends import CSV_SUFFIX, get_datatable_format
+
+# The formats write_datatable() can write.
+WRITABLE_FORMATS = ("xls", "xlsx", "csv", "json", "ndjson")
+
+def format_csv_cell(value):
+    """
+    Turn a cell value into the text of a .csv cell, the way a spreadsheet
+    saves it. Whole numbers lose the ".0" a float would print with, which
+    the item builders read the same as the number.
+
+    :param value: A str, float, bool, or None cell value.
+
+    :return: A str.
+    """
+
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, float):
+        return str(int(value)) if value.is_integer() else repr(value)
+    return str(value)
+
+def write_temp_file(target_path: str, write_rows, newline: str = None):
+    """
+    Open a temporary file next to the target, let write_rows() fill it, and
+    then move it into place, so a reader never sees a half written file.
+
+    :param target_path: A str filepath to write to.
+    :param write_rows: A function that is called with the open text file.
+    :param newline: An optional str to pass to open(), "" for the csv module.
+    """
+
+    temp_path = f"{target_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "w", encoding="utf-8", newline=newline) as temp_file:
+            write_rows(temp_file)
+        os.replace(temp_path, target_path)
+    except Exception:
+        if OSPATH.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def write_csv_folder(target_path: str, sheets: dict):
+    """
+    Write each sheet to a .csv file named after it in a folder.
+
+    :param target_path: A str path to the folder. It is made if it doesn't exist.
+    :param sheets: A dict of str sheet names to iterables of rows, the header first.
+
+    :return: An int of how many rows were written, not counting the header rows.
+    """
+
+    os.makedirs(target_path, exist_ok=True)
+    row_count = 0
+    for sheet_name, rows in sheets.items():
+        sheet_rows = 0
+
+        def write_rows(sheet_file, rows=rows):
+            nonlocal sheet_rows
+            writer = csv.writer(sheet_file, lineterminator="\n")
+            for row in rows:
+                writer.writerow(map(format_csv_cell, row))
+                sheet_rows += 1
+
+        write_temp_file(OSPATH.join(target_path, f"{sheet_name}{CSV_SUFFIX}"), write_rows, "")
+        row_count += max(sheet_rows - 1, 0)
+    return row_count
+
+def write_json(target_path: str, sheets: dict):
+    """
+    Write the sheets to a .json file of sheet names to lists of rows, with
+    each row on a line of its own so a changed row is a one line diff.
+
+    :param target_path: A str filepath to write to.
+    :param sheets: A dict of str sheet names to iterables of rows, the header first.
+
+    :return: An int of how many rows were written, not counting the header rows.
+    """
+
+    row_count = 0
+
+    def write_rows(json_file):
+        nonlocal row_count
+        json_file.write("{")
+        for sheet_number, (sheet_name, rows) in enumerate(sheets.items()):
+            json_file.write(f"{',' if sheet_number > 0 else ''}\n{json.dumps(sheet_name)}: [")
+            sheet_rows = 0
+            for row in rows:
+                json_file.write(f"{',' if sheet_rows > 0 else ''}\n"
+                                f"{json.dumps(list(row), ensure_ascii=False)}")
+                sheet_rows += 1
+            json_file.write("\n]")
+            row_count += max(sheet_rows - 1, 0)
+        json_file.write("\n}\n")
+
+    write_temp_file(target_path, write_rows)
+    return row_count
+
+def write_ndjson(target_path: str, sheets: dict):
+    """
+    Write the sheets to a .ndjson file with a JSON array of the sheet name and
+    the cells of a row on each line.
+
+    :param target_path: A str filepath to write to.
+    :param sheets: A dict of str sheet names to iterables of rows, the header first.
+
+    :return: An int of how many rows were written, not counting the header rows.
+    """
+
+    row_count = 0
+
+    def write_rows(ndjson_file):
+        nonlocal row_count
+        for sheet_name, rows in sheets.items():
+            sheet_rows = 0
+            for row in rows:
+                ndjson_file.write(json.dumps([sheet_name, *row], ensure_ascii=False))
+                ndjson_file.write("\n")
+                sheet_rows += 1
+            row_count += max(sheet_rows - 1, 0)
+
+    write_temp_file(target_path, write_rows)
+    return row_count
+
+def write_xlsx(target_path: str, sheets: dict):
+    """
+    Write the sheets to a .xlsx workbook with openpyxl.
+
+    :param target_path: A str filepath to write to.
+    :param sheets: A dict of str sheet names to iterables of rows, the header first.
+
+    :return: An int of how many rows were written, not counting the header rows.
+    """
+
+    # pylint: disable=import-outside-toplevel
+    import openpyxl
+
+    workbook = openpyxl.Workbook(write_only=True)
+    row_count = 0
+    for sheet_name, rows in sheets.items():
+        worksheet = workbook.create_sheet(sheet_name)
+        sheet_rows = 0
+        for row in rows:
+            worksheet.append(list(row))
+            sheet_rows += 1
+        row_count += max(sheet_rows - 1, 0)
+
+    temp_path = f"{target_path}.{os.getpid()}.tmp"
+    try:
+        workbook.save(temp_path)
+        os.replace(temp_path, target_path)
+    except Exception:
+        if OSPATH.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return row_count
+
+def write_xls(target_path: str, sheets: dict):
+    """
+    Write the sheets to a .xls workbook with xlwt. A .xls sheet can't have
+    more than 65536 rows.
+
+    :param target_path: A str filepath to write to.
+    :param sheets: A dict of str sheet names to iterables of rows, the header first.
+
+    :return: An int of how many rows were written, not counting the header rows.
+    """
+
+    # pylint: disable=import-outside-toplevel
+    import xlwt
+
+    workbook = xlwt.Workbook()
+    row_count = 0
+    for sheet_name, rows in sheets.items():
+        worksheet = workbook.add_sheet(sheet_name)
+        sheet_rows = 0
+        for row in rows:
+            for column, value in enumerate(row):
+                if value is not None:
+                    worksheet.write(sheet_rows, column, value)
+            sheet_rows += 1
+        row_count += max(sheet_rows - 1, 0)
+
+    temp_path = f"{target_path}.{os.getpid()}.tmp"
+    try:
+        workbook.save(temp_path)
+        os.replace(temp_path, target_path)
+    except Exception:
+        if OSPATH.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return row_count
+
+DATATABLE_WRITERS = {
+    "xls": write_xls,
+    "xlsx": write_xlsx,
+    "csv": write_csv_folder,
+    "json": write_json,
+    "ndjson": write_ndjson
+}
+
+def get_target_format(target_path: str):
+    """
+    Return the format to write a datatable in from the path it is written to.
+    A path without a known file extension is a folder of .csv files.
+
+    :param target_path: A str filepath to write the datatable to.
+
+    :return: A str of one of WRITABLE_FORMATS.
+    """
+
+    if OSPATH.splitext(target_path)[1].lower() in (".xls", ".xlsx", ".json", ".ndjson",
+                                                     ".jsonl"):
+        return get_datatable_format(target_path)
+    return "csv"
+
+def write_datatable(target_path: str, sheets: dict, target_format: str = None):
+    """
+    Write the sheets of a datatable in one of WRITABLE_FORMATS.
+
+    :param target_path: A str filepath to write the datatable to, a folder for CSV.
+    :param sheets: A dict of str sheet names to iterables of rows, the header first.
+    :param target_format: An optional str of the format to write. Defaults to the \
+format of target_path, see get_target_format().
+
+    :return: An int of how many rows were written, not counting the header rows.
+    """
+
+    if target_format is None:
+        target_format = get_target_format(target_path)
+    if target_format not in DATATABLE_WRITERS:
+        raise ValueError(f"Invalid datatable format: {target_format}")
+    return DATATABLE_WRITERS[target_format](target_path, sheets)
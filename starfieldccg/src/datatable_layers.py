@@ -0,0 +1,397 @@
+"""
+    A module to read an ordered list of datatables as one catalog.
+
+    The first datatable is the base and every datatable after it is an
+    overlay, e.g. a workbook of modded items or new DLC. An overlay only
+    needs the sheets it adds to, and its items replace the items of the
+    layers under it that have the same lowercase key. Each layer is read
+    (and snapshotted) on its own, so editing an overlay doesn't mean
+    reading the base datatable again.
+"""
+import copy
+from collections import ChainMap
+from os import path as OSPATH
+from .data_file_reader import DataFileReader
+from .item_indexes import IndexedItemDict
+from .load_timings import mark_phase
+from .reader_backends import XlrdBackend, get_datatable_backend
+
+class DatatableLayer(DataFileReader):
+    """
+        Reads an overlay datatable, which can leave out any of the sheets.
+
+        A left out sheet reads as a sheet without rows. The spacesuit sets
+        of an overlay can use the spacesuits, helmets, and packs of the
+        layers under it.
+    """
+
+    def __init__(self, file_path: str, lower_layers: list, use_snapshot: bool = False,
+                 rebuild_snapshot: bool = False, backend: str = "auto",
+                 load_in_background: bool = False, write_snapshot: bool = True):
+        """
+        Create a DatatableLayer object.
+
+        :param file_path: The str filepath to the overlay datatable.
+        :param lower_layers: A list of the DataFileReader objects of the layers \
+under this one, the base first.
+        :param use_snapshot: A bool of whether to load from and save to a snapshot file.
+        :param rebuild_snapshot: A bool to ignore any existing snapshot and write a new one.
+        :param backend: A str of the reader backend to build the item dicts with.
+        :param load_in_background: A bool of whether to start loading every item dict \
+on a background thread.
+        :param write_snapshot: A bool of whether a missing or out of date snapshot \
+is built and saved.
+        """
+
+        # pylint: disable=too-many-positional-arguments
+        # pylint: disable=too-many-arguments
+
+        self.lower_layers = list(lower_layers)
+        super().__init__(file_path, use_snapshot=use_snapshot,
+                         rebuild_snapshot=rebuild_snapshot, backend=backend,
+                         load_in_background=load_in_background,
+                         write_snapshot=write_snapshot)
+
+    def __repr__(self):
+        """
+        Return a str representation of the DatatableLayer object.
+
+        :return: A str version of DatatableLayer.
+        """
+
+        return f"DatatableLayer(file_path='{self.file_path}', sheet_names={self.sheet_names})"
+
+    def get_sheet_names(self):
+        """
+        Return the names of the sheets the overlay has, without parsing them.
+
+        :return: A list of str sheet names.
+        """
+
+        backend = get_datatable_backend(self.file_path)
+        try:
+            workbook_sheets = backend.get_sheet_names()
+        finally:
+            backend.close()
+        return [sheet for sheet in self.SHEET_NAMES if sheet in workbook_sheets]
+
+    def get_sheet_columns(self, sheet_name: str):
+        """
+        Return the used columns of a sheet, or empty columns if the overlay doesn't have it.
+
+        :param sheet_name: A str of the name of the sheet.
+
+        :return: A list of column lists.
+        """
+
+        if sheet_name not in self.sheet_names:
+            return [[] for _ in range(self.SHEET_COLUMN_COUNTS[sheet_name])]
+        return super().get_sheet_columns(sheet_name)
+
+    def read_changed_sheet(self, backend: XlrdBackend, sheet_name: str):
+        """
+        Return the used columns of a sheet from the file reload() opened, or empty
+        columns if the overlay doesn't have it.
+
+        :param backend: An XlrdBackend with the new file open.
+        :param sheet_name: A str of the name of the sheet.
+
+        :return: A list of column lists.
+        """
+
+        if sheet_name not in self.sheet_names:
+            return [[] for _ in range(self.SHEET_COLUMN_COUNTS[sheet_name])]
+        return super().read_changed_sheet(backend, sheet_name)
+
+    def get_dependency_dicts(self, catalog_name: str, new_catalog: dict = None):
+        """
+        Return the item dicts an item dict is built from, looking in the layers
+        under this one for anything this layer doesn't have.
+
+        :param catalog_name: A str of the item dict's attribute name, e.g. "spacesuit_set_data".
+        :param new_catalog: An optional dict of item dicts to use instead of the loaded ones.
+
+        :return: A list of ChainMaps in CATALOG_SOURCES order.
+        """
+
+        own_dicts = super().get_dependency_dicts(catalog_name, new_catalog)
+        return [ChainMap(own_dict, *[layer.wait_for_catalog(dependency)
+                                     for layer in reversed(self.lower_layers)])
+                for dependency, own_dict in zip(self.CATALOG_SOURCES[catalog_name][1],
+                                                own_dicts)]
+
+class LayeredDataFileReader(DataFileReader):
+    """
+        Reads an ordered list of datatables as a single catalog.
+
+        Each item dict is merged from the same item dict of every layer in
+        order, so a later layer's item replaces an earlier layer's item with
+        the same key (keeping its place in the menus) and adds the rest.
+        Every replaced key is listed in conflicts. The spacesuit sets are
+        linked to the merged spacesuits, helmets, and packs, so an overlay
+        that replaces a helmet changes the sets of the base too.
+
+        datasheets and the other DataFrame methods read the base datatable.
+    """
+
+    def __init__(self, file_paths: list, use_snapshot: bool = False,
+                 rebuild_snapshot: bool = False, backend: str = "auto",
+                 record_timings: bool = False, load_in_background: bool = False,
+                 write_snapshot: bool = True):
+        """
+        Create a LayeredDataFileReader object.
+
+        :param file_paths: A list of str filepaths to the datatables, the base first.
+        :param use_snapshot: A bool of whether each layer loads from and saves to \
+its own snapshot file.
+        :param rebuild_snapshot: A bool to ignore any existing snapshots and write new ones.
+        :param backend: A str of the reader backend to build the item dicts with.
+        :param record_timings: A bool of whether to time the phases of every merged \
+item dict for load_report(). The layers' reading and building is counted in the \
+merged sheet and the merge itself is counted as its join.
+        :param load_in_background: A bool of whether every layer and the merged \
+item dicts start loading on background threads. The merge waits for each layer's \
+item dict with wait_for_catalog().
+        :param write_snapshot: A bool of whether a layer's missing or out of date \
+snapshot is built and saved.
+        """
+
+        # pylint: disable=too-many-positional-arguments
+        # pylint: disable=too-many-arguments
+
+        if len(file_paths) == 0:
+            raise ValueError("At least one datatable is needed")
+
+        self.layers = [DataFileReader(file_paths[0], use_snapshot=use_snapshot,
+                                      rebuild_snapshot=rebuild_snapshot, backend=backend,
+                                      load_in_background=load_in_background,
+                                      write_snapshot=write_snapshot)]
+        for file_path in file_paths[1:]:
+            self.layers.append(DatatableLayer(file_path, self.layers, use_snapshot=use_snapshot,
+                                              rebuild_snapshot=rebuild_snapshot,
+                                              backend=backend,
+                                              load_in_background=load_in_background,
+                                              write_snapshot=write_snapshot))
+        self.conflicts = {}
+        super().__init__(file_paths[0], backend=backend, record_timings=record_timings,
+                         load_in_background=load_in_background)
+
+    def __repr__(self):
+        """
+        Return a str representation of the LayeredDataFileReader object.
+
+        :return: A str version of LayeredDataFileReader.
+        """
+
+        return f"LayeredDataFileReader(file_paths={[layer.file_path for layer in self.layers]})"
+
+    def merge_catalog(self, catalog_name: str, new_catalog: dict = None):
+        """
+        Merge an item dict from every layer in a single pass over their items.
+
+        :param catalog_name: A str of the item dict's attribute name, e.g. "ammo_data".
+        :param new_catalog: An optional dict of merged item dicts to link the \
+spacesuit sets to instead of the loaded ones.
+
+        :return: A tuple of the merged dict and a list of (str item key, str \
+overridden datatable path, str overriding datatable path) tuples.
+        """
+
+        layer_dicts = [layer.wait_for_catalog(catalog_name) for layer in self.layers]
+        mark_phase("join")
+
+        merged_dict = {}
+        item_layers = {}
+        conflicts = []
+        for layer, layer_dict in zip(self.layers, layer_dicts):
+            for item_key, item in layer_dict.items():
+                if item_key in item_layers:
+                    conflicts.append((item_key, item_layers[item_key].file_path,
+                                      layer.file_path))
+                item_layers[item_key] = layer
+                merged_dict[item_key] = item
+
+        if catalog_name == "spacesuit_set_data":
+            merged_dict = self.link_spacesuit_sets(
+                merged_dict, *self.get_dependency_dicts(catalog_name, new_catalog))
+
+        return (merged_dict, conflicts)
+
+    @staticmethod
+    def link_spacesuit_sets(spacesuit_sets: dict, spacesuits: dict, helmets: dict, packs: dict):
+        """
+        Point every spacesuit set at the merged part with the same key as its part.
+
+        The layers' sets are copied before they are changed. A part that isn't
+        in the merged dicts is left as it is.
+
+        :param spacesuit_sets: A dict of merged spacesuit sets.
+        :param spacesuits: A dict of the merged SpacesuitItem objects.
+        :param helmets: A dict of the merged HelmetItem objects.
+        :param packs: A dict of the merged PackItem objects.
+
+        :return: A dict of lowercase names to SpacesuitSetItem objects.
+        """
+
+        part_dicts = (("spacesuit", spacesuits), ("helmet", helmets), ("pack", packs))
+        linked_sets = {}
+        for set_key, spacesuit_set in spacesuit_sets.items():
+            linked_parts = {}
+            for part_name, part_dict in part_dicts:
+                part = getattr(spacesuit_set, part_name)
+                if part is not None:
+                    merged_part = part_dict.get(part.get_name().lower(), part)
+                    if merged_part is not part:
+                        linked_parts[part_name] = merged_part
+            if len(linked_parts) > 0:
+                spacesuit_set = copy.copy(spacesuit_set)
+                for part_name, part in linked_parts.items():
+                    setattr(spacesuit_set, part_name, part)
+                spacesuit_set.set_id()
+            linked_sets[set_key] = spacesuit_set
+
+        return linked_sets
+
+    def build_catalog_data(self, catalog_name: str):
+        """
+        Merge one item dict from the layers.
+
+        :param catalog_name: A str of the item dict's attribute name, e.g. "ammo_data".
+
+        :return: A dict with the merged items.
+        """
+
+        if catalog_name not in self.CATALOG_SOURCES:
+            raise ValueError(f"Unknown catalog name: {catalog_name}")
+        data_dict, self.conflicts[catalog_name] = self.merge_catalog(catalog_name)
+        return data_dict
+
+    def get_conflicts(self):
+        """
+        Return every item key that a layer replaced, merging any item dict that
+        hasn't been merged yet.
+
+        :return: A list of (str catalog name, str item key, str overridden datatable \
+path, str overriding datatable path) tuples.
+        """
+
+        self.build_catalog()
+        return [(catalog_name,) + conflict for catalog_name in self.CATALOG_NAMES
+                for conflict in self.conflicts.get(catalog_name, [])]
+
+    def format_conflict_report(self):
+        """
+        Return the replaced item keys as printable lines.
+
+        :return: A str with a line for each replaced item.
+        """
+
+        conflicts = self.get_conflicts()
+        if len(conflicts) == 0:
+            return "No items were overridden."
+        lines = [f"{len(conflicts)} items were overridden:"]
+        for catalog_name, item_key, old_path, new_path in conflicts:
+            lines.append(f"{catalog_name:<26} {item_key:<32} {OSPATH.basename(old_path)} -> "
+                         f"{OSPATH.basename(new_path)}")
+        return "\n".join(lines)
+
+    def load_parallel(self, max_workers: int = None, executor_type: str = "auto"):
+        """
+        Read the unloaded sheets of every layer in parallel, then merge the item dicts.
+
+        :param max_workers: An int of how many workers to use.
+        :param executor_type: A str of "process", "thread", or "auto".
+
+        :return: A dict of sheet names to dicts with the "parse" and "build" seconds \
+added up over the layers.
+        """
+
+        for layer in self.layers:
+            for sheet_name, timings in layer.load_parallel(max_workers, executor_type).items():
+                sheet_timings = self.sheet_timings.setdefault(sheet_name, {})
+                for phase, seconds in timings.items():
+                    sheet_timings[phase] = sheet_timings.get(phase, 0.0) + seconds
+        for name in self.CATALOG_NAMES:
+            self.load_catalog(name)
+
+        return self.sheet_timings
+
+    def reload(self):
+        """
+        Reload every layer and merge the item dicts again whose sheets changed in
+        any layer, swapping them in all at once.
+
+        :return: A list of the str names of the sheets that changed in any layer.
+        """
+
+        changed_sheets = []
+        for layer in self.layers:
+            for sheet_name in layer.reload():
+                if sheet_name not in changed_sheets:
+                    changed_sheets.append(sheet_name)
+
+        with self.load_lock:
+            new_catalog = {}
+            new_conflicts = {}
+            for name in self.get_stale_catalog_names(changed_sheets):
+                data_dict, new_conflicts[name] = self.merge_catalog(name, new_catalog)
+                new_catalog[name] = self.make_indexed_dict(name, data_dict)
+            self.swap_catalog(new_catalog)
+            self.conflicts.update(new_conflicts)
+
+        return changed_sheets
+
+    def make_indexed_dict(self, catalog_name: str, data_dict: dict):
+        """
+        Return a merged item dict as an IndexedItemDict with its secondary indexes built.
+
+        :param catalog_name: A str of the item dict's attribute name.
+        :param data_dict: A dict with the merged items.
+
+        :return: An IndexedItemDict.
+        """
+
+        data_dict = IndexedItemDict(data_dict)
+        data_dict.build_indexes(self.SECONDARY_INDEXES.get(catalog_name, ()))
+        return data_dict
+
+    def record_sheet_hashes(self):
+        """
+        Record the sheet hashes of every layer as they are now.
+        """
+
+        for layer in self.layers:
+            layer.record_sheet_hashes()
+
+    def get_file_state(self):
+        """
+        Return the size and modification time of every layer's datatable.
+
+        :return: A tuple with a (int size, int mtime in nanoseconds) tuple or None \
+for each layer.
+        """
+
+        return tuple(layer.get_file_state() for layer in self.layers)
+
+    def iter_items(self, sheet_name: str, chunk_size: int = None):
+        """
+        Streaming isn't supported across layers, since an item can't be yielded
+        before every layer has been checked for a replacement.
+
+        :param sheet_name: A str of the name of the sheet to read.
+        :param chunk_size: An optional int of how many rows to build at a time.
+        """
+
+        raise ValueError("Stream the items of each layer's reader in layers instead")
+
+    def close(self):
+        """
+        Stop the background loads and close any workbooks the layers' reader
+        backends left open.
+        """
+
+        # The merge waits for the layers, so it is stopped before them.
+        self.stop_background_load()
+        for layer in self.layers:
+            layer.close()
+        super().close()
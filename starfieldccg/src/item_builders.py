@@ -0,0 +1,318 @@
+"""
+    A module that builds item dicts from whole columns of sheet data.
+
+    Every sheet is handled as a list of columns, each a list of plain python
+    values. Cleaning (stripping, lowercasing, id and flag conversion) is done
+    a whole column at a time and the cleaned columns are fed straight into the
+    item classes, so no per row pandas objects are created.
+
+    Ids are normalized a whole column at a time by normalize_ids() and the
+    items are told so, instead of each item normalizing its own id.
+
+    Each builder calls mark_phase() as it moves from normalizing the columns
+    to building the items (and for the spacesuit sets, to joining them to
+    their parts), so a DataFileReader that records timings can split them up.
+"""
+from itertools import repeat
+from .data_objects import AmmoItem, SpacesuitItem, PackItem, HelmetItem
+from .data_objects import SpacesuitSetItem, WeaponItem, ResourceItem, StatusModType
+from .data_objects import QualityModType, normalize_ids
+from .item_indexes import IndexedItemDict
+from .load_timings import mark_phase
+
+# Cell text that pandas reads as a missing value by default. The same strings
+# are treated as missing here so every reader backend builds the same items.
+MISSING_TEXT_VALUES = frozenset([
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND",
+    "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"
+])
+
+def is_missing(value):
+    """
+    Return whether a cell value counts as empty.
+
+    :param value: A cell value.
+
+    :return: A bool of whether the value is missing.
+    """
+
+    if value is None:
+        return True
+    if isinstance(value, float):
+        # NaN is the only value that isn't equal to itself.
+        return value != value # pylint: disable=comparison-with-itself
+    if isinstance(value, str):
+        return value.strip() in MISSING_TEXT_VALUES
+    return False
+
+def clean_text_column(column: list):
+    """
+    Strip every value in a column, turning missing values into None.
+
+    :param column: A list of cell values.
+
+    :return: A list of str values or None.
+    """
+
+    return [None if is_missing(value) else str(value).strip() for value in column]
+
+def clean_id_column(column: list):
+    """
+    Turn every value in a column into a stripped id str. Whole numbers that
+    were stored as numbers lose the ".0" a float would print with.
+
+    :param column: A list of cell values.
+
+    :return: A list of str ids.
+    """
+
+    return [str(int(value)) if isinstance(value, float) and value.is_integer()
+            else str(value).strip() for value in column]
+
+def clean_flag_column(column: list):
+    """
+    Turn every value in a column into a bool. "TRUE"/"FALSE" text is read
+    as the matching bool and missing values are False.
+
+    :param column: A list of cell values.
+
+    :return: A list of bools.
+    """
+
+    return [value.strip().upper() == "TRUE" if isinstance(value, str)
+            else (not is_missing(value) and bool(value)) for value in column]
+
+def clean_slot_column(column: list):
+    """
+    Turn every value in a column into an int, including numbers stored as text.
+
+    :param column: A list of cell values.
+
+    :return: A list of ints.
+    """
+
+    return [int(float(value)) if isinstance(value, str) else int(value) for value in column]
+
+def drop_unnamed_rows(columns: list):
+    """
+    Remove the rows that have no name in the first column, like blank rows.
+
+    :param columns: A list of column lists.
+
+    :return: A list of column lists with only the named rows.
+    """
+
+    names = columns[0]
+    keep_rows = [row for row, name in enumerate(names) if not is_missing(name)]
+    if len(keep_rows) == len(names):
+        return columns
+
+    return [[column[row] for row in keep_rows] for column in columns]
+
+def make_item_dict(names: list, items):
+    """
+    Return a dict of the items keyed by their lowercase names.
+
+    :param names: A list of the str item names.
+    :param items: An iterable of the items in the same order as the names.
+
+    :return: An IndexedItemDict of lowercase names to items.
+    """
+
+    return IndexedItemDict(zip([name.lower() for name in names], items))
+
+def build_name_id_items(item_class, columns: list, normalize: bool = True):
+    """
+    Build a dict of an item class that takes a name and an id.
+
+    :param item_class: The class to build, e.g. AmmoItem.
+    :param columns: A list of the name and id column lists.
+    :param normalize: A bool of whether the class normalizes its ids. When it does \
+the ids are normalized here and the items are told so.
+
+    :return: A dict of lowercase names to items.
+    """
+
+    mark_phase("normalize", len(columns[0]))
+    columns = drop_unnamed_rows(columns)
+    names = clean_text_column(columns[0])
+    ids = clean_id_column(columns[1])
+
+    if normalize is not True:
+        mark_phase("build")
+        return make_item_dict(names, map(item_class, names, ids))
+
+    ids = normalize_ids(ids)
+    mark_phase("build")
+    return make_item_dict(names, map(item_class, names, ids, repeat(True)))
+
+def build_name_id_dlc_items(item_class, columns: list):
+    """
+    Build a dict of an item class that takes a name, an id, and a DLC flag.
+
+    :param item_class: The class to build, e.g. SpacesuitItem.
+    :param columns: A list of the name, id, and DLC flag column lists.
+
+    :return: A dict of lowercase names to items.
+    """
+
+    mark_phase("normalize", len(columns[0]))
+    columns = drop_unnamed_rows(columns)
+    names = clean_text_column(columns[0])
+    ids = clean_id_column(columns[1])
+    dlc_flags = clean_flag_column(columns[2])
+    ids = normalize_ids(ids, dlc_flags)
+
+    mark_phase("build")
+    return make_item_dict(names, map(item_class, names, ids, dlc_flags, repeat(True)))
+
+def build_ammo_items(columns: list):
+    """
+    Build the Ammo sheet's items.
+
+    :param columns: A list of the Ammo sheet's column lists.
+
+    :return: A dict of lowercase names to AmmoItem objects.
+    """
+
+    return build_name_id_items(AmmoItem, columns)
+
+def build_resource_items(columns: list):
+    """
+    Build the Resources sheet's items.
+
+    :param columns: A list of the Resources sheet's column lists.
+
+    :return: A dict of lowercase names to ResourceItem objects.
+    """
+
+    return build_name_id_items(ResourceItem, columns)
+
+def build_quality_mod_items(columns: list):
+    """
+    Build a quality mod sheet's items.
+
+    :param columns: A list of the quality mod sheet's column lists.
+
+    :return: A dict of lowercase names to QualityModType objects.
+    """
+
+    return build_name_id_items(QualityModType, columns, normalize=False)
+
+def build_spacesuit_items(columns: list):
+    """
+    Build the Spacesuits sheet's items.
+
+    :param columns: A list of the Spacesuits sheet's column lists.
+
+    :return: A dict of lowercase names to SpacesuitItem objects.
+    """
+
+    return build_name_id_dlc_items(SpacesuitItem, columns)
+
+def build_helmet_items(columns: list):
+    """
+    Build the Helmets sheet's items.
+
+    :param columns: A list of the Helmets sheet's column lists.
+
+    :return: A dict of lowercase names to HelmetItem objects.
+    """
+
+    return build_name_id_dlc_items(HelmetItem, columns)
+
+def build_pack_items(columns: list):
+    """
+    Build the Packs sheet's items.
+
+    :param columns: A list of the Packs sheet's column lists.
+
+    :return: A dict of lowercase names to PackItem objects.
+    """
+
+    return build_name_id_dlc_items(PackItem, columns)
+
+def build_weapon_items(columns: list):
+    """
+    Build the Weapons sheet's items.
+
+    :param columns: A list of the Weapons sheet's column lists.
+
+    :return: A dict of lowercase names to WeaponItem objects.
+    """
+
+    mark_phase("normalize", len(columns[0]))
+    columns = drop_unnamed_rows(columns)
+    names = clean_text_column(columns[0])
+    ids = clean_id_column(columns[1])
+    dlc_flags = clean_flag_column(columns[2])
+    unique_flags = clean_flag_column(columns[3])
+    weapon_types = [str(value).strip() for value in columns[4]]
+    ids = normalize_ids(ids, dlc_flags)
+
+    mark_phase("build")
+    return make_item_dict(names, map(WeaponItem, names, ids, dlc_flags,
+                                     unique_flags, weapon_types, repeat(True)))
+
+def build_status_mod_items(columns: list):
+    """
+    Build a status mod sheet's items.
+
+    :param columns: A list of the status mod sheet's column lists.
+
+    :return: A dict of lowercase names to StatusModType objects.
+    """
+
+    mark_phase("normalize", len(columns[0]))
+    columns = drop_unnamed_rows(columns)
+    names = clean_text_column(columns[0])
+    ids = clean_id_column(columns[1])
+    descriptions = [str(value).strip() for value in columns[2]]
+    slots = clean_slot_column(columns[3])
+
+    mark_phase("build")
+    return make_item_dict(names, map(StatusModType, names, ids, descriptions, slots))
+
+def build_spacesuit_set_items(columns: list, spacesuits: dict, helmets: dict, packs: dict):
+    """
+    Build the Spacesuit_Sets sheet's items and link them to their parts.
+
+    :param columns: A list of the Spacesuit_Sets sheet's column lists.
+    :param spacesuits: A dict with all of the SpacesuitItem objects in it.
+    :param helmets: A dict with all of the HelmetItem objects in it.
+    :param packs: A dict with all of the PackItem objects in it.
+
+    :return: A dict of lowercase names to SpacesuitSetItem objects.
+    """
+
+    # pylint: disable=too-many-locals
+
+    mark_phase("normalize", len(columns[0]))
+    columns = drop_unnamed_rows(columns)
+    names = clean_text_column(columns[0])
+    spacesuit_keys = [None if name is None else name.lower()
+                      for name in clean_text_column(columns[1])]
+    helmet_keys = [None if name is None else name.lower()
+                   for name in clean_text_column(columns[2])]
+    pack_keys = [None if name is None else name.lower()
+                 for name in clean_text_column(columns[3])]
+    factions = [None if name is None else name.lower()
+                for name in clean_text_column(columns[4])]
+    dlc_flags = clean_flag_column(columns[5])
+
+    mark_phase("build")
+    output_list = list(map(SpacesuitSetItem, names, dlc_flags))
+
+    mark_phase("join")
+    for spacesuit_set, spacesuit_key, helmet_key, pack_key, faction in zip(
+            output_list, spacesuit_keys, helmet_keys, pack_keys, factions):
+        if spacesuit_key is not None:
+            spacesuit_set.set_spacesuit(spacesuits[spacesuit_key])
+        if helmet_key is not None:
+            spacesuit_set.set_helmet(helmets[helmet_key])
+        if pack_key is not None:
+            spacesuit_set.set_pack(packs[pack_key])
+        if faction is not None:
+            spacesuit_set.set_faction(faction)
+
+    return make_item_dict(names, output_list)
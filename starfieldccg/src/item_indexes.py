@@ -0,0 +1,151 @@
+"""
+    A module containing the item dict that keeps secondary indexes
+    of its items, so filtered sets of items don't have to be rebuilt
+    by scanning every item each time they are asked for.
+"""
+from types import MappingProxyType
+
+# Returned for an index value that no item has.
+EMPTY_VIEW = MappingProxyType({})
+
+class IndexedItemDict(dict):
+    """
+        A dict of lowercase item names to items that can group its items by
+        the value of one of their attributes.
+
+        Each index is built with a single pass over the items and kept until
+        the dict is changed. The groups are returned as read only views.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """
+        Create an IndexedItemDict object. It takes the same arguments as dict.
+        """
+
+        super().__init__(*args, **kwargs)
+        self.indexes = {}
+
+    def __reduce__(self):
+        """
+        Pickle only the items. The indexes are rebuilt when they are next used.
+
+        :return: A tuple of the class and the arguments to rebuild it with.
+        """
+
+        return (type(self), (dict(self),))
+
+    def build_indexes(self, attributes):
+        """
+        Build the indexes for the given attributes if they haven't been built yet.
+
+        :param attributes: An iterable of str attribute names, e.g. ["unique", "weapon_type"].
+        """
+
+        for attribute in attributes:
+            self.get_index(attribute)
+
+    def get_index(self, attribute: str):
+        """
+        Return the index for an attribute, building it the first time.
+
+        :param attribute: A str of the item attribute to group by, e.g. "mod_slot".
+
+        :return: A read only dict of attribute values to read only dicts of the \
+items with that value.
+        """
+
+        index = self.indexes.get(attribute)
+        if index is None:
+            groups = {}
+            for key, item in self.items():
+                groups.setdefault(getattr(item, attribute), {})[key] = item
+            index = MappingProxyType({value: MappingProxyType(group)
+                                      for value, group in groups.items()})
+            self.indexes[attribute] = index
+
+        return index
+
+    def get_indexed(self, attribute: str, value):
+        """
+        Return the items whose attribute has a value.
+
+        :param attribute: A str of the item attribute to filter by, e.g. "dlc".
+        :param value: The value the attribute has to have.
+
+        :return: A read only dict of lowercase item names to items.
+        """
+
+        return self.get_index(attribute).get(value, EMPTY_VIEW)
+
+    def clear_indexes(self):
+        """
+        Forget every index so they are rebuilt from the current items.
+        """
+
+        self.indexes.clear()
+
+    # Every method that changes the items drops the indexes first.
+
+    def __setitem__(self, key, value):
+        """
+        Set an item and drop the indexes.
+        """
+
+        self.indexes.clear()
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        """
+        Remove an item and drop the indexes.
+        """
+
+        self.indexes.clear()
+        super().__delitem__(key)
+
+    def __ior__(self, other):
+        """
+        Update the items with |= and drop the indexes.
+        """
+
+        self.indexes.clear()
+        return super().__ior__(other)
+
+    def clear(self):
+        """
+        Remove every item and drop the indexes.
+        """
+
+        self.indexes.clear()
+        super().clear()
+
+    def pop(self, *args):
+        """
+        Remove and return an item and drop the indexes.
+        """
+
+        self.indexes.clear()
+        return super().pop(*args)
+
+    def popitem(self):
+        """
+        Remove and return the last item and drop the indexes.
+        """
+
+        self.indexes.clear()
+        return super().popitem()
+
+    def setdefault(self, key, default=None):
+        """
+        Return an item, adding it if it is missing, and drop the indexes.
+        """
+
+        self.indexes.clear()
+        return super().setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        """
+        Update the items and drop the indexes.
+        """
+
+        self.indexes.clear()
+        super().update(*args, **kwargs)
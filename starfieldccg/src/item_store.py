@@ -0,0 +1,153 @@
+"""
+    A module containing a columnar copy of an item dict.
+
+    The items' names, ids, and filterable attributes are kept in NumPy
+    arrays so several filters can be combined as boolean masks without
+    touching the item objects. Only the rows a mask selects are turned
+    back into the item objects.
+"""
+import numpy as np
+from .item_indexes import IndexedItemDict
+
+class ItemStore():
+    """
+        Holds an item dict as NumPy columns.
+
+        Bool attributes (dlc, unique) are stored as bool arrays, mod_slot as
+        an int array, and text attributes (weapon_type, faction) as an int
+        code per row plus the list of the distinct values the codes point to.
+    """
+
+    BOOL_ATTRIBUTES = ("dlc", "unique")
+    INT_ATTRIBUTES = ("mod_slot",)
+    CATEGORY_ATTRIBUTES = ("weapon_type", "faction")
+
+    def __init__(self, items: dict):
+        """
+        Create an ItemStore object from an item dict.
+
+        :param items: A dict of lowercase item names to items, e.g. weapon_data.
+        """
+
+        self.keys = np.array(list(items), dtype=object)
+        self.items = list(items.values())
+        self.names = np.array([item.get_name() for item in self.items], dtype=object)
+        self.ids = np.array([item.get_id() for item in self.items], dtype=object)
+        self.columns = {}
+        self.categories = {}
+
+        first_item = self.items[0] if len(self.items) > 0 else None
+        for attribute in self.BOOL_ATTRIBUTES:
+            if hasattr(first_item, attribute):
+                self.columns[attribute] = np.fromiter(
+                    (getattr(item, attribute) is True for item in self.items),
+                    dtype=bool, count=len(self.items))
+        for attribute in self.INT_ATTRIBUTES:
+            if hasattr(first_item, attribute):
+                self.columns[attribute] = np.fromiter(
+                    (getattr(item, attribute) for item in self.items),
+                    dtype=np.int16, count=len(self.items))
+        for attribute in self.CATEGORY_ATTRIBUTES:
+            if hasattr(first_item, attribute):
+                codes = {}
+                self.columns[attribute] = np.fromiter(
+                    (codes.setdefault(getattr(item, attribute), len(codes))
+                     for item in self.items), dtype=np.int32, count=len(self.items))
+                self.categories[attribute] = codes
+
+    def __repr__(self):
+        """
+        Return a str representation of the ItemStore object.
+
+        :return: A str version of ItemStore.
+        """
+
+        return f"ItemStore(rows={len(self)}, columns={list(self.columns)})"
+
+    def __len__(self):
+        """
+        Return the number of rows.
+
+        :return: An int of the number of items.
+        """
+
+        return len(self.items)
+
+    def get_column(self, attribute: str):
+        """
+        Return the array for a column, with the values of the text columns
+        instead of their codes.
+
+        :param attribute: A str of the column name, e.g. "dlc" or "weapon_type".
+
+        :return: A NumPy array with a value for each row.
+        """
+
+        if attribute not in self.columns:
+            raise ValueError(f"Invalid column: {attribute}")
+        if attribute in self.categories:
+            values = np.array(list(self.categories[attribute]), dtype=object)
+            return values[self.columns[attribute]]
+        return self.columns[attribute]
+
+    def mask(self, **conditions):
+        """
+        Return a boolean mask of the rows that meet every condition.
+
+        Each keyword is a column name and its value is the value the column has
+        to have, or a list, tuple, or set of values it can have. Masks can be
+        combined with &, |, and ~ before being passed to select().
+
+        :return: A NumPy bool array with a value for each row.
+        """
+
+        row_mask = np.ones(len(self), dtype=bool)
+        for attribute, wanted in conditions.items():
+            if attribute not in self.columns:
+                raise ValueError(f"Invalid column: {attribute}")
+            column = self.columns[attribute]
+            if isinstance(wanted, (list, tuple, set, frozenset)):
+                wanted = list(wanted)
+            else:
+                wanted = [wanted]
+            if attribute in self.categories:
+                codes = self.categories[attribute]
+                wanted = [codes[value] for value in wanted if value in codes]
+            if len(wanted) == 1:
+                row_mask &= column == wanted[0]
+            else:
+                row_mask &= np.isin(column, wanted)
+
+        return row_mask
+
+    def select(self, row_mask: np.ndarray = None, **conditions):
+        """
+        Return the items of the rows a mask selects, as an item dict.
+
+        :param row_mask: An optional NumPy bool array from mask(). It is combined \
+with any keyword conditions.
+
+        :return: An IndexedItemDict of lowercase item names to items.
+        """
+
+        if row_mask is None or len(conditions) > 0:
+            condition_mask = self.mask(**conditions)
+            row_mask = condition_mask if row_mask is None else row_mask & condition_mask
+
+        rows = np.flatnonzero(row_mask).tolist()
+        items = self.items
+        return IndexedItemDict(zip(self.keys[rows].tolist(), [items[row] for row in rows]))
+
+    def count(self, row_mask: np.ndarray = None, **conditions):
+        """
+        Return how many rows a mask and the keyword conditions select.
+
+        :param row_mask: An optional NumPy bool array from mask().
+
+        :return: An int of the number of selected rows.
+        """
+
+        if row_mask is None or len(conditions) > 0:
+            condition_mask = self.mask(**conditions)
+            row_mask = condition_mask if row_mask is None else row_mask & condition_mask
+        return int(np.count_nonzero(row_mask))
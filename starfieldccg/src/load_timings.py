@@ -0,0 +1,200 @@
+"""
+    A module to record how long each phase of loading each sheet takes.
+
+    A DataFileReader created with record_timings=True starts a PhaseClock
+    for every item dict it builds. The item_builders functions call
+    mark_phase() when they move from one phase to the next. The clock is
+    kept per thread, so when no clock is running mark_phase() only looks up
+    one attribute and returns.
+"""
+import threading
+import time
+
+# The phases of loading a sheet, in the order they happen.
+LOAD_PHASES = ("read", "normalize", "build", "join", "index")
+
+# The PhaseClock that is running on each thread, if any.
+running_clocks = threading.local()
+
+def mark_phase(phase: str, rows: int = None):
+    """
+    Tell the PhaseClock running on this thread that the next phase has started.
+    Does nothing when no clock is running.
+
+    :param phase: A str of the phase that is starting, one of LOAD_PHASES.
+    :param rows: An optional int of how many rows the sheet has.
+    """
+
+    clock = getattr(running_clocks, "clock", None)
+    if clock is not None:
+        clock.mark(phase, rows)
+
+class LoadTimings():
+    """
+        The time each phase took and the row and item counts for every sheet
+        that was loaded.
+    """
+
+    def __init__(self):
+        """
+        Create an empty LoadTimings object.
+        """
+
+        self.sheets = {}
+        self.lock = threading.Lock()
+
+    def __repr__(self):
+        """
+        Return a str representation of the LoadTimings object.
+
+        :return: A str version of LoadTimings.
+        """
+
+        return f"LoadTimings(sheets={list(self.sheets)})"
+
+    def get_sheet(self, sheet_name: str):
+        """
+        Return the record of a sheet, creating it the first time.
+
+        :param sheet_name: A str of the sheet name.
+
+        :return: A dict with the seconds of each phase and the "rows" and "items" counts.
+        """
+
+        with self.lock:
+            if sheet_name not in self.sheets:
+                sheet = dict.fromkeys(LOAD_PHASES, 0.0)
+                sheet.update({"rows": None, "items": None})
+                self.sheets[sheet_name] = sheet
+            return self.sheets[sheet_name]
+
+    def add_time(self, sheet_name: str, phase: str, seconds: float):
+        """
+        Add time to a phase of a sheet.
+
+        :param sheet_name: A str of the sheet name.
+        :param phase: A str of the phase, one of LOAD_PHASES.
+        :param seconds: A float of the seconds to add.
+        """
+
+        if phase not in LOAD_PHASES:
+            raise ValueError(f"Unknown load phase: {phase}")
+        sheet = self.get_sheet(sheet_name)
+        with self.lock:
+            sheet[phase] += seconds
+
+    def start_clock(self, sheet_name: str):
+        """
+        Start a PhaseClock for a sheet on this thread, in the "read" phase.
+
+        :param sheet_name: A str of the sheet name.
+
+        :return: The running PhaseClock.
+        """
+
+        return PhaseClock(self, sheet_name).start()
+
+    def to_dict(self):
+        """
+        Return the timings as plain values.
+
+        :return: A dict with a "sheets" dict of sheet names to their records, each \
+with a "total" of its phases, and a "totals" dict of each phase summed over the sheets.
+        """
+
+        with self.lock:
+            sheets = {sheet_name: dict(sheet, total=sum(sheet[phase] for phase in LOAD_PHASES))
+                      for sheet_name, sheet in self.sheets.items()}
+        totals = {phase: sum(sheet[phase] for sheet in sheets.values())
+                  for phase in LOAD_PHASES + ("total",)}
+        return {"sheets": sheets, "totals": totals}
+
+    def format(self):
+        """
+        Return the timings as a printable table.
+
+        :return: A str with a line for each sheet and one for the totals.
+        """
+
+        def format_phases(record: dict):
+            return "".join(f"{record[phase] * 1000:>9.1f}ms"
+                           for phase in LOAD_PHASES + ("total",))
+
+        report = self.to_dict()
+        lines = [f"{'Sheet':<22}{'rows':>8}{'items':>8}"
+                 + "".join(f"{phase:>11}" for phase in LOAD_PHASES + ("total",))]
+        for sheet_name, sheet in report["sheets"].items():
+            lines.append(f"{sheet_name:<22}"
+                         + "".join(f"{'-' if sheet[count] is None else sheet[count]:>8}"
+                                   for count in ("rows", "items"))
+                         + format_phases(sheet))
+        lines.append(f"{'Total':<38}" + format_phases(report["totals"]))
+        return "\n".join(lines)
+
+class PhaseClock():
+    """
+        Times the phases of loading one sheet on the thread that started it.
+    """
+
+    def __init__(self, timings: LoadTimings, sheet_name: str):
+        """
+        Create a PhaseClock object. It doesn't run until start() is called.
+
+        :param timings: The LoadTimings to add the times to.
+        :param sheet_name: A str of the sheet being loaded.
+        """
+
+        self.timings = timings
+        self.sheet_name = sheet_name
+        self.phase = None
+        self.phase_start = None
+        self.previous_clock = None
+
+    def __repr__(self):
+        """
+        Return a str representation of the PhaseClock object.
+
+        :return: A str version of PhaseClock.
+        """
+
+        return f"PhaseClock(sheet_name='{self.sheet_name}', phase='{self.phase}')"
+
+    def start(self):
+        """
+        Make this the running clock of this thread, in the "read" phase.
+
+        :return: The PhaseClock object.
+        """
+
+        self.previous_clock = getattr(running_clocks, "clock", None)
+        running_clocks.clock = self
+        self.phase = "read"
+        self.phase_start = time.perf_counter()
+        return self
+
+    def mark(self, phase: str, rows: int = None):
+        """
+        End the current phase and start another one.
+
+        :param phase: A str of the phase that is starting, one of LOAD_PHASES.
+        :param rows: An optional int of how many rows the sheet has.
+        """
+
+        now = time.perf_counter()
+        self.timings.add_time(self.sheet_name, self.phase, now - self.phase_start)
+        self.phase = phase
+        self.phase_start = now
+        if rows is not None:
+            self.timings.get_sheet(self.sheet_name)["rows"] = rows
+
+    def stop(self, items: int = None):
+        """
+        End the current phase and give the thread back its previous clock.
+
+        :param items: An optional int of how many items the sheet was built into.
+        """
+
+        self.timings.add_time(self.sheet_name, self.phase, time.perf_counter() - self.phase_start)
+        if items is not None:
+            self.timings.get_sheet(self.sheet_name)["items"] = items
+        running_clocks.clock = self.previous_clock
@@ -2,6 +2,7 @@
     A module contain classes for menus.
 """
 from abc import abstractmethod
+from collections.abc import Mapping
 import sys
 from os import path as OSPATH
 from os import system as OSSYS
@@ -26,7 +27,7 @@ class AutoCompleteList:
 
         self.input_structure = input_structure
 
-        if isinstance(self.input_structure, dict):
+        if isinstance(self.input_structure, Mapping):
             self.completer = self.generate_wordcompleter_list(self.input_structure)
         elif isinstance(input_structure, list):
             self.completer = WordCompleter(self.duplicate_input(self.input_structure))
@@ -406,8 +407,8 @@ class StatusModMenu(BaseMenu):
         super().__init__(title)
         self.input_dict = input_dict
 
-        if isinstance(self.input_dict, dict) is not True:
-            raise TypeError(f"input_dict is not a dict. input_dict is type {type(input_dict)}")
+        if isinstance(self.input_dict, Mapping) is not True:
+            raise TypeError(f"input_dict is not a Mapping. input_dict is type {type(input_dict)}")
 
         self.menu_items = self.get_menu_items()
         self.completers = (AutoCompleteList(
@@ -701,6 +702,7 @@ class SettingsMenu(BaseMenu):
         super().__init__(title)
         self.input_dict = {}
         self.input_dict["dlc_load_order"] = settings_io.global_settings.settings["dlc_load_order"]
+        self.input_dict["load_workers"] = settings_io.global_settings.settings["load_workers"]
         self.menu_items = self.get_menu_items()
         self.completer = AutoCompleteList(self.menu_items).completer
         self.display_chunks = self.split_menu_items()
@@ -869,6 +871,14 @@ if the input is valid.
                 self.clear_screen()
                 print("DLC Load order must be only two characters \
 long and valid hex.")
+        elif selection[0] == "load_workers":
+            try:
+                settings_io.global_settings.set_load_workers(selection[1])
+                result = (True, True)
+            except ValueError:
+                result = (False, False)
+                self.clear_screen()
+                print("Load workers must be zero or a positive whole number.")
         else:
             self.clear_screen()
             print("Incorrect User Input.")
@@ -0,0 +1,147 @@
+"""
+    A module for the one shot commands, which print the console commands of
+    their arguments and exit instead of showing the menus, e.g.:
+
+    python -m starfieldccg give weapon "Broken Fang's Heirloom Rifle" 5
+    python -m starfieldccg mods armor "<slot 1 mod>" skip "<slot 3 mod>"
+    python -m starfieldccg quality weapon III
+
+    They are meant to be called many times from scripts, so the catalog
+    snapshot is loaded when it is up to date and otherwise only the item dict
+    a command needs is built. A missing or out of date snapshot is left for
+    the menus to write. The menus (and prompt_toolkit with them) are never
+    imported. They are a thin layer over Catalog.
+"""
+import argparse
+import sys
+from .catalog import Catalog
+
+# The first arguments that run a one shot command instead of the menus.
+ONE_SHOT_COMMANDS = ("give", "mods", "quality")
+
+# What a status mod argument is given as to leave its slot empty.
+SKIP_SLOT = "skip"
+
+def make_parser():
+    """
+    Return the argument parser of the one shot commands.
+
+    :return: An argparse.ArgumentParser object.
+    """
+
+    reader_options = argparse.ArgumentParser(add_help=False)
+    reader_options.add_argument("--datatable", metavar="PATH",
+                                help="Read the datatable from PATH instead of the built in one.")
+    reader_options.add_argument("--database", metavar="PATH",
+                                help="Load the items from a catalog database.")
+    reader_options.add_argument("--map", metavar="PATH",
+                                help="Read the items from a catalog map file.")
+    reader_options.add_argument("--no-snapshot", action="store_true",
+                                help="Always read the datasheet instead of a catalog "
+                                "snapshot.")
+
+    parser = argparse.ArgumentParser(prog="starfieldccg",
+                                     description="Print Starfield console commands and exit.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    give_parser = commands.add_parser("give", parents=[reader_options],
+                                      help="Print the command that adds an item.")
+    give_parser.add_argument("category", help="The kind of item, e.g. weapon, ammo, helmet, "
+                             "spacesuit, pack, spacesuit set, or resource.")
+    give_parser.add_argument("name", help="The name of the item.")
+    give_parser.add_argument("quantity", nargs="?", type=int, default=1,
+                             help="How many to add. Defaults to 1.")
+
+    mods_parser = commands.add_parser("mods", parents=[reader_options],
+                                      help="Print the commands of up to three status mods.")
+    mods_parser.add_argument("kind", choices=("armor", "weapon"))
+    mods_parser.add_argument("slots", nargs="+", metavar="slot",
+                             help=f"The name of the mod of each slot in order, or "
+                             f"'{SKIP_SLOT}' to leave a slot as it is.")
+
+    quality_parser = commands.add_parser("quality", parents=[reader_options],
+                                         help="Print the command of a quality mod.")
+    quality_parser.add_argument("kind", choices=("armor", "weapon"))
+    quality_parser.add_argument("level", help="The quality level, e.g. III.")
+
+    return parser
+
+def make_catalog(args):
+    """
+    Create the Catalog of the parsed reader options. Its item dicts are built
+    the first time they are used, and it never writes a snapshot.
+
+    :param args: The argparse.Namespace of the parsed arguments.
+
+    :return: A Catalog object.
+    """
+
+    return Catalog(args.datatable, use_snapshot=not args.no_snapshot,
+                   database_path=args.database, map_path=args.map, write_snapshot=False)
+
+def get_give_commands(catalog, args):
+    """
+    Return the commands of the give command.
+
+    :param catalog: The Catalog to find the item in.
+    :param args: The argparse.Namespace of the parsed arguments.
+
+    :return: A list of str command lines.
+    """
+
+    catalog.get_catalog_name(args.category)
+    return catalog.get_commands([(args.category, args.name, args.quantity)])
+
+def get_mods_commands(catalog, args):
+    """
+    Return the commands of the mods command. Every mod that isn't found, or
+    isn't a mod of its slot, is reported in one ValueError.
+
+    :param catalog: The Catalog to find the mods in.
+    :param args: The argparse.Namespace of the parsed arguments.
+
+    :return: A list of str command lines.
+    """
+
+    return catalog.get_status_mod_commands(args.kind, [
+        None if name.strip().lower() == SKIP_SLOT else name for name in args.slots])
+
+def get_quality_commands(catalog, args):
+    """
+    Return the command of the quality command.
+
+    :param catalog: The Catalog to find the mod in.
+    :param args: The argparse.Namespace of the parsed arguments.
+
+    :return: A list of str command lines.
+    """
+
+    return catalog.get_commands([(f"{args.kind} quality mods", args.level, 1)])
+
+ONE_SHOT_HANDLERS = {
+    "give": get_give_commands,
+    "mods": get_mods_commands,
+    "quality": get_quality_commands
+}
+
+def run_one_shot(argv: list, output=None):
+    """
+    Run a one shot command and print its console commands.
+
+    :param argv: A list of the str arguments, starting with one of ONE_SHOT_COMMANDS.
+    :param output: An optional text file to print to. Defaults to sys.stdout.
+
+    :return: An int exit code, 0 if the commands were printed and 1 if they weren't.
+    """
+
+    args = make_parser().parse_args(argv)
+    if output is None:
+        output = sys.stdout
+    try:
+        command_lines = ONE_SHOT_HANDLERS[args.command](make_catalog(args), args)
+    except (OSError, ValueError) as e:
+        print(f"starfieldccg {args.command}: {e}", file=sys.stderr)
+        return 1
+
+    output.write("\n".join(command_lines))
+    output.write("\n")
+    return 0
@@ -0,0 +1,893 @@
+"""
+    A module containing the backends that DataFileReader uses to pull
+    rows out of the datasheet.
+
+    The xlrd backend reads the workbook with xlrd alone and hands back plain
+    python row tuples, so building the catalog doesn't need pandas or numpy.
+    The pandas backend reads each sheet into a DataFrame for the code that
+    works with DataFrames, like get_cell_value() and get_row_index().
+    The xlrd backend can also stream a workbook a sheet at a time for
+    reading datatables too big to hold in memory.
+
+    A datatable can also be a .xlsx workbook, a folder with a .csv file for
+    each sheet, a .json file, or a .ndjson file. Each is read by a backend of
+    its own with that format's own parser, see get_datatable_backend().
+"""
+import csv
+import hashlib
+import json
+import os
+import threading
+from os import path as OSPATH
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# The datatable format of each file extension. A folder is a CSV datatable.
+DATATABLE_EXTENSIONS = {".xls": "xls", ".xlsx": "xlsx", ".json": "json",
+                        ".ndjson": "ndjson", ".jsonl": "ndjson"}
+CSV_SUFFIX = ".csv"
+
+def get_datatable_format(file_path: str):
+    """
+    Return the format of a datatable from its path.
+
+    :param file_path: The str filepath to the data table.
+
+    :return: A str of "xls", "xlsx", "csv", "json", or "ndjson". A folder is "csv" \
+and a file with any other extension is "xls".
+    """
+
+    if OSPATH.isdir(file_path):
+        return "csv"
+    return DATATABLE_EXTENSIONS.get(OSPATH.splitext(file_path)[1].lower(), "xls")
+
+def get_datatable_size(file_path: str):
+    """
+    Return how many bytes of data a datatable has.
+
+    :param file_path: The str filepath to the data table.
+
+    :return: An int of the file's size, or of the sizes of the .csv files in it \
+added up if it is a folder.
+    """
+
+    if OSPATH.isdir(file_path):
+        return sum(OSPATH.getsize(OSPATH.join(file_path, file_name))
+                   for file_name in os.listdir(file_path)
+                   if file_name.lower().endswith(CSV_SUFFIX))
+    return OSPATH.getsize(file_path)
+
+def fit_rows(rows, column_count: int = None):
+    """
+    Yield rows as tuples of exactly column_count cells, cutting off the cells
+    after them and padding short rows with None.
+
+    :param rows: An iterable of row lists or tuples.
+    :param column_count: An optional int of how many cells each row has. The rows \
+are left as long as they are if it isn't supplied.
+
+    :return: An iterator of tuples.
+    """
+
+    if column_count is None:
+        yield from map(tuple, rows)
+        return
+    padding = (None,) * column_count
+    for row in rows:
+        if len(row) == column_count:
+            yield tuple(row)
+        else:
+            yield (tuple(row) + padding)[:column_count]
+
+class ReaderBackend():
+    """
+        The interface every reader backend implements.
+
+        A backend reads the leading columns of a sheet, skipping the header
+        row, either as row tuples from iter_rows() or as column lists from
+        read_sheet_columns(). iter_table() reads a whole sheet, header and all.
+    """
+
+    name = None
+
+    def __init__(self, file_path: str):
+        """
+        Create a ReaderBackend object. Nothing is read until a sheet is asked for.
+
+        :param file_path: The str filepath to the data table.
+        """
+
+        self.file_path = file_path
+        self.read_sheet_names = []
+        self.lock = threading.RLock()
+
+    def __repr__(self):
+        """
+        Return a str representation of the ReaderBackend object.
+
+        :return: A str version of ReaderBackend.
+        """
+
+        return f"{type(self).__name__}(file_path='{self.file_path}')"
+
+    def get_sheet_names(self):
+        """
+        Return the names of every sheet in the datatable.
+
+        :return: A list of str sheet names.
+        """
+
+        raise NotImplementedError
+
+    def iter_table(self, sheet_name: str, column_count: int = None):
+        """
+        Yield every row of a sheet, the header row first.
+
+        :param sheet_name: A str of the name of the sheet to read.
+        :param column_count: An optional int of how many leading columns to read. \
+Every cell of each row is read if it isn't supplied.
+
+        :return: An iterator of row tuples.
+        """
+
+        raise NotImplementedError
+
+    def iter_rows(self, sheet_name: str, column_count: int):
+        """
+        Yield the data rows of a sheet.
+
+        :param sheet_name: A str of the name of the sheet to read.
+        :param column_count: An int of how many leading columns to read.
+
+        :return: An iterator of tuples with column_count cell values each.
+        """
+
+        rows = self.iter_table(sheet_name, column_count)
+        next(rows, None)
+        yield from rows
+
+    def read_sheet_columns(self, sheet_name: str, column_count: int):
+        """
+        Return the data rows of a sheet as lists of column values.
+
+        :param sheet_name: A str of the name of the sheet to read.
+        :param column_count: An int of how many leading columns to read.
+
+        :return: A list of column_count column lists.
+        """
+
+        rows = list(self.iter_rows(sheet_name, column_count))
+        if len(rows) == 0:
+            return [[] for _ in range(column_count)]
+        return [list(column) for column in zip(*rows)]
+
+    def close(self):
+        """
+        Release anything the backend is holding open.
+        """
+
+class XlrdBackend(ReaderBackend):
+    """
+        Reads the datasheet with xlrd and returns plain python values.
+
+        Text cells are str, number cells are float, boolean cells are bool,
+        and empty or error cells are None.
+    """
+
+    name = "xlrd"
+
+    def __init__(self, file_path: str, use_mmap: bool = False):
+        """
+        Create an XlrdBackend object.
+
+        :param file_path: The str filepath to the data table.
+        :param use_mmap: An optional bool of whether to map the file instead of \
+reading it into memory. The file is held open until close() is called.
+        """
+
+        super().__init__(file_path)
+        self.use_mmap = use_mmap
+        self.workbook = None
+
+    def get_workbook(self):
+        """
+        Return the workbook, opening it the first time.
+
+        It is opened on demand so only the sheets that are read get parsed, and
+        by default without mmap so the file isn't held open and can still be edited.
+
+        :return: An xlrd Book.
+        """
+
+        # pylint: disable=import-outside-toplevel
+        import xlrd
+
+        with self.lock:
+            if self.workbook is None:
+                self.workbook = xlrd.open_workbook(self.file_path, on_demand=True,
+                                                   use_mmap=self.use_mmap)
+            return self.workbook
+
+    @staticmethod
+    def convert_cell(cell_type: int, cell_value):
+        """
+        Turn an xlrd cell into a plain python value.
+
+        :param cell_type: An int xlrd cell type.
+        :param cell_value: The raw xlrd cell value.
+
+        :return: A str, float, bool, or None.
+        """
+
+        # xlrd cell types: 0 empty, 1 text, 2 number, 3 date, 4 boolean, 5 error, 6 blank.
+        if cell_type in (0, 5, 6):
+            return None
+        if cell_type == 4:
+            return bool(cell_value)
+        return cell_value
+
+    def get_sheet_names(self):
+        """
+        Return the names of every sheet in the workbook, without parsing them.
+
+        :return: A list of str sheet names.
+        """
+
+        with self.lock:
+            return self.get_workbook().sheet_names()
+
+    def iter_table(self, sheet_name: str, column_count: int = None):
+        """
+        Yield every row of a sheet, the header row first.
+
+        :param sheet_name: A str of the name of the sheet to read.
+        :param column_count: An optional int of how many leading columns to read. \
+Every column of the sheet is read if it isn't supplied.
+
+        :return: An iterator of row tuples.
+        """
+
+        return self.iter_sheet_rows(sheet_name, column_count, 0)
+
+    def iter_rows(self, sheet_name: str, column_count: int):
+        """
+        Yield the data rows of a sheet.
+
+        :param sheet_name: A str of the name of the sheet to read.
+        :param column_count: An int of how many leading columns to read.
+
+        :return: An iterator of tuples with column_count cell values each.
+        """
+
+        return self.iter_sheet_rows(sheet_name, column_count, 1)
+
+    def iter_sheet_rows(self, sheet_name: str, column_count: int, first_row: int):
+        """
+        Yield the rows of a sheet from first_row on.
+
+        :param sheet_name: A str of the name of the sheet to read.
+        :param column_count: An int of how many leading columns to read, or None \
+for every column of the sheet.
+        :param first_row: An int of the first row to yield, 1 to skip the header row.
+
+        :return: An iterator of tuples with column_count cell values each.
+        """
+
+        with self.lock:
+            sheet = self.get_workbook().sheet_by_name(sheet_name)
+            self.read_sheet_names.append(sheet_name)
+
+        if column_count is None:
+            column_count = sheet.ncols
+        convert_cell = self.convert_cell
+        padding = (None,) * column_count
+        for row in range(first_row, sheet.nrows):
+            cell_types = sheet.row_types(row, 0, column_count)
+            cell_values = sheet.row_values(row, 0, column_count)
+            values = tuple(map(convert_cell, cell_types, cell_values))
+            if len(values) < column_count:
+                values = (values + padding)[:column_count]
+            yield values
+
+    def stream_rows(self, sheet_name: str, column_count: int):
+        """
+        Yield the data rows of a sheet, then unload it again.
+
+        The rows are the same as the ones iter_rows() yields. The sheet is loaded
+        on its own with xlrd's on demand loading and unloaded when the rows are
+        done, unless it was already loaded, so a workbook is streamed a sheet at
+        a time. This only works for .xls workbooks.
+
+        :param sheet_name: A str of the name of the sheet to read.
+        :param column_count: An int of how many leading columns to read.
+
+        :return: An iterator of tuples with column_count cell values each.
+        """
+
+        with self.lock:
+            workbook = self.get_workbook()
+            if sheet_name not in workbook.sheet_names():
+                raise ValueError(f"Unknown sheet name: {sheet_name}")
+            was_loaded = workbook.sheet_loaded(sheet_name)
+        try:
+            yield from self.iter_sheet_rows(sheet_name, column_count, 1)
+        finally:
+            with self.lock:
+                if was_loaded is not True and self.workbook is workbook:
+                    workbook.unload_sheet(sheet_name)
+
+    def get_sheet_hashes(self, sheet_names: list):
+        """
+        Return a hash of the cell types and values of each sheet.
+
+        Each sheet is loaded on its own with xlrd's on demand loading and unloaded
+        again after it is hashed, unless it was already loaded, so only one sheet
+        is held in memory at a time.
+
+        :param sheet_names: A list of the str names of the sheets to hash.
+
+        :return: A dict of sheet names to str sha256 hashes.
+        """
+
+        sheet_hashes = {}
+        for sheet_name in sheet_names:
+            with self.lock:
+                workbook = self.get_workbook()
+                was_loaded = workbook.sheet_loaded(sheet_name)
+                sheet = workbook.sheet_by_name(sheet_name)
+                digest = hashlib.sha256()
+                for row in range(sheet.nrows):
+                    digest.update(repr((sheet.row_types(row),
+                                        sheet.row_values(row))).encode("utf-8"))
+                    digest.update(b"\n")
+                if was_loaded is not True:
+                    workbook.unload_sheet(sheet_name)
+            sheet_hashes[sheet_name] = digest.hexdigest()
+
+        return sheet_hashes
+
+    def close(self):
+        """
+        Release the workbook.
+        """
+
+        with self.lock:
+            if self.workbook is not None:
+                self.workbook.release_resources()
+                self.workbook = None
+
+class PandasBackend(ReaderBackend):
+    """
+        Reads the datasheet into pandas DataFrames.
+
+        A .xls workbook is parsed by pandas. The sheets of the other formats
+        are read by the format's own backend and then made into DataFrames.
+    """
+
+    name = "pandas"
+
+    def __init__(self, file_path: str):
+        """
+        Create a PandasBackend object.
+
+        :param file_path: The str filepath to the data table.
+        """
+
+        super().__init__(file_path)
+        self.workbook = None
+
+    def read_sheet(self, sheet_name: str, column_count: int = None):
+        """
+        Read a sheet into a DataFrame.
+
+        The workbook is opened on demand the first time and kept open, so only
+        the records for the sheets that are actually read get parsed.
+
+        :param sheet_name: A str of the name of the sheet to read.
+        :param column_count: An optional int of how many leading columns to read. \
+Every column is read if it isn't supplied.
+
+        :return: A DataFrame with the sheet data.
+        """
+
+        # pylint: disable=import-outside-toplevel
+        import pandas as pd
+
+        if get_datatable_format(self.file_path) != "xls":
+            return self.make_dataframe(sheet_name, column_count)
+
+        with self.lock:
+            if self.workbook is None:
+                # use_mmap is off so the file isn't held open and can still be edited.
+                self.workbook = pd.ExcelFile(self.file_path, engine="xlrd",
+                                             engine_kwargs={"on_demand": True,
+                                                            "use_mmap": False})
+            used_columns = None
+            if column_count is not None:
+                used_columns = list(range(column_count))
+            self.read_sheet_names.append(sheet_name)
+            return self.workbook.parse(sheet_name, usecols=used_columns)
+
+    def make_dataframe(self, sheet_name: str, column_count: int = None):
+        """
+        Read a sheet with the backend of the datatable's format and make it into
+        a DataFrame, with the header row as the column names.
+
+        :param sheet_name: A str of the name of the sheet to read.
+        :param column_count: An optional int of how many leading columns to read.
+
+        :return: A DataFrame with the sheet data.
+        """
+
+        # pylint: disable=import-outside-toplevel
+        import pandas as pd
+
+        with self.lock:
+            if self.workbook is None:
+                self.workbook = get_datatable_backend(self.file_path)
+            self.read_sheet_names.append(sheet_name)
+            rows = list(self.workbook.iter_table(sheet_name, column_count))
+        if len(rows) == 0:
+            return pd.DataFrame()
+        return pd.DataFrame(rows[1:], columns=rows[0])
+
+    def get_sheet_names(self):
+        """
+        Return the names of every sheet in the datatable.
+
+        :return: A list of str sheet names.
+        """
+
+        backend = get_datatable_backend(self.file_path)
+        try:
+            return backend.get_sheet_names()
+        finally:
+            backend.close()
+
+    def iter_table(self, sheet_name: str, column_count: int = None):
+        """
+        Yield every row of a sheet, the header row first.
+
+        :param sheet_name: A str of the name of the sheet to read.
+        :param column_count: An optional int of how many leading columns to read.
+
+        :return: An iterator of row tuples.
+        """
+
+        data = self.read_sheet(sheet_name, column_count)
+        yield tuple(data.columns)
+        yield from zip(*self.get_dataframe_columns(data, len(data.columns)))
+
+    @staticmethod
+    def get_dataframe_columns(data: "pd.DataFrame", column_count: int):
+        """
+        Return the leading columns of a DataFrame as lists of plain python values.
+
+        :param data: A DataFrame with the sheet data.
+        :param column_count: An int of how many leading columns to return.
+
+        :return: A list of column lists.
+        """
+
+        return [data.iloc[:, column].tolist() for column in range(column_count)]
+
+    def iter_rows(self, sheet_name: str, column_count: int):
+        """
+        Yield the data rows of a sheet.
+
+        :param sheet_name: A str of the name of the sheet to read.
+        :param column_count: An int of how many leading columns to read.
+
+        :return: An iterator of tuples with column_count cell values each.
+        """
+
+        yield from zip(*self.read_sheet_columns(sheet_name, column_count))
+
+    def read_sheet_columns(self, sheet_name: str, column_count: int):
+        """
+        Return the data rows of a sheet as lists of column values.
+
+        :param sheet_name: A str of the name of the sheet to read.
+        :param column_count: An int of how many leading columns to read.
+
+        :return: A list of column_count column lists.
+        """
+
+        return self.get_dataframe_columns(self.read_sheet(sheet_name, column_count),
+                                          column_count)
+
+    def close(self):
+        """
+        Close the workbook if it was left open.
+        """
+
+        with self.lock:
+            if self.workbook is not None:
+                self.workbook.close()
+                self.workbook = None
+
+class XlsxBackend(ReaderBackend):
+    """
+        Reads a .xlsx workbook with openpyxl in read only mode.
+
+        Cells are turned into the same values the xlrd backend gives: whole
+        numbers are float like every number in a .xls workbook, and empty cells
+        are None.
+    """
+
+    name = "xlsx"
+
+    def __init__(self, file_path: str):
+        """
+        Create an XlsxBackend object.
+
+        :param file_path: The str filepath to the .xlsx workbook.
+        """
+
+        super().__init__(file_path)
+        self.workbook = None
+
+    def get_workbook(self):
+        """
+        Return the workbook, opening it the first time.
+
+        :return: An openpyxl Workbook.
+        """
+
+        # pylint: disable=import-outside-toplevel
+        import openpyxl
+
+        with self.lock:
+            if self.workbook is None:
+                self.workbook = openpyxl.load_workbook(self.file_path, read_only=True,
+                                                       data_only=True)
+            return self.workbook
+
+    @staticmethod
+    def convert_cell(cell_value):
+        """
+        Turn an openpyxl cell value into a plain python value.
+
+        :param cell_value: The cell value openpyxl read.
+
+        :return: A str, float, bool, or None.
+        """
+
+        if isinstance(cell_value, int) and not isinstance(cell_value, bool):
+            return float(cell_value)
+        return cell_value
+
+    def get_sheet_names(self):
+        """
+        Return the names of every sheet in the workbook.
+
+        :return: A list of str sheet names.
+        """
+
+        return list(self.get_workbook().sheetnames)
+
+    def iter_table(self, sheet_name: str, column_count: int = None):
+        """
+        Yield every row of a sheet, the header row first.
+
+        :param sheet_name: A str of the name of the sheet to read.
+        :param column_count: An optional int of how many leading columns to read.
+
+        :return: An iterator of row tuples.
+        """
+
+        convert_cell = self.convert_cell
+        with self.lock:
+            workbook = self.get_workbook()
+            if sheet_name not in workbook.sheetnames:
+                raise ValueError(f"Unknown sheet name: {sheet_name}")
+            self.read_sheet_names.append(sheet_name)
+            # A read only workbook reads from one open file, so a sheet is read whole.
+            rows = [tuple(map(convert_cell, row)) for row in
+                    workbook[sheet_name].iter_rows(max_col=column_count, values_only=True)]
+        yield from fit_rows(rows, column_count)
+
+    def close(self):
+        """
+        Close the workbook if it was left open.
+        """
+
+        with self.lock:
+            if self.workbook is not None:
+                self.workbook.close()
+                self.workbook = None
+
+class CsvBackend(ReaderBackend):
+    """
+        Reads a folder with a .csv file for each sheet, named after the sheet,
+        with the csv module.
+
+        Every cell is read as the text in the file, and an empty cell is "".
+        The item builders read ids, flags, and numbers stored as text the same
+        as the numbers and bools of a workbook, so the catalog is the same.
+    """
+
+    name = "csv"
+
+    def get_sheet_path(self, sheet_name: str):
+        """
+        Return the path of a sheet's .csv file.
+
+        :param sheet_name: A str of the sheet name.
+
+        :return: A str filepath.
+        """
+
+        return OSPATH.join(self.file_path, f"{sheet_name}{CSV_SUFFIX}")
+
+    def get_sheet_names(self):
+        """
+        Return the names of the sheets that have a .csv file in the folder.
+
+        :return: A sorted list of str sheet names.
+        """
+
+        return sorted(file_name[:-len(CSV_SUFFIX)] for file_name in os.listdir(self.file_path)
+                      if file_name.lower().endswith(CSV_SUFFIX))
+
+    def iter_table(self, sheet_name: str, column_count: int = None):
+        """
+        Yield every row of a sheet, the header row first. The file is read a
+        row at a time.
+
+        :param sheet_name: A str of the name of the sheet to read.
+        :param column_count: An optional int of how many leading columns to read.
+
+        :return: An iterator of row tuples.
+        """
+
+        sheet_path = self.get_sheet_path(sheet_name)
+        if OSPATH.isfile(sheet_path) is not True:
+            raise ValueError(f"Unknown sheet name: {sheet_name}")
+        with self.lock:
+            self.read_sheet_names.append(sheet_name)
+        # utf-8-sig skips the byte order mark Excel starts its CSV files with.
+        with open(sheet_path, "r", newline="", encoding="utf-8-sig") as sheet_file:
+            yield from fit_rows(csv.reader(sheet_file), column_count)
+
+class JsonBackend(ReaderBackend):
+    """
+        Reads a .json datatable with the json module. The file holds an object
+        of sheet names to lists of rows, the header row first:
+
+        {"Ammo": [["Name", "ID"], ["7.77mm Caseless", "0002B559"], ...], ...}
+
+        Cells keep their JSON types, so numbers are float, true and false are
+        bool, and null is None, like the cells of a workbook.
+    """
+
+    name = "json"
+
+    def __init__(self, file_path: str):
+        """
+        Create a JsonBackend object.
+
+        :param file_path: The str filepath to the .json datatable.
+        """
+
+        super().__init__(file_path)
+        self.sheets = None
+
+    def get_sheets(self):
+        """
+        Return the sheets in the file, reading it the first time.
+
+        :return: A dict of str sheet names to lists of row lists.
+        """
+
+        with self.lock:
+            if self.sheets is None:
+                with open(self.file_path, "r", encoding="utf-8") as json_file:
+                    # Numbers that are whole in the file are float in a workbook too.
+                    self.sheets = json.load(json_file, parse_int=float)
+            return self.sheets
+
+    def get_sheet_names(self):
+        """
+        Return the names of every sheet in the file.
+
+        :return: A list of str sheet names.
+        """
+
+        return list(self.get_sheets())
+
+    def iter_table(self, sheet_name: str, column_count: int = None):
+        """
+        Yield every row of a sheet, the header row first.
+
+        :param sheet_name: A str of the name of the sheet to read.
+        :param column_count: An optional int of how many leading columns to read.
+
+        :return: An iterator of row tuples.
+        """
+
+        sheets = self.get_sheets()
+        if sheet_name not in sheets:
+            raise ValueError(f"Unknown sheet name: {sheet_name}")
+        with self.lock:
+            self.read_sheet_names.append(sheet_name)
+        yield from fit_rows(sheets[sheet_name], column_count)
+
+    def close(self):
+        """
+        Drop the rows that were read.
+        """
+
+        with self.lock:
+            self.sheets = None
+
+class NdjsonBackend(ReaderBackend):
+    """
+        Reads a .ndjson datatable, which has a JSON array on each line: the
+        sheet name and then the cells of one row. The first line of each sheet
+        is its header row.
+
+        ["Ammo", "7.77mm Caseless", "0002B559"]
+
+        The file is gone over once to find where each sheet's lines are,
+        decoding only the sheet names. A sheet is then read by joining its
+        lines into one JSON array and decoding that in a single call, so the
+        rows of the other sheets are never decoded.
+    """
+
+    name = "ndjson"
+
+    def __init__(self, file_path: str):
+        """
+        Create an NdjsonBackend object.
+
+        :param file_path: The str filepath to the .ndjson datatable.
+        """
+
+        super().__init__(file_path)
+        self.sheet_spans = None
+
+    def get_sheet_spans(self):
+        """
+        Return where the lines of each sheet are, finding them the first time.
+
+        :return: A dict of str sheet names to lists of (int start, int end) byte \
+positions, one for each run of the sheet's lines.
+        """
+
+        with self.lock:
+            if self.sheet_spans is None:
+                self.sheet_spans = self.find_sheet_spans()
+            return self.sheet_spans
+
+    def find_sheet_spans(self):
+        """
+        Go over the lines of the file and find where each sheet's lines are.
+
+        A line that starts with the same bytes as the line before it, up to the
+        end of the sheet name, is from the same sheet, so the sheet name is only
+        decoded where the sheet changes.
+
+        :return: A dict of str sheet names to lists of [int start, int end] byte positions.
+        """
+
+        decoder = json.JSONDecoder()
+        sheet_spans = {}
+        line_start = None
+        span = None
+        position = 0
+        with open(self.file_path, "rb") as ndjson_file:
+            for line in ndjson_file:
+                if line_start is None or line.startswith(line_start) is not True:
+                    text = line.decode("utf-8")
+                    name_start = len(text) - len(text.lstrip().lstrip("[").lstrip())
+                    if name_start == len(text):
+                        # A blank line.
+                        position += len(line)
+                        continue
+                    sheet_name, name_end = decoder.raw_decode(text, name_start)
+                    line_start = text[:name_end].encode("utf-8")
+                    span = [position, position]
+                    sheet_spans.setdefault(sheet_name, []).append(span)
+                position += len(line)
+                span[1] = position
+        return sheet_spans
+
+    def get_sheet_names(self):
+        """
+        Return the names of every sheet in the file, in the order they first come up.
+
+        :return: A list of str sheet names.
+        """
+
+        return list(self.get_sheet_spans())
+
+    def iter_table(self, sheet_name: str, column_count: int = None):
+        """
+        Yield every row of a sheet, the header row first. Each run of the
+        sheet's lines is read and decoded on its own.
+
+        :param sheet_name: A str of the name of the sheet to read.
+        :param column_count: An optional int of how many leading columns to read.
+
+        :return: An iterator of row tuples.
+        """
+
+        sheet_spans = self.get_sheet_spans()
+        if sheet_name not in sheet_spans:
+            raise ValueError(f"Unknown sheet name: {sheet_name}")
+        with self.lock:
+            self.read_sheet_names.append(sheet_name)
+        yield from fit_rows(self.iter_sheet_lines(sheet_spans[sheet_name]), column_count)
+
+    def iter_sheet_lines(self, spans: list):
+        """
+        Yield the decoded rows of a sheet without the sheet name.
+
+        :param spans: A list of (int start, int end) byte positions of the sheet's lines.
+
+        :return: An iterator of row lists.
+        """
+
+        with open(self.file_path, "rb") as ndjson_file:
+            for start, end in spans:
+                ndjson_file.seek(start)
+                lines = [line for line in ndjson_file.read(end - start).splitlines()
+                         if len(line.strip()) > 0]
+                # Numbers that are whole in the file are float in a workbook too.
+                rows = json.loads(b"[" + b",".join(lines) + b"]", parse_int=float)
+                for row in rows:
+                    yield row[1:]
+
+    def close(self):
+        """
+        Forget where the sheets are, so they are found again if the file changes.
+        """
+
+        with self.lock:
+            self.sheet_spans = None
+
+READER_BACKENDS = {
+    XlrdBackend.name: XlrdBackend,
+    PandasBackend.name: PandasBackend,
+    XlsxBackend.name: XlsxBackend,
+    CsvBackend.name: CsvBackend,
+    JsonBackend.name: JsonBackend,
+    NdjsonBackend.name: NdjsonBackend
+}
+
+# The backend that reads each datatable format with the format's own parser.
+DATATABLE_BACKENDS = {
+    "xls": XlrdBackend,
+    "xlsx": XlsxBackend,
+    "csv": CsvBackend,
+    "json": JsonBackend,
+    "ndjson": NdjsonBackend
+}
+
+def get_reader_backend(backend_name: str, file_path: str):
+    """
+    Create a reader backend by name.
+
+    :param backend_name: A str of the backend name, one of READER_BACKENDS.
+    :param file_path: The str filepath to the data table.
+
+    :return: A ReaderBackend object.
+    """
+
+    if backend_name not in READER_BACKENDS:
+        raise ValueError(f"Invalid reader backend: {backend_name}")
+    return READER_BACKENDS[backend_name](file_path)
+
+def get_datatable_backend(file_path: str):
+    """
+    Create the reader backend for a datatable's format, see get_datatable_format().
+
+    :param file_path: The str filepath to the data table.
+
+    :return: A ReaderBackend object.
+    """
+
+    return DATATABLE_BACKENDS[get_datatable_format(file_path)](file_path)
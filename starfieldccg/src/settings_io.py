@@ -3,8 +3,16 @@ A module to write and contain settings
 """
 import json
 import string
+import threading
+import weakref
 from os import path as OSPATH
+from types import MethodType
 
+DEFAULT_LOAD_WORKERS = 0    # 0 means the sheets are read one at a time.
+SETTINGS_FILE_PATH = OSPATH.abspath(OSPATH.join(OSPATH.dirname(__file__),
+                                                '../data/settings_data.json'))
+
+global_settings_lock = threading.Lock()
 
 class SCCGSettings():
     """
@@ -21,6 +29,7 @@ class SCCGSettings():
         self.settings_file_path = settings_file_path
         # self.dlc_load_order = "FF"
         self.settings = {}
+        self.subscribers = {}
         self.load_settings()
 
 
@@ -32,11 +41,91 @@ class SCCGSettings():
         """
         if len(load_order) == 2 and load_order[0] in string.hexdigits \
         and load_order[1] in string.hexdigits:
+            old_load_order = self.settings["dlc_load_order"]
             self.settings["dlc_load_order"] = load_order
             self.save_settings()
+            self.notify_subscribers("dlc_load_order", old_load_order, load_order)
         else:
             raise ValueError("DLC Load order must be only two characters long and valid hex.")
 
+    def set_load_workers(self, load_workers):
+        """
+        Sets how many workers read the datasheet in parallel and auto-saves the settings.
+
+        :param load_workers: An int (or str of an int) of the number of workers. \
+0 reads the sheets one at a time.
+        """
+        try:
+            load_workers = int(load_workers)
+        except (TypeError, ValueError) as e:
+            raise ValueError("Load workers must be a whole number.") from e
+        if load_workers < 0:
+            raise ValueError("Load workers must be zero or a positive whole number.")
+        old_load_workers = self.settings["load_workers"]
+        self.settings["load_workers"] = load_workers
+        self.save_settings()
+        self.notify_subscribers("load_workers", old_load_workers, load_workers)
+
+    def subscribe(self, setting_name: str, callback):
+        """
+        Call a function whenever a setting is changed to a new value.
+
+        A bound method is only held weakly, so subscribing doesn't keep the
+        object it belongs to alive.
+
+        :param setting_name: A str of the setting, e.g. "dlc_load_order".
+        :param callback: A function called with the old and the new value, \
+after the settings are saved.
+        """
+
+        if setting_name not in self.settings:
+            raise ValueError(f"Unknown setting: {setting_name}")
+        if isinstance(callback, MethodType):
+            callback = weakref.WeakMethod(callback)
+        self.subscribers.setdefault(setting_name, []).append(callback)
+
+    def unsubscribe(self, setting_name: str, callback):
+        """
+        Stop calling a function that was subscribed to a setting.
+
+        :param setting_name: A str of the setting, e.g. "dlc_load_order".
+        :param callback: The function that was passed to subscribe().
+        """
+
+        self.subscribers[setting_name] = [
+            subscriber for subscriber in self.subscribers.get(setting_name, [])
+            if self.get_subscriber(subscriber) not in (callback, None)]
+
+    @staticmethod
+    def get_subscriber(subscriber):
+        """
+        Return the function a subscriber calls.
+
+        :param subscriber: A function or the weakref.WeakMethod of a bound method.
+
+        :return: The function, or None if the object of a bound method is gone.
+        """
+
+        if isinstance(subscriber, weakref.WeakMethod):
+            return subscriber()
+        return subscriber
+
+    def notify_subscribers(self, setting_name: str, old_value, new_value):
+        """
+        Call the functions subscribed to a setting if its value changed.
+
+        :param setting_name: A str of the setting that was set.
+        :param old_value: The value the setting had.
+        :param new_value: The value the setting has now.
+        """
+
+        if old_value == new_value:
+            return
+        for subscriber in list(self.subscribers.get(setting_name, [])):
+            callback = self.get_subscriber(subscriber)
+            if callback is not None:
+                callback(old_value, new_value)
+
 
     def to_dict(self):
         """
@@ -71,8 +160,31 @@ class SCCGSettings():
 
             #self.dlc_load_order = file_data["dlc_load_order"]
             self.settings["dlc_load_order"] = file_data["settings"]["dlc_load_order"]
+            self.settings["load_workers"] = file_data["settings"].get("load_workers",
+                                                                      DEFAULT_LOAD_WORKERS)
 
         settings_file.close()
 
-global_settings = SCCGSettings(OSPATH.abspath(OSPATH.join(OSPATH.dirname(__file__),
-                                                  '../data/settings_data.json')))
+def get_global_settings():
+    """
+    Return the SCCGSettings of the settings file the package ships with,
+    reading it the first time it is used so importing the package reads no files.
+    It is also the module's global_settings attribute.
+
+    :return: The SCCGSettings object.
+    """
+
+    with global_settings_lock:
+        if "global_settings" not in globals():
+            globals()["global_settings"] = SCCGSettings(SETTINGS_FILE_PATH)
+    return globals()["global_settings"]
+
+def __getattr__(name):
+    """
+    Make global_settings the first time it is used, see get_global_settings().
+    Once it is made it is a plain module attribute and this isn't called for it.
+    """
+
+    if name == "global_settings":
+        return get_global_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
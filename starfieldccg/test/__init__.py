@@ -2,7 +2,28 @@
     This the package containing all of the tests.
 """
 __all__ =[
+    'benchmark_suite',
     'context',
+    'synthetic_datatable',
+    'test_background_load',
+    'test_batch_files',
+    'test_catalog',
+    'test_benchmark_suite',
+    'test_benchmarks',
+    'test_catalog_database',
+    'test_catalog_mapfile',
+    'test_catalog_snapshot',
+    'test_command_cache',
+    'test_datatable_formats',
+    'test_datatable_layers',
     'test_dfr',
     'test_dump_commands',
-    'test_menu_views']
+    'test_item_builders',
+    'test_item_indexes',
+    'test_item_store',
+    'test_load_timings',
+    'test_menu_views',
+    'test_one_shot',
+    'test_reader_backends',
+    'test_reload',
+    'test_settings_io']
@@ -0,0 +1,271 @@
+"""
+    A load time benchmark suite that builds the catalog from synthetic copies
+    of the datatable at several sizes and saves the results as JSON, so two
+    commits can be compared. Run it from the starfieldccg folder, e.g.:
+
+    python -m test.benchmark_suite --output new.json --baseline old.json
+
+    It exits with 1 when a result got worse than the baseline by more than the
+    threshold. A .xls sheet can't have more than 65535 rows, so the biggest
+    sheets are cut off at the larger scales. The row counts that were actually
+    read are saved with the results.
+"""
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from .context import SCCGTestContext as STC
+from .context import DFR
+from .synthetic_datatable import write_synthetic_datatable
+
+RESULTS_FORMAT_VERSION = 1
+DEFAULT_SCALES = [1, 10, 100, 1000]
+DEFAULT_THRESHOLD = 0.25    # How much worse than the baseline a result can get, 0.25 is 25%.
+# Timings shorter than this in both runs are mostly noise, so they aren't compared.
+MIN_COMPARED_SECONDS = 0.02
+
+def get_datatable(work_dir: str, scale: int):
+    """
+        Returns the path to a synthetic datatable, writing it the first time.
+
+        :param work_dir: A str path to the folder the datatables are kept in.
+        :param scale: An int of how many copies of each row the datatable has.
+        :return: A str path to the datatable.
+    """
+    datatable_path = os.path.join(work_dir, f"synthetic_{scale}x.xls")
+    if os.path.exists(datatable_path) is not True:
+        write_synthetic_datatable(datatable_path, scale, STC().known_datasheet_path)
+    return datatable_path
+
+def time_sheets(datatable_path: str):
+    """
+        Opens the workbook and then loads every item dict one sheet at a time,
+        timing reading each sheet's columns and building its items separately.
+
+        :param datatable_path: A str path to the datatable.
+        :return: A tuple of the float seconds it took to open the workbook, a dict \
+of sheet names to dicts with the "parse" and "build" seconds, and a dict of sheet \
+names to their row counts.
+    """
+    test_reader = DFR.DataFileReader(datatable_path)
+    start = time.perf_counter()
+    test_reader.get_backend().get_workbook()
+    open_time = time.perf_counter() - start
+    sheet_timings = {}
+    row_counts = {}
+    for catalog_name in test_reader.CATALOG_NAMES:
+        sheet_name = test_reader.CATALOG_SOURCES[catalog_name][0]
+        start = time.perf_counter()
+        columns = test_reader.get_backend().read_sheet_columns(
+            sheet_name, test_reader.SHEET_COLUMN_COUNTS[sheet_name])
+        parse_time = time.perf_counter() - start
+        test_reader.parsed_columns[sheet_name] = columns
+        start = time.perf_counter()
+        test_reader.load_catalog(catalog_name)
+        sheet_timings[sheet_name] = {"parse": parse_time, "build": time.perf_counter() - start}
+        row_counts[sheet_name] = len(columns[0])
+    test_reader.close()
+    return (open_time, sheet_timings, row_counts)
+
+def measure_memory(datatable_path: str):
+    """
+        Builds the whole catalog while tracing allocations.
+
+        :param datatable_path: A str path to the datatable.
+        :return: A dict with the "peak_bytes" python allocated, the "retained_bytes" \
+still allocated after the load, the number of "gc_objects" the load added, the \
+number of "items" built, and the retained "bytes_per_item".
+    """
+    gc.collect()
+    objects_before = len(gc.get_objects())
+    tracemalloc.start()
+    try:
+        test_reader = DFR.DataFileReader(datatable_path)
+        catalog = test_reader.get_catalog()
+        retained_bytes, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    gc.collect()
+    gc_objects = len(gc.get_objects()) - objects_before
+    item_count = sum(len(data_dict) for data_dict in catalog.values())
+    test_reader.close()
+    return {"peak_bytes": peak_bytes, "retained_bytes": retained_bytes,
+            "gc_objects": gc_objects, "items": item_count,
+            "bytes_per_item": retained_bytes / max(item_count, 1)}
+
+def best_time(func, repeat: int = 3):
+    """
+        Runs a function a few times and returns the fastest wall time.
+
+        :param func: A function with no arguments to time.
+        :param repeat: An int of how many times to run it.
+        :return: A float of the fastest run in seconds.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def benchmark_scale(datatable_path: str, repeat: int = 3):
+    """
+        Runs every measurement on one datatable.
+
+        :param datatable_path: A str path to the datatable.
+        :param repeat: An int of how many times each timing is run. The fastest run is kept.
+        :return: A dict of the results.
+    """
+    construct_time = best_time(lambda: DFR.DataFileReader(datatable_path), repeat)
+    catalog_time = best_time(lambda: DFR.DataFileReader(datatable_path).get_catalog(), repeat)
+
+    runs = [time_sheets(datatable_path) for _ in range(repeat)]
+    row_counts = runs[0][2]
+    sheet_timings = {sheet_name: {phase: min(run[1][sheet_name][phase] for run in runs)
+                                  for phase in ("parse", "build")}
+                     for sheet_name in row_counts}
+
+    results = {"construct_seconds": construct_time, "catalog_seconds": catalog_time,
+               "open_seconds": min(run[0] for run in runs),
+               "file_bytes": os.path.getsize(datatable_path), "rows": row_counts,
+               "sheets": sheet_timings}
+    results.update(measure_memory(datatable_path))
+    return results
+
+def run_suite(scales: list, work_dir: str, repeat: int = 3):
+    """
+        Benchmarks every scale and returns the results.
+
+        :param scales: A list of int scales to benchmark.
+        :param work_dir: A str path to the folder the datatables are kept in.
+        :param repeat: An int of how many times each timing is run.
+        :return: A dict of the results that can be saved as JSON.
+    """
+    return {
+        "format_version": RESULTS_FORMAT_VERSION,
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scales": {str(scale): benchmark_scale(get_datatable(work_dir, scale), repeat)
+                   for scale in scales}
+    }
+
+def get_compared_values(scale_results: dict):
+    """
+        Returns the results of one scale that are compared between runs.
+
+        :param scale_results: A dict of the results of one scale.
+        :return: A dict of str result names to tuples of (value, bool of whether it is seconds).
+    """
+    values = {name: (scale_results[name], name.endswith("_seconds"))
+              for name in ("construct_seconds", "open_seconds", "catalog_seconds",
+                           "peak_bytes", "retained_bytes", "bytes_per_item", "gc_objects")
+              if name in scale_results}
+    for sheet_name, timings in scale_results["sheets"].items():
+        for phase, seconds in timings.items():
+            values[f"{sheet_name} {phase}"] = (seconds, True)
+    return values
+
+def compare_results(baseline: dict, current: dict, threshold: float = DEFAULT_THRESHOLD):
+    """
+        Compares two sets of results from run_suite().
+
+        Only the scales and results that are in both are compared. Timings
+        shorter than MIN_COMPARED_SECONDS in both runs are skipped.
+
+        :param baseline: A dict of the results to compare against.
+        :param current: A dict of the new results.
+        :param threshold: A float of how much bigger a result can get, e.g. 0.25 for 25%.
+        :return: A list of str descriptions of the results that got worse by more than \
+the threshold.
+    """
+    if baseline.get("format_version") != current.get("format_version"):
+        raise ValueError("The results were saved by different versions of the suite")
+
+    regressions = []
+    for scale, scale_results in current["scales"].items():
+        if scale not in baseline["scales"]:
+            continue
+        old_values = get_compared_values(baseline["scales"][scale])
+        for name, (new_value, is_seconds) in get_compared_values(scale_results).items():
+            if name not in old_values:
+                continue
+            old_value = old_values[name][0]
+            if is_seconds and max(old_value, new_value) < MIN_COMPARED_SECONDS:
+                continue
+            if new_value > old_value * (1 + threshold):
+                change = new_value / old_value - 1 if old_value > 0 else float("inf")
+                regressions.append(f"{scale}x {name}: {old_value:.6g} -> {new_value:.6g} "
+                                   f"(+{change:.0%})")
+    return regressions
+
+def format_results(results: dict):
+    """
+        Returns the results as printable lines.
+
+        :param results: A dict of results from run_suite().
+        :return: A str with a block of lines for each scale.
+    """
+    lines = []
+    for scale, scale_results in results["scales"].items():
+        lines.append(f"{scale}x: {sum(scale_results['rows'].values())} rows, "
+                     f"{scale_results['items']} items, construct "
+                     f"{scale_results['construct_seconds'] * 1000:.2f}ms, open workbook "
+                     f"{scale_results['open_seconds'] * 1000:.1f}ms, whole catalog "
+                     f"{scale_results['catalog_seconds']:.3f}s, peak memory "
+                     f"{scale_results['peak_bytes'] / 1e6:.1f}MB, "
+                     f"{scale_results.get('bytes_per_item', 0):.0f} bytes per item, "
+                     f"{scale_results['gc_objects']} gc objects")
+        for sheet_name, timings in scale_results["sheets"].items():
+            lines.append(f"    {sheet_name:<22} {scale_results['rows'][sheet_name]:>7} rows "
+                         f"parse {timings['parse'] * 1000:8.1f}ms "
+                         f"build {timings['build'] * 1000:8.1f}ms")
+    return "\n".join(lines)
+
+def main(argv: list = None):
+    """
+        Runs the suite from the command line.
+
+        :param argv: An optional list of str arguments. Defaults to sys.argv.
+        :return: An int exit code, 1 if there were regressions.
+    """
+    arg_parser = argparse.ArgumentParser(prog="python -m test.benchmark_suite",
+                                         description="Benchmark loading synthetic datatables.")
+    arg_parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES,
+                            help="How many copies of each row the datatables have.")
+    arg_parser.add_argument("--work-dir", default="benchmark_datatables",
+                            help="The folder the synthetic datatables are written to "
+                            "and reused from.")
+    arg_parser.add_argument("--repeat", type=int, default=3,
+                            help="How many times each timing is run.")
+    arg_parser.add_argument("--output", metavar="PATH", help="Write the results to a JSON file.")
+    arg_parser.add_argument("--baseline", metavar="PATH",
+                            help="Compare the results to a JSON file from an earlier run.")
+    arg_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                            help="How much worse than the baseline a result can get.")
+    args = arg_parser.parse_args(argv)
+
+    os.makedirs(args.work_dir, exist_ok=True)
+    results = run_suite(args.scales, args.work_dir, args.repeat)
+    print(format_results(results))
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(results, output_file, indent=2)
+
+    if args.baseline is not None:
+        with open(args.baseline, "r", encoding="utf-8") as baseline_file:
+            regressions = compare_results(json.load(baseline_file), results, args.threshold)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        if len(regressions) > 0:
+            return 1
+        print(f"No regressions over {args.threshold:.0%}.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
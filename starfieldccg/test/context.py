@@ -2,15 +2,30 @@
     Makes it so that the tests have the context of the ../src directory.
 """
 
+import shutil
 import sys
 from os import path as OSPATH
 sys.path.insert(0, OSPATH.abspath(OSPATH.join(OSPATH.dirname(__file__), '../.')))
 # pylint: disable=wrong-import-position
 # pylint: disable=import-error
 # pylint: disable=unused-import
+import src.batch_files as BF
+import src.catalog as CA
+import src.catalog_database as CD
+import src.catalog_mapfile as CM
+import src.catalog_snapshot as CS
+import src.command_cache as CC
 import src.data_file_reader as DFR
+import src.datatable_formats as DF
+import src.datatable_layers as DL
 import src.data_objects as DO
+import src.item_builders as IB
+import src.item_indexes as II
+import src.item_store as IS
+import src.load_timings as LT
 import src.menu_views as MV
+import src.one_shot as OSC
+import src.reader_backends as RB
 import src.settings_io as SIO
 
 # pylint: disable=too-few-public-methods
@@ -26,6 +41,18 @@ class SCCGTestContext():
         self.known_datasheet_path = OSPATH.abspath(OSPATH.join(OSPATH.dirname(__file__),
                                                   '../data/Starfield_Datatable.xls'))
 
+    def copy_datasheet(self, tgt_folder: str):
+        """
+        Copies the known datasheet into a folder so tests can write files next to it.
+
+        :param tgt_folder: A str path to the folder to copy the datasheet into.
+
+        :return: A str path to the copied datasheet.
+        """
+        tgt_path = OSPATH.join(tgt_folder, OSPATH.basename(self.known_datasheet_path))
+        shutil.copyfile(self.known_datasheet_path, tgt_path)
+        return tgt_path
+
     def get_a_dfr(self):
         """
         Static Method, returns a DataFileReader object that uses the correct path 
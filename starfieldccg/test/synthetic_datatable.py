@@ -0,0 +1,119 @@
+"""
+    Generates synthetic, scaled up copies of the datatable for benchmarks.
+"""
+import xlrd
+
+# Columns of each sheet holding item names. Copies get a suffix on these so
+# keys stay unique and spacesuit sets still point at existing items.
+NAME_COLUMNS = {
+    "Spacesuit_Sets": (0, 1, 2, 3)
+}
+MISSING_VALUES = ("", "NA")
+XLS_MAX_ROWS = 65536  # The most rows a .xls sheet can have, including the header.
+
+def read_datatable_rows(datasheet_path: str):
+    """
+        Reads every sheet of a datatable as plain python values.
+
+        :param datasheet_path: A str path to the datatable to read.
+        :return: A dict of sheet names to a tuple of (header list, list of row lists).
+    """
+    output_dict = {}
+    workbook = xlrd.open_workbook(datasheet_path)
+    for sheet in workbook.sheets():
+        rows = []
+        for row in range(sheet.nrows):
+            values = sheet.row_values(row)
+            types = sheet.row_types(row)
+            rows.append([bool(value) if cell_type == xlrd.XL_CELL_BOOLEAN else value
+                         for value, cell_type in zip(values, types)])
+        if len(rows) > 0:
+            output_dict[sheet.name] = (rows[0], rows[1:])
+        else:
+            output_dict[sheet.name] = ([], [])
+    return output_dict
+
+def scale_rows(sheet_name: str, rows: list, scale: int):
+    """
+        Repeats the rows of a sheet, suffixing the names of each copy.
+
+        :param sheet_name: A str of the sheet the rows are from.
+        :param rows: A list of row lists.
+        :param scale: An int of how many copies of the rows to make.
+        :return: A list of the scaled row lists.
+    """
+    name_columns = NAME_COLUMNS.get(sheet_name, (0,))
+    output_list = []
+    for copy_number in range(scale):
+        for row in rows:
+            new_row = list(row)
+            if copy_number > 0:
+                for column in name_columns:
+                    if column < len(new_row) and isinstance(new_row[column], str) \
+                    and new_row[column] not in MISSING_VALUES:
+                        new_row[column] = f"{new_row[column]} #{copy_number}"
+            output_list.append(new_row)
+    return output_list
+
+def write_synthetic_datatable(tgt_path: str, scale: int, source_path: str):
+    """
+        Writes a .xls datatable with the same sheets as the source, but with
+        every item sheet's rows repeated scale times. Sheets that would go past
+        the .xls row limit are cut off at it.
+
+        :param tgt_path: A str path to write the new datatable to.
+        :param scale: An int of how many copies of each row to write.
+        :param source_path: A str path to the datatable to copy.
+        :return: A str of the tgt_path.
+    """
+    sheets = {}
+    for sheet_name, (header, rows) in read_datatable_rows(source_path).items():
+        if sheet_name != "Title":
+            rows = scale_rows(sheet_name, rows, scale)[:XLS_MAX_ROWS - 1]
+        sheets[sheet_name] = (header, rows)
+    return write_datatable(tgt_path, sheets)
+
+def write_datatable(tgt_path: str, sheets: dict):
+    """
+        Writes a .xls datatable from the header and rows of each sheet.
+
+        :param tgt_path: A str path to write the datatable to.
+        :param sheets: A dict of sheet names to (header list, list of row lists) \
+like read_datatable_rows() returns.
+        :return: A str of the tgt_path.
+    """
+    # pylint: disable=import-outside-toplevel
+    import xlwt
+
+    workbook = xlwt.Workbook()
+    for sheet_name, (header, rows) in sheets.items():
+        worksheet = workbook.add_sheet(sheet_name)
+        for row_number, row in enumerate([header] + rows):
+            for column, value in enumerate(row):
+                if value != "":
+                    worksheet.write(row_number, column, value)
+    workbook.save(tgt_path)
+    return tgt_path
+
+def make_synthetic_frames(source_path: str, row_count: int):
+    """
+        Builds a DataFrame for every item sheet of a datatable with the rows
+        repeated until each sheet has exactly row_count rows.
+
+        :param source_path: A str path to the datatable to copy.
+        :param row_count: An int of how many rows each sheet should have.
+        :return: A dict of sheet names to DataFrames.
+    """
+    # pylint: disable=import-outside-toplevel
+    import pandas as pd
+
+    output_dict = {}
+    with pd.ExcelFile(source_path) as workbook:
+        for sheet_name in workbook.sheet_names:
+            if sheet_name == "Title":
+                continue
+            source = workbook.parse(sheet_name)
+            copies = -(-row_count // len(source))
+            rows = scale_rows(sheet_name, source.values.tolist(), copies)[:row_count]
+            output_dict[sheet_name] = pd.DataFrame(rows, columns=source.columns)
+    return output_dict
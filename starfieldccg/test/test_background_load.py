@@ -0,0 +1,122 @@
+"""
+    Tests loading a DataFileReader's item dicts on a background thread.
+"""
+import threading
+import time
+from os import path as OSPATH
+import pytest
+from .context import SCCGTestContext as STC
+from .context import CA, DFR
+
+def join_background_load(test_reader):
+    """
+        Waits for a reader's background load to finish.
+
+        :param test_reader: A DataFileReader that may be loading in the background.
+    """
+    load_thread = test_reader.load_thread
+    if load_thread is not None:
+        load_thread.join(30)
+    assert test_reader.is_loading() is False
+
+def test_background_load():
+    """
+        Tests that the background load builds every item dict.
+    """
+
+    test_reader = DFR.DataFileReader(STC().known_datasheet_path, load_in_background=True)
+    assert len(test_reader.wait_for_catalog("weapon_data")) == 139
+
+    join_background_load(test_reader)
+    assert test_reader.get_load_progress() == (11, 11)
+    assert len(test_reader.spacesuit_set_data) == 86
+
+def test_wait_for_catalog_goes_first():
+    """
+        Tests that the item dict being waited for is built next, and that the
+        progress is reported while waiting.
+    """
+
+    test_reader = STC().get_a_dfr()
+    progress = []
+    waiting = threading.Event()
+
+    def on_wait(load_progress):
+        progress.append(load_progress)
+        waiting.set()
+
+    waiter = threading.Thread(target=test_reader.wait_for_catalog,
+                              args=("resource_data", on_wait, 0.01))
+    with test_reader.load_lock:
+        # The background thread takes the first item dict and waits for the lock.
+        test_reader.start_background_load()
+        for _ in range(1000):
+            if len(test_reader.pending_catalogs) < 11:
+                break
+            time.sleep(0.01)
+        waiter.start()
+        assert waiting.wait(10) is True
+    waiter.join(30)
+    join_background_load(test_reader)
+
+    assert list(test_reader.catalog_data)[:2] == ["ammo_data", "resource_data"]
+    assert progress[0] == (0, 11)
+
+def test_background_load_error(tmp_path):
+    """
+        Tests that an error building an item dict in the background is raised
+        by wait_for_catalog().
+    """
+
+    test_reader = DFR.DataFileReader(OSPATH.join(tmp_path, "missing.xls"),
+                                     load_in_background=True)
+    with pytest.raises(FileNotFoundError):
+        test_reader.wait_for_catalog("ammo_data")
+    join_background_load(test_reader)
+    with pytest.raises(ValueError):
+        test_reader.wait_for_catalog("not_a_catalog")
+
+def test_background_load_snapshot(tmp_path):
+    """
+        Tests that the background load saves the snapshot and that the next
+        reader loads it.
+    """
+
+    datasheet_path = STC().copy_datasheet(tmp_path)
+    test_reader = DFR.DataFileReader(datasheet_path, use_snapshot=True, load_in_background=True)
+    join_background_load(test_reader)
+    assert test_reader.loaded_from_snapshot is False
+    assert OSPATH.exists(test_reader.snapshot.snapshot_path) is True
+
+    snapshot_reader = DFR.DataFileReader(datasheet_path, use_snapshot=True,
+                                         load_in_background=True)
+    assert len(snapshot_reader.wait_for_catalog("ammo_data")) == 22
+    join_background_load(snapshot_reader)
+    assert snapshot_reader.loaded_from_snapshot is True
+
+def test_close_stops_background_load():
+    """
+        Tests that closing a Catalog stops its background load once the item
+        dict being built is built, and waits for it before closing the backends.
+    """
+
+    test_catalog = CA.Catalog(STC().known_datasheet_path, use_snapshot=False)
+    test_reader = test_catalog.get_reader()
+    with test_reader.load_lock:
+        # The background thread takes the first item dict and waits for the lock.
+        test_reader.start_background_load()
+        for _ in range(1000):
+            if len(test_reader.pending_catalogs) < 11:
+                break
+            time.sleep(0.01)
+        closer = threading.Thread(target=test_catalog.close)
+        closer.start()
+        assert test_reader.load_stop.wait(10) is True
+    closer.join(30)
+
+    assert closer.is_alive() is False
+    assert test_reader.is_loading() is False
+    assert test_reader.get_load_progress() == (1, 11)
+    assert test_reader.backends == {}
+    assert len(test_reader.wait_for_catalog("weapon_data")) == 139
+    test_reader.close()
@@ -0,0 +1,104 @@
+"""
+    Tests the batch_files module.
+"""
+import json
+import os
+from os import path as OSPATH
+import pytest
+from .context import SCCGTestContext as STC
+from .context import BF
+
+def read_lines(file_path: str):
+    """
+        Reads the lines of a text file.
+
+        :param file_path: A str path to the file.
+        :return: A list of str lines.
+    """
+    with open(file_path, "r", encoding="utf-8") as text_file:
+        return text_file.read().splitlines()
+
+def test_single_batch_file(tmp_path):
+    """
+        Tests that without a line limit every command goes in one batch file,
+        and the index adds up the lines of each label.
+    """
+
+    with BF.BatchFileWriter(OSPATH.join(tmp_path, "loadout.txt")) as writer:
+        assert writer.write_commands(["player.additem 0000000F 10"], "Credits x10") == 1
+        assert writer.write_commands(["player.additem 1 1\nplayer.additem 2 1"], "Set") == 2
+        assert writer.write_commands(["player.additem 3 1"], "Set") == 1
+        assert writer.write_commands([""], "Nothing") == 0
+
+    assert read_lines(OSPATH.join(tmp_path, "loadout.txt")) == \
+        ["player.additem 0000000F 10", "player.additem 1 1", "player.additem 2 1",
+         "player.additem 3 1"]
+    with open(OSPATH.join(tmp_path, "loadout_index.json"), "r", encoding="utf-8") as index_file:
+        index = json.load(index_file)
+    assert index["lines"] == 4
+    assert index["batches"] == [{"file": "loadout.txt", "lines": 4,
+                                 "contents": [{"label": "Credits x10", "lines": 1},
+                                              {"label": "Set", "lines": 3}]}]
+
+def test_split_batch_files(tmp_path):
+    """
+        Tests that the commands are split into numbered files at the line limit,
+        with a label that spans two files listed in both.
+    """
+
+    commands = (f"player.additem {number:08X} 1" for number in range(10_005))
+    with BF.BatchFileWriter(OSPATH.join(tmp_path, "big"), max_lines=4000) as writer:
+        writer.write_commands(["player.additem 0000000F 1"], "First")
+        writer.write_commands(commands, "Bulk")
+    batches = writer.close()
+
+    assert repr(writer) == (f"BatchFileWriter(target_stem='{writer.target_stem}', "
+                            "max_lines=4000, batches=3, line_count=10006)")
+    assert [batch["file"] for batch in batches] == ["big_1.txt", "big_2.txt", "big_3.txt"]
+    assert [batch["lines"] for batch in batches] == [4000, 4000, 2006]
+    assert batches[0]["contents"] == [{"label": "First", "lines": 1},
+                                      {"label": "Bulk", "lines": 3999}]
+    assert read_lines(OSPATH.join(tmp_path, "big_3.txt"))[-1] == "player.additem 00002714 1"
+    assert sorted(os.listdir(tmp_path)) == ["big_1.txt", "big_2.txt", "big_3.txt",
+                                            "big_index.json"]
+
+def test_batch_writer_abort(tmp_path):
+    """
+        Tests that a with block that raises leaves no half written batch file,
+        and that a bad line limit isn't taken.
+    """
+
+    with pytest.raises(RuntimeError):
+        with BF.BatchFileWriter(OSPATH.join(tmp_path, "broken")) as writer:
+            writer.write_commands(["player.additem 0000000F 1"])
+            raise RuntimeError("stopped")
+    assert not os.listdir(tmp_path)
+    with pytest.raises(ValueError):
+        BF.BatchFileWriter(OSPATH.join(tmp_path, "bad"), max_lines=0)
+
+def test_loadout_to_batch_file(tmp_path):
+    """
+        Tests that a loadout .csv file is read a row at a time and its batch
+        commands are written to a batch file.
+    """
+
+    loadout_path = OSPATH.join(tmp_path, "loadout.csv")
+    with open(loadout_path, "w", encoding="utf-8") as loadout_file:
+        loadout_file.write("Category,Name,Quantity\nammo,.27 Caliber,100\n\n"
+                           "ammo, .27 caliber ,50\narmor quality mod,II\n")
+    entries = list(BF.iter_loadout_entries(loadout_path))
+    assert entries == [("ammo", ".27 Caliber", 100), ("ammo", " .27 caliber ", 50),
+                       ("armor quality mod", "II", 1)]
+
+    test_reader = STC().get_a_dfr()
+    batch = test_reader.get_command_cache().make_batch(entries)
+    with BF.BatchFileWriter(OSPATH.join(tmp_path, "loadout")) as writer:
+        writer.write_commands(batch.iter_commands(), "Loadout")
+    assert read_lines(OSPATH.join(tmp_path, "loadout.txt")) == [
+        test_reader.ammo_data[".27 caliber"].get_command(150),
+        test_reader.armor_quality_mods_data["ii"].get_command()]
+
+    with open(loadout_path, "a", encoding="utf-8") as loadout_file:
+        loadout_file.write("ammo,.27 Caliber,lots\n")
+    with pytest.raises(ValueError):
+        list(BF.iter_loadout_entries(loadout_path))
@@ -0,0 +1,70 @@
+"""
+    Tests the benchmark_suite module.
+"""
+import json
+from os import path as OSPATH
+import pytest
+from .benchmark_suite import compare_results, main, run_suite
+
+def make_results(catalog_seconds: float, peak_bytes: int, parse_seconds: float = 0.1):
+    """
+        Returns results like run_suite() makes for a single 10x scale.
+
+        :param catalog_seconds: A float of the whole catalog time.
+        :param peak_bytes: An int of the peak memory.
+        :param parse_seconds: A float of the Weapons sheet's parse time.
+        :return: A dict of results.
+    """
+    return {"format_version": 1,
+            "scales": {"10": {"construct_seconds": 0.0001, "open_seconds": 0.01,
+                              "catalog_seconds": catalog_seconds,
+                              "peak_bytes": peak_bytes, "retained_bytes": 500,
+                              "gc_objects": 1000, "items": 10, "rows": {"Weapons": 10},
+                              "sheets": {"Weapons": {"parse": parse_seconds, "build": 0.1}}}}}
+
+def test_compare_results():
+    """
+        Tests that only the results that got worse by more than the threshold
+        are reported, and that tiny timings are skipped.
+    """
+
+    baseline = make_results(1.0, 1000)
+    assert not compare_results(baseline, make_results(1.2, 1100), 0.25)
+
+    regressions = compare_results(baseline, make_results(1.5, 2000, 0.2), 0.25)
+    assert [regression.split(":")[0] for regression in regressions] == \
+        ["10x catalog_seconds", "10x peak_bytes", "10x Weapons parse"]
+
+    # The construct time grew tenfold, but it is under MIN_COMPARED_SECONDS.
+    current = make_results(1.0, 1000)
+    current["scales"]["10"]["construct_seconds"] = 0.001
+    assert not compare_results(baseline, current)
+
+def test_compare_results_versions():
+    """
+        Tests that results saved by another version of the suite aren't compared.
+    """
+
+    baseline = make_results(1.0, 1000)
+    baseline["format_version"] = 0
+    with pytest.raises(ValueError):
+        compare_results(baseline, make_results(1.0, 1000))
+
+def test_run_suite(tmp_path):
+    """
+        Tests running the suite at 1x from the command line, saving the results
+        and comparing them against themselves.
+    """
+
+    output_path = OSPATH.join(tmp_path, "results.json")
+    assert main(["--scales", "1", "--repeat", "1", "--work-dir", str(tmp_path),
+                 "--output", output_path]) == 0
+    with open(output_path, "r", encoding="utf-8") as output_file:
+        results = json.load(output_file)
+
+    scale_results = results["scales"]["1"]
+    assert scale_results["rows"]["Weapons"] == 139
+    assert scale_results["items"] == sum(scale_results["rows"].values())
+    assert set(scale_results["sheets"]["Weapons"]) == {"parse", "build"}
+    assert scale_results["peak_bytes"] > 0
+    assert not compare_results(results, run_suite([1], str(tmp_path), 1), threshold=100)
@@ -0,0 +1,746 @@
+"""
+    Benchmarks for loading the datatable. They take a while, so they only run
+    when the SCCG_BENCHMARKS environment variable is set to 1, e.g.:
+
+    SCCG_BENCHMARKS=1 python -m pytest -s test/test_benchmarks.py
+"""
+import gc
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+import pytest
+from .context import SCCGTestContext as STC
+from .context import DFR, DO
+from .benchmark_suite import best_time
+from .synthetic_datatable import write_synthetic_datatable
+
+BENCHMARKS_ENABLED = os.environ.get("SCCG_BENCHMARKS") == "1"
+SKIP_REASON = "benchmarks only run when SCCG_BENCHMARKS=1"
+SYNTHETIC_SCALE = 50    # How many copies of each row the synthetic datatable has.
+
+def read_sheets_one_at_a_time(datasheet_path: str):
+    """
+        Reads the sheets the way DataFileReader used to, opening the
+        workbook again for every sheet.
+
+        :param datasheet_path: A str path to the datatable.
+        :return: A dict of sheet names to DataFrames.
+    """
+    # pylint: disable=import-outside-toplevel
+    import pandas as pd
+
+    return {sheet: pd.read_excel(datasheet_path, sheet_name=sheet)
+            for sheet in DFR.DataFileReader.SHEET_NAMES}
+
+def compare_read_paths(datasheet_path: str, label: str):
+    """
+        Prints the time for reading a datatable one sheet at a time vs
+        with a single open.
+
+        :param datasheet_path: A str path to the datatable.
+        :param label: A str describing the datatable.
+        :return: A tuple of the (old, new) times in seconds.
+    """
+    test_reader = STC().get_a_dfr()
+    test_reader.file_path = datasheet_path
+
+    old_time = best_time(lambda: read_sheets_one_at_a_time(datasheet_path))
+    new_time = best_time(test_reader.read_sheets)
+    used_time = best_time(lambda: test_reader.read_sheets(used_columns_only=True))
+    print(f"\n{label}: one open per sheet {old_time:.3f}s, single open {new_time:.3f}s, "
+          f"single open used columns {used_time:.3f}s ({old_time / new_time:.1f}x)")
+    return (old_time, new_time)
+
+@pytest.mark.skipif(BENCHMARKS_ENABLED is not True, reason=SKIP_REASON)
+def test_benchmark_read_sheets_shipped():
+    """
+        Benchmarks reading the shipped datatable.
+    """
+
+    compare_read_paths(STC().known_datasheet_path, "Shipped datatable")
+
+@pytest.mark.skipif(BENCHMARKS_ENABLED is not True, reason=SKIP_REASON)
+def test_benchmark_read_sheets_synthetic(tmp_path):
+    """
+        Benchmarks reading a datatable with every row repeated SYNTHETIC_SCALE times.
+    """
+
+    pytest.importorskip("xlwt")
+    datasheet_path = write_synthetic_datatable(str(tmp_path / "synthetic.xls"), SYNTHETIC_SCALE,
+                                               STC().known_datasheet_path)
+    compare_read_paths(datasheet_path, f"{SYNTHETIC_SCALE}x synthetic datatable")
+
+def time_parallel_load(datasheet_path: str, max_workers: int, executor_type: str):
+    """
+        Times building a whole catalog with load_parallel().
+
+        :param datasheet_path: A str path to the datatable.
+        :param max_workers: An int of how many workers to use.
+        :param executor_type: A str of "process" or "thread".
+        :return: A float of the time in seconds.
+    """
+    def load():
+        test_reader = DFR.DataFileReader(datasheet_path)
+        test_reader.load_parallel(max_workers, executor_type)
+    return best_time(load)
+
+@pytest.mark.skipif(BENCHMARKS_ENABLED is not True, reason=SKIP_REASON)
+def test_benchmark_load_parallel(tmp_path):
+    """
+        Benchmarks building the catalog serially vs. with thread and process pools.
+    """
+
+    pytest.importorskip("xlwt")
+    datasheet_path = write_synthetic_datatable(str(tmp_path / "synthetic.xls"), SYNTHETIC_SCALE,
+                                               STC().known_datasheet_path)
+    serial_time = best_time(lambda: DFR.DataFileReader(datasheet_path).build_catalog())
+    print(f"\n{SYNTHETIC_SCALE}x synthetic datatable, {os.cpu_count()} cpus: serial "
+          f"{serial_time:.3f}s")
+    for max_workers in [2, 4]:
+        for executor_type in ["thread", "process"]:
+            parallel_time = time_parallel_load(datasheet_path, max_workers, executor_type)
+            print(f"{executor_type} pool, {max_workers} workers: {parallel_time:.3f}s "
+                  f"({serial_time / parallel_time:.1f}x)")
+
+    test_reader = DFR.DataFileReader(datasheet_path)
+    test_reader.load_parallel(4, "process")
+    print(test_reader.format_sheet_timings())
+
+BUILDER_ROW_COUNT = 100_000 # Rows in each synthetic DataFrame for the builder benchmark.
+
+def legacy_sheet_columns(data, column_count: int):
+    """
+        Walks a DataFrame one .loc row at a time the way the get_*_data
+        methods used to, collecting the values into columns.
+
+        :param data: A DataFrame to walk.
+        :param column_count: An int of how many leading columns to collect.
+        :return: A list of column lists.
+    """
+    columns = [[] for _ in range(column_count)]
+    for row in range(data.shape[0]):
+        temp_row = data.loc[row]
+        for column in range(column_count):
+            columns[column].append(temp_row.iloc[column])
+    return columns
+
+@pytest.mark.skipif(BENCHMARKS_ENABLED is not True, reason=SKIP_REASON)
+def test_benchmark_item_builders():
+    """
+        Benchmarks building each item dict from a BUILDER_ROW_COUNT row synthetic
+        DataFrame with the column builders vs. walking the rows with .loc.
+    """
+
+    # pylint: disable=import-outside-toplevel
+    # pylint: disable=cell-var-from-loop
+    from .synthetic_datatable import make_synthetic_frames
+
+    frames = make_synthetic_frames(STC().known_datasheet_path, BUILDER_ROW_COUNT)
+    print(f"\nBuilding each item dict from {BUILDER_ROW_COUNT} rows:")
+    for name, (sheet_name, _) in DFR.DataFileReader.CATALOG_SOURCES.items():
+        test_reader = STC().get_a_dfr()
+        test_reader.datasheets.loaded_sheets.update(frames)
+        for dependency in DFR.DataFileReader.CATALOG_SOURCES[name][1]:
+            test_reader.load_catalog(dependency)
+
+        new_time = best_time(lambda: test_reader.build_catalog_data(name), repeat=1)
+
+        column_count = test_reader.SHEET_COLUMN_COUNTS[sheet_name]
+        test_reader.get_sheet_columns = lambda sheet: legacy_sheet_columns(
+            frames[sheet], column_count)
+        old_time = best_time(lambda: test_reader.build_catalog_data(name), repeat=1)
+
+        assert len(test_reader.build_catalog_data(name)) == BUILDER_ROW_COUNT
+        print(f"{name:<26} .loc rows {old_time:7.3f}s, columns {new_time:7.3f}s "
+              f"({old_time / new_time:.1f}x)")
+
+def time_cold_load(datasheet_path: str, backend: str):
+    """
+        Builds the whole catalog in a fresh interpreter and returns how long the
+        imports and the build took, so the cost of importing pandas is counted.
+
+        :param datasheet_path: A str path to the datatable.
+        :param backend: A str of the reader backend to build the catalog with.
+        :return: A float of the seconds from the first import to the built catalog.
+    """
+    package_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../."))
+    script = "\n".join([
+        "import sys, time",
+        "start = time.perf_counter()",
+        f"sys.path.insert(0, {package_path!r})",
+        "import src.data_file_reader as DFR",
+        f"DFR.DataFileReader({datasheet_path!r}, backend={backend!r}).get_catalog()",
+        "print(time.perf_counter() - start)"
+    ])
+    times = []
+    for _ in range(3):
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True,
+                                text=True, check=True, cwd=package_path)
+        times.append(float(result.stdout.strip()))
+    return min(times)
+
+@pytest.mark.skipif(BENCHMARKS_ENABLED is not True, reason=SKIP_REASON)
+def test_benchmark_reader_backends(tmp_path):
+    """
+        Benchmarks a cold start build of the catalog with the xlrd backend vs the
+        pandas backend on the shipped and synthetic datatables.
+    """
+
+    synthetic_path = write_synthetic_datatable(os.path.join(tmp_path, "synthetic.xls"),
+                                               SYNTHETIC_SCALE, STC().known_datasheet_path)
+    for label, datasheet_path in [("shipped", STC().known_datasheet_path),
+                                  (f"{SYNTHETIC_SCALE}x synthetic", synthetic_path)]:
+        xlrd_time = time_cold_load(datasheet_path, "xlrd")
+        pandas_time = time_cold_load(datasheet_path, "pandas")
+        print(f"\n{label} cold start: pandas backend {pandas_time:.3f}s, "
+              f"xlrd backend {xlrd_time:.3f}s ({pandas_time / xlrd_time:.1f}x)")
+
+LOOKUP_ROW_COUNT = 100_000  # Rows in the synthetic DataFrame for the lookup benchmark.
+LOOKUP_COUNT = 500  # How many names are looked up.
+
+@pytest.mark.skipif(BENCHMARKS_ENABLED is not True, reason=SKIP_REASON)
+def test_benchmark_cell_lookups():
+    """
+        Benchmarks looking up LOOKUP_COUNT ids by name in a LOOKUP_ROW_COUNT row
+        sheet with a list scan per lookup vs the column index and get_cell_values().
+    """
+
+    # pylint: disable=import-outside-toplevel
+    from .synthetic_datatable import make_synthetic_frames
+
+    resources_data = make_synthetic_frames(STC().known_datasheet_path,
+                                           LOOKUP_ROW_COUNT)["Resources"]
+    name_column, id_column = resources_data.columns[:2]
+    names = resources_data[name_column].tolist()[-LOOKUP_COUNT:]
+    test_reader = STC().get_a_dfr()
+
+    def scan_lookups():
+        return [resources_data.at[resources_data[name_column].array.tolist().index(name),
+                                  id_column] for name in names]
+
+    def index_lookups():
+        test_reader.clear_row_indexes()
+        return [test_reader.get_cell_value(resources_data, name_column, name, id_column)
+                for name in names]
+
+    def bulk_lookups():
+        test_reader.clear_row_indexes()
+        return test_reader.get_cell_values(resources_data, name_column, names, id_column)
+
+    assert scan_lookups() == index_lookups() == bulk_lookups()
+    scan_time = best_time(scan_lookups, repeat=1)
+    index_time = best_time(index_lookups)
+    bulk_time = best_time(bulk_lookups)
+    print(f"\n{LOOKUP_COUNT} lookups in {LOOKUP_ROW_COUNT} rows: list scan {scan_time:.3f}s, "
+          f"index {index_time:.3f}s, bulk {bulk_time:.3f}s ({scan_time / bulk_time:.0f}x)")
+
+FILTER_ROW_COUNT = 100_000  # Weapons in the synthetic DataFrame for the filter benchmark.
+
+@pytest.mark.skipif(BENCHMARKS_ENABLED is not True, reason=SKIP_REASON)
+def test_benchmark_weapon_filters():
+    """
+        Benchmarks getting the filtered weapon sets the weapons menu opens with
+        by scanning every weapon vs the secondary indexes.
+    """
+
+    # pylint: disable=import-outside-toplevel
+    from .synthetic_datatable import make_synthetic_frames
+
+    test_reader = STC().get_a_dfr()
+    test_reader.datasheets.loaded_sheets.update(
+        make_synthetic_frames(STC().known_datasheet_path, FILTER_ROW_COUNT))
+    load_time = best_time(lambda: test_reader.load_catalog("weapon_data"), repeat=1)
+    weapon_dict = dict(test_reader.weapon_data)
+
+    def scan_filters():
+        return [{key: weapon for key, weapon in weapon_dict.items() if weapon.unique is True},
+                {key: weapon for key, weapon in weapon_dict.items() if weapon.unique is False},
+                {key: weapon for key, weapon in weapon_dict.items()
+                 if weapon.weapon_type == "gun"}]
+
+    def index_filters():
+        return [test_reader.get_weapons_by_unique(True), test_reader.get_weapons_by_unique(False),
+                test_reader.get_weapons_by_type("gun")]
+
+    assert [list(view) for view in index_filters()] == [list(view) for view in scan_filters()]
+    scan_time = best_time(scan_filters)
+    index_time = best_time(index_filters)
+    print(f"\n{FILTER_ROW_COUNT} weapons: load with indexes {load_time:.3f}s, "
+          f"menu filters by scan {scan_time * 1000:.1f}ms, by index {index_time * 1000:.4f}ms")
+
+STORE_ROW_COUNTS = [1_000, 100_000, 1_000_000]    # Weapon counts for the ItemStore benchmark.
+
+def make_synthetic_weapons(row_count: int):
+    """
+        Builds a weapon dict of row_count weapons by repeating the shipped
+        weapons with " #n" added to their names. Every other weapon is a DLC weapon.
+
+        :param row_count: An int of how many weapons to build.
+        :return: A dict of lowercase weapon names to WeaponItem objects.
+    """
+    # pylint: disable=import-outside-toplevel
+    from .context import IB
+
+    names, ids, _, unique_flags, weapon_types = STC().get_a_dfr().get_sheet_columns("Weapons")
+    rows = [(f"{names[row % len(names)]} #{row}", ids[row % len(names)], row % 2 == 0,
+             unique_flags[row % len(names)], weapon_types[row % len(names)])
+            for row in range(row_count)]
+    return IB.build_weapon_items([list(column) for column in zip(*rows)])
+
+@pytest.mark.skipif(BENCHMARKS_ENABLED is not True, reason=SKIP_REASON)
+def test_benchmark_item_store():
+    """
+        Benchmarks selecting the DLC guns that aren't unique with a dict
+        comprehension vs ItemStore masks at each of STORE_ROW_COUNTS.
+    """
+
+    # pylint: disable=import-outside-toplevel
+    # pylint: disable=cell-var-from-loop
+    from .context import IS
+
+    for row_count in STORE_ROW_COUNTS:
+        weapon_dict = make_synthetic_weapons(row_count)
+        build_time = best_time(lambda: IS.ItemStore(weapon_dict), repeat=1)
+        weapon_store = IS.ItemStore(weapon_dict)
+
+        def comprehension_filter():
+            return {key: weapon for key, weapon in weapon_dict.items()
+                    if weapon.dlc is True and weapon.weapon_type == "gun"
+                    and weapon.unique is False}
+
+        def store_filter():
+            return weapon_store.select(dlc=True, weapon_type="gun", unique=False)
+
+        def store_count():
+            return weapon_store.count(dlc=True, weapon_type="gun", unique=False)
+
+        assert list(store_filter()) == list(comprehension_filter())
+        assert store_count() == len(comprehension_filter())
+        comprehension_time = best_time(comprehension_filter)
+        select_time = best_time(store_filter)
+        count_time = best_time(store_count)
+        print(f"\n{row_count} weapons: store build {build_time:.3f}s, dict comprehension "
+              f"{comprehension_time * 1000:.2f}ms, store select {select_time * 1000:.2f}ms, "
+              f"store mask only {count_time * 1000:.3f}ms "
+              f"({comprehension_time / count_time:.0f}x)")
+
+@pytest.mark.skipif(BENCHMARKS_ENABLED is not True, reason=SKIP_REASON)
+def test_benchmark_catalog_database(tmp_path):
+    """
+        Benchmarks building the whole catalog from the synthetic datatable vs
+        from a catalog database exported from it, and an id lookup in each.
+    """
+
+    synthetic_path = write_synthetic_datatable(os.path.join(tmp_path, "synthetic.xls"),
+                                               SYNTHETIC_SCALE, STC().known_datasheet_path)
+    database_path = os.path.join(tmp_path, "synthetic.sqlite")
+    export_time = best_time(lambda: DFR.DataFileReader(synthetic_path)
+                            .export_database(database_path), repeat=1)
+
+    sheet_time = best_time(lambda: DFR.DataFileReader(synthetic_path).get_catalog())
+    database_time = best_time(lambda: DFR.DataFileReader(
+        None, database_path=database_path).get_catalog())
+
+    # pylint: disable=import-outside-toplevel
+    from .context import CD
+    test_database = CD.CatalogDatabase(database_path)
+    weapons = test_database.query("weapon_data")
+    wanted_id = weapons[-1]["item_id"]
+    scan_time = best_time(lambda: [weapon for weapon in DFR.DataFileReader(synthetic_path)
+                                   .weapon_data.values() if weapon.get_id() == wanted_id])
+    query_time = best_time(lambda: test_database.query(item_id=wanted_id))
+    print(f"\n{SYNTHETIC_SCALE}x synthetic: export {export_time:.3f}s, build from datasheet "
+          f"{sheet_time:.3f}s, build from database {database_time:.3f}s, id lookup by "
+          f"parsing the datasheet {scan_time * 1000:.1f}ms vs database {query_time * 1000:.2f}ms")
+
+@pytest.mark.skipif(BENCHMARKS_ENABLED is not True, reason=SKIP_REASON)
+def test_benchmark_reload(tmp_path):
+    """
+        Benchmarks a full load of the synthetic datatable vs reloading it after
+        one sheet was edited.
+    """
+
+    # pylint: disable=import-outside-toplevel
+    from .synthetic_datatable import read_datatable_rows, write_datatable
+
+    datasheet_path = write_synthetic_datatable(os.path.join(tmp_path, "synthetic.xls"),
+                                               SYNTHETIC_SCALE, STC().known_datasheet_path)
+    sheets = read_datatable_rows(datasheet_path)
+    full_time = best_time(lambda: DFR.DataFileReader(datasheet_path).get_catalog())
+
+    test_reader = DFR.DataFileReader(datasheet_path)
+    test_reader.get_catalog()
+    test_reader.record_sheet_hashes()
+
+    reload_times = []
+    for edit_number in range(3):
+        sheets["Weapons"][1][0][0] = f"Edited Weapon {edit_number}"
+        write_datatable(datasheet_path, sheets)
+        start = time.perf_counter()
+        assert test_reader.reload() == ["Weapons"]
+        reload_times.append(time.perf_counter() - start)
+    print(f"\n{SYNTHETIC_SCALE}x synthetic: full load {full_time:.3f}s, reload of one edited "
+          f"sheet {min(reload_times):.3f}s ({min(reload_times) / full_time:.0%} of a full load)")
+
+def get_peak_memory(func):
+    """
+        Runs a function and returns the peak memory python allocated during it.
+
+        :param func: A function with no arguments to measure.
+        :return: An int of the peak number of bytes.
+    """
+
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+@pytest.mark.skipif(BENCHMARKS_ENABLED is not True, reason=SKIP_REASON)
+def test_benchmark_iter_items(tmp_path):
+    """
+        Benchmarks the peak memory of streaming every item vs building the item
+        dicts, at two sizes of synthetic datatable. Spacesuit_Sets is left out of
+        the streaming since it needs the spacesuit, helmet, and pack dicts.
+    """
+
+    # pylint: disable=cell-var-from-loop
+
+    def stream_every_item(test_reader):
+        for sheet_name in test_reader.sheet_names:
+            if sheet_name != "Spacesuit_Sets":
+                for _ in test_reader.iter_items(sheet_name):
+                    pass
+
+    # Import xlrd before measuring so its modules aren't counted.
+    stream_every_item(STC().get_a_dfr())
+    stream_peaks = []
+    for scale in (10, 100):
+        datasheet_path = write_synthetic_datatable(
+            os.path.join(tmp_path, f"synthetic_{scale}.xls"), scale, STC().known_datasheet_path)
+        load_peak = get_peak_memory(lambda: DFR.DataFileReader(datasheet_path).get_catalog())
+        stream_peak = get_peak_memory(lambda: stream_every_item(DFR.DataFileReader(datasheet_path)))
+        stream_time = best_time(lambda: stream_every_item(DFR.DataFileReader(datasheet_path)), 1)
+        stream_peaks.append(stream_peak)
+        print(f"\n{scale}x synthetic: building the item dicts peaks at "
+              f"{load_peak / 2**20:.1f}MB, streaming every item peaks at "
+              f"{stream_peak / 2**20:.1f}MB ({stream_time:.2f}s)")
+
+    assert stream_peaks[1] < stream_peaks[0] * 2
+
+def time_first_lookups(tmp_path, scale: int):
+    """
+        Times getting to the first weapon lookup from a synthetic datatable, a
+        catalog database, and a catalog map file, and making every item from the map file.
+
+        :param tmp_path: The folder to write the files to.
+        :param scale: An int of how many copies of each row the datatable has.
+        :return: A str line of the results.
+    """
+    synthetic_path = write_synthetic_datatable(os.path.join(tmp_path, f"synthetic{scale}.xls"),
+                                               scale, STC().known_datasheet_path)
+    database_path = os.path.join(tmp_path, f"synthetic{scale}.sqlite")
+    map_path = os.path.join(tmp_path, f"synthetic{scale}.map")
+    test_reader = DFR.DataFileReader(synthetic_path)
+    test_reader.export_database(database_path)
+    test_reader.export_catalog_map(map_path)
+    wanted_key = list(test_reader.weapon_data)[-1]
+
+    sheet_time = best_time(lambda: DFR.DataFileReader(synthetic_path).weapon_data[wanted_key])
+    database_time = best_time(lambda: DFR.DataFileReader(
+        None, database_path=database_path).weapon_data[wanted_key])
+    map_time = best_time(lambda: DFR.DataFileReader(
+        None, map_path=map_path).weapon_data[wanted_key])
+    full_map_time = best_time(lambda: [data_dict.values() for data_dict in DFR.DataFileReader(
+        None, map_path=map_path).get_catalog().values()])
+    return (f"{scale}x synthetic ({os.path.getsize(map_path) / 1e6:.1f}MB map file): "
+            f"first weapon from datasheet {sheet_time * 1000:.1f}ms, database "
+            f"{database_time * 1000:.1f}ms, map file {map_time * 1000:.2f}ms, "
+            f"making every item from the map file {full_map_time:.3f}s")
+
+@pytest.mark.skipif(BENCHMARKS_ENABLED is not True, reason=SKIP_REASON)
+def test_benchmark_catalog_map(tmp_path):
+    """
+        Benchmarks getting to the first weapon lookup from the synthetic datatable,
+        a catalog database, and a catalog map file, at two sizes to show that
+        opening the map file doesn't grow with the catalog.
+    """
+
+    for scale in [SYNTHETIC_SCALE // 10, SYNTHETIC_SCALE]:
+        print(f"\n{time_first_lookups(tmp_path, scale)}")
+
+@pytest.mark.skipif(BENCHMARKS_ENABLED is not True, reason=SKIP_REASON)
+def test_benchmark_load_timings(tmp_path):
+    """
+        Benchmarks building the synthetic datatable's catalog with and without
+        recording the load timings.
+    """
+
+    synthetic_path = write_synthetic_datatable(os.path.join(tmp_path, "synthetic.xls"),
+                                               SYNTHETIC_SCALE, STC().known_datasheet_path)
+    plain_time = best_time(lambda: DFR.DataFileReader(synthetic_path).get_catalog(), repeat=5)
+    timed_time = best_time(lambda: DFR.DataFileReader(
+        synthetic_path, record_timings=True).get_catalog(), repeat=5)
+    test_reader = DFR.DataFileReader(synthetic_path, record_timings=True)
+    test_reader.get_catalog()
+    print(f"\n{SYNTHETIC_SCALE}x synthetic: whole catalog {plain_time:.3f}s without timings, "
+          f"{timed_time:.3f}s with timings\n{test_reader.format_load_report()}")
+
+@pytest.mark.skipif(BENCHMARKS_ENABLED is not True, reason=SKIP_REASON)
+def test_benchmark_datatable_formats(tmp_path):
+    """
+        Benchmarks building the whole catalog from the synthetic datatable
+        converted to each format, next to the size of each on disk.
+    """
+
+    # pylint: disable=import-outside-toplevel
+    import importlib.util
+
+    synthetic_path = write_synthetic_datatable(os.path.join(tmp_path, "synthetic.xls"),
+                                               SYNTHETIC_SCALE, STC().known_datasheet_path)
+    format_paths = {"xls": synthetic_path, "csv": os.path.join(tmp_path, "synthetic"),
+                    "json": os.path.join(tmp_path, "synthetic.json"),
+                    "ndjson": os.path.join(tmp_path, "synthetic.ndjson")}
+    if importlib.util.find_spec("openpyxl") is not None:
+        format_paths["xlsx"] = os.path.join(tmp_path, "synthetic.xlsx")
+
+    source_reader = DFR.DataFileReader(synthetic_path)
+    lines = [f"\n{SYNTHETIC_SCALE}x synthetic datatable by format:"]
+    for datatable_format, format_path in format_paths.items():
+        if format_path != synthetic_path:
+            source_reader.export_datatable(format_path)
+        if os.path.isdir(format_path):
+            file_bytes = sum(os.path.getsize(os.path.join(format_path, file_name))
+                             for file_name in os.listdir(format_path))
+        else:
+            file_bytes = os.path.getsize(format_path)
+        catalog_time = best_time(lambda path=format_path: DFR.DataFileReader(path).get_catalog())
+        lines.append(f"    {datatable_format:<7} {file_bytes / 1e6:7.2f}MB "
+                     f"whole catalog {catalog_time * 1000:8.1f}ms")
+    print("\n".join(lines))
+
+# How to make each item class again from one of its items.
+ITEM_ARGUMENTS = {
+    "AmmoItem": lambda item: (item.ammo_name, item.ammo_id),
+    "SpacesuitItem": lambda item: (item.spacesuit_name, item.spacesuit_id, item.dlc),
+    "PackItem": lambda item: (item.pack_name, item.pack_id, item.dlc),
+    "HelmetItem": lambda item: (item.helmet_name, item.helmet_id, item.dlc),
+    "SpacesuitSetItem": lambda item: (item.spacesuit_set_name, item.dlc),
+    "WeaponItem": lambda item: (item.weapon_name, item.weapon_id, item.dlc, item.unique,
+                                item.weapon_type),
+    "ResourceItem": lambda item: (item.resource_name, item.resource_id),
+    "StatusModType": lambda item: (item.status_mod_name, item.status_mod_id,
+                                   item.status_mod_desc, item.mod_slot),
+    "QualityModType": lambda item: (item.mod_name, item.mod_id)
+}
+
+def make_dict_item_class(item_class):
+    """
+        Returns a copy of an item class without __slots__, so its items keep
+        their fields in a __dict__ like they used to.
+
+        :param item_class: A slotted item class from data_objects.
+        :return: A class with the same methods whose items have a __dict__.
+    """
+    namespace = {name: value for name, value in vars(item_class).items()
+                 if name not in item_class.__slots__ and name != "__slots__"}
+    # The bases' empty __slots__ don't stop a subclass without them from having a __dict__.
+    return type(item_class.__name__, item_class.__bases__, namespace)
+
+def measure_item_bytes(item_class, arguments: list):
+    """
+        Makes an item from each set of arguments while tracing allocations.
+
+        :param item_class: The item class to make the items with.
+        :param arguments: A list of argument tuples, made before tracing starts \
+so the names and ids they hold aren't counted.
+        :return: A float of the bytes allocated for each item.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        items = [None] * len(arguments)
+        start_bytes = tracemalloc.get_traced_memory()[0]
+        for index, item_arguments in enumerate(arguments):
+            items[index] = item_class(*item_arguments)
+        item_bytes = tracemalloc.get_traced_memory()[0] - start_bytes
+    finally:
+        tracemalloc.stop()
+    return item_bytes / len(items)
+
+@pytest.mark.skipif(BENCHMARKS_ENABLED is not True, reason=SKIP_REASON)
+def test_benchmark_item_memory():
+    """
+        Benchmarks the bytes each item takes with __slots__ and with a __dict__.
+    """
+
+    item_count = 20000
+    lines = [f"\nBytes per item, {item_count} items of each class:"]
+    measured_classes = set()
+    for data_dict in STC().get_a_dfr().get_catalog().values():
+        sample_items = list(data_dict.values())
+        item_class = type(sample_items[0])
+        if item_class in measured_classes:
+            continue
+        measured_classes.add(item_class)
+        arguments = [ITEM_ARGUMENTS[item_class.__name__](item) for item in sample_items]
+        arguments = (arguments * (item_count // len(arguments) + 1))[:item_count]
+        slotted_bytes = measure_item_bytes(item_class, arguments)
+        dict_bytes = measure_item_bytes(make_dict_item_class(item_class), arguments)
+        lines.append(f"    {item_class.__name__:<16} __dict__ {dict_bytes:6.1f} "
+                     f"__slots__ {slotted_bytes:6.1f} ({1 - slotted_bytes / dict_bytes:.0%} less)")
+    print("\n".join(lines))
+
+def process_id_one_at_a_time(item_id: str, dlc: bool):
+    """
+        Normalizes one id the way ItemType.process_id() used to, a character at a
+        time and reading the settings every call.
+
+        :param item_id: A str id.
+        :param dlc: A bool of whether the item is from a DLC.
+        :return: A str of the normalized id.
+    """
+    temp_id_list = list(item_id)
+    dlc_prefix = DO.settings_io.global_settings.settings["dlc_load_order"]
+    if len(temp_id_list) != 8:
+        for i, char in enumerate(temp_id_list):
+            if char.lower() == "x":
+                temp_id_list[i] = "0"
+        while len(temp_id_list) > 8:
+            temp_id_list.pop(0)
+        while len(temp_id_list) < 8:
+            temp_id_list.insert(0, "0")
+    if dlc is True:
+        temp_id_list[0] = dlc_prefix[0]
+        temp_id_list[1] = dlc_prefix[1]
+    return "".join(temp_id_list)
+
+def make_synthetic_ids(id_count: int):
+    """
+        Makes ids of mixed lengths, some with x placeholders, and DLC flags for them.
+
+        :param id_count: An int of how many ids to make.
+        :return: A tuple of (list of str ids, list of bool DLC flags).
+    """
+    item_ids = []
+    for number in range(id_count):
+        item_id = f"{number * 2654435761 % 0xFFFFFFFFFF:X}"[:4 + number % 7]
+        if number % 5 == 0:
+            item_id = "xx" + item_id[2:]
+        item_ids.append(item_id)
+    return (item_ids, [number % 3 == 0 for number in range(id_count)])
+
+@pytest.mark.skipif(BENCHMARKS_ENABLED is not True, reason=SKIP_REASON)
+def test_benchmark_normalize_ids():
+    """
+        Benchmarks normalizing a million ids as one column and one at a time.
+    """
+
+    item_ids, dlc_flags = make_synthetic_ids(1_000_000)
+    column_ids = DO.normalize_ids(item_ids, dlc_flags)
+    assert column_ids == list(map(process_id_one_at_a_time, item_ids, dlc_flags))
+
+    column_time = best_time(lambda: DO.normalize_ids(item_ids, dlc_flags))
+    single_time = best_time(lambda: list(map(process_id_one_at_a_time, item_ids, dlc_flags)))
+    print(f"\nNormalizing {len(item_ids)} ids: one at a time {single_time:.3f}s, "
+          f"as a column {column_time:.3f}s ({single_time / column_time:.1f}x faster)")
+
+@pytest.mark.skipif(BENCHMARKS_ENABLED is not True, reason=SKIP_REASON)
+def test_benchmark_command_cache():
+    """
+        Benchmarks the commands of 100,000 weapons from the items and from a
+        CommandCache, and giving the DLC half of them a new load order prefix.
+    """
+    # pylint: disable=import-outside-toplevel
+    from .context import CC
+
+    test_reader = STC().get_a_dfr()
+    test_reader.store_catalog("weapon_data", make_synthetic_weapons(100_000))
+    weapons = test_reader.weapon_data
+    test_cache = CC.CommandCache(test_reader)
+    build_time = best_time(lambda: test_cache.entries.clear() or test_cache.get_entries(
+        "weapon_data"), repeat=3)
+
+    item_time = best_time(lambda: [item.get_command(1) for item in weapons.values()])
+    cached_time = best_time(lambda: [test_cache.get_command("weapon_data", key, 1)
+                                     for key in weapons])
+    prefix_time = best_time(lambda: test_cache.apply_dlc_load_order(
+        test_reader.get_dlc_load_order()), repeat=3)
+    test_cache.close()
+    print(f"\n{len(weapons)} weapons: building the cache {build_time:.3f}s, every command "
+          f"from the items {item_time:.3f}s, from the cache {cached_time:.3f}s, "
+          f"new DLC prefix for {len(weapons.get_indexed('dlc', True))} weapons "
+          f"{prefix_time:.3f}s")
+
+@pytest.mark.skipif(BENCHMARKS_ENABLED is not True, reason=SKIP_REASON)
+def test_benchmark_command_batch():
+    """
+        Benchmarks turning 100,000 (category, name, quantity) entries made from
+        every item of the shipped datatable into batch commands.
+    """
+
+    test_reader = STC().get_a_dfr()
+    test_cache = test_reader.get_command_cache()
+    items = [(sheet_name, item.get_name())
+             for catalog_name, (sheet_name, _) in test_reader.CATALOG_SOURCES.items()
+             for item in test_reader.load_catalog(catalog_name).values()]
+    entries = [(*items[row % len(items)], row % 7 + 1) for row in range(100_000)]
+    entries[::1000] = [("weapon", f"unknown weapon {row}", 1) for row in range(100)]
+
+    def run_batch():
+        batch = test_cache.make_batch(entries, allow_unknown=True)
+        return batch, sum(1 for _ in batch.iter_commands())
+
+    batch, line_count = run_batch()
+    assert len(batch.unknown) == 100
+    batch_time = best_time(run_batch)
+    print(f"\n{len(entries)} entries: {len(batch)} items, {line_count} lines, "
+          f"{len(batch.unknown)} unknown in {batch_time:.3f}s")
+
+@pytest.mark.skipif(BENCHMARKS_ENABLED is not True, reason=SKIP_REASON)
+def test_benchmark_batch_files(tmp_path):
+    """
+        Benchmarks streaming a million commands into batch files of 100,000
+        lines, and the peak memory it takes.
+    """
+    # pylint: disable=import-outside-toplevel
+    from .context import BF
+
+    def write_batches():
+        with BF.BatchFileWriter(os.path.join(tmp_path, "million"),
+                                max_lines=100_000) as writer:
+            writer.write_commands((f"player.additem {number:08X} 1"
+                                   for number in range(1_000_000)), "Bulk")
+        return writer
+
+    write_time = best_time(write_batches, repeat=3)
+    peak_bytes = get_peak_memory(write_batches)
+    print(f"\n1000000 commands in {len(write_batches().batches)} batch files: "
+          f"{write_time:.3f}s, peak memory {peak_bytes / 1024:.0f} KiB")
+
+@pytest.mark.skipif(BENCHMARKS_ENABLED is not True, reason=SKIP_REASON)
+def test_benchmark_one_shot_start():
+    """
+        Benchmarks the cold start of a one shot give command, from the catalog
+        snapshot and from the datasheet, against importing the menus and
+        loading the snapshot the way the interactive program starts.
+    """
+
+    package_parent = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+    give = [sys.executable, "-m", "starfieldccg", "give", "ammo", ".27 caliber", "3"]
+    menus = [sys.executable, "-c", "import starfieldccg.src.menu_views\n"
+             "from starfieldccg.src.catalog import DEFAULT_DATATABLE_PATH\n"
+             "from starfieldccg.src.data_file_reader import DataFileReader\n"
+             "DataFileReader(DEFAULT_DATATABLE_PATH, use_snapshot=True)"]
+    subprocess.run(give, check=True, capture_output=True, cwd=package_parent)
+
+    def time_run(command: list):
+        return best_time(lambda: subprocess.run(command, check=True, capture_output=True,
+                                                cwd=package_parent), repeat=10)
+
+    print(f"\nOne shot give: {time_run(give):.3f}s from the snapshot, "
+          f"{time_run(give + ['--no-snapshot']):.3f}s from the datasheet, "
+          f"menus and snapshot {time_run(menus):.3f}s")
@@ -0,0 +1,95 @@
+"""
+    Tests the catalog module.
+"""
+import json
+import subprocess
+import sys
+import threading
+from os import path as OSPATH
+import pytest
+from .context import SCCGTestContext as STC
+from .context import CA
+
+def test_import_reads_no_files():
+    """
+        Tests that importing the package opens no file but its own modules and
+        doesn't read the settings.
+    """
+
+    code = ("import sys\n"
+            "opened = []\n"
+            "sys.addaudithook(lambda event, args: opened.append(str(args[0]))\n"
+            "                 if event == 'open' else None)\n"
+            "import starfieldccg\n"
+            "import starfieldccg.src.one_shot\n"
+            "print(sorted({path for path in opened if not path.endswith(('.py', '.pyc'))\n"
+            "              and 'starfieldccg' in path}))\n"
+            "print('global_settings' in vars(starfieldccg.src.catalog.settings_io))\n")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                            check=True, cwd=OSPATH.abspath(OSPATH.join(OSPATH.dirname(__file__),
+                                                             "../..")))
+    assert result.stdout.splitlines() == ["[]", "False"]
+
+def test_catalog_is_shared_across_threads():
+    """
+        Tests that a Catalog makes its reader once, on first use, and gives the
+        same commands to every thread.
+    """
+
+    test_catalog = CA.Catalog(STC().known_datasheet_path, use_snapshot=False)
+    assert test_catalog.reader is None
+    results = []
+
+    def get_commands():
+        results.append((test_catalog.get_reader(),
+                        test_catalog.get_command("ammo", ".27 Caliber", 3)))
+
+    threads = [threading.Thread(target=get_commands) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    reader = test_catalog.get_reader()
+    ammo = next(item for item in reader.ammo_data.values() if item.get_name() == ".27 Caliber")
+    assert results == [(reader, ammo.get_command(3))] * 8
+    assert repr(test_catalog) == (f"Catalog(datatable_path='{STC().known_datasheet_path}', "
+                                  "overlay_paths=[], loaded=True)")
+    backends = list(reader.backends.values())
+    assert len(backends) > 0
+    test_catalog.close()
+    assert test_catalog.reader is None
+    assert all(backend.workbook is None for backend in backends)
+    assert reader.backends == {}
+
+def test_catalog_commands(tmp_path):
+    """
+        Tests the commands of a spacesuit set, status mods, and batch files, and
+        that unknown categories and mods are reported.
+    """
+
+    with CA.Catalog(STC().known_datasheet_path, use_snapshot=False) as test_catalog:
+        suit_set = test_catalog.get_items("spacesuit sets")["fang's"]
+        assert test_catalog.get_command("Spacesuit_Sets", "Fang's") == suit_set.get_command(1)
+        with pytest.raises(ValueError):
+            test_catalog.get_command("not a category", "x")
+
+        mods = test_catalog.get_items("armor status mods")
+        first_mod = next(mod for mod in mods.values() if mod.mod_slot == 1)
+        assert test_catalog.get_status_mod_commands("armor", [first_mod.get_name(), None]) == \
+            [first_mod.get_command()]
+        with pytest.raises(ValueError) as error:
+            test_catalog.get_status_mod_commands("armor", [None, first_mod.get_name()])
+        assert "not slot 2" in str(error.value)
+
+        batch_path = str(tmp_path / "loadout")
+        batches = test_catalog.write_batch_files([("ammo", ".27 Caliber", 10)], batch_path,
+                                                 label="Ammo")
+        assert batches == [{"file": "loadout.txt", "lines": 1,
+                            "contents": [{"label": "Ammo", "lines": 1}]}]
+        with open(f"{batch_path}_index.json", "r", 1, "UTF-8") as index_file:
+            assert json.load(index_file)["lines"] == 1
+        with pytest.raises(ValueError):
+            test_catalog.write_batch_files([("ammo", "not an ammo", 1)], batch_path)
+
+    with pytest.raises(ValueError):
+        CA.Catalog(overlay_paths=["overlay.xls"], map_path="catalog.map")
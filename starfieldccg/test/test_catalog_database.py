@@ -0,0 +1,133 @@
+"""
+    Tests the catalog_database module.
+"""
+import sqlite3
+from os import path as OSPATH
+import pytest
+from .context import SCCGTestContext as STC
+from .context import CD, DFR, MV
+
+def get_catalog_reprs(reader):
+    """
+        Returns the repr of every item a DataFileReader builds.
+
+        :param reader: A DataFileReader object.
+        :return: A list of (catalog name, item key, item repr) tuples in catalog order.
+    """
+    return [(name, key, repr(item)) for name, data_dict in reader.get_catalog().items()
+            for key, item in data_dict.items()]
+
+def export_known_catalog(tmp_path):
+    """
+        Exports the known datasheet's catalog to a database in tmp_path.
+
+        :param tmp_path: The folder to write the database to.
+        :return: A tuple of the DataFileReader and the str database path.
+    """
+    database_path = OSPATH.join(tmp_path, "catalog.sqlite")
+    test_reader = STC().get_a_dfr()
+    test_reader.export_database(database_path)
+    return (test_reader, database_path)
+
+def test_database_round_trip(tmp_path):
+    """
+        Tests that a reader served from the database builds the same catalog
+        as the datasheet it was exported from.
+    """
+
+    test_reader, database_path = export_known_catalog(tmp_path)
+    database_reader = DFR.DataFileReader(None, database_path=database_path)
+
+    assert get_catalog_reprs(database_reader) == get_catalog_reprs(test_reader)
+    assert database_reader.spacesuit_set_data["deimos 1"].spacesuit is \
+        database_reader.spacesuit_data["deimos spacesuit"]
+    assert len(database_reader.get_weapons_by_type("melee")) == \
+        len(test_reader.get_weapons_by_type("melee"))
+
+def test_database_lazy_catalog(tmp_path):
+    """
+        Tests that the database reader only builds the item dicts that are used.
+    """
+
+    _, database_path = export_known_catalog(tmp_path)
+    database_reader = DFR.DataFileReader(None, database_path=database_path)
+
+    assert len(database_reader.ammo_data) == 22
+    assert database_reader.is_loaded("weapon_data") is False
+
+def test_database_indexes(tmp_path):
+    """
+        Tests that the name, id, type, and slot lookups use an index.
+    """
+
+    _, database_path = export_known_catalog(tmp_path)
+    connection = sqlite3.connect(database_path)
+    queries = ["SELECT * FROM items WHERE name = 'AA-99' COLLATE NOCASE",
+               "SELECT * FROM items WHERE item_id = '002BF65B'",
+               "SELECT * FROM items WHERE catalog = 'weapon_data' AND weapon_type = 'gun'",
+               "SELECT * FROM items WHERE catalog = 'armor_status_mods_data' AND mod_slot = 2"]
+    for query in queries:
+        plan = " ".join(row[-1] for row in connection.execute(f"EXPLAIN QUERY PLAN {query}"))
+        assert "USING INDEX" in plan
+    connection.close()
+
+def test_database_query(tmp_path):
+    """
+        Tests querying the database by name, id, and slot.
+    """
+
+    test_reader, database_path = export_known_catalog(tmp_path)
+    test_database = CD.CatalogDatabase(database_path)
+
+    rows = test_database.query("weapon_data", name="aa-99")
+    assert len(rows) == 1
+    assert rows[0]["item_id"] == test_reader.weapon_data["aa-99"].get_id()
+    assert test_database.query(item_id=rows[0]["item_id"])[0]["item_key"] == "aa-99"
+    assert len(test_database.query("armor_status_mods_data", mod_slot=1)) == \
+        len(test_reader.get_status_mods_by_mod_slot(1, test_reader.armor_status_mods_data))
+    with pytest.raises(ValueError):
+        test_database.query(weapon_id="002BF65B")
+
+def test_database_dlc_load_order(tmp_path):
+    """
+        Tests that DLC ids are prefixed with the current load order when
+        they are read back from the database.
+    """
+
+    # The item classes read the settings module the way data_file_reader imports it.
+    global_settings = DFR.settings_io.global_settings
+    _, database_path = export_known_catalog(tmp_path)
+    old_settings = global_settings.settings.copy()
+    try:
+        global_settings.settings["dlc_load_order"] = "7F"
+        database_reader = DFR.DataFileReader(None, database_path=database_path)
+        dlc_weapons = database_reader.get_items_by_dlc("weapon_data", True)
+        assert all(weapon.get_id().startswith("7F") for weapon in dlc_weapons.values())
+        assert CD.CatalogDatabase(database_path).get_metadata()["dlc_load_order"] == \
+            old_settings["dlc_load_order"]
+    finally:
+        global_settings.settings = old_settings
+
+def test_database_menus(tmp_path):
+    """
+        Tests that the menus can be built from the database reader's item dicts.
+    """
+
+    _, database_path = export_known_catalog(tmp_path)
+    database_reader = DFR.DataFileReader(None, database_path=database_path)
+
+    assert len(MV.ItemMenu(database_reader.resource_data, "Test Menu").display_chunks) == 9
+    MV.StatusModMenu(database_reader.weapon_status_mods_data, "Test Menu")
+
+def test_database_not_a_catalog(tmp_path):
+    """
+        Tests that a missing file or another sqlite file can't be read as a catalog.
+    """
+
+    other_path = OSPATH.join(tmp_path, "other.sqlite")
+    sqlite3.connect(other_path).close()
+
+    with pytest.raises(FileNotFoundError):
+        CD.CatalogDatabase(OSPATH.join(tmp_path, "missing.sqlite")).get_metadata()
+    with pytest.raises(ValueError):
+        CD.CatalogDatabase(other_path).get_metadata()
@@ -0,0 +1,116 @@
+"""
+    Tests the catalog_mapfile module.
+"""
+from os import path as OSPATH
+import pytest
+from .context import SCCGTestContext as STC
+from .context import CM, DFR
+
+def get_catalog_reprs(reader):
+    """
+        Returns the repr of every item a DataFileReader builds.
+
+        :param reader: A DataFileReader object.
+        :return: A list of (catalog name, item key, item repr) tuples in catalog order.
+    """
+    return [(name, key, repr(item)) for name, data_dict in reader.get_catalog().items()
+            for key, item in data_dict.items()]
+
+def export_known_catalog(tmp_path):
+    """
+        Exports the known datasheet's catalog to a map file in tmp_path.
+
+        :param tmp_path: The folder to write the map file to.
+        :return: A tuple of the DataFileReader and the str map file path.
+    """
+    map_path = OSPATH.join(tmp_path, "catalog.map")
+    test_reader = STC().get_a_dfr()
+    test_reader.export_catalog_map(map_path)
+    return (test_reader, map_path)
+
+def test_map_round_trip(tmp_path):
+    """
+        Tests that a reader served from the map file makes the same catalog
+        as the datasheet it was exported from.
+    """
+
+    test_reader, map_path = export_known_catalog(tmp_path)
+    map_reader = DFR.DataFileReader(None, map_path=map_path)
+
+    assert get_catalog_reprs(map_reader) == get_catalog_reprs(test_reader)
+    assert map_reader.spacesuit_set_data["deimos 1"].spacesuit is \
+        map_reader.spacesuit_data["deimos spacesuit"]
+    assert len(map_reader.get_weapons_by_type("melee")) == \
+        len(test_reader.get_weapons_by_type("melee"))
+    assert list(map_reader.get_status_mods_by_mod_slot(2, map_reader.armor_status_mods_data)) \
+        == list(test_reader.get_status_mods_by_mod_slot(2, test_reader.armor_status_mods_data))
+
+def test_map_items_made_lazily(tmp_path):
+    """
+        Tests that looking up a key only makes that key's item, and makes it once.
+    """
+
+    _, map_path = export_known_catalog(tmp_path)
+    map_reader = DFR.DataFileReader(None, map_path=map_path)
+    ammo_data = map_reader.ammo_data
+
+    assert isinstance(ammo_data, CM.MappedItemDict)
+    assert len(ammo_data) == 22
+    assert ".27 caliber" in ammo_data
+    assert "not an ammo" not in ammo_data
+    assert map_reader.catalog_map.made_items.get("ammo_data", {}) == {}
+
+    ammo = ammo_data[".27 caliber"]
+    assert ammo_data[".27 caliber"] is ammo
+    assert len(map_reader.catalog_map.made_items["ammo_data"]) == 1
+    with pytest.raises(KeyError):
+        _ = ammo_data["not an ammo"]
+
+def test_map_indexes(tmp_path):
+    """
+        Tests that the indexes are grouped from the records and are views
+        of the same items.
+    """
+
+    test_reader, map_path = export_known_catalog(tmp_path)
+    map_reader = DFR.DataFileReader(None, map_path=map_path)
+    unique_weapons = map_reader.get_indexed_items("weapon_data", "unique", True)
+
+    assert list(unique_weapons) == list(test_reader.get_indexed_items("weapon_data",
+                                                                      "unique", True))
+    assert map_reader.catalog_map.made_items.get("weapon_data", {}) == {}
+    first_key = next(iter(unique_weapons))
+    assert unique_weapons[first_key] is map_reader.weapon_data[first_key]
+    not_unique_key = next(iter(map_reader.get_indexed_items("weapon_data", "unique", False)))
+    assert not_unique_key not in unique_weapons
+    assert len(map_reader.get_indexed_items("weapon_data", "weapon_type", "not a type")) == 0
+
+def test_map_dlc_load_order(tmp_path):
+    """
+        Tests that a map file written with another DLC load order isn't used.
+    """
+
+    _, map_path = export_known_catalog(tmp_path)
+    global_settings = DFR.settings_io.global_settings
+    old_settings = global_settings.settings.copy()
+    try:
+        global_settings.settings["dlc_load_order"] = "7F"
+        map_reader = DFR.DataFileReader(None, map_path=map_path)
+        with pytest.raises(ValueError):
+            _ = map_reader.ammo_data
+    finally:
+        global_settings.settings = old_settings
+
+def test_map_bad_file(tmp_path):
+    """
+        Tests that a file that isn't a map file and a missing file aren't opened.
+    """
+
+    bad_path = OSPATH.join(tmp_path, "bad.map")
+    with open(bad_path, "wb") as bad_file:
+        bad_file.write(b"not a catalog map file at all")
+
+    with pytest.raises(ValueError):
+        CM.CatalogMapFile(bad_path).open("FE")
+    with pytest.raises(FileNotFoundError):
+        CM.CatalogMapFile(OSPATH.join(tmp_path, "missing.map")).open("FE")
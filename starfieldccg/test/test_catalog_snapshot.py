@@ -0,0 +1,125 @@
+"""
+    Tests the catalog_snapshot module.
+"""
+import os
+import pytest
+from .context import SCCGTestContext as STC
+from .context import CS, DFR, DO, SIO
+
+def get_commands(reader):
+    """
+        Returns every console command a DataFileReader can generate.
+
+        :param reader: A DataFileReader object.
+        :return: A dict of the commands keyed by catalog name and item key.
+    """
+    commands = {}
+    for name, data_dict in reader.get_catalog().items():
+        for key, item in data_dict.items():
+            if isinstance(item, (DO.StatusModType, DO.QualityModType)):
+                commands[(name, key)] = item.get_command()
+            else:
+                commands[(name, key)] = item.get_command(1)
+    return commands
+
+def test_snapshot_round_trip(tmp_path):
+    """
+        Tests that a reader loaded from a snapshot has the same catalog
+        as the one that wrote it.
+    """
+
+    datasheet_path = STC().copy_datasheet(tmp_path)
+    first_reader = DFR.DataFileReader(datasheet_path, use_snapshot=True)
+    second_reader = DFR.DataFileReader(datasheet_path, use_snapshot=True)
+
+    assert first_reader.loaded_from_snapshot is False
+    assert second_reader.loaded_from_snapshot is True
+    assert os.path.exists(f"{datasheet_path}{CS.SNAPSHOT_SUFFIX}")
+    assert get_commands(first_reader) == get_commands(second_reader)
+
+def test_snapshot_keeps_set_links(tmp_path):
+    """
+        Tests that spacesuit sets loaded from a snapshot point at the same
+        objects as the spacesuit, helmet, and pack dicts.
+    """
+
+    datasheet_path = STC().copy_datasheet(tmp_path)
+    DFR.DataFileReader(datasheet_path, use_snapshot=True)
+    test_reader = DFR.DataFileReader(datasheet_path, use_snapshot=True)
+
+    test_set = test_reader.spacesuit_set_data["deimos 1"]
+    assert isinstance(test_set, DO.SpacesuitSetItem)
+    assert test_set.spacesuit is test_reader.spacesuit_data["deimos spacesuit"]
+    assert test_set.helmet is test_reader.helmet_data["deimos space helmet"]
+
+def test_snapshot_invalid_after_workbook_change(tmp_path):
+    """
+        Tests that a snapshot isn't used after the datasheet changes.
+    """
+
+    datasheet_path = STC().copy_datasheet(tmp_path)
+    DFR.DataFileReader(datasheet_path, use_snapshot=True)
+    with open(datasheet_path, "ab") as datasheet_file:
+        datasheet_file.write(b"\0")
+
+    test_snapshot = CS.CatalogSnapshot(datasheet_path)
+    assert test_snapshot.load(SIO.global_settings.settings["dlc_load_order"],
+                              DFR.DataFileReader.SHEET_NAMES) is None
+
+def test_snapshot_valid_after_touch(tmp_path):
+    """
+        Tests that a snapshot is still used when only the mtime of the
+        datasheet changes.
+    """
+
+    datasheet_path = STC().copy_datasheet(tmp_path)
+    DFR.DataFileReader(datasheet_path, use_snapshot=True)
+    workbook_stat = os.stat(datasheet_path)
+    os.utime(datasheet_path, ns=(workbook_stat.st_atime_ns,
+                                 workbook_stat.st_mtime_ns + 1_000_000_000))
+
+    test_reader = DFR.DataFileReader(datasheet_path, use_snapshot=True)
+    assert test_reader.loaded_from_snapshot is True
+
+def test_snapshot_invalid_after_dlc_change(tmp_path):
+    """
+        Tests that a snapshot isn't used when the DLC load order is different.
+    """
+
+    datasheet_path = STC().copy_datasheet(tmp_path)
+    DFR.DataFileReader(datasheet_path, use_snapshot=True)
+
+    test_snapshot = CS.CatalogSnapshot(datasheet_path)
+    assert test_snapshot.load("FE", DFR.DataFileReader.SHEET_NAMES) is None
+
+def test_snapshot_rebuild(tmp_path):
+    """
+        Tests that rebuild_snapshot ignores an existing snapshot.
+    """
+
+    datasheet_path = STC().copy_datasheet(tmp_path)
+    DFR.DataFileReader(datasheet_path, use_snapshot=True)
+    test_reader = DFR.DataFileReader(datasheet_path, use_snapshot=True,
+                                     rebuild_snapshot=True)
+
+    assert test_reader.loaded_from_snapshot is False
+    assert len(test_reader.datasheets) == len(test_reader.sheet_names)
+
+def test_snapshot_problems_are_warnings(tmp_path, capsys):
+    """
+        Tests that an unreadable snapshot, and one that can't be written, are
+        reported as warnings and print nothing to stdout.
+    """
+
+    datasheet_path = STC().copy_datasheet(tmp_path)
+    test_snapshot = CS.CatalogSnapshot(datasheet_path)
+    with open(test_snapshot.snapshot_path, "wb") as snapshot_file:
+        snapshot_file.write(b"not a snapshot")
+    with pytest.warns(RuntimeWarning, match="unreadable snapshot"):
+        assert test_snapshot.load("FF", ["Ammo"]) is None
+
+    unwritable_snapshot = CS.CatalogSnapshot(datasheet_path,
+                                             str(tmp_path / "missing" / "catalog.snapshot"))
+    with pytest.warns(RuntimeWarning, match="writing snapshot"):
+        assert unwritable_snapshot.save({}, "FF", ["Ammo"]) is False
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,162 @@
+"""
+    Tests the command_cache module.
+"""
+import pytest
+from .context import SCCGTestContext as STC
+from .context import CC, DFR, DO, SIO
+from .test_settings_io import make_settings_file
+
+def test_cached_commands_match_items():
+    """
+        Tests that every cached command is the one the item gives.
+    """
+
+    test_reader = STC().get_a_dfr()
+    test_cache = test_reader.get_command_cache()
+    assert test_reader.get_command_cache() is test_cache
+
+    for catalog_name in test_reader.CATALOG_NAMES:
+        for key, item in test_reader.load_catalog(catalog_name).items():
+            if catalog_name in CC.MOD_CATALOGS:
+                assert test_cache.get_command(catalog_name, key) == item.get_command()
+            else:
+                assert test_cache.get_command(catalog_name, key, 5) == item.get_command(5)
+            assert test_cache.get_id(catalog_name, key) == item.get_id()
+
+def test_rebuilt_catalog_is_cached_again():
+    """
+        Tests that the entries of an item dict the reader replaces are built again.
+    """
+
+    test_reader = STC().get_a_dfr()
+    test_cache = CC.CommandCache(test_reader)
+    ammo_key = next(iter(test_reader.ammo_data))
+    assert test_cache.get_id("ammo_data", ammo_key) == test_reader.ammo_data[ammo_key].get_id()
+
+    test_reader.store_catalog("ammo_data", {ammo_key: DO.AmmoItem("Ammo", "ABC")})
+    assert test_cache.get_command("ammo_data", ammo_key, 2) == "player.additem 00000ABC 2"
+    test_cache.close()
+
+def test_dlc_load_order_change(tmp_path):
+    """
+        Tests that changing the DLC load order gives only the cached commands of
+        the DLC items and spacesuit sets the new prefix, and leaves the items
+        as they were built.
+    """
+
+    test_settings = SIO.SCCGSettings(make_settings_file(tmp_path, {"dlc_load_order": "01"}))
+    global_settings = DFR.settings_io.global_settings
+    old_settings = global_settings.settings.copy()
+    try:
+        global_settings.settings["dlc_load_order"] = "01"
+        test_reader = STC().get_a_dfr()
+        test_cache = CC.CommandCache(test_reader, test_settings)
+        weapons = test_reader.weapon_data
+        dlc_key = next(iter(weapons.get_indexed("dlc", True)))
+        dlc_id = weapons[dlc_key].weapon_id
+        base_key = next(iter(weapons.get_indexed("dlc", False)))
+        base_command = test_cache.get_command("weapon_data", base_key, 1)
+        set_key = next(iter(test_reader.spacesuit_set_data.get_indexed("dlc", True)))
+        set_id = test_reader.spacesuit_set_data[set_key].spacesuit_set_id
+        assert test_cache.get_command("spacesuit_set_data", set_key, 1).startswith(
+            "player.additem 01")
+
+        global_settings.settings["dlc_load_order"] = "7F"
+        test_settings.set_dlc_load_order("7F")
+
+        assert weapons[dlc_key].weapon_id == dlc_id
+        assert test_cache.get_command("weapon_data", dlc_key, 3) == \
+            f"player.additem 7F{dlc_id[2:]} 3"
+        assert test_cache.get_command("weapon_data", base_key, 1) == base_command
+        assert all(line.startswith("player.additem 7F") for line in
+                   test_cache.get_command("spacesuit_set_data", set_key, 1).splitlines())
+        assert test_reader.spacesuit_set_data[set_key].spacesuit_set_id == set_id
+        assert test_reader.is_dlc_load_order_current() is False
+        with pytest.raises(ValueError):
+            test_reader.export_catalog_map(str(tmp_path / "catalog.map"))
+
+        # An item dict cached after the change gets the new prefix too.
+        assert all(test_cache.get_id("pack_data", key).startswith("7F")
+                   for key in test_reader.pack_data.get_indexed("dlc", True))
+
+        test_cache.close()
+        test_settings.set_dlc_load_order("02")
+        assert test_cache.dlc_load_order == "7F"
+    finally:
+        global_settings.settings = old_settings
+
+def test_apply_dlc_load_order_counts_dlc_items():
+    """
+        Tests that only the DLC entries of the cached item dicts get a new prefix.
+    """
+
+    test_reader = STC().get_a_dfr()
+    test_cache = CC.CommandCache(test_reader)
+    test_cache.get_entries("weapon_data")
+    assert test_cache.apply_dlc_load_order(test_reader.get_dlc_load_order()) == 13
+    assert test_reader.is_loaded("pack_data") is False
+    test_cache.close()
+
+def test_batch_commands():
+    """
+        Tests that a batch finds items by category and name however they are
+        written, adds up the quantities of the same item, and gives a mod once.
+    """
+
+    test_reader = STC().get_a_dfr()
+    test_cache = test_reader.get_command_cache()
+    weapon = next(iter(test_reader.weapon_data.values()))
+    ammo = next(iter(test_reader.ammo_data.values()))
+    mod = next(iter(test_reader.armor_status_mods_data.values()))
+    suit_set = test_reader.spacesuit_set_data["fang's"]
+
+    batch = test_cache.make_batch([("weapon", weapon.get_name(), 2),
+                                   ("Ammo", ammo.get_name(), 100),
+                                   ("Weapons", f"  {weapon.get_name().upper()} ", 3),
+                                   ("armor_status_mods_data", mod.get_name(), 1),
+                                   ("Armor Status Mod", mod.get_name(), 4),
+                                   ("spacesuit sets", "Fang's", 1)])
+    assert len(batch) == 4
+    assert batch.unknown == []
+    assert list(batch.iter_commands()) == [weapon.get_command(5), ammo.get_command(100),
+                                           mod.get_command(),
+                                           *suit_set.get_command(1).splitlines()]
+
+def test_batch_unknown_entries():
+    """
+        Tests that every unknown category and name is reported at once.
+    """
+
+    test_cache = STC().get_a_dfr().get_command_cache()
+    entries = [("weapon", "not a weapon", 1), ("ammo", "not an ammo", 2),
+               ("not a category", "x", 1)]
+    with pytest.raises(ValueError) as error:
+        test_cache.make_batch(entries + [("ammo", ".27 Caliber", 5)])
+    assert str(error.value).startswith("3 unknown items")
+
+    batch = test_cache.make_batch(entries + [("ammo", ".27 Caliber", 5)], allow_unknown=True)
+    assert batch.unknown == entries
+    assert len(batch) == 1
+    with pytest.raises(ValueError):
+        test_cache.make_batch([("ammo", ".27 Caliber", 0)])
+
+def test_batch_reports_every_bad_entry():
+    """
+        Tests that unknown entries and bad quantities are reported together in
+        one ValueError.
+    """
+
+    test_cache = STC().get_a_dfr().get_command_cache()
+    entries = [("ammo", ".27 Caliber", 0), ("weapon", "not a weapon", 1),
+               ("ammo", ".27 Caliber", "5"), ("not a category", "x", 1),
+               ("ammo", ".27 Caliber", True), ("ammo", ".27 Caliber", 5)]
+    with pytest.raises(ValueError) as error:
+        test_cache.make_batch(entries)
+    assert str(error.value) == ("2 unknown items: weapon 'not a weapon', not a category 'x'; "
+                                "3 quantities that aren't whole numbers above 0: "
+                                "ammo '.27 Caliber' 0, ammo '.27 Caliber' '5', "
+                                "ammo '.27 Caliber' True")
+
+    with pytest.raises(ValueError) as error:
+        test_cache.make_batch(entries, allow_unknown=True)
+    assert str(error.value).startswith("3 quantities")
@@ -435,3 +435,47 @@ def test_spacesuit_set_id_three():
     assert test_spacesuit_set.get_id()[0] == "00000001"
     assert test_spacesuit_set.get_id()[1] == "00000002"
     assert test_spacesuit_set.get_id()[2] == "00000003"
+
+def test_items_are_slotted():
+    """
+    Tests that the item classes keep their fields in __slots__ instead of a
+    __dict__, and that they still pickle for the snapshot.
+    """
+
+    # pylint: disable=import-outside-toplevel
+    import pickle
+
+    test_spacesuit_set = DO.SpacesuitSetItem("Test Spacesuit Set", False)
+    test_spacesuit_set.set_spacesuit(DO.SpacesuitItem("Test Spacesuit", "00000001", False))
+    test_items = [DO.AmmoItem("Test Ammo", "00000001"),
+                  DO.PackItem("Test Pack", "00000003", False),
+                  DO.HelmetItem("Test Helmet", "00000002", False),
+                  DO.WeaponItem("Test Weapon", "00000004", False, True, "Gun"),
+                  DO.ResourceItem("Test Resource", "00000005"),
+                  DO.StatusModType("Test Mod", "00000006", "Test mod desc", 1),
+                  DO.QualityModType("Test Quality", "00000007"),
+                  test_spacesuit_set]
+
+    for test_item in test_items:
+        assert hasattr(test_item, "__dict__") is False
+        with pytest.raises(AttributeError):
+            test_item.not_a_field = 1
+        assert repr(pickle.loads(pickle.dumps(test_item))) == repr(test_item)
+
+def test_normalize_ids():
+    """
+    Tests that a column of ids is normalized the same way each item's
+    process_id() normalizes its own.
+    """
+
+    test_ids = ["00012345", "12345", "0x01A3", "000000001", "xx12345678", "xX12", "XX007540"]
+    assert DO.normalize_ids(test_ids) == ["00012345", "00012345", "000001A3", "00000001",
+                                          "12345678", "00000012", "XX007540"]
+    assert DO.normalize_ids(["12345", "12345"], [True, False], "7F00") == ["7F012345", "00012345"]
+
+    dlc_prefix = DO.settings_io.global_settings.settings["dlc_load_order"][:2]
+    assert DO.normalize_ids(test_ids, [True] * len(test_ids)) == \
+        [DO.WeaponItem("Test Weapon", test_id, True, False, "Gun").get_id()
+         for test_id in test_ids]
+    assert DO.normalize_ids(["0001A3B2"], [True]) == [f"{dlc_prefix}01A3B2"]
+    assert DO.AmmoItem("Test Ammo", "1A3B2", normalized=True).get_id() == "1A3B2"
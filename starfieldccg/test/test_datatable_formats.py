@@ -0,0 +1,135 @@
+"""
+    Tests reading datatables in every format and converting between them.
+"""
+import os
+from os import path as OSPATH
+import pytest
+from .context import SCCGTestContext as STC
+from .context import DF, DFR, DL, RB
+from .test_reader_backends import get_catalog_reprs
+
+TEXT_FORMAT_PATHS = {"csv": "datatable", "json": "datatable.json",
+                     "ndjson": "datatable.ndjson", "xls": "datatable.xls"}
+
+@pytest.mark.parametrize("target_format", list(TEXT_FORMAT_PATHS))
+def test_formats_build_identical_catalogs(tmp_path, target_format):
+    """
+        Tests that a datatable converted to another format builds the same catalog.
+    """
+
+    test_reader = STC().get_a_dfr()
+    target_path = OSPATH.join(tmp_path, TEXT_FORMAT_PATHS[target_format])
+    assert test_reader.export_datatable(target_path) == 577
+
+    converted_reader = DFR.DataFileReader(target_path)
+    assert converted_reader.datatable_format == target_format
+    assert get_catalog_reprs(converted_reader) == get_catalog_reprs(test_reader)
+    assert converted_reader.get_backend().read_sheet_names[:1] == ["Ammo"]
+
+def test_xlsx_builds_identical_catalog(tmp_path):
+    """
+        Tests that a .xlsx copy of the datatable builds the same catalog.
+    """
+
+    pytest.importorskip("openpyxl")
+    test_reader = STC().get_a_dfr()
+    target_path = OSPATH.join(tmp_path, "datatable.xlsx")
+    test_reader.export_datatable(target_path)
+
+    assert get_catalog_reprs(DFR.DataFileReader(target_path)) == get_catalog_reprs(test_reader)
+
+def test_format_cell_values(tmp_path):
+    """
+        Tests that the typed formats give back the cells a workbook has, and
+        that a .csv folder gives back their text.
+    """
+
+    sheets = {"Weapons": [("Weapon_Name", "Weapon_ID", "Is_Unique", "Count"),
+                          ("Rifle ", "00012345", True, 2.0),
+                          ("Pistol", None, False, 2.5)]}
+    DF.write_datatable(OSPATH.join(tmp_path, "table.json"), sheets)
+    DF.write_datatable(OSPATH.join(tmp_path, "table.ndjson"), sheets)
+    DF.write_datatable(OSPATH.join(tmp_path, "csv"), sheets)
+
+    for file_name in ("table.json", "table.ndjson"):
+        backend = RB.get_datatable_backend(OSPATH.join(tmp_path, file_name))
+        assert list(backend.iter_rows("Weapons", 5)) == \
+            [("Rifle ", "00012345", True, 2.0, None), ("Pistol", None, False, 2.5, None)]
+        assert backend.get_sheet_names() == ["Weapons"]
+        with pytest.raises(ValueError):
+            list(backend.iter_rows("Ammo", 2))
+    assert list(RB.CsvBackend(OSPATH.join(tmp_path, "csv")).iter_rows("Weapons", 4)) == \
+        [("Rifle ", "00012345", "TRUE", "2"), ("Pistol", "", "FALSE", "2.5")]
+
+def test_datatable_format_from_path(tmp_path):
+    """
+        Tests that the format of a datatable comes from its path.
+    """
+
+    assert RB.get_datatable_format(str(tmp_path)) == "csv"
+    assert RB.get_datatable_format("table.XLSX") == "xlsx"
+    assert RB.get_datatable_format("table.jsonl") == "ndjson"
+    assert RB.get_datatable_format("table") == "xls"
+    csv_path = OSPATH.join(tmp_path, "datatable")
+    STC().get_a_dfr().export_datatable(csv_path)
+    assert RB.get_datatable_size(csv_path) == sum(
+        OSPATH.getsize(OSPATH.join(csv_path, file_name)) for file_name in os.listdir(csv_path))
+    assert RB.get_datatable_size(csv_path) > OSPATH.getsize(csv_path)
+    assert RB.get_datatable_size(STC().known_datasheet_path) == \
+        OSPATH.getsize(STC().known_datasheet_path)
+    assert DF.get_target_format(OSPATH.join(tmp_path, "new_folder")) == "csv"
+    with pytest.raises(ValueError):
+        DF.write_datatable(OSPATH.join(tmp_path, "table.txt"), {}, "txt")
+
+def test_csv_snapshot(tmp_path):
+    """
+        Tests that a .csv folder's snapshot is used until one of its files changes.
+    """
+
+    csv_path = OSPATH.join(tmp_path, "datatable")
+    STC().get_a_dfr().export_datatable(csv_path)
+    DFR.DataFileReader(csv_path, use_snapshot=True)
+    assert DFR.DataFileReader(csv_path, use_snapshot=True).loaded_from_snapshot is True
+
+    with open(OSPATH.join(csv_path, "Ammo.csv"), "a", encoding="utf-8") as ammo_file:
+        ammo_file.write("New Ammo,00ABC001\n")
+    changed_reader = DFR.DataFileReader(csv_path, use_snapshot=True)
+    assert changed_reader.loaded_from_snapshot is False
+    assert len(changed_reader.ammo_data) == 23
+
+def test_csv_overlay(tmp_path):
+    """
+        Tests that an overlay can be a .csv folder with only some of the sheets.
+    """
+
+    # pylint: disable=import-outside-toplevel
+    from .test_datatable_layers import write_overlay
+
+    base_path = STC().known_datasheet_path
+    overlay_layer = DL.DatatableLayer(write_overlay(OSPATH.join(tmp_path, "overlay.xls")),
+                                      [DFR.DataFileReader(base_path)])
+    overlay_layer.export_datatable(OSPATH.join(tmp_path, "overlay"))
+    assert sorted(os.listdir(OSPATH.join(tmp_path, "overlay"))) == \
+        ["Helmets.csv", "Spacesuit_Sets.csv", "Weapons.csv"]
+
+    test_reader = DL.LayeredDataFileReader([base_path, OSPATH.join(tmp_path, "overlay")])
+    assert len(test_reader.weapon_data) == 140
+    assert test_reader.spacesuit_set_data["modded set"].helmet.get_id() == "00ABC003"
+
+def test_text_formats_stream_items(tmp_path):
+    """
+        Tests that iter_items() streams the rows of the text formats and that
+        they can't be reloaded.
+    """
+
+    test_reader = STC().get_a_dfr()
+    ndjson_path = OSPATH.join(tmp_path, "datatable.ndjson")
+    test_reader.export_datatable(ndjson_path)
+    ndjson_reader = DFR.DataFileReader(ndjson_path)
+
+    assert [repr(item) for item in ndjson_reader.iter_items("Weapons", 50)] == \
+        [repr(item) for item in test_reader.weapon_data.values()]
+    with pytest.raises(ValueError):
+        ndjson_reader.reload()
+    with pytest.raises(ValueError):
+        ndjson_reader.start_watching()
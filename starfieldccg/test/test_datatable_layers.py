@@ -0,0 +1,137 @@
+"""
+    Tests the datatable_layers module.
+"""
+import time
+from os import path as OSPATH
+import pytest
+from .context import SCCGTestContext as STC
+from .context import DL
+from .synthetic_datatable import write_datatable
+
+BASE_WEAPONS_COUNT = 139    # Total Expected Types of Weapons in the known datatable.
+BASE_SETS_COUNT = 86    # Total Expected Types of Spacesuit Sets in the known datatable.
+
+def write_overlay(tgt_path: str, weapon_id: str = "00ABC001"):
+    """
+        Writes an overlay datatable with only the Weapons, Helmets, and
+        Spacesuit_Sets sheets.
+
+        :param tgt_path: A str path to write the overlay to.
+        :param weapon_id: A str of the id of the overridden AA-99.
+        :return: A str of the tgt_path.
+    """
+    return write_datatable(tgt_path, {
+        "Weapons": (["Weapon_Name", "Weapon_ID", "Set_DLC_Flag", "Is_Unique", "Weapon_Type"],
+                    [["AA-99", weapon_id, False, False, "Gun"],
+                     ["Modded Rifle", "00ABC002", False, True, "Gun"]]),
+        "Helmets": (["Helmet_Name", "Helmet_ID", "Helmet_DLC_Flag"],
+                    [["Bounty Hunter Space Helmet", "00ABC003", "FALSE"]]),
+        "Spacesuit_Sets": (["Set_Name", "Suit_Name", "Helmet_Name", "Pack_Name",
+                            "Faction_Name", "Set_DLC_Flag"],
+                           [["Modded Set", "Bounty Hunter Spacesuit",
+                             "Bounty Hunter Space Helmet", "", "NA", False]])
+    })
+
+def make_layered_reader(tmp_path, use_snapshot: bool = False):
+    """
+        Returns a LayeredDataFileReader of a copy of the known datatable and an overlay.
+
+        :param tmp_path: The folder to write the datatables to.
+        :param use_snapshot: A bool of whether the layers use snapshots.
+        :return: A LayeredDataFileReader object.
+    """
+    base_path = STC().copy_datasheet(tmp_path)
+    overlay_path = OSPATH.join(tmp_path, "overlay.xls")
+    if OSPATH.exists(overlay_path) is not True:
+        write_overlay(overlay_path)
+    return DL.LayeredDataFileReader([base_path, overlay_path], use_snapshot=use_snapshot)
+
+def test_overlay_overrides_and_extends(tmp_path):
+    """
+        Tests that an overlay replaces items by key in place and adds new ones.
+    """
+
+    test_reader = make_layered_reader(tmp_path)
+    base_layer, overlay_layer = test_reader.layers
+    weapon_data = test_reader.weapon_data
+
+    assert len(weapon_data) == BASE_WEAPONS_COUNT + 1
+    assert weapon_data["aa-99"] is overlay_layer.weapon_data["aa-99"]
+    assert list(weapon_data).index("aa-99") == list(base_layer.weapon_data).index("aa-99")
+    assert list(weapon_data)[-1] == "modded rifle"
+    assert "modded rifle" in test_reader.get_weapons_by_unique(True)
+    assert len(test_reader.ammo_data) == len(base_layer.ammo_data)
+    assert overlay_layer.sheet_names == ["Helmets", "Spacesuit_Sets", "Weapons"]
+
+def test_overlay_conflict_report(tmp_path):
+    """
+        Tests that every overridden key is reported with the layers it came from.
+    """
+
+    test_reader = make_layered_reader(tmp_path)
+    base_path, overlay_path = [layer.file_path for layer in test_reader.layers]
+
+    assert test_reader.get_conflicts() == [
+        ("helmet_data", "bounty hunter space helmet", base_path, overlay_path),
+        ("weapon_data", "aa-99", base_path, overlay_path)
+    ]
+    assert "aa-99" in test_reader.format_conflict_report()
+
+def test_overlay_links_spacesuit_sets(tmp_path):
+    """
+        Tests that the base sets use the overlay's helmet and that the overlay's
+        sets can use the base spacesuits.
+    """
+
+    test_reader = make_layered_reader(tmp_path)
+    base_layer = test_reader.layers[0]
+    spacesuit_sets = test_reader.spacesuit_set_data
+    overlay_helmet = test_reader.helmet_data["bounty hunter space helmet"]
+
+    assert len(spacesuit_sets) == BASE_SETS_COUNT + 1
+    assert spacesuit_sets["bounty hunter 1"].helmet is overlay_helmet
+    assert base_layer.spacesuit_set_data["bounty hunter 1"].helmet is not overlay_helmet
+    assert spacesuit_sets["modded set"].spacesuit \
+        is test_reader.spacesuit_data["bounty hunter spacesuit"]
+    assert spacesuit_sets["modded set"].helmet is overlay_helmet
+
+def test_layers_cached_separately(tmp_path):
+    """
+        Tests that changing the overlay only rebuilds the overlay's snapshot.
+    """
+
+    make_layered_reader(tmp_path, use_snapshot=True)
+    overlay_path = OSPATH.join(tmp_path, "overlay.xls")
+    time.sleep(0.01)
+    write_overlay(overlay_path, weapon_id="00ABC009")
+    test_reader = make_layered_reader(tmp_path, use_snapshot=True)
+
+    assert test_reader.layers[0].loaded_from_snapshot is True
+    assert test_reader.layers[1].loaded_from_snapshot is False
+    assert test_reader.weapon_data["aa-99"].weapon_id == "00ABC009"
+
+def test_layered_reload(tmp_path):
+    """
+        Tests that reloading picks up a changed overlay.
+    """
+
+    test_reader = make_layered_reader(tmp_path)
+    old_ammo_data = test_reader.ammo_data
+    assert test_reader.weapon_data["aa-99"].weapon_id == "00ABC001"
+    test_reader.record_sheet_hashes()
+
+    write_overlay(OSPATH.join(tmp_path, "overlay.xls"), weapon_id="00ABC009")
+
+    assert test_reader.reload() == ["Weapons"]
+    assert test_reader.weapon_data["aa-99"].weapon_id == "00ABC009"
+    assert test_reader.ammo_data is old_ammo_data
+
+def test_layered_reader_needs_a_datatable():
+    """
+        Tests that a LayeredDataFileReader needs at least one datatable and can't stream.
+    """
+
+    with pytest.raises(ValueError):
+        DL.LayeredDataFileReader([])
+    with pytest.raises(ValueError):
+        next(DL.LayeredDataFileReader([STC().known_datasheet_path]).iter_items("Ammo"))
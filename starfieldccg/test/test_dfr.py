@@ -356,3 +356,218 @@ def test_non_unique_weapons_count():
 
     test_reader = STC().get_a_dfr()
     assert len(test_reader.get_weapons_by_unique(False)) == NORMAL_WEAPONS_COUNT
+
+def test_read_sheets_used_columns():
+    """
+    Tests that read_sheets() can limit each sheet to the columns that are used.
+    """
+
+    test_reader = STC().get_a_dfr()
+    all_columns = test_reader.read_sheets()
+    used_columns = test_reader.read_sheets(used_columns_only=True)
+
+    assert len(all_columns) == EXPECTED_SHEETS_COUNT
+    assert len(used_columns) == EXPECTED_SHEETS_COUNT
+    for sheet_name, column_count in test_reader.SHEET_COLUMN_COUNTS.items():
+        assert list(used_columns[sheet_name].columns) == \
+            list(all_columns[sheet_name].columns)[:column_count]
+
+def test_lazy_catalog_reads_one_sheet():
+    """
+    Tests that using one item dict only reads and builds that item dict's sheet.
+    """
+
+    test_reader = STC().get_a_dfr()
+    assert len(test_reader.ammo_data) == AMMO_COUNT
+    assert test_reader.is_loaded("ammo_data") is True
+    assert test_reader.is_loaded("weapon_data") is False
+    assert test_reader.get_backend().read_sheet_names == ["Ammo"]
+    assert len(test_reader.datasheets.loaded_sheets) == 0
+
+def test_lazy_catalog_set_dependencies():
+    """
+    Tests that building the spacesuit sets builds the spacesuits, helmets,
+    and packs but nothing else.
+    """
+
+    test_reader = STC().get_a_dfr()
+    assert len(test_reader.spacesuit_set_data) == SPACESUIT_SETS_COUNT
+    for name in ["spacesuit_data", "helmet_data", "pack_data", "spacesuit_set_data"]:
+        assert test_reader.is_loaded(name) is True
+    assert test_reader.is_loaded("weapon_data") is False
+    assert sorted(test_reader.get_backend().read_sheet_names) == \
+        ["Helmets", "Packs", "Spacesuit_Sets", "Spacesuits"]
+
+def test_lazy_catalog_build_once():
+    """
+    Tests that an item dict is only built once.
+    """
+
+    test_reader = STC().get_a_dfr()
+    assert test_reader.weapon_data is test_reader.weapon_data
+
+def test_load_parallel_threads():
+    """
+    Tests that reading the sheets with a thread pool builds the same catalog.
+    """
+
+    test_reader = STC().get_a_dfr()
+    timings = test_reader.load_parallel(max_workers=2, executor_type="thread")
+
+    assert sorted(timings) == sorted(test_reader.sheet_names)
+    assert len(test_reader.weapon_data) == WEAPONS_COUNT
+    assert len(test_reader.spacesuit_set_data) == SPACESUIT_SETS_COUNT
+
+def test_load_parallel_processes():
+    """
+    Tests that reading the sheets with a process pool builds the same catalog.
+    """
+
+    test_reader = STC().get_a_dfr()
+    test_reader.load_parallel(max_workers=2, executor_type="process")
+
+    assert len(test_reader.resource_data) == RESOURCES_COUNT
+    assert len(test_reader.spacesuit_set_data) == SPACESUIT_SETS_COUNT
+    assert test_reader.spacesuit_set_data["deimos 1"].spacesuit is \
+        test_reader.spacesuit_data["deimos spacesuit"]
+
+def test_load_parallel_bad_executor():
+    """
+    Tests that an unknown executor type raises a ValueError.
+    """
+
+    test_reader = STC().get_a_dfr()
+    with pytest.raises(ValueError):
+        test_reader.load_parallel(executor_type="fibers")
+
+def test_get_row_index_reuses_index():
+    """
+    Tests that a column index is built once and reused by get_row_index().
+    """
+
+    test_reader = STC().get_a_dfr()
+    resources_data = test_reader.datasheets["Resources"]
+    row_a = test_reader.get_row_index(resources_data, "Resource_Name", "Water")
+    column_index = test_reader.get_column_index(resources_data, "Resource_Name")
+    row_b = test_reader.get_row_index(resources_data, "Resource_Name", "Water")
+
+    assert row_a == row_b == resources_data["Resource_Name"].tolist().index("Water")
+    assert test_reader.get_column_index(resources_data, "Resource_Name") is column_index
+    with pytest.raises(ValueError):
+        test_reader.get_row_index(resources_data, "Resource_Name", "Unobtainium")
+
+def test_get_row_index_first_duplicate():
+    """
+    Tests that get_row_index() returns the first row when a value is repeated.
+    """
+
+    # pylint: disable=import-outside-toplevel
+    import pandas as pd
+
+    test_reader = STC().get_a_dfr()
+    test_frame = pd.DataFrame({"Name": ["a", "b", "a"], "ID": ["1", "2", "3"]})
+
+    assert test_reader.get_row_index(test_frame, "Name", "a") == 0
+    assert test_reader.get_cell_value(test_frame, "Name", "a", "ID") == "1"
+
+def test_get_cell_values():
+    """
+    Tests that get_cell_values() matches get_cell_value() for many values at once.
+    """
+
+    test_reader = STC().get_a_dfr()
+    resources_data = test_reader.datasheets["Resources"]
+    names = resources_data["Resource_Name"].tolist()[::-1]
+    expected_ids = [test_reader.get_cell_value(resources_data, "Resource_Name", name,
+                                               "Resource_ID") for name in names]
+
+    assert test_reader.get_cell_values("Resources", "Resource_Name", names,
+                                       "Resource_ID") == expected_ids
+    assert test_reader.get_cell_values(resources_data, "Resource_Name", [],
+                                       "Resource_ID") == []
+
+def test_get_cell_values_missing():
+    """
+    Tests that get_cell_values() reports every value that isn't found.
+    """
+
+    test_reader = STC().get_a_dfr()
+    with pytest.raises(ValueError, match="Unobtainium.*Adamantium"):
+        test_reader.get_cell_values("Resources", "Resource_Name",
+                                    ["Water", "Unobtainium", "Adamantium"], "Resource_ID")
+    with pytest.raises(ValueError):
+        test_reader.get_cell_values("Title", "Resource_Name", ["Water"], "Resource_ID")
+
+def test_secondary_indexes_built_on_load():
+    """
+    Tests that loading an item dict builds its secondary indexes.
+    """
+
+    test_reader = STC().get_a_dfr()
+    assert sorted(test_reader.weapon_data.indexes) == ["dlc", "unique", "weapon_type"]
+    assert test_reader.get_weapons_by_type("gun") is test_reader.get_weapons_by_type("gun")
+    assert test_reader.get_weapons_by_unique(True) is test_reader.get_weapons_by_unique(True)
+
+def test_secondary_indexes_match_scan():
+    """
+    Tests that the indexed weapon filters match a scan of every weapon.
+    """
+
+    test_reader = STC().get_a_dfr()
+    for weapon_type in DO.WeaponItem.get_valid_weapon_types():
+        expected = [key for key, weapon in test_reader.weapon_data.items()
+                    if weapon.weapon_type == weapon_type]
+        assert list(test_reader.get_weapons_by_type(weapon_type)) == expected
+    mod_dict = dict(test_reader.armor_status_mods_data)
+    for slot in [1, 2, 3]:
+        assert dict(test_reader.get_status_mods_by_mod_slot(slot, mod_dict)) == \
+            dict(test_reader.get_status_mods_by_mod_slot(
+                slot, test_reader.armor_status_mods_data))
+
+def test_items_by_dlc():
+    """
+    Tests that get_items_by_dlc() splits an item dict into DLC and base game items.
+    """
+
+    test_reader = STC().get_a_dfr()
+    dlc_helmets = test_reader.get_items_by_dlc("helmet_data", True)
+    base_helmets = test_reader.get_items_by_dlc("helmet_data", False)
+
+    assert len(dlc_helmets) + len(base_helmets) == HELMETS_COUNT
+    assert all(helmet.dlc is True for helmet in dlc_helmets.values())
+
+def test_spacesuit_sets_by_faction():
+    """
+    Tests that get_spacesuit_sets_by_faction() only returns sets of that faction.
+    """
+
+    test_reader = STC().get_a_dfr()
+    faction = test_reader.spacesuit_set_data["deimos 1"].faction
+    faction_sets = test_reader.get_spacesuit_sets_by_faction(faction.upper())
+
+    assert "deimos 1" in faction_sets
+    assert all(spacesuit_set.faction == faction for spacesuit_set in faction_sets.values())
+
+def test_iter_items_matches_item_dicts():
+    """
+    Tests that streaming a sheet's items yields the same items as its item dict.
+    """
+
+    test_reader = STC().get_a_dfr()
+    for catalog_name, (sheet_name, _) in test_reader.CATALOG_SOURCES.items():
+        streamed_items = [repr(item) for item in test_reader.iter_items(sheet_name, 10)]
+        assert streamed_items == \
+            [repr(item) for item in test_reader.load_catalog(catalog_name).values()]
+
+def test_iter_items_keeps_nothing():
+    """
+    Tests that streaming a sheet's items doesn't build or cache anything.
+    """
+
+    test_reader = STC().get_a_dfr()
+    assert len(list(test_reader.iter_items("Weapons"))) == WEAPONS_COUNT
+    assert test_reader.is_loaded("weapon_data") is False
+    assert len(test_reader.backends) == 0
+    assert len(test_reader.datasheets.loaded_sheets) == 0
+    with pytest.raises(ValueError):
+        next(test_reader.iter_items("Title"))
@@ -0,0 +1,79 @@
+"""
+    Tests the item_builders module.
+"""
+from .context import IB, DO
+
+def test_is_missing():
+    """
+        Tests that empty cells in either pandas or raw xlrd form count as missing.
+    """
+
+    assert IB.is_missing(None) is True
+    assert IB.is_missing(float("nan")) is True
+    assert IB.is_missing("NA") is True
+    assert IB.is_missing("  ") is True
+    assert IB.is_missing("Deimos Pack") is False
+    assert IB.is_missing(0) is False
+
+def test_clean_id_column():
+    """
+        Tests that ids stored as numbers don't keep a trailing ".0".
+    """
+
+    assert IB.clean_id_column([" 0000556D ", 12345.0, 6789]) == ["0000556D", "12345", "6789"]
+
+def test_clean_flag_column():
+    """
+        Tests that flags stored as bools, numbers, or text all become bools.
+    """
+
+    assert IB.clean_flag_column([True, 0, 1, "FALSE", "TRUE", float("nan")]) == \
+        [True, False, True, False, True, False]
+
+def test_clean_slot_column():
+    """
+        Tests that slots stored as numbers or text become ints.
+    """
+
+    assert IB.clean_slot_column([1, 2.0, "3"]) == [1, 2, 3]
+
+def test_build_weapon_items():
+    """
+        Tests building weapons from columns of raw values.
+    """
+
+    test_dict = IB.build_weapon_items([[" AA-99 ", "Ace Sidearm"],
+                                       ["002BF65B", "2E073B"],
+                                       [False, "FALSE"],
+                                       [0, "TRUE"],
+                                       ["Gun", "gun"]])
+    assert list(test_dict) == ["aa-99", "ace sidearm"]
+    assert test_dict["ace sidearm"].get_id() == "002E073B"
+    assert test_dict["ace sidearm"].unique is True
+    assert test_dict["aa-99"].weapon_type == "gun"
+
+def test_build_items_skips_unnamed_rows():
+    """
+        Tests that rows without a name, like blank rows, are skipped.
+    """
+
+    test_dict = IB.build_ammo_items([["Test Ammo", float("nan"), ""],
+                                     ["00000001", float("nan"), ""]])
+    assert list(test_dict) == ["test ammo"]
+
+def test_build_spacesuit_set_items():
+    """
+        Tests that spacesuit sets are linked to their parts and missing parts are skipped.
+    """
+
+    spacesuits = {"test suit": DO.SpacesuitItem("Test Suit", "00000001", False)}
+    helmets = {"test helmet": DO.HelmetItem("Test Helmet", "00000002", False)}
+    test_dict = IB.build_spacesuit_set_items([["Test Set"], ["Test Suit"], ["Test Helmet"],
+                                              ["NA"], [float("nan")], [0]],
+                                             spacesuits, helmets, {})
+    test_set = test_dict["test set"]
+    assert test_set.spacesuit is spacesuits["test suit"]
+    assert test_set.helmet is helmets["test helmet"]
+    assert test_set.pack is None
+    assert test_set.faction is None
+    assert test_set.dlc is False
@@ -0,0 +1,67 @@
+"""
+    Tests the item_indexes module.
+"""
+import pickle
+import pytest
+from .context import DO, II
+
+def make_test_dict():
+    """
+        Returns an IndexedItemDict with a few weapons in it.
+
+        :return: An IndexedItemDict of weapons.
+    """
+    weapons = [DO.WeaponItem("AA-99", "002BF65B", False, False, "Gun"),
+               DO.WeaponItem("Ace Sidearm", "0027B8FB", False, True, "Gun"),
+               DO.WeaponItem("Barrow Knife", "00250CF3", False, False, "Melee")]
+    return II.IndexedItemDict((weapon.get_name().lower(), weapon) for weapon in weapons)
+
+def test_index_groups():
+    """
+        Tests that an index groups the items by an attribute.
+    """
+
+    test_dict = make_test_dict()
+
+    assert list(test_dict.get_indexed("weapon_type", "gun")) == ["aa-99", "ace sidearm"]
+    assert list(test_dict.get_indexed("unique", True)) == ["ace sidearm"]
+    assert test_dict.get_indexed("weapon_type", "thrown") is II.EMPTY_VIEW
+
+def test_index_built_once():
+    """
+        Tests that an index is only built once and its groups are read only.
+    """
+
+    test_dict = make_test_dict()
+    guns = test_dict.get_indexed("weapon_type", "gun")
+
+    assert test_dict.get_indexed("weapon_type", "gun") is guns
+    with pytest.raises(TypeError):
+        guns["new gun"] = None # pylint: disable=unsupported-assignment-operation
+
+def test_index_dropped_on_change():
+    """
+        Tests that changing the items drops the indexes.
+    """
+
+    test_dict = make_test_dict()
+    assert len(test_dict.get_indexed("weapon_type", "melee")) == 1
+
+    test_dict["rock"] = DO.WeaponItem("Rock", "00000001", False, False, "Thrown")
+    assert len(test_dict.get_indexed("weapon_type", "thrown")) == 1
+    del test_dict["barrow knife"]
+    assert len(test_dict.get_indexed("weapon_type", "melee")) == 0
+
+def test_index_pickle():
+    """
+        Tests that an IndexedItemDict pickles without its indexes.
+    """
+
+    test_dict = make_test_dict()
+    test_dict.build_indexes(["unique", "weapon_type"])
+    loaded_dict = pickle.loads(pickle.dumps(test_dict))
+
+    assert isinstance(loaded_dict, II.IndexedItemDict)
+    assert list(loaded_dict) == list(test_dict)
+    assert not loaded_dict.indexes
+    assert len(loaded_dict.get_indexed("unique", False)) == 2
@@ -0,0 +1,80 @@
+"""
+    Tests the item_store module.
+"""
+import pytest
+from .context import SCCGTestContext as STC
+from .context import IS
+
+def test_store_columns():
+    """
+        Tests that an ItemStore has a row and a column value for every item.
+    """
+
+    test_reader = STC().get_a_dfr()
+    test_store = test_reader.get_item_store("weapon_data")
+
+    assert len(test_store) == len(test_reader.weapon_data)
+    assert sorted(test_store.columns) == ["dlc", "unique", "weapon_type"]
+    assert test_store.get_column("weapon_type").tolist() == \
+        [weapon.weapon_type for weapon in test_reader.weapon_data.values()]
+    assert test_store.ids.tolist() == \
+        [weapon.get_id() for weapon in test_reader.weapon_data.values()]
+
+def test_store_combined_filter():
+    """
+        Tests that combined masks select the same weapons as a dict comprehension.
+    """
+
+    test_reader = STC().get_a_dfr()
+    test_store = test_reader.get_item_store("weapon_data")
+    expected = {key: weapon for key, weapon in test_reader.weapon_data.items()
+                if weapon.weapon_type == "gun" and weapon.unique is False}
+
+    selected = test_store.select(weapon_type="gun", unique=False)
+    assert list(selected) == list(expected)
+    assert all(selected[key] is expected[key] for key in expected)
+
+    row_mask = test_store.mask(weapon_type=["melee", "thrown"]) | test_store.mask(unique=True)
+    expected = {key for key, weapon in test_reader.weapon_data.items()
+                if weapon.weapon_type != "gun" or weapon.unique is True}
+    assert set(test_store.select(row_mask)) == expected
+    assert test_store.count(~row_mask) == len(test_reader.weapon_data) - len(expected)
+
+def test_store_mod_slots_and_factions():
+    """
+        Tests filtering the status mods by slot and the spacesuit sets by faction.
+    """
+
+    test_reader = STC().get_a_dfr()
+    mod_store = test_reader.get_item_store("armor_status_mods_data")
+    assert dict(mod_store.select(mod_slot=2)) == \
+        dict(test_reader.get_status_mods_by_mod_slot(2, test_reader.armor_status_mods_data))
+
+    set_store = test_reader.get_item_store("spacesuit_set_data")
+    faction = test_reader.spacesuit_set_data["deimos 1"].faction
+    assert dict(set_store.select(faction=faction)) == \
+        dict(test_reader.get_spacesuit_sets_by_faction(faction))
+    assert len(set_store.select(faction="not a faction")) == 0
+
+def test_store_bad_column():
+    """
+        Tests that filtering on a column the items don't have raises a ValueError.
+    """
+
+    test_store = IS.ItemStore(STC().get_a_dfr().ammo_data)
+    with pytest.raises(ValueError):
+        test_store.mask(unique=True)
+    with pytest.raises(ValueError):
+        test_store.get_column("dlc")
+
+def test_store_rebuilt_with_catalog():
+    """
+        Tests that the store is cached and rebuilt when its item dict is replaced.
+    """
+
+    test_reader = STC().get_a_dfr()
+    test_store = test_reader.get_item_store("helmet_data")
+    assert test_reader.get_item_store("helmet_data") is test_store
+
+    test_reader.helmet_data = {}
+    assert len(test_reader.get_item_store("helmet_data")) == 0
@@ -0,0 +1,85 @@
+"""
+    Tests the load_timings module and DataFileReader.load_report().
+"""
+from os import path as OSPATH
+import pytest
+from .context import SCCGTestContext as STC
+from .context import DFR, DL, LT
+
+def test_load_report():
+    """
+        Tests that every phase of the built sheets is timed and counted.
+    """
+
+    test_reader = DFR.DataFileReader(STC().known_datasheet_path, record_timings=True)
+    _ = test_reader.weapon_data
+    _ = test_reader.spacesuit_set_data
+    report = test_reader.load_report()
+
+    assert list(report["sheets"]) == ["Weapons", "Spacesuits", "Helmets", "Packs",
+                                      "Spacesuit_Sets"]
+    weapons = report["sheets"]["Weapons"]
+    assert weapons["rows"] == 139
+    assert weapons["items"] == 139
+    assert weapons["read"] > 0 and weapons["normalize"] > 0 and weapons["build"] > 0
+    assert weapons["join"] == 0
+    assert weapons["total"] == pytest.approx(sum(weapons[phase] for phase in LT.LOAD_PHASES))
+    assert report["sheets"]["Spacesuit_Sets"]["join"] > 0
+    assert report["totals"]["read"] == pytest.approx(sum(sheet["read"] for sheet
+                                                         in report["sheets"].values()))
+    assert "Spacesuit_Sets" in test_reader.format_load_report()
+
+def test_load_report_disabled():
+    """
+        Tests that a reader that doesn't record timings has no report.
+    """
+
+    test_reader = STC().get_a_dfr()
+    assert len(test_reader.ammo_data) == 22
+    assert test_reader.load_timings is None
+    with pytest.raises(ValueError):
+        test_reader.load_report()
+
+def test_layered_load_report(tmp_path):
+    """
+        Tests that a layered reader counts the layers' rows in the merged sheet.
+    """
+
+    # pylint: disable=import-outside-toplevel
+    from .test_datatable_layers import write_overlay
+
+    overlay_path = write_overlay(OSPATH.join(tmp_path, "overlay.xls"))
+    test_reader = DL.LayeredDataFileReader([STC().known_datasheet_path, overlay_path],
+                                           record_timings=True)
+    assert len(test_reader.weapon_data) == 140
+
+    weapons = test_reader.load_report()["sheets"]["Weapons"]
+    assert weapons["items"] == 140
+    assert weapons["build"] > 0
+    assert weapons["join"] > 0
+
+def test_phase_clock():
+    """
+        Tests that mark_phase() only does something while a clock runs, and that
+        stopping a clock gives the thread back the clock it had before.
+    """
+
+    timings = LT.LoadTimings()
+    LT.mark_phase("build")
+    assert not timings.sheets
+
+    outer_clock = timings.start_clock("Outer")
+    inner_clock = timings.start_clock("Inner")
+    LT.mark_phase("normalize", 5)
+    inner_clock.stop(4)
+    assert LT.running_clocks.clock is outer_clock
+    LT.mark_phase("join")
+    outer_clock.stop()
+    assert LT.running_clocks.clock is None
+
+    assert timings.sheets["Inner"]["rows"] == 5
+    assert timings.sheets["Inner"]["items"] == 4
+    assert timings.sheets["Outer"]["join"] > 0
+    assert timings.sheets["Outer"]["rows"] is None
+    with pytest.raises(ValueError):
+        timings.add_time("Outer", "not a phase", 1.0)
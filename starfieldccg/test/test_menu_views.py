@@ -5,7 +5,7 @@
 import pytest
 from .context import MV
 from .context import SCCGTestContext as STC
-from .context import DO
+from .context import DFR, DO
 
 @staticmethod
 def generate_fake_data_for_item_menus(num_items: int):
@@ -261,6 +261,24 @@ def test_statusmodmenu_weapons_chunks_three():
     assert len(weapons_status_mod_menu.display_chunks[1]) == 1
     assert len(weapons_status_mod_menu.display_chunks[2]) == 1
 
+def test_statusmodmenu_map_reader(tmp_path):
+    """
+    Test that a StatusModMenu of a reader built from a catalog map file
+    has the same mods in each slot as one of the datasheet's.
+    """
+
+    map_path = str(tmp_path / "catalog.map")
+    test_reader = STC().get_a_dfr()
+    test_reader.export_catalog_map(map_path)
+    map_reader = DFR.DataFileReader(STC().known_datasheet_path, map_path=map_path)
+
+    for catalog_name in ("armor_status_mods_data", "weapon_status_mods_data"):
+        map_menu = MV.StatusModMenu(getattr(map_reader, catalog_name), "Test Menu")
+        known_menu = MV.StatusModMenu(getattr(test_reader, catalog_name), "Test Menu")
+        assert [sorted(items) for items in map_menu.menu_items] == \
+            [sorted(items) for items in known_menu.menu_items]
+        assert all(len(items) > 0 for items in map_menu.menu_items)
+
 def test_qualitymenu_options_weapons():
     """
     Tests that the quality menu has the right amount of options
@@ -294,3 +312,12 @@ def test_status_menu_wrong_dict_type():
     with pytest.raises(TypeError) as te:
         bad_mod_menu = MV.StatusModMenu("invalid data type as str",
                                   "Test Menu")
+
+def test_itemmenu_read_only_view():
+    """
+        Verifies that an ItemMenu can be built from a read only filtered view.
+    """
+    test_reader = STC().get_a_dfr()
+    unique_menu = MV.ItemMenu(test_reader.get_weapons_by_unique(True), "Test Menu")
+
+    assert len(unique_menu.menu_items) == len(test_reader.get_weapons_by_unique(True))
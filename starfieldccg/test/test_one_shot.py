@@ -0,0 +1,96 @@
+"""
+    Tests the one_shot module.
+"""
+import io
+import shutil
+import subprocess
+import sys
+from os import path as OSPATH
+import pytest
+from .context import SCCGTestContext as STC
+from .context import OSC
+
+def run_command(argv: list):
+    """
+        Runs a one shot command without a snapshot.
+
+        :param argv: A list of the str arguments.
+        :return: A tuple of the int exit code and the str output.
+    """
+    output = io.StringIO()
+    return OSC.run_one_shot(argv + ["--no-snapshot"], output), output.getvalue()
+
+def test_give():
+    """
+        Tests that give prints the command of an item found by its category and
+        name however they are written.
+    """
+
+    test_reader = STC().get_a_dfr()
+    rifle = test_reader.weapon_data["broken fang's heirloom rifle"]
+    assert run_command(["give", "Weapons", "Broken Fang's Heirloom  Rifle", "5"]) == \
+        (0, f"{rifle.get_command(5)}\n")
+    assert run_command(["give", "spacesuit set", "fang's"]) == \
+        (0, f"{test_reader.spacesuit_set_data["fang's"].get_command(1)}\n")
+
+def test_mods_and_quality():
+    """
+        Tests that mods prints a command for each slot that isn't skipped, and
+        quality prints the command of a level.
+    """
+
+    test_reader = STC().get_a_dfr()
+    mods = test_reader.armor_status_mods_data
+    assert run_command(["mods", "armor", "ablative", "skip", "Assisted Carry"]) == \
+        (0, f"{mods['ablative'].get_command()}\n{mods['assisted carry'].get_command()}\n")
+    assert run_command(["quality", "weapon", "II"]) == \
+        (0, f"{test_reader.weapon_quality_mods_data['ii'].get_command()}\n")
+
+def test_one_shot_errors(capsys):
+    """
+        Tests that the problems of a command are printed together and it exits with 1.
+    """
+
+    assert run_command(["mods", "armor", "acrobat", "not a mod"]) == (1, "")
+    error = capsys.readouterr().err
+    assert "'acrobat' is a slot 2 mod, not slot 1" in error
+    assert "'not a mod' isn't a armor status mod" in error
+    assert run_command(["give", "not a category", "x"]) == (1, "")
+    with pytest.raises(SystemExit):
+        run_command(["give", "weapon", "x", "lots"])
+
+def test_one_shot_skips_menus():
+    """
+        Tests that running a one shot command through the package never
+        imports prompt_toolkit, or sqlite3 without --database.
+    """
+
+    code = ("import runpy, sys\n"
+            "sys.argv = ['starfieldccg', 'give', 'ammo', '.27 caliber', '3', '--no-snapshot']\n"
+            "try:\n"
+            "    runpy.run_module('starfieldccg', run_name='__main__', alter_sys=True)\n"
+            "except SystemExit as e:\n"
+            "    print(e.code, 'prompt_toolkit' in sys.modules, 'sqlite3' in sys.modules)\n")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                            check=True, cwd=OSPATH.abspath(OSPATH.join(OSPATH.dirname(__file__),
+                                                             "../..")))
+    assert result.stdout.splitlines()[-1] == "0 False False"
+    assert result.stdout.startswith("player.additem ")
+
+def test_one_shot_builds_only_what_it_needs(tmp_path):
+    """
+        Tests that a one shot command with no snapshot builds only the item dict
+        it needs and leaves writing the snapshot to the menus.
+    """
+
+    datatable_path = str(tmp_path / "datatable.xls")
+    shutil.copyfile(STC().known_datasheet_path, datatable_path)
+    args = OSC.make_parser().parse_args(["give", "ammo", ".27 Caliber", "--datatable",
+                                         datatable_path])
+    catalog = OSC.make_catalog(args)
+    assert OSC.get_give_commands(catalog, args) == \
+        [catalog.get_items("ammo")[".27 caliber"].get_command(1)]
+    reader = catalog.get_reader()
+    assert [name for name in reader.CATALOG_NAMES if reader.is_loaded(name)] == ["ammo_data"]
+    assert OSPATH.exists(reader.snapshot.snapshot_path) is False
+    catalog.close()
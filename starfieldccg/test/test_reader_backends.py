@@ -0,0 +1,167 @@
+"""
+    Tests the reader_backends module.
+"""
+import subprocess
+import sys
+from os import path as OSPATH
+import pytest
+from .context import SCCGTestContext as STC
+from .context import DFR, RB
+from .synthetic_datatable import write_datatable, write_synthetic_datatable
+
+def get_catalog_reprs(reader):
+    """
+        Returns the repr of every item a DataFileReader builds.
+
+        :param reader: A DataFileReader object.
+        :return: A dict of item reprs keyed by catalog name and item key.
+    """
+    return {(name, key): repr(item) for name, data_dict in reader.get_catalog().items()
+            for key, item in data_dict.items()}
+
+def test_backends_build_identical_catalogs():
+    """
+        Tests that the xlrd and pandas backends build the same catalog.
+    """
+
+    datasheet_path = STC().known_datasheet_path
+    xlrd_catalog = get_catalog_reprs(DFR.DataFileReader(datasheet_path, backend="xlrd"))
+    pandas_catalog = get_catalog_reprs(DFR.DataFileReader(datasheet_path, backend="pandas"))
+
+    assert len(xlrd_catalog) > 0
+    assert xlrd_catalog == pandas_catalog
+
+def test_backends_build_identical_synthetic_catalogs(tmp_path):
+    """
+        Tests that the xlrd and pandas backends build the same catalog from
+        a larger generated datatable.
+    """
+
+    datasheet_path = write_synthetic_datatable(OSPATH.join(tmp_path, "synthetic.xls"), 3,
+                                               STC().known_datasheet_path)
+    xlrd_catalog = get_catalog_reprs(DFR.DataFileReader(datasheet_path, backend="xlrd"))
+    pandas_catalog = get_catalog_reprs(DFR.DataFileReader(datasheet_path, backend="pandas"))
+
+    assert xlrd_catalog == pandas_catalog
+
+def test_xlrd_backend_rows():
+    """
+        Tests that the xlrd backend yields plain tuples without the header row.
+    """
+
+    backend = RB.XlrdBackend(STC().known_datasheet_path)
+    rows = list(backend.iter_rows("Weapons", 5))
+    backend.close()
+
+    assert len(rows) == 139
+    assert rows[0] == ("AA-99", "002BF65B", False, False, "Gun")
+    assert all(isinstance(row, tuple) and len(row) == 5 for row in rows)
+
+def test_xlrd_backend_pads_short_rows():
+    """
+        Tests that rows are padded with None when a sheet has fewer columns than asked for.
+    """
+
+    backend = RB.XlrdBackend(STC().known_datasheet_path)
+    rows = list(backend.iter_rows("Ammo", 4))
+    backend.close()
+
+    assert rows[0] == (".27 Caliber", "002B559C", None, None)
+
+def test_xlrd_backend_streams_same_rows(tmp_path):
+    """
+        Tests that streaming a sheet yields the same rows as parsing it, and
+        unloads the sheet again.
+    """
+
+    datasheet_paths = [STC().known_datasheet_path,
+                       write_synthetic_datatable(OSPATH.join(tmp_path, "synthetic.xls"), 3,
+                                                 STC().known_datasheet_path)]
+    for datasheet_path in datasheet_paths:
+        parsing_backend = RB.XlrdBackend(datasheet_path)
+        streaming_backend = RB.XlrdBackend(datasheet_path, use_mmap=True)
+        for sheet_name in parsing_backend.get_workbook().sheet_names():
+            for column_count in (2, 6):
+                assert list(streaming_backend.stream_rows(sheet_name, column_count)) \
+                    == list(parsing_backend.iter_rows(sheet_name, column_count))
+                assert streaming_backend.get_workbook().sheet_loaded(sheet_name) is False
+        parsing_backend.close()
+        streaming_backend.close()
+
+def test_xlrd_backend_streams_cell_types(tmp_path):
+    """
+        Tests that streamed number, bool, formula, and blank cells match xlrd's values.
+    """
+
+    # pylint: disable=import-outside-toplevel
+    import xlwt
+
+    rows = [["Ammo_Name", "Ammo_ID", "Count", "Ratio", "Flag", "Sum", "Label"],
+            ["First", "0001", 5, 0.123456789, True, xlwt.Formula("2+3"),
+             xlwt.Formula('"a"&"b"')],
+            ["", "", "", "", "", "", ""],
+            ["Third", 3, -2.5, 1e300, False, xlwt.Formula("1=1"), "Text"]]
+    datasheet_path = write_datatable(OSPATH.join(tmp_path, "cells.xls"),
+                                     {"Ammo": (rows[0], rows[1:])})
+    backend = RB.XlrdBackend(datasheet_path)
+    streamed_rows = list(backend.stream_rows("Ammo", 8))
+
+    assert streamed_rows == list(backend.iter_rows("Ammo", 8))
+    assert streamed_rows[1] == (None,) * 8
+    assert streamed_rows[2][:5] == ("Third", 3.0, -2.5, 1e300, False)
+    backend.close()
+
+def test_reader_iter_rows():
+    """
+        Tests that DataFileReader.iter_rows() yields the used columns of a sheet.
+    """
+
+    test_reader = STC().get_a_dfr()
+    rows = list(test_reader.iter_rows("Armor_Status_Mods"))
+
+    assert len(rows) == 32
+    assert all(len(row) == 4 for row in rows)
+    with pytest.raises(ValueError):
+        list(test_reader.iter_rows("Title"))
+
+def test_datasheets_still_use_pandas():
+    """
+        Tests that get_cell_value() still works on the DataFrames in datasheets
+        when the item dicts are built with the xlrd backend.
+    """
+
+    test_reader = STC().get_a_dfr()
+    ammo_sheet = test_reader.datasheets["Ammo"]
+
+    assert test_reader.get_cell_value(ammo_sheet, "Ammo_Name", ".27 Caliber", "Ammo_ID") \
+        == "002B559C"
+    assert len(test_reader.ammo_data) == 22
+
+def test_invalid_backend():
+    """
+        Tests that an unknown backend name raises a ValueError.
+    """
+
+    with pytest.raises(ValueError):
+        DFR.DataFileReader(STC().known_datasheet_path, backend="openpyxl")
+    with pytest.raises(ValueError):
+        RB.get_reader_backend("openpyxl", STC().known_datasheet_path)
+
+def test_auto_backend_skips_pandas():
+    """
+        Tests that building the whole catalog with the default backend doesn't import pandas.
+    """
+
+    package_path = OSPATH.abspath(OSPATH.join(OSPATH.dirname(__file__), "../."))
+    script = "\n".join([
+        "import sys",
+        f"sys.path.insert(0, {package_path!r})",
+        "import src.data_file_reader as DFR",
+        f"reader = DFR.DataFileReader({STC().known_datasheet_path!r})",
+        "reader.get_catalog()",
+        "print('pandas' in sys.modules, 'numpy' in sys.modules)"
+    ])
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True,
+                            text=True, check=True, cwd=package_path)
+
+    assert result.stdout.strip() == "False False"
@@ -0,0 +1,179 @@
+"""
+    Tests reloading a DataFileReader when its datasheet changes.
+"""
+import threading
+import time
+from os import path as OSPATH
+import pytest
+from .context import SCCGTestContext as STC
+from .context import DFR, RB
+from .synthetic_datatable import read_datatable_rows, write_datatable
+
+def write_edited_datatable(tgt_path: str, edits: dict):
+    """
+        Writes a copy of the known datatable with some cells changed.
+
+        :param tgt_path: A str path to write the datatable to.
+        :param edits: A dict of (sheet name, row, column) to the new cell value.
+        :return: A str of the tgt_path.
+    """
+    sheets = read_datatable_rows(STC().known_datasheet_path)
+    for (sheet_name, row, column), value in edits.items():
+        sheets[sheet_name][1][row][column] = value
+    return write_datatable(tgt_path, sheets)
+
+def make_watched_reader(tmp_path):
+    """
+        Writes an unedited copy of the known datatable and returns a reader for it
+        with the ammo, weapon, and spacesuit set dicts built and the sheets hashed.
+
+        :param tmp_path: The folder to write the datatable to.
+        :return: A tuple of the DataFileReader and the str datatable path.
+    """
+    datasheet_path = write_edited_datatable(OSPATH.join(tmp_path, "datatable.xls"), {})
+    test_reader = DFR.DataFileReader(datasheet_path)
+    for name in ["ammo_data", "weapon_data", "spacesuit_set_data"]:
+        test_reader.load_catalog(name)
+    test_reader.record_sheet_hashes()
+    return (test_reader, datasheet_path)
+
+def test_reload_unchanged(tmp_path):
+    """
+        Tests that reloading an unchanged datatable keeps every item dict.
+    """
+
+    test_reader, _ = make_watched_reader(tmp_path)
+    ammo_data = test_reader.ammo_data
+
+    assert not test_reader.reload()
+    assert test_reader.ammo_data is ammo_data
+
+def test_reload_changed_sheet(tmp_path):
+    """
+        Tests that only the item dict of the edited sheet is rebuilt.
+    """
+
+    test_reader, datasheet_path = make_watched_reader(tmp_path)
+    weapon_data = test_reader.weapon_data
+    old_ammo_data = test_reader.ammo_data
+
+    write_edited_datatable(datasheet_path, {("Ammo", 0, 0): "Reloaded Caliber"})
+    assert test_reader.reload() == ["Ammo"]
+
+    assert test_reader.weapon_data is weapon_data
+    assert test_reader.ammo_data is not old_ammo_data
+    assert "reloaded caliber" in test_reader.ammo_data
+    assert ".27 caliber" not in test_reader.ammo_data
+    assert ".27 caliber" in old_ammo_data
+
+def test_sheet_hashes(tmp_path):
+    """
+        Tests that only the hash of an edited sheet changes, and that hashing
+        leaves the sheets unloaded.
+    """
+
+    _, datasheet_path = make_watched_reader(tmp_path)
+    sheet_names = DFR.DataFileReader.SHEET_NAMES
+    backend = RB.XlrdBackend(datasheet_path)
+    old_hashes = backend.get_sheet_hashes(sheet_names)
+    assert not any(backend.get_workbook().sheet_loaded(sheet) for sheet in sheet_names)
+    backend.close()
+
+    write_edited_datatable(datasheet_path, {("Ammo", 0, 0): "Reloaded Caliber"})
+    backend = RB.XlrdBackend(datasheet_path)
+    new_hashes = backend.get_sheet_hashes(sheet_names)
+    backend.close()
+    assert [sheet for sheet in sheet_names if new_hashes[sheet] != old_hashes[sheet]] == \
+        ["Ammo"]
+
+def test_reload_relinks_sets(tmp_path):
+    """
+        Tests that rebuilding the spacesuits rebuilds the spacesuit sets so they
+        point at the new spacesuits, but the unbuilt helmets stay unbuilt.
+    """
+
+    test_reader, datasheet_path = make_watched_reader(tmp_path)
+    spacesuit_key = test_reader.spacesuit_set_data["deimos 1"].spacesuit.get_name()
+    row = list(test_reader.spacesuit_data).index(spacesuit_key.lower())
+
+    write_edited_datatable(datasheet_path, {("Spacesuits", row, 1): "00ABCDEF"})
+    assert test_reader.reload() == ["Spacesuits"]
+
+    new_set = test_reader.spacesuit_set_data["deimos 1"]
+    assert new_set.spacesuit is test_reader.spacesuit_data[spacesuit_key.lower()]
+    assert new_set.get_id()[0].endswith("ABCDEF")
+
+def test_reload_unbuilt_dicts_use_new_file(tmp_path):
+    """
+        Tests that an item dict that wasn't built before the reload is built
+        from the new file.
+    """
+
+    test_reader, datasheet_path = make_watched_reader(tmp_path)
+    write_edited_datatable(datasheet_path, {("Resources", 0, 0): "Reloadium"})
+
+    assert test_reader.reload() == ["Resources"]
+    assert test_reader.is_loaded("resource_data") is False
+    assert "reloadium" in test_reader.resource_data
+
+def test_reload_database_reader():
+    """
+        Tests that a reader using a catalog database can't be reloaded.
+    """
+
+    test_reader = DFR.DataFileReader(None, database_path="catalog.sqlite")
+    with pytest.raises(ValueError):
+        test_reader.reload()
+
+def test_watch_reloads(tmp_path):
+    """
+        Tests that the watch thread reloads the edited sheet on its own.
+    """
+
+    test_reader, datasheet_path = make_watched_reader(tmp_path)
+    reloaded = threading.Event()
+    reloaded_sheets = []
+
+    def on_reload(sheets):
+        reloaded_sheets.extend(sheets)
+        reloaded.set()
+
+    test_reader.start_watching(interval=0.05, on_reload=on_reload)
+    try:
+        write_edited_datatable(datasheet_path, {("Weapons", 0, 0): "A Much Longer Weapon Name"})
+        assert reloaded.wait(10) is True
+    finally:
+        test_reader.stop_watching()
+
+    assert reloaded_sheets == ["Weapons"]
+    assert "a much longer weapon name" in test_reader.weapon_data
+    assert test_reader.watch_thread is None
+
+def test_watch_reports_errors_once(tmp_path):
+    """
+        Tests that a reload that fails is reported once, not on every check,
+        and that the next good save is reloaded.
+    """
+
+    test_reader, datasheet_path = make_watched_reader(tmp_path)
+    errors = []
+    failed = threading.Event()
+    reloaded = threading.Event()
+    test_reader.start_watching(interval=0.02, on_reload=lambda sheets: reloaded.set(),
+                               on_error=lambda e: (errors.append(e), failed.set()))
+    try:
+        with open(datasheet_path, "wb") as datasheet_file:
+            datasheet_file.write(b"not a workbook")
+        assert failed.wait(10) is True
+        time.sleep(0.2)
+        assert len(errors) == 1
+        assert test_reader.get_watch_error() is errors[0]
+        assert test_reader.get_watch_error() is None
+
+        write_edited_datatable(datasheet_path, {("Weapons", 0, 0): "A Much Longer Weapon Name"})
+        assert reloaded.wait(10) is True
+    finally:
+        test_reader.stop_watching()
+
+    assert len(errors) == 1
+    assert "a much longer weapon name" in test_reader.weapon_data
@@ -0,0 +1,91 @@
+"""
+    Tests the settings_io module.
+"""
+import json
+import pytest
+from .context import SIO
+
+def make_settings_file(tgt_folder, settings: dict):
+    """
+        Writes a settings file to a folder.
+
+        :param tgt_folder: A path to the folder to write the file to.
+        :param settings: A dict of the settings to write.
+        :return: A str path to the settings file.
+    """
+    settings_path = str(tgt_folder / "settings_data.json")
+    with open(settings_path, "w", 1, "UTF-8") as settings_file:
+        settings_file.write(json.dumps({"name": "SCCGSettings Class", "settings": settings}))
+    return settings_path
+
+def test_load_workers_default(tmp_path):
+    """
+        Tests that an older settings file without load_workers gets the default.
+    """
+
+    test_settings = SIO.SCCGSettings(make_settings_file(tmp_path, {"dlc_load_order": "01"}))
+    assert test_settings.settings["load_workers"] == SIO.DEFAULT_LOAD_WORKERS
+
+def test_set_load_workers(tmp_path):
+    """
+        Tests that set_load_workers() saves the value.
+    """
+
+    settings_path = make_settings_file(tmp_path, {"dlc_load_order": "01"})
+    SIO.SCCGSettings(settings_path).set_load_workers("4")
+    assert SIO.SCCGSettings(settings_path).settings["load_workers"] == 4
+
+def test_set_load_workers_invalid(tmp_path):
+    """
+        Tests that set_load_workers() rejects values that aren't zero or positive.
+    """
+
+    test_settings = SIO.SCCGSettings(make_settings_file(tmp_path, {"dlc_load_order": "01"}))
+    with pytest.raises(ValueError):
+        test_settings.set_load_workers("-1")
+    with pytest.raises(ValueError):
+        test_settings.set_load_workers("four")
+
+def test_subscribe(tmp_path):
+    """
+        Tests that subscribers are called when a setting changes, that a bound
+        method is held weakly, and that unsubscribed functions aren't called.
+    """
+
+    class Subscriber():
+        """
+            Records the changes it is told about.
+        """
+        # pylint: disable=too-few-public-methods
+
+        def __init__(self):
+            self.changes = []
+
+        def on_change(self, old_value, new_value):
+            """
+                Records a change.
+            """
+            self.changes.append((old_value, new_value))
+
+    test_settings = SIO.SCCGSettings(make_settings_file(tmp_path, {"dlc_load_order": "01"}))
+    changes = []
+    subscriber = Subscriber()
+    test_settings.subscribe("dlc_load_order", lambda *change: changes.append(change))
+    test_settings.subscribe("dlc_load_order", subscriber.on_change)
+    test_settings.subscribe("load_workers", subscriber.on_change)
+
+    test_settings.set_dlc_load_order("7F")
+    test_settings.set_dlc_load_order("7F")
+    test_settings.set_load_workers(2)
+    assert changes == [("01", "7F")]
+    assert subscriber.changes == [("01", "7F"), (0, 2)]
+
+    test_settings.unsubscribe("dlc_load_order", subscriber.on_change)
+    test_settings.set_dlc_load_order("02")
+    assert subscriber.changes == [("01", "7F"), (0, 2)]
+
+    del subscriber
+    test_settings.set_load_workers(3)
+    assert changes == [("01", "7F"), ("7F", "02")]
+    with pytest.raises(ValueError):
+        test_settings.subscribe("not_a_setting", print)